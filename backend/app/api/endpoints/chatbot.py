@@ -633,9 +633,7 @@ async def chatbot_health(
         redis_healthy = False
         try:
             from app.services.genai_service import genai_service
-            if genai_service.redis_client:
-                genai_service.redis_client.ping()
-                redis_healthy = True
+            redis_healthy = await genai_service.test_redis_connection()
         except:
             pass
         
@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, Query, HTTPException, Path
+from fastapi.responses import StreamingResponse
 from typing import List, Dict, Any, Optional
 from app.core.permissions import require_permissions
 from app.models.user import User
 from pydantic import BaseModel
+import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -71,6 +73,8 @@ class ResourceSummaryResponse(BaseModel):
     resources: Dict[str, List[Dict[str, Any]]]
     total_resources: int
     last_updated: str
+    stale_entries: int = 0
+    staleness_seconds: float = 0.0
 
 @router.get("/compartments", response_model=List[CompartmentResponse])
 async def get_compartments(
@@ -100,6 +104,29 @@ async def get_compartments(
             )
         ]
 
+@router.get("/compartments/tree")
+async def get_compartment_tree(
+    root: Optional[str] = Query(None, description="Compartment OCID to start from (defaults to the tenancy)"),
+    max_depth: Optional[int] = Query(None, ge=0, description="Deepest level to include"),
+    current_user: User = Depends(require_permissions("can_view_dashboard"))
+) -> Dict[str, Any]:
+    """
+    Get the compartment hierarchy as a nested tree.
+    
+    **Required permissions:** viewer, operator, or admin
+    
+    Each node carries its depth and descendant count, children sorted by name.
+    """
+    try:
+        tree = await get_oci_service().get_compartment_tree()
+    except Exception as e:
+        logger.error(f"Failed to get compartment tree: {e}")
+        raise HTTPException(status_code=500, detail="Unable to retrieve compartment tree")
+    node = tree.to_dict(root, max_depth)
+    if node is None:
+        raise HTTPException(status_code=404, detail="Compartment not found")
+    return node
+
 @router.get("/compartments/{compartment_id}/resources", response_model=ResourceSummaryResponse)
 async def get_compartment_resources(
     compartment_id: str = Path(..., description="OCI Compartment ID"),
@@ -129,6 +156,44 @@ async def get_compartment_resources(
         logger.error(f"Failed to get compartment resources: {e}")
         raise HTTPException(status_code=500, detail="Unable to retrieve compartment resources")
 
+@router.get("/compartments/{compartment_id}/resources/stream")
+async def stream_compartment_resources(
+    compartment_id: str = Path(..., description="OCI Compartment ID (the tenancy OCID streams every compartment)"),
+    resource_types: Optional[str] = Query(None, description="Comma-separated list of resource types to filter"),
+    format: str = Query("ndjson", pattern="^(ndjson|sse)$", description="ndjson (one JSON object per line) or sse"),
+    current_user: User = Depends(require_permissions("can_view_dashboard"))
+) -> StreamingResponse:
+    """
+    Stream resource discovery chunk by chunk.
+    
+    **Required permissions:** viewer, operator, or admin
+    
+    Emits a `start` event, one `resources` chunk per compartment/type listing as it
+    completes (with `source_compartment` on the chunk), `progress` events and a final
+    `summary`, so the first resources arrive without waiting for the whole tenancy.
+    """
+    resource_filter = [rt.strip() for rt in resource_types.split(",")] if resource_types else None
+    oci_svc = get_oci_service()
+
+    async def event_generator():
+        try:
+            async for event in oci_svc.stream_all_resources(compartment_id, resource_filter):
+                payload = json.dumps(event, default=str)
+                yield f"event: {event['event']}\ndata: {payload}\n\n" if format == "sse" else f"{payload}\n"
+        except Exception as e:
+            logger.error(f"Resource discovery stream failed: {e}")
+            payload = json.dumps({"event": "error", "message": "Unable to retrieve compartment resources"})
+            yield f"event: error\ndata: {payload}\n\n" if format == "sse" else f"{payload}\n"
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream" if format == "sse" else "application/x-ndjson",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
 @router.get("/compartments/{compartment_id}/compute-instances")
 async def get_compute_instances(
     compartment_id: str = Path(..., description="OCI Compartment ID"),
@@ -276,7 +276,7 @@ async def clear_conversation_context(
     """Clear conversation context for a session"""
     try:
         if genai_service.context_manager:
-            genai_service.context_manager.clear_context(session_id)
+            await genai_service.context_manager.clear_context(session_id)
         
         return {"message": f"Context cleared for session {session_id}"}
         
@@ -297,7 +297,7 @@ async def get_conversation_context(
         if not genai_service.context_manager:
             return {"messages": [], "metadata": {}}
         
-        context = genai_service.context_manager.get_context(session_id)
+        context = await genai_service.context_manager.get_context(session_id)
         return context
         
     except Exception as e:
@@ -430,7 +430,7 @@ async def create_prompt_version(
         })
         
         # Register new version
-        genai_service.register_prompt_version(prompt_type, version, template, metadata)
+        await genai_service.register_prompt_version(prompt_type, version, template, metadata)
         
         return {
             "status": "success",
@@ -494,7 +494,7 @@ async def create_ab_test(
         genai_service = genai_service
         
         # Create A/B test
-        test_id = genai_service.create_prompt_ab_test(
+        test_id = await genai_service.create_prompt_ab_test(
             prompt_type=prompt_type,
             baseline_template=baseline_template,
             variant_template=variant_template,
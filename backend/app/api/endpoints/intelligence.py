@@ -142,12 +142,8 @@ async def refresh_health_matrix(
     try:
         service = get_intelligence_service()
         
-        # Clear cache for this compartment
-        cache_key = service._get_cache_key('health_matrix', compartment_id)
-        if cache_key in service._cache:
-            del service._cache[cache_key]
-        if f"{cache_key}:timestamp" in service._cache:
-            del service._cache[f"{cache_key}:timestamp"]
+        # Clear cache for this compartment (in every worker)
+        await service.invalidate_health_matrix(compartment_id)
         
         # Recompute
         matrix = await service.get_health_matrix(compartment_id)
@@ -12,6 +12,7 @@ from app.services.kubernetes_service_working import get_working_kubernetes_servi
 from app.services.auth_service import AuthService
 from app.models.user import User
 from app.core.permissions import check_user_permissions
+from app.core.executors import get_executor
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +38,7 @@ async def kubernetes_health():
     try:
         loop = asyncio.get_event_loop()
         health_result = await asyncio.wait_for(
-            loop.run_in_executor(None, get_working_kubernetes_service().health_check),
+            loop.run_in_executor(get_executor("k8s"), get_working_kubernetes_service().health_check),
             timeout=5.0
         )
         return health_result
@@ -72,7 +73,7 @@ async def configure_cluster(
         
         success = await asyncio.wait_for(
             loop.run_in_executor(
-                None,
+                get_executor("k8s"),
                 lambda: get_working_kubernetes_service().configure_cluster(
                     kubeconfig_content=request.kubeconfig_content,
                     cluster_name=request.cluster_name
@@ -84,7 +85,7 @@ async def configure_cluster(
         if success:
             # Get cluster info with timeout
             cluster_info = await asyncio.wait_for(
-                loop.run_in_executor(None, get_working_kubernetes_service().get_cluster_info),
+                loop.run_in_executor(get_executor("k8s"), get_working_kubernetes_service().get_cluster_info),
                 timeout=10.0  # 10 second timeout
             )
             
@@ -134,7 +135,7 @@ async def get_cluster_info(
         # Get cluster info with timeout
         loop = asyncio.get_event_loop()
         cluster_info = await asyncio.wait_for(
-            loop.run_in_executor(None, get_working_kubernetes_service().get_cluster_info),
+            loop.run_in_executor(get_executor("k8s"), get_working_kubernetes_service().get_cluster_info),
             timeout=10.0
         )
         
@@ -167,7 +168,7 @@ async def get_namespaces(
         
         loop = asyncio.get_event_loop()
         namespaces = await asyncio.wait_for(
-            loop.run_in_executor(None, get_working_kubernetes_service().get_namespaces),
+            loop.run_in_executor(get_executor("k8s"), get_working_kubernetes_service().get_namespaces),
             timeout=10.0
         )
         
@@ -202,7 +203,7 @@ async def get_pods(
         loop = asyncio.get_event_loop()
         pods = await asyncio.wait_for(
             loop.run_in_executor(
-                None,
+                get_executor("k8s"),
                 lambda: get_working_kubernetes_service().get_pods(namespace)
             ),
             timeout=15.0
@@ -242,7 +243,7 @@ async def get_pod_logs(
         loop = asyncio.get_event_loop()
         logs = await asyncio.wait_for(
             loop.run_in_executor(
-                None,
+                get_executor("k8s"),
                 lambda: get_working_kubernetes_service().get_pod_logs(
                     pod_name=pod_name,
                     namespace=namespace,
@@ -290,7 +291,7 @@ async def get_rbac_roles(
         loop = asyncio.get_event_loop()
         roles = await asyncio.wait_for(
             loop.run_in_executor(
-                None,
+                get_executor("k8s"),
                 lambda: get_working_kubernetes_service().get_rbac_roles(namespace)
             ),
             timeout=15.0
@@ -327,7 +328,7 @@ async def get_rbac_bindings(
         loop = asyncio.get_event_loop()
         bindings = await asyncio.wait_for(
             loop.run_in_executor(
-                None,
+                get_executor("k8s"),
                 lambda: get_working_kubernetes_service().get_rbac_bindings(namespace)
             ),
             timeout=15.0
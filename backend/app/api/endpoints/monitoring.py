@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Response
+from fastapi.responses import StreamingResponse
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
+import json
 import logging
 
 from app.core.permissions import require_permissions
@@ -17,6 +19,7 @@ class AlertSummaryResponse(BaseModel):
     compartment_id: str
     total_alarms: int
     active_alarms: int
+    firing_alarms: int = 0
     severity_breakdown: Dict[str, int]
     recent_activity: Dict[str, Any]
     top_alerts: List[Dict[str, Any]]
@@ -35,11 +38,14 @@ class LogSearchRequest(BaseModel):
     start_time: datetime
     end_time: datetime
     limit: Optional[int] = 1000
+    page: Optional[str] = None  # Cursor (X-Next-Page) of a previous, truncated search
+    time_budget_seconds: Optional[float] = None
 
 # Monitoring Endpoints
 @router.get("/alerts/summary")
 async def get_alert_summary(
     compartment_id: str = Query(..., description="OCI Compartment ID"),
+    include_subtree: bool = Query(False, description="Include OCI alarms of all child compartments"),
     current_user: User = Depends(require_permissions("can_view_alerts"))
 ) -> AlertSummaryResponse:
     """
@@ -52,7 +58,7 @@ async def get_alert_summary(
     try:
         logger.info(f"Getting alert summary for compartment {compartment_id} by user {current_user.username}")
         
-        summary = await get_monitoring_service().get_alert_summary(compartment_id)
+        summary = await get_monitoring_service().get_alert_summary(compartment_id, include_subtree)
         return AlertSummaryResponse(**summary)
         
     except Exception as e:
@@ -62,6 +68,7 @@ async def get_alert_summary(
 @router.get("/alarms")
 async def get_alarms(
     compartment_id: str = Query(..., description="OCI Compartment ID"),
+    include_subtree: bool = Query(False, description="Include OCI alarms of all child compartments"),
     current_user: User = Depends(require_permissions("can_view_alerts"))
 ) -> List[Dict[str, Any]]:
     """
@@ -69,12 +76,12 @@ async def get_alarms(
     
     **Required permissions:** viewer or higher
     
-    Returns list of active alarms with their configuration and status.
+    Returns list of active alarms with their configuration and firing status.
     """
     try:
         logger.info(f"Getting alarms for compartment {compartment_id}")
         
-        alarms = await get_monitoring_service().get_alarm_status(compartment_id)
+        alarms = await get_monitoring_service().get_alarm_status(compartment_id, include_subtree)
         return alarms
         
     except Exception as e:
@@ -169,6 +176,7 @@ async def get_metric_namespaces(
 
 @router.post("/logs/search")
 async def search_logs(
+    response: Response,
     compartment_id: str = Query(..., description="OCI Compartment ID"),
     log_request: LogSearchRequest = None,
     current_user: User = Depends(require_permissions("can_view_alerts"))
@@ -178,25 +186,70 @@ async def search_logs(
     
     **Required permissions:** viewer or higher
     
-    Returns log entries matching the search criteria.
+    Returns log entries matching the search criteria. When the search stops at
+    the result limit or time budget, the `X-Next-Page` header carries the cursor
+    to pass as `page` to continue it.
     """
     try:
         logger.info(f"Searching logs for compartment {compartment_id}")
         
-        logs = await get_monitoring_service().search_logs(
+        search = await get_monitoring_service().search_logs(
             compartment_id=compartment_id,
             search_query=log_request.search_query,
             start_time=log_request.start_time,
             end_time=log_request.end_time,
-            limit=log_request.limit
+            limit=log_request.limit,
+            page=log_request.page,
+            time_budget=log_request.time_budget_seconds
         )
+        if search["next_page"]:
+            response.headers["X-Next-Page"] = search["next_page"]
         
-        return logs
+        return search["results"]
         
     except Exception as e:
         logger.error(f"Failed to search logs: {e}")
         raise HTTPException(status_code=500, detail="Unable to search logs")
 
+@router.post("/logs/search/stream")
+async def stream_log_search(
+    log_request: LogSearchRequest,
+    compartment_id: str = Query(..., description="OCI Compartment ID"),
+    format: str = Query("ndjson", pattern="^(ndjson|sse)$", description="ndjson (one JSON object per line) or sse"),
+    current_user: User = Depends(require_permissions("can_view_alerts"))
+) -> StreamingResponse:
+    """
+    Stream log search results page by page.
+    
+    **Required permissions:** viewer or higher
+    
+    Emits a `logs` event per result page as it arrives and a final `summary` with
+    the `next_page` cursor when the search stopped at the result limit or time budget.
+    """
+    monitoring = get_monitoring_service()
+
+    async def event_generator():
+        try:
+            async for event in monitoring.stream_logs(
+                compartment_id, log_request.search_query, log_request.start_time, log_request.end_time,
+                max_results=log_request.limit, time_budget=log_request.time_budget_seconds, page=log_request.page
+            ):
+                payload = json.dumps(event, default=str)
+                yield f"event: {event['event']}\ndata: {payload}\n\n" if format == "sse" else f"{payload}\n"
+        except Exception as e:
+            logger.error(f"Log search stream failed: {e}")
+            payload = json.dumps({"event": "error", "message": "Unable to search logs"})
+            yield f"event: error\ndata: {payload}\n\n" if format == "sse" else f"{payload}\n"
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream" if format == "sse" else "application/x-ndjson",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
 @router.get("/health")
 async def get_monitoring_health(
     compartment_id: str = Query(..., description="OCI Compartment ID"),
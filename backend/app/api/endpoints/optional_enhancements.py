@@ -20,6 +20,7 @@ from app.core.permissions import require_permissions
 from app.services.auth_service import AuthService
 from app.models.user import User
 from app.services.prometheus_service import get_prometheus_service, MetricDefinition
+from app.services.cache_service import cache_service
 from app.services.grafana_service import get_grafana_service, GrafanaDataSource, GrafanaDashboard
 from app.services.notification_service import (
     get_notification_service, 
@@ -45,6 +46,8 @@ async def get_prometheus_metrics():
     """Export Prometheus metrics in standard format"""
     try:
         prometheus_service = get_prometheus_service()
+        # Cache size gauges are sampled at scrape time
+        cache_service.update_usage_metrics()
         metrics_data = prometheus_service.export_metrics()
         
         return Response(
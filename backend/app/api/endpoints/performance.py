@@ -4,6 +4,7 @@ import logging
 from app.services.performance_service import performance_service
 from app.services.cache_service import cache_service
 from app.api.endpoints.auth import get_current_user
+from app.core.executors import get_executor_stats, run_in_pool
 from app.core.permissions import RequireAdminRole, RequireOperatorRole
 from app.models.user import User
 
@@ -21,7 +22,7 @@ async def get_system_metrics(
         _ = current_user  # already validated by dependency
 
         
-        metrics = performance_service.system_monitor.get_system_metrics()
+        metrics = await run_in_pool("io", performance_service.system_monitor.get_system_metrics)
         process_metrics = await performance_service.system_monitor.get_process_metrics()
         
         return {
@@ -29,7 +30,7 @@ async def get_system_metrics(
             "data": {
                 "system": metrics,
                 "process": process_metrics,
-                "timestamp": performance_service.system_monitor.get_system_metrics().get("timestamp")
+                "timestamp": metrics.get("timestamp")
             }
         }
         
@@ -90,6 +91,56 @@ async def get_cache_stats(
             detail=f"Failed to get cache statistics: {str(e)}"
         )
 
+@router.get("/oci/stats", tags=["performance"])
+async def get_oci_stats(
+    current_user: User = Depends(RequireOperatorRole)
+) -> Dict[str, Any]:
+    """Get OCI list call pagination and rate governor statistics"""
+    try:
+        from app.core.oci_governor import oci_governor
+        from app.services.cloud_service import get_oci_service
+        from app.services.monitoring_service import get_monitoring_service
+        
+        monitoring = get_monitoring_service()
+        metric_store, alert_engine = monitoring.metric_store, monitoring.alert_engine
+        return {
+            "success": True,
+            "data": {
+                "pagination": get_oci_service().get_pagination_stats(),
+                "rate_governor": oci_governor.get_stats(),
+                "inventory_sync": get_oci_service().inventory_sync.get_stats(),
+                "inventory_index": get_oci_service().inventory_index.get_stats(),
+                "metric_batcher": get_oci_service().metric_batcher.get_stats(),
+                "metric_store": metric_store.get_stats() if metric_store is not None else None,
+                "alert_rules": alert_engine.get_stats() if alert_engine is not None else None
+            }
+        }
+        
+    except Exception as e:
+        logger.error(f"Error getting OCI stats: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get OCI statistics: {str(e)}"
+        )
+
+@router.get("/executors/stats", tags=["performance"])
+async def get_executors_stats(
+    current_user: User = Depends(RequireOperatorRole)
+) -> Dict[str, Any]:
+    """Get queue depth, active threads and queue wait of the named executor pools"""
+    try:
+        return {
+            "success": True,
+            "data": get_executor_stats()
+        }
+        
+    except Exception as e:
+        logger.error(f"Error getting executor stats: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get executor statistics: {str(e)}"
+        )
+
 @router.get("/database/optimization", tags=["performance"])
 async def get_database_optimization(
     current_user: User = Depends(RequireAdminRole)
@@ -129,7 +180,7 @@ async def get_performance_health(
         
         # Get health information
         cache_health = await cache_service.health_check()
-        system_metrics = performance_service.system_monitor.get_system_metrics()
+        system_metrics = await run_in_pool("io", performance_service.system_monitor.get_system_metrics)
         
         # Calculate overall health
         overall_status = "healthy"
@@ -241,7 +292,7 @@ async def get_performance_alerts(
         # Require admin or operator role
         require_role(current_user, ["Admin", "Operator"])
         
-        system_metrics = performance_service.system_monitor.get_system_metrics()
+        system_metrics = await run_in_pool("io", performance_service.system_monitor.get_system_metrics)
         process_metrics = await performance_service.system_monitor.get_process_metrics()
         
         alerts = performance_service._check_performance_alerts(system_metrics, process_metrics)
@@ -326,7 +326,7 @@ async def clear_vault_cache(
 ):
     """Clear the vault cache to force refresh from OCI Vault"""
     try:
-        get_vault_service().clear_cache()
+        await get_vault_service().clear_cache()
         return {"message": "Vault cache cleared successfully"}
     
     except Exception as e:
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 import os
 
 class Settings(BaseSettings):
@@ -35,6 +35,23 @@ class Settings(BaseSettings):
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
     REDIS_PASSWORD: str = ""
+    REDIS_MAX_CONNECTIONS: int = 50  # Shared async pool used by all services
+    REDIS_SOCKET_TIMEOUT: float = 0.5  # Short timeout so an unreachable Redis fails fast
+    REDIS_CIRCUIT_FAILURE_THRESHOLD: int = 3  # Consecutive failures before Redis is skipped
+    REDIS_CIRCUIT_RESET_TIMEOUT: float = 5.0  # Seconds before the first half-open probe
+    REDIS_CIRCUIT_MAX_RESET_TIMEOUT: float = 60.0  # Probe backoff ceiling
+    
+    # In-process cache tier limits
+    CACHE_LOCAL_MAX_ENTRIES: int = 1000
+    CACHE_LOCAL_MAX_BYTES: int = 64 * 1024 * 1024  # 64MB
+    CACHE_NAMESPACE_QUOTAS: Dict[str, int] = {}  # Per-namespace byte quotas, e.g. {"oci": 33554432}
+    CACHE_FILE_MAX_BYTES: int = 512 * 1024 * 1024  # Size cap of the persistent SQLite tier
+    CACHE_FILE_JANITOR_INTERVAL: int = 300  # Seconds between purges of expired persistent entries (0 disables)
+    CACHE_GENERATION_REFRESH_SECONDS: float = 2.0  # How often namespace generations are re-read from Redis
+    CACHE_CODEC: str = "auto"  # Payload codec for Redis/file tiers: auto, orjson or json
+    CACHE_NAMESPACE_CODECS: Dict[str, str] = {}  # Per-namespace codec overrides, e.g. {"rate_limit": "json"}
+    CACHE_COMPRESSION: str = "zstd"  # zstd, lz4 or none
+    CACHE_COMPRESSION_MIN_BYTES: int = 16 * 1024  # Payloads smaller than this are stored uncompressed
     
     # Security Settings
     SECURITY_MIDDLEWARE_ENABLED: bool = False  # Temporarily disabled to fix login timeout
@@ -61,6 +78,32 @@ class Settings(BaseSettings):
     OCI_USER_ID: str = ""
     OCI_FINGERPRINT: str = ""
     OCI_KEY_FILE: str = ""
+    OCI_LIST_PAGE_SIZE: int = 0  # Items requested per list page (0 = service default)
+    OCI_LIST_MAX_ITEMS: int = 0  # Stop paginating one listing after this many items (0 = follow every page)
+    OCI_FANOUT_CONCURRENCY: int = 16  # Concurrent child calls shared by all fan-outs (subnets, bucket details, ...)
+    OCI_FANOUT_TIMEOUT: float = 30.0  # Seconds allowed for each child call of a fan-out
+    OCI_RATE_INITIAL: float = 10.0  # Starting requests/s per OCI operation, adapted on 429s (AIMD)
+    OCI_RATE_MIN: float = 0.5  # Floor the adaptive rate never drops below
+    OCI_RATE_MAX: float = 50.0  # Ceiling the adaptive rate never grows past
+    OCI_RATE_BURST: float = 10.0  # Requests an idle operation may send at once
+    OCI_RATE_MAX_RETRIES: int = 5  # Retries of a throttled (429) call before the error is raised
+    OCI_INVENTORY_BACKEND: str = "search"  # Tenancy-wide inventory: "search" (Resource Search) or "compartments"
+    OCI_INVENTORY_SEARCH_ENRICH: bool = True  # Fill fields search lacks by listing the non-empty compartment/type pairs
+    OCI_INVENTORY_SYNC_ENABLED: bool = True  # Background delta sync into a persistent OCID-keyed inventory snapshot
+    OCI_INVENTORY_SYNC_INTERVAL: int = 60  # Seconds between delta syncs (timeCreated/timeUpdated search filters)
+    OCI_INVENTORY_RECONCILE_INTERVAL: int = 3600  # Seconds between full reconciles against an unfiltered search
+    OCI_DISCOVERY_STREAM_WORKERS: int = 16  # Compartment/type listings in flight per streaming discovery request
+    METRIC_STORE_MAX_SERIES: int = 10000  # Metric streams kept in the local time-series store (least recently used out)
+    METRIC_STORE_RAW_HOURS: int = 6  # Hours of 1-minute points kept per stream
+    METRIC_STORE_5M_HOURS: int = 24  # Hours of 5-minute rollups kept per stream
+    METRIC_STORE_1H_DAYS: int = 14  # Days of 1-hour rollups kept per stream
+    ALERT_EVALUATION_INTERVAL: int = 60  # Seconds between alert rule evaluations per compartment (reads in between are served from rule state)
+    ALARM_DEFINITIONS_TTL: int = 900  # Seconds tenancy-wide alarm definitions (list_alarms) are cached
+    ALARM_STATUS_TTL: int = 60  # Seconds tenancy-wide alarm firing status (list_alarms_status) is cached
+    EXECUTOR_OCI_SDK_WORKERS: int = 32  # Threads for blocking OCI SDK calls
+    EXECUTOR_OCI_USAGE_WORKERS: int = 4  # Threads for slow OCI Usage API queries
+    EXECUTOR_K8S_WORKERS: int = 8  # Threads for Kubernetes client calls
+    EXECUTOR_IO_WORKERS: int = 8  # Threads for file cache I/O and system sampling
     
     # Global Dummy Mode Flags (disable all live external connections by default)
     USE_DUMMY_OCI: bool = True
@@ -85,6 +128,8 @@ class Settings(BaseSettings):
     MONITORING_CACHE_TTL: int = 300  # 5 minutes cache for monitoring data
     ALERT_HISTORY_HOURS: int = 24  # Default hours of alert history to retrieve
     MAX_LOG_SEARCH_RESULTS: int = 1000  # Maximum log search results per query
+    LOG_SEARCH_PAGE_SIZE: int = 500  # Results requested per Logging Search page (opc-next-page is followed)
+    LOG_SEARCH_TIME_BUDGET_SECONDS: float = 30.0  # Stop paginating one search after this long; the cursor resumes it
     HEALTH_SCORE_THRESHOLD_HEALTHY: float = 90.0
     HEALTH_SCORE_THRESHOLD_WARNING: float = 70.0
     HEALTH_SCORE_THRESHOLD_DEGRADED: float = 50.0
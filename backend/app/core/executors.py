@@ -0,0 +1,160 @@
+"""
+Named thread pools for blocking work
+Each workload class gets its own sized executor so a slow call of one kind (a long
+Usage API query, a hung Kubernetes request) can only exhaust its own pool:
+
+- ``oci-sdk``: OCI SDK calls (inventory, monitoring, logging, identity)
+- ``oci-usage``: OCI Usage API queries, which routinely take seconds
+- ``k8s``: Kubernetes client calls
+- ``io``: file cache I/O and system sampling (psutil)
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+POOLS = ("oci-sdk", "oci-usage", "k8s", "io")
+
+
+class InstrumentedThreadPool(ThreadPoolExecutor):
+    """ThreadPoolExecutor reporting queue depth, active threads and queue wait"""
+
+    def __init__(self, name: str, max_workers: int):
+        super().__init__(max_workers=max_workers, thread_name_prefix=name)
+        self.name = name
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.queue_seconds = 0.0
+        self.max_queue_seconds = 0.0
+
+    def submit(self, fn: Callable, /, *args, **kwargs) -> Future:
+        submitted = time.perf_counter()
+        with self._lock:
+            self.queued += 1
+            queued, active = self.queued, self.active
+        self._publish(queued, active)
+
+        def run():
+            waited = time.perf_counter() - submitted
+            with self._lock:
+                self.queued -= 1
+                self.active += 1
+                self.queue_seconds += waited
+                self.max_queue_seconds = max(self.max_queue_seconds, waited)
+                queued, active = self.queued, self.active
+            self._publish(queued, active, waited)
+            failed = False
+            try:
+                return fn(*args, **kwargs)
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                with self._lock:
+                    self.active -= 1
+                    self.completed += 1
+                    self.failed += failed
+                    queued, active = self.queued, self.active
+                self._publish(queued, active)
+
+        def dequeue(cancelled: bool):
+            with self._lock:
+                self.queued -= 1
+                self.cancelled += cancelled
+                queued, active = self.queued, self.active
+            self._publish(queued, active)
+
+        def on_done(future: Future):
+            # A future can only be cancelled while queued, so run() never started
+            if future.cancelled():
+                dequeue(True)
+
+        try:
+            future = super().submit(run)
+        except BaseException:
+            # Rejected, e.g. after shutdown
+            dequeue(False)
+            raise
+        future.add_done_callback(on_done)
+        return future
+
+    def _publish(self, queued: int, active: int, waited: Optional[float] = None):
+        # Imported here: app.services imports modules that import this one
+        from app.services.prometheus_service import get_prometheus_service
+        get_prometheus_service().update_executor_state(self.name, queued, active, waited)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            started = self.completed + self.active
+            return {
+                "max_workers": self.max_workers,
+                "threads": len(self._threads),
+                "active": self.active,
+                "queue_depth": self.queued,
+                "completed": self.completed,
+                "failed": self.failed,
+                "cancelled": self.cancelled,
+                "avg_queue_wait_ms": round(self.queue_seconds / started * 1000, 3) if started else 0,
+                "max_queue_wait_ms": round(self.max_queue_seconds * 1000, 3),
+            }
+
+
+_executors: Dict[str, InstrumentedThreadPool] = {}
+_executors_lock = threading.Lock()
+
+
+def _pool_size(name: str) -> int:
+    return {
+        "oci-sdk": settings.EXECUTOR_OCI_SDK_WORKERS,
+        "oci-usage": settings.EXECUTOR_OCI_USAGE_WORKERS,
+        "k8s": settings.EXECUTOR_K8S_WORKERS,
+        "io": settings.EXECUTOR_IO_WORKERS,
+    }[name]
+
+
+def get_executor(name: str) -> InstrumentedThreadPool:
+    """Get a named pool, creating it on first use"""
+    if name not in POOLS:
+        raise ValueError(f"Unknown executor pool '{name}' (expected one of {', '.join(POOLS)})")
+
+    executor = _executors.get(name)
+    if executor is None:
+        with _executors_lock:
+            executor = _executors.get(name)
+            if executor is None:
+                executor = _executors[name] = InstrumentedThreadPool(name, _pool_size(name))
+                logger.info(f"🧵 Executor pool '{name}' created ({executor.max_workers} workers)")
+    return executor
+
+
+async def run_in_pool(name: str, func: Callable, *args, **kwargs) -> Any:
+    """Run a blocking callable in a named pool without blocking the event loop"""
+    return await asyncio.get_running_loop().run_in_executor(
+        get_executor(name), functools.partial(func, *args, **kwargs)
+    )
+
+
+def get_executor_stats() -> Dict[str, Any]:
+    """Get size, queue depth, active threads and queue wait of every pool created so far"""
+    return {name: _executors[name].get_stats() for name in POOLS if name in _executors}
+
+
+def shutdown_executors():
+    """Stop every pool; queued work is cancelled, running calls finish in the background"""
+    with _executors_lock:
+        for executor in _executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        _executors.clear()
@@ -0,0 +1,138 @@
+"""
+Cross-worker cache invalidation bus
+In-process caches (CacheService's local tier, the chatbot resource context, intelligence
+and vault caches) subscribe by name; an invalidation published in one worker is delivered
+to the same cache in every other worker over Redis pub/sub
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from app.core.redis_pool import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+InvalidationHandler = Callable[[Dict[str, Any]], Union[None, Awaitable[None]]]
+# (operation, command) -> command result, or None when the call was skipped or failed
+RedisCaller = Callable[[str, Callable[[], Awaitable[Any]]], Awaitable[Any]]
+
+
+class InvalidationBus:
+    """Redis pub/sub fan-out of invalidation messages to named in-process caches"""
+
+    CHANNEL = "cache:invalidations"
+
+    def __init__(self):
+        # Messages published by this process are ignored when they come back
+        self.origin = uuid.uuid4().hex
+        self._handlers: Dict[str, List[InvalidationHandler]] = {}
+        self._listener_task: Optional[asyncio.Task] = None
+        self._redis_caller: Optional[RedisCaller] = None
+        self.stats = {"published": 0, "received": 0, "publish_errors": 0, "handler_errors": 0, "reconnects": 0}
+
+    def route_through(self, redis_caller: RedisCaller):
+        """Publish through ``redis_caller`` (``CacheService._call_redis``), so an open
+        Redis circuit skips publishing instead of waiting on socket timeouts"""
+        self._redis_caller = redis_caller
+
+    def subscribe(self, cache_name: str, handler: InvalidationHandler):
+        """Register a handler (sync or async) for invalidations of a named cache"""
+        self._handlers.setdefault(cache_name, []).append(handler)
+
+    async def publish(self, cache_name: str, **fields: Any):
+        """Tell every other worker to invalidate entries of a named cache
+
+        The publishing worker is expected to have updated its own cache already.
+        Failures are logged and swallowed: local TTLs remain the safety net.
+        """
+        client = get_redis_client()
+        if client is None:
+            return
+
+        message = json.dumps({"origin": self.origin, "cache": cache_name, **fields}, default=str)
+        try:
+            if self._redis_caller is None:
+                await client.publish(self.CHANNEL, message)
+            elif await self._redis_caller("publish", lambda: client.publish(self.CHANNEL, message)) is None:
+                # Circuit open or Redis unreachable
+                self.stats["publish_errors"] += 1
+                return
+            self.stats["published"] += 1
+        except Exception as e:
+            self.stats["publish_errors"] += 1
+            logger.debug(f"Invalidation publish failed for {cache_name}: {e}")
+
+    def start(self):
+        """Start listening for invalidations from other workers (no-op without Redis)"""
+        if get_redis_client() is None or (self._listener_task and not self._listener_task.done()):
+            return
+        self._listener_task = asyncio.get_running_loop().create_task(self._listen())
+        logger.info("📡 Cache invalidation bus listening")
+
+    async def stop(self):
+        """Stop the listener"""
+        if self._listener_task:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener_task = None
+
+    async def _listen(self):
+        """Consume the channel, reconnecting with backoff when Redis drops"""
+        backoff = 1.0
+        while True:
+            pubsub = get_redis_client().pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.CHANNEL)
+                backoff = 1.0
+                async for raw in pubsub.listen():
+                    if raw.get("type") == "message":
+                        await self.dispatch(raw["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["reconnects"] += 1
+                logger.warning(f"⚠️ Invalidation bus disconnected, retrying in {backoff:.0f}s: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    async def dispatch(self, raw: Union[str, bytes]):
+        """Deliver one raw message to the handlers of its cache"""
+        try:
+            message = json.loads(raw)
+        except (TypeError, ValueError):
+            return
+        if message.get("origin") == self.origin:
+            return
+
+        self.stats["received"] += 1
+        for handler in self._handlers.get(message.get("cache"), []):
+            try:
+                result = handler(message)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                self.stats["handler_errors"] += 1
+                logger.warning(f"Invalidation handler failed for {message.get('cache')}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get message counters and subscriptions"""
+        return {
+            **self.stats,
+            "listening": bool(self._listener_task and not self._listener_task.done()),
+            "subscriptions": sorted(self._handlers),
+        }
+
+
+# Global invalidation bus instance
+invalidation_bus = InvalidationBus()
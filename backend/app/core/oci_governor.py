@@ -0,0 +1,244 @@
+"""
+Process-wide OCI API rate governor
+Every OCI SDK call made by the backend (inventory, monitoring, cost and access analysis)
+passes through one adaptive token bucket per (service, operation). Limits follow AIMD:
+each success raises the rate a little, each 429 cuts it and honours ``Retry-After``,
+so callers share what the tenancy's throttling has taught instead of backing off alone.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.executors import run_in_pool
+
+logger = logging.getLogger(__name__)
+
+# Multiplicative decrease applied on a 429, and additive increase in requests/s
+# gained per second of sustained successful traffic
+DECREASE_FACTOR = 0.5
+INCREASE_PER_SECOND = 0.5
+
+# Throughput is reported over this trailing window
+THROUGHPUT_WINDOW_SECONDS = 60.0
+
+# Executor pool per SDK client; anything not listed runs in ``oci-sdk``
+SERVICE_POOLS = {"UsageapiClient": "oci-usage"}
+
+
+def is_throttle_error(error: Exception) -> bool:
+    """True for an OCI 429 (TooManyRequests) response"""
+    return getattr(error, 'status', None) == 429 or 'TooManyRequests' in str(getattr(error, 'code', ''))
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Delay requested by a ``Retry-After`` header (seconds or HTTP date), if any"""
+    headers = getattr(error, 'headers', None) or {}
+    value = headers.get('retry-after') or headers.get('Retry-After')
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveTokenBucket:
+    """Token bucket whose refill rate adapts to throttling (AIMD)
+
+    Tokens are reserved synchronously and may go negative, so concurrent callers
+    queue in arrival order without a lock; a caller sleeps until its reservation
+    is covered. A ``Retry-After`` is applied as token debt, pausing the whole
+    operation rather than only the request that was throttled.
+    """
+
+    def __init__(self, rate: float, burst: float, min_rate: float, max_rate: float):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.tokens = burst
+        self.updated = time.monotonic()
+        # 429s for requests sent before the last decrease report load we already reacted to
+        self.last_decrease = 0.0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """Take a token, returning how long the caller must wait before using it"""
+        self._refill(time.monotonic())
+        self.tokens -= 1
+        return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+    def on_success(self):
+        self.rate = min(self.max_rate, self.rate + INCREASE_PER_SECOND / self.rate)
+
+    def on_throttle(self, sent_at: float, retry_after: Optional[float]) -> bool:
+        """Back off after a 429; returns True when the rate was actually cut"""
+        now = time.monotonic()
+        self._refill(now)
+        decreased = sent_at >= self.last_decrease
+        if decreased:
+            self.rate = max(self.min_rate, self.rate * DECREASE_FACTOR)
+            self.last_decrease = now
+        # Drain the bucket so the next request waits at least one interval, or Retry-After
+        self.tokens = min(self.tokens, 0.0) - (retry_after or 0.0) * self.rate
+        return decreased
+
+
+class _OperationStats:
+    __slots__ = ("calls", "successes", "throttles", "errors", "retries", "queue_seconds",
+                 "max_queue_seconds", "waiting", "completions")
+
+    def __init__(self):
+        self.calls = 0
+        self.successes = 0
+        self.throttles = 0
+        self.errors = 0
+        self.retries = 0
+        self.queue_seconds = 0.0
+        self.max_queue_seconds = 0.0
+        self.waiting = 0
+        self.completions: Deque[float] = deque()
+
+    def record_completion(self, now: float):
+        """Count a successful call; the window is trimmed here so it stays bounded between stats reads"""
+        self.completions.append(now)
+        self._trim(now)
+
+    def throughput(self, now: float) -> float:
+        self._trim(now)
+        return len(self.completions) / THROUGHPUT_WINDOW_SECONDS
+
+    def _trim(self, now: float):
+        while self.completions and now - self.completions[0] > THROUGHPUT_WINDOW_SECONDS:
+            self.completions.popleft()
+
+
+class OCIRateGovernor:
+    """Shared adaptive rate limits for OCI SDK calls, keyed by service and operation"""
+
+    def __init__(self):
+        self.initial_rate = settings.OCI_RATE_INITIAL
+        self.min_rate = settings.OCI_RATE_MIN
+        self.max_rate = settings.OCI_RATE_MAX
+        self.burst = settings.OCI_RATE_BURST
+        self.max_retries = settings.OCI_RATE_MAX_RETRIES
+        self._buckets: Dict[Tuple[str, str], AdaptiveTokenBucket] = {}
+        self._stats: Dict[Tuple[str, str], _OperationStats] = {}
+
+    @staticmethod
+    def describe(client_method: Callable) -> Tuple[str, str]:
+        """(service, operation) labels of a bound SDK client method"""
+        service = type(getattr(client_method, '__self__', None)).__name__
+        return service, getattr(client_method, '__name__', 'call')
+
+    def _bucket(self, key: Tuple[str, str]) -> AdaptiveTokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = AdaptiveTokenBucket(
+                self.initial_rate, self.burst, self.min_rate, self.max_rate
+            )
+            self._stats[key] = _OperationStats()
+        return bucket
+
+    async def call(self, client_method: Callable, *args, **kwargs) -> Any:
+        """Run a blocking SDK call in its executor pool once its operation's bucket allows it
+
+        429s are retried (up to ``OCI_RATE_MAX_RETRIES``) after the bucket has
+        backed off; the last 429 and every other error propagate unchanged.
+        """
+        # Imported here: app.services imports this module while initializing
+        from app.services.prometheus_service import get_prometheus_service
+
+        key = self.describe(client_method)
+        bucket = self._bucket(key)
+        stats = self._stats[key]
+        prometheus = get_prometheus_service()
+        pool = SERVICE_POOLS.get(key[0], "oci-sdk")
+        stats.calls += 1
+
+        for attempt in range(self.max_retries + 1):
+            wait = bucket.reserve()
+            if wait:
+                stats.waiting += 1
+                try:
+                    await asyncio.sleep(wait)
+                finally:
+                    stats.waiting -= 1
+            stats.queue_seconds += wait
+            stats.max_queue_seconds = max(stats.max_queue_seconds, wait)
+            prometheus.observe_oci_queue_wait(*key, wait)
+
+            sent_at = time.monotonic()
+            try:
+                result = await run_in_pool(pool, client_method, *args, **kwargs)
+            except Exception as e:
+                elapsed = time.monotonic() - sent_at
+                if not is_throttle_error(e):
+                    stats.errors += 1
+                    prometheus.record_oci_api_call(*key, "error", elapsed)
+                    raise
+
+                stats.throttles += 1
+                prometheus.record_oci_api_call(*key, "throttled", elapsed)
+                retry_after = retry_after_seconds(e)
+                if bucket.on_throttle(sent_at, retry_after):
+                    logger.warning(
+                        f"⚠️ OCI throttling (429) on {key[0]}.{key[1]}; rate lowered to {bucket.rate:.2f}/s"
+                        + (f", pausing {retry_after:.1f}s" if retry_after else "")
+                    )
+                prometheus.record_oci_throttle(*key)
+                prometheus.update_oci_rate_limit(*key, bucket.rate)
+                if attempt == self.max_retries:
+                    raise
+                stats.retries += 1
+                continue
+
+            stats.successes += 1
+            stats.record_completion(time.monotonic())
+            bucket.on_success()
+            prometheus.record_oci_api_call(*key, "success", time.monotonic() - sent_at)
+            prometheus.update_oci_rate_limit(*key, bucket.rate)
+            return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-operation throughput, queue wait, throttle counts and current limits"""
+        now = time.monotonic()
+        operations = {}
+        for (service, operation), stats in sorted(self._stats.items()):
+            bucket = self._buckets[(service, operation)]
+            waits = stats.calls + stats.retries
+            operations[f"{service}.{operation}"] = {
+                "calls": stats.calls,
+                "successes": stats.successes,
+                "throttles": stats.throttles,
+                "retries": stats.retries,
+                "errors": stats.errors,
+                "throughput_per_second": round(stats.throughput(now), 3),
+                "avg_queue_wait_ms": round(stats.queue_seconds / waits * 1000, 3) if waits else 0,
+                "max_queue_wait_ms": round(stats.max_queue_seconds * 1000, 3),
+                "waiting": stats.waiting,
+                "rate_per_second": round(bucket.rate, 3),
+            }
+        return {
+            "initial_rate": self.initial_rate,
+            "min_rate": self.min_rate,
+            "max_rate": self.max_rate,
+            "burst": self.burst,
+            "operations": operations,
+        }
+
+
+oci_governor = OCIRateGovernor()
@@ -0,0 +1,96 @@
+"""
+Shared asyncio Redis client
+Every service borrows connections from a single pooled client so Redis round trips
+never block the event loop or occupy executor threads needed by the OCI SDK
+"""
+
+import logging
+from typing import Optional
+
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_redis_client: Optional[aioredis.Redis] = None
+# Separate pool returning raw bytes, for binary cache payloads
+_redis_binary_client: Optional[aioredis.Redis] = None
+
+
+def _create_client(decode_responses: bool) -> aioredis.Redis:
+    pool = aioredis.ConnectionPool(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        db=settings.REDIS_DB,
+        password=settings.REDIS_PASSWORD or None,
+        decode_responses=decode_responses,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        retry_on_timeout=False,
+        health_check_interval=30
+    )
+    return aioredis.Redis(connection_pool=pool)
+
+
+def get_redis_client() -> Optional[aioredis.Redis]:
+    """Get the shared asyncio Redis client, or None when Redis is disabled.
+
+    The pool connects lazily on the first command, so calling this during
+    service construction never blocks startup.
+    """
+    global _redis_client
+    if not settings.REDIS_ENABLED:
+        return None
+
+    if _redis_client is None:
+        _redis_client = _create_client(decode_responses=True)
+        logger.info(f"✅ Shared async Redis pool created (max {settings.REDIS_MAX_CONNECTIONS} connections, lazy)")
+
+    return _redis_client
+
+
+def get_redis_binary_client() -> Optional[aioredis.Redis]:
+    """Get the shared asyncio Redis client that returns bytes, or None when Redis is disabled"""
+    global _redis_binary_client
+    if not settings.REDIS_ENABLED:
+        return None
+
+    if _redis_binary_client is None:
+        _redis_binary_client = _create_client(decode_responses=False)
+        logger.info("✅ Shared async Redis binary pool created (lazy)")
+
+    return _redis_binary_client
+
+
+def _pool_stats(client: Optional[aioredis.Redis]) -> dict:
+    if client is None:
+        return {"enabled": settings.REDIS_ENABLED, "created": False}
+
+    pool = client.connection_pool
+    return {
+        "enabled": True,
+        "created": True,
+        "max_connections": pool.max_connections,
+        "in_use_connections": len(pool._in_use_connections),
+        "available_connections": len(pool._available_connections),
+    }
+
+
+def get_pool_stats() -> dict:
+    """Get connection pool usage for health and metrics reporting"""
+    return {**_pool_stats(_redis_client), "binary": _pool_stats(_redis_binary_client)}
+
+
+async def close_redis_client():
+    """Close the shared clients and disconnect every pooled connection"""
+    global _redis_client, _redis_binary_client
+    for client in (_redis_client, _redis_binary_client):
+        if client is not None:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing Redis pool: {e}")
+    _redis_client = None
+    _redis_binary_client = None
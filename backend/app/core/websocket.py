@@ -51,6 +51,7 @@ class SubscriptionType(str, Enum):
     KUBERNETES_PODS = "kubernetes_pods"
     COST_ANALYSIS = "cost_analysis"
     SYSTEM_HEALTH = "system_health"
+    INVENTORY = "inventory"
 
 @dataclass
 class WebSocketMessage:
@@ -91,6 +92,12 @@ class ConnectionInfo:
 class WebSocketManager:
     """Manages WebSocket connections and real-time data broadcasting"""
     
+    # Message type of broadcasts per subscription (alert notification otherwise)
+    _message_types = {
+        SubscriptionType.DASHBOARD_METRICS: MessageType.METRICS_UPDATE,
+        SubscriptionType.INVENTORY: MessageType.RESOURCE_UPDATE,
+    }
+    
     def __init__(self):
         # Active connections: connection_id -> ConnectionInfo
         self.connections: Dict[str, ConnectionInfo] = {}
@@ -238,7 +245,7 @@ class WebSocketManager:
             return
         
         message = WebSocketMessage(
-            type=MessageType.METRICS_UPDATE if subscription_type == SubscriptionType.DASHBOARD_METRICS else MessageType.ALERT_NOTIFICATION,
+            type=self._message_types.get(subscription_type, MessageType.ALERT_NOTIFICATION),
             data=data,
             subscription=subscription_type
         )
@@ -275,6 +282,10 @@ class WebSocketManager:
         """Broadcast cost analysis update"""
         await self.broadcast_to_subscription(SubscriptionType.COST_ANALYSIS, cost_data)
     
+    async def broadcast_resource_changes(self, changes: List[Dict[str, Any]]):
+        """Broadcast a batch of inventory change events"""
+        await self.broadcast_to_subscription(SubscriptionType.INVENTORY, {"changes": changes})
+    
     async def handle_message(self, connection_id: str, message_data: Dict[str, Any]):
         """Handle incoming WebSocket message"""
         try:
@@ -343,6 +354,7 @@ class WebSocketManager:
             SubscriptionType.KUBERNETES_PODS: getattr(user, 'can_view_pod_analyzer', True),
             SubscriptionType.COST_ANALYSIS: getattr(user, 'can_view_cost_analyzer', True),
             SubscriptionType.SYSTEM_HEALTH: True,  # All users can view system health
+            SubscriptionType.INVENTORY: True,  # All users can view the resource inventory
         }
         
         return permission_map.get(subscription_type, False)
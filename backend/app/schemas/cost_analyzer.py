@@ -96,6 +96,9 @@ class CompartmentCostBreakdownSchema(BaseModel):
     resource_count: int = Field(..., ge=0)
     top_resources: List[TopCostlyResourceSchema]
     cost_trends: List[CostTrendSchema]
+    parent_compartment_id: Optional[str] = None
+    depth: Optional[int] = None
+    subtree_cost: Optional[float] = Field(None, ge=0, description="Cost of the compartment and everything below it")
 
 class CostSummarySchema(BaseModel):
     """Schema for overall cost summary"""
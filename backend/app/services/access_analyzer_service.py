@@ -34,6 +34,8 @@ class RBACBinding:
 
 from app.services.genai_service import GenAIRequest
 from app.core.exceptions import ExternalServiceError
+from app.core.executors import run_in_pool
+from app.core.oci_governor import oci_governor
 
 logger = logging.getLogger(__name__)
 
@@ -287,13 +289,15 @@ class AccessAnalyzerService:
             if not identity_client:
                 raise ExternalServiceError("OCI Identity client not available")
             
-            # List policies in compartment with timeout
+            # Policies attached to the compartment and to every compartment above it
+            # apply to it, so list them all (concurrently) with one timeout
+            tree = await self.oci_service.get_compartment_tree()
+            scope = [compartment_id] + tree.ancestors(compartment_id)
             try:
-                policies_response = await asyncio.wait_for(
-                    asyncio.get_event_loop().run_in_executor(
-                        None,
-                        lambda: identity_client.list_policies(compartment_id=compartment_id)
-                    ),
+                responses = await asyncio.wait_for(
+                    asyncio.gather(*[
+                        oci_governor.call(identity_client.list_policies, compartment_id=cid) for cid in scope
+                    ]),
                     timeout=10.0  # 10 second timeout
                 )
             except asyncio.TimeoutError:
@@ -304,7 +308,7 @@ class AccessAnalyzerService:
                 raise ExternalServiceError(f"Failed to fetch IAM policies: {str(e)}")
             
             policies = []
-            for policy in policies_response.data:
+            for policy in (policy for response in responses for policy in response.data):
                 # Calculate risk score and level
                 risk_score = self._calculate_iam_risk_score(policy.statements)
                 risk_level = self._get_risk_level(risk_score)
@@ -316,7 +320,7 @@ class AccessAnalyzerService:
                     id=policy.id,
                     name=policy.name,
                     compartment_id=policy.compartment_id,
-                    compartment_name="Unknown",  # Would need compartment lookup
+                    compartment_name=tree.name(policy.compartment_id),
                     description=policy.description or "",
                     statements=policy.statements,
                     version_date=policy.version_date.isoformat() if policy.version_date else "",
@@ -412,10 +416,7 @@ class AccessAnalyzerService:
                 try:
                     # Test cluster connection with timeout
                     cluster_health = await asyncio.wait_for(
-                        asyncio.get_event_loop().run_in_executor(
-                            None,
-                            self.kubernetes_service.health_check
-                        ),
+                        run_in_pool("k8s", self.kubernetes_service.health_check),
                         timeout=5.0
                     )
                     cluster_configured = cluster_health.get("status") == "healthy"
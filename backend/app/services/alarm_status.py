@@ -0,0 +1,120 @@
+"""
+Tenancy-wide alarm status
+Alarm definitions (``list_alarms``) and their firing status (``list_alarms_status``)
+are each listed once for the whole tenancy with ``compartment_id_in_subtree`` and
+merged by alarm OCID into a view indexed by compartment, with status and severity
+counts per compartment. Compartment and subtree queries are lookups in that view
+instead of one ``list_alarms`` call per compartment.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def definition_to_dict(alarm: Any) -> Dict[str, Any]:
+    """Alarm definition (``AlarmSummary``) as returned by ``get_alarm_status``"""
+    time_created = getattr(alarm, 'time_created', None)
+    time_updated = getattr(alarm, 'time_updated', None)
+    return {
+        "id": alarm.id,
+        "display_name": alarm.display_name,
+        "compartment_id": getattr(alarm, 'compartment_id', None),
+        "severity": alarm.severity or "MEDIUM",
+        "lifecycle_state": alarm.lifecycle_state,
+        "is_enabled": alarm.is_enabled,
+        "metric_compartment_id": alarm.metric_compartment_id,
+        "namespace": alarm.namespace,
+        "query": alarm.query,
+        "rule_name": getattr(alarm, 'rule_name', ''),
+        "time_created": time_created.isoformat() if time_created else None,
+        "time_updated": time_updated.isoformat() if time_updated else None,
+        "source": "oci_alarm"
+    }
+
+
+def status_to_dict(status: Any) -> Dict[str, Any]:
+    """Alarm status (``AlarmStatusSummary``): FIRING, OK or SUSPENDED"""
+    triggered = getattr(status, 'timestamp_triggered', None)
+    return {
+        "id": status.id,
+        "status": status.status,
+        "timestamp_triggered": triggered.isoformat() if triggered else None,
+    }
+
+
+def count_alarms(alarms: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Totals, status counts and severity counts (all and firing only) of merged alarms"""
+    counts = {"total": 0, "active": 0, "firing": 0, "by_status": {}, "by_severity": {}, "firing_by_severity": {}}
+    for alarm in alarms:
+        _add(counts, alarm)
+    return counts
+
+
+def _add(counts: Dict[str, Any], alarm: Dict[str, Any]):
+    counts["total"] += 1
+    if alarm.get("is_enabled") and alarm.get("lifecycle_state") == "ACTIVE":
+        counts["active"] += 1
+    status, severity = alarm.get("status"), alarm.get("severity")
+    if status:
+        counts["by_status"][status] = counts["by_status"].get(status, 0) + 1
+    counts["by_severity"][severity] = counts["by_severity"].get(severity, 0) + 1
+    if status == "FIRING":
+        counts["firing"] += 1
+        counts["firing_by_severity"][severity] = counts["firing_by_severity"].get(severity, 0) + 1
+
+
+def _merge_counts(target: Dict[str, Any], counts: Dict[str, Any]):
+    for field in ("total", "active", "firing"):
+        target[field] += counts[field]
+    for field in ("by_status", "by_severity", "firing_by_severity"):
+        for key, value in counts[field].items():
+            target[field][key] = target[field].get(key, 0) + value
+
+
+class AlarmStatusView:
+    """Alarm definitions merged with their status, indexed by compartment
+
+    Statuses of alarms missing from ``definitions`` (created after the definitions
+    were listed) are collected in ``unknown_ids``.
+    """
+
+    def __init__(self, definitions: List[Dict[str, Any]], statuses: List[Dict[str, Any]]):
+        status_by_id = {status["id"]: status for status in statuses}
+        self._alarms: Dict[str, Dict[str, Any]] = {}
+        self._by_compartment: Dict[Optional[str], List[str]] = {}
+        self._counts: Dict[Optional[str], Dict[str, Any]] = {}
+        for definition in definitions:
+            status = status_by_id.get(definition["id"]) or {}
+            alarm = {
+                **definition,
+                "status": status.get("status"),
+                "timestamp_triggered": status.get("timestamp_triggered"),
+            }
+            compartment_id = alarm.get("compartment_id")
+            self._alarms[alarm["id"]] = alarm
+            self._by_compartment.setdefault(compartment_id, []).append(alarm["id"])
+            _add(self._counts.setdefault(compartment_id, count_alarms(())), alarm)
+        self.unknown_ids = [alarm_id for alarm_id in status_by_id if alarm_id not in self._alarms]
+
+    def __len__(self) -> int:
+        return len(self._alarms)
+
+    def get(self, alarm_id: str) -> Optional[Dict[str, Any]]:
+        return self._alarms.get(alarm_id)
+
+    def alarms(self, compartment_ids: Iterable[str], status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Alarms defined in any of the compartments, optionally only those in ``status``"""
+        return [
+            self._alarms[alarm_id]
+            for compartment_id in compartment_ids
+            for alarm_id in self._by_compartment.get(compartment_id, ())
+            if status is None or self._alarms[alarm_id]["status"] == status
+        ]
+
+    def counts(self, compartment_ids: Iterable[str]) -> Dict[str, Any]:
+        """``count_alarms`` over the compartments, from the per-compartment counters"""
+        total = count_alarms(())
+        for compartment_id in compartment_ids:
+            counts = self._counts.get(compartment_id)
+            if counts is not None:
+                _merge_counts(total, counts)
+        return total
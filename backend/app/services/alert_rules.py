@@ -0,0 +1,211 @@
+"""
+Alert rule engine
+Declarative metric rules (threshold, rate of change and absent data, each optionally
+held for a duration) evaluated for every series of a metric at once as NumPy arrays.
+Per (rule, resource) state is kept between evaluations, so only firing/resolved
+transitions are emitted and the active alerts are a read of that state.
+"""
+
+import logging
+import operator
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Safe import guard for optional dependency
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+OPERATORS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le}
+
+
+class RuleKind(str, Enum):
+    """What a rule compares against its threshold"""
+    THRESHOLD = "threshold"  # Mean over the window
+    RATE_OF_CHANGE = "rate_of_change"  # (last - first) per minute over the window
+    ABSENT = "absent"  # No datapoints in the window
+
+
+@dataclass(frozen=True)
+class AlertRule:
+    """One alert condition on one metric, applied to every resource of a scope"""
+    name: str  # Alert type, e.g. CPU_CRITICAL
+    metric: str
+    kind: RuleKind = RuleKind.THRESHOLD
+    operator: str = ">"
+    threshold: float = 0.0
+    severity: str = "HIGH"
+    for_seconds: int = 0  # Condition must hold this long before the rule fires
+    group: Optional[str] = None  # Per resource, only the first matching rule of a group applies
+    namespace: str = "oci_computeagent"
+    resource_type: str = "compute_instance"
+    description: str = "{metric} is {value:.1f} (threshold: {threshold:g})"
+
+
+DEFAULT_RULES: List[AlertRule] = [
+    AlertRule("CPU_CRITICAL", "CpuUtilization", threshold=90, severity="CRITICAL", group="cpu",
+              description="CPU utilization critically high: {value:.1f}% (threshold: {threshold:g}%)"),
+    AlertRule("CPU_HIGH", "CpuUtilization", threshold=80, severity="HIGH", group="cpu",
+              description="CPU utilization high: {value:.1f}% (threshold: {threshold:g}%)"),
+    AlertRule("MEMORY_CRITICAL", "MemoryUtilization", threshold=95, severity="CRITICAL", group="memory",
+              description="Memory utilization critically high: {value:.1f}% (threshold: {threshold:g}%)"),
+    AlertRule("MEMORY_HIGH", "MemoryUtilization", threshold=85, severity="HIGH", group="memory",
+              description="Memory utilization high: {value:.1f}% (threshold: {threshold:g}%)"),
+]
+
+
+class MetricFrame:
+    """One metric's window for a list of resources, as arrays aligned with ``resource_ids``"""
+
+    def __init__(self, resource_ids: List[str], series: Dict[str, List[Tuple[str, float]]]):
+        """``series`` maps resource id -> [(ISO timestamp, value), ...] in time order
+        (``MetricBatcher.fetch`` output); resources without points count as absent"""
+        self.resource_ids = resource_ids
+        size = len(resource_ids)
+        self.mean = np.full(size, np.nan)
+        self.first = np.full(size, np.nan)
+        self.last = np.full(size, np.nan)
+        self.minutes = np.zeros(size)
+        self.count = np.zeros(size, np.int64)
+        for i, resource_id in enumerate(resource_ids):
+            points = series.get(resource_id)
+            if not points:
+                continue
+            values = [value for _, value in points]
+            self.count[i] = len(values)
+            self.mean[i] = sum(values) / len(values)
+            self.first[i], self.last[i] = values[0], values[-1]
+            if len(points) > 1:
+                elapsed = datetime.fromisoformat(points[-1][0]) - datetime.fromisoformat(points[0][0])
+                self.minutes[i] = elapsed.total_seconds() / 60
+
+
+class AlertRuleEngine:
+    """Evaluates rules per scope (compartment) and tracks which (rule, resource) pairs fire"""
+
+    def __init__(self, rules: Optional[Iterable[AlertRule]] = None):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("NumPy is required for the alert rule engine")
+        self.rules = list(rules if rules is not None else DEFAULT_RULES)
+        # (rule, resource) -> {"status": "pending" | "firing", "since", "fired_at", "value", "scope", ...}
+        self._state: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._by_scope: Dict[str, Set[Tuple[str, str]]] = {}
+        self._rules = {rule.name: rule for rule in self.rules}
+        self.stats = {"evaluations": 0, "series_evaluated": 0, "fired": 0, "resolved": 0}
+
+    @property
+    def metrics(self) -> Set[str]:
+        return {rule.metric for rule in self.rules}
+
+    def _condition(self, rule: AlertRule, frame: MetricFrame):
+        """(matches, values) over every resource of the frame"""
+        if rule.kind == RuleKind.ABSENT:
+            return frame.count == 0, frame.count.astype(float)
+        if rule.kind == RuleKind.RATE_OF_CHANGE:
+            values = (frame.last - frame.first) / np.maximum(frame.minutes, 1.0)
+            valid = frame.count >= 2
+        else:
+            values = frame.mean
+            valid = frame.count > 0
+        with np.errstate(invalid="ignore"):
+            return valid & OPERATORS[rule.operator](np.nan_to_num(values), rule.threshold), values
+
+    def evaluate(self, scope: str, resources: Dict[str, str], frames: Dict[str, MetricFrame],
+                 now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Evaluate every rule over ``resources`` (id -> name) of ``scope``; returns the transitions
+
+        ``frames`` must be aligned with ``list(resources)``. Rules whose metric has no
+        frame (fetch failed) keep their state; resources no longer listed resolve.
+        """
+        now = now or datetime.utcnow()
+        ids = list(resources)
+        transitions: List[Dict[str, Any]] = []
+        claimed: Dict[str, Any] = {}
+        matched: Set[Tuple[str, str]] = set()
+        evaluated: Set[str] = set()
+        self.stats["evaluations"] += 1
+
+        for rule in self.rules:
+            frame = frames.get(rule.metric)
+            if frame is None:
+                continue
+            evaluated.add(rule.name)
+            matches, values = self._condition(rule, frame)
+            if rule.group:
+                taken = claimed.setdefault(rule.group, np.zeros(len(ids), bool))
+                matches, taken[:] = matches & ~taken, taken | matches
+            self.stats["series_evaluated"] += len(ids)
+
+            for i in np.flatnonzero(matches):
+                key = (rule.name, ids[i])
+                matched.add(key)
+                state = self._state.get(key)
+                if state is None:
+                    state = self._state[key] = {"status": "pending", "since": now, "fired_at": None, "scope": scope}
+                    self._by_scope.setdefault(scope, set()).add(key)
+                state.update(value=float(values[i]), resource_name=resources[ids[i]])
+                if state["status"] == "pending" and (now - state["since"]).total_seconds() >= rule.for_seconds:
+                    state.update(status="firing", fired_at=now)
+                    self.stats["fired"] += 1
+                    transitions.append(self._transition("firing", rule, ids[i], state, now))
+
+        listed = set(ids)
+        for key in list(self._by_scope.get(scope, ())):
+            rule_name, resource_id = key
+            if key in matched or (rule_name not in evaluated and resource_id in listed):
+                continue
+            state = self._state.pop(key)
+            self._by_scope[scope].discard(key)
+            if state["status"] == "firing":
+                self.stats["resolved"] += 1
+                rule = self._rules.get(rule_name)
+                if rule is not None:
+                    transitions.append(self._transition("resolved", rule, resource_id, state, now))
+
+        if transitions:
+            logger.info(f"🔔 {len(transitions)} alert transitions in {scope[:30]}...")
+        return transitions
+
+    def _transition(self, event: str, rule: AlertRule, resource_id: str, state: Dict[str, Any],
+                    now: datetime) -> Dict[str, Any]:
+        return {
+            "event": event,
+            "alert_type": rule.name,
+            "severity": rule.severity,
+            "resource_id": resource_id,
+            "resource_name": state.get("resource_name"),
+            "resource_type": rule.resource_type,
+            "compartment_id": state["scope"],
+            "value": state.get("value"),
+            "timestamp": now.isoformat(),
+        }
+
+    def active(self, scope: str) -> List[Dict[str, Any]]:
+        """Firing alerts of ``scope`` with their rule, value and description"""
+        alerts = []
+        for key in self._by_scope.get(scope, ()):
+            state = self._state[key]
+            rule = self._rules.get(key[0])
+            if state["status"] != "firing" or rule is None:
+                continue
+            alerts.append({
+                "rule": rule,
+                "resource_id": key[1],
+                "resource_name": state.get("resource_name"),
+                "value": state.get("value"),
+                "fired_at": state["fired_at"],
+                "description": rule.description.format(metric=rule.metric, value=state.get("value") or 0.0,
+                                                       threshold=rule.threshold),
+            })
+        return alerts
+
+    def get_stats(self) -> Dict[str, Any]:
+        firing = sum(1 for state in self._state.values() if state["status"] == "firing")
+        return {**self.stats, "rules": len(self.rules), "tracked": len(self._state), "firing": firing}
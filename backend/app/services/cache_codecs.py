@@ -0,0 +1,251 @@
+"""
+Cache payload codecs
+Serializes cache entries for the Redis and persistent tiers with a pluggable codec
+(orjson with typed datetime round-trips, or stdlib json) and transparent compression
+(zstd or lz4) above a size threshold. Payloads carry a small header naming the codec
+and compression used, so entries written under an older configuration stay readable.
+"""
+
+import json
+import logging
+import time
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Safe import guards for optional dependencies
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+try:
+    import lz4.frame as lz4_frame
+    LZ4_AVAILABLE = True
+except ImportError:
+    lz4_frame = None
+    LZ4_AVAILABLE = False
+
+# Header: marker byte, codec id, compression id. JSON text never starts with NUL.
+_MAGIC = 0x00
+
+_DATETIME_TAG = "__datetime__"
+_DATE_TAG = "__date__"
+
+
+class CodecError(Exception):
+    """Raised when a payload cannot be decoded"""
+
+
+def _restore_dates(value: Any) -> Any:
+    """Turn tagged datetime/date objects back into Python values"""
+    if isinstance(value, dict):
+        if len(value) == 1:
+            if _DATETIME_TAG in value:
+                return datetime.fromisoformat(value[_DATETIME_TAG])
+            if _DATE_TAG in value:
+                return date.fromisoformat(value[_DATE_TAG])
+        return {k: _restore_dates(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_restore_dates(v) for v in value]
+    return value
+
+
+class JsonCodec:
+    """Stdlib JSON; datetimes degrade to strings (legacy behaviour)"""
+
+    name = "json"
+    codec_id = 1
+
+    def encode(self, value: Any) -> bytes:
+        return json.dumps(value, default=str).encode()
+
+    def decode(self, payload: bytes) -> Any:
+        return json.loads(payload)
+
+
+class OrjsonCodec:
+    """orjson with datetimes and dates tagged so they decode to the same type"""
+
+    name = "orjson"
+    codec_id = 2
+    _options = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS) if ORJSON_AVAILABLE else 0
+
+    @staticmethod
+    def _default(value: Any) -> Any:
+        if isinstance(value, datetime):
+            return {_DATETIME_TAG: value.isoformat()}
+        if isinstance(value, date):
+            return {_DATE_TAG: value.isoformat()}
+        return str(value)
+
+    def encode(self, value: Any) -> bytes:
+        return orjson.dumps(value, default=self._default, option=self._options)
+
+    def decode(self, payload: bytes) -> Any:
+        value = orjson.loads(payload)
+        # Only walk the structure when it actually contains tagged values
+        if _DATETIME_TAG.encode() in payload or _DATE_TAG.encode() in payload:
+            return _restore_dates(value)
+        return value
+
+
+class ZstdCompression:
+    name = "zstd"
+    compression_id = 1
+
+    def __init__(self, level: int = 3):
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def compress(self, payload: bytes) -> bytes:
+        return self._compressor.compress(payload)
+
+    def decompress(self, payload: bytes) -> bytes:
+        return self._decompressor.decompress(payload)
+
+
+class Lz4Compression:
+    name = "lz4"
+    compression_id = 2
+
+    def compress(self, payload: bytes) -> bytes:
+        return lz4_frame.compress(payload)
+
+    def decompress(self, payload: bytes) -> bytes:
+        return lz4_frame.decompress(payload)
+
+
+def _build_codecs() -> Dict[str, Any]:
+    codecs = {"json": JsonCodec()}
+    if ORJSON_AVAILABLE:
+        codecs["orjson"] = OrjsonCodec()
+    return codecs
+
+
+def _build_compressions() -> Dict[str, Any]:
+    compressions = {}
+    if ZSTD_AVAILABLE:
+        compressions["zstd"] = ZstdCompression()
+    if LZ4_AVAILABLE:
+        compressions["lz4"] = Lz4Compression()
+    return compressions
+
+
+class CacheSerializer:
+    """Encodes and decodes cache payloads, choosing the codec per namespace
+
+    ``default_codec`` may be ``"auto"`` (fastest available). Unknown or
+    unavailable codecs and compressions fall back with a warning instead of failing.
+    """
+
+    def __init__(self, default_codec: str = "auto", namespace_codecs: Optional[Dict[str, str]] = None,
+                 compression: str = "zstd", compression_min_bytes: int = 16384):
+        self._codecs = _build_codecs()
+        self._codecs_by_id = {codec.codec_id: codec for codec in self._codecs.values()}
+        self._compressions = _build_compressions()
+        self._compressions_by_id = {c.compression_id: c for c in self._compressions.values()}
+
+        self.default_codec = self._resolve_codec(default_codec)
+        self.namespace_codecs = {ns: self._resolve_codec(name) for ns, name in (namespace_codecs or {}).items()}
+        self.compression = self._resolve_compression(compression)
+        self.compression_min_bytes = compression_min_bytes
+
+        self.stats: Dict[str, Dict[str, float]] = {}
+
+    def _resolve_codec(self, name: str) -> Any:
+        if name == "auto":
+            return self._codecs.get("orjson") or self._codecs["json"]
+        if name not in self._codecs:
+            logger.warning(f"⚠️ Cache codec '{name}' unavailable, falling back to json")
+            return self._codecs["json"]
+        return self._codecs[name]
+
+    def _resolve_compression(self, name: str) -> Optional[Any]:
+        if not name or name == "none":
+            return None
+        if name not in self._compressions:
+            logger.warning(f"⚠️ Cache compression '{name}' unavailable, storing payloads uncompressed")
+            return None
+        return self._compressions[name]
+
+    def _codec_stats(self, codec_name: str) -> Dict[str, float]:
+        return self.stats.setdefault(codec_name, {
+            "encodes": 0, "decodes": 0, "encode_seconds": 0.0, "decode_seconds": 0.0,
+            "raw_bytes": 0, "stored_bytes": 0, "compressed": 0
+        })
+
+    def encode(self, namespace: str, value: Any) -> Tuple[bytes, int]:
+        """Encode a value for a namespace, returning the payload and its uncompressed size"""
+        codec = self.namespace_codecs.get(namespace, self.default_codec)
+        start = time.perf_counter()
+
+        body = codec.encode(value)
+        raw_size = len(body)
+        compression_id = 0
+        if self.compression and raw_size >= self.compression_min_bytes:
+            body = self.compression.compress(body)
+            compression_id = self.compression.compression_id
+        payload = bytes((_MAGIC, codec.codec_id, compression_id)) + body
+
+        stats = self._codec_stats(codec.name)
+        stats["encodes"] += 1
+        stats["encode_seconds"] += time.perf_counter() - start
+        stats["raw_bytes"] += raw_size
+        stats["stored_bytes"] += len(payload)
+        stats["compressed"] += 1 if compression_id else 0
+        return payload, raw_size
+
+    def decode(self, payload: bytes) -> Any:
+        """Decode a payload written by any codec/compression, or legacy plain JSON"""
+        start = time.perf_counter()
+        if not payload or payload[0] != _MAGIC:
+            codec, compression, body = self._codecs["json"], None, payload
+        else:
+            if len(payload) < 3:
+                raise CodecError("Truncated cache payload")
+            codec = self._codecs_by_id.get(payload[1])
+            compression = self._compressions_by_id.get(payload[2]) if payload[2] else None
+            if codec is None or (payload[2] and compression is None):
+                raise CodecError(f"Payload uses an unavailable codec or compression ({payload[1]}, {payload[2]})")
+            body = payload[3:]
+
+        try:
+            if compression:
+                body = compression.decompress(body)
+            value = codec.decode(body)
+        except Exception as e:
+            raise CodecError(f"Failed to decode {codec.name} payload: {e}") from e
+
+        stats = self._codec_stats(codec.name)
+        stats["decodes"] += 1
+        stats["decode_seconds"] += time.perf_counter() - start
+        return value
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-codec timings and compression ratio"""
+        codecs = {}
+        for name, stats in self.stats.items():
+            codecs[name] = {
+                **stats,
+                "avg_encode_ms": round(stats["encode_seconds"] / stats["encodes"] * 1000, 3) if stats["encodes"] else 0,
+                "avg_decode_ms": round(stats["decode_seconds"] / stats["decodes"] * 1000, 3) if stats["decodes"] else 0,
+                "compression_ratio": round(stats["raw_bytes"] / stats["stored_bytes"], 2) if stats["stored_bytes"] else 1.0,
+            }
+        return {
+            "default_codec": self.default_codec.name,
+            "namespace_codecs": {ns: codec.name for ns, codec in self.namespace_codecs.items()},
+            "compression": self.compression.name if self.compression else "none",
+            "compression_min_bytes": self.compression_min_bytes,
+            "codecs": codecs,
+        }
@@ -2,68 +2,561 @@ import json
 import asyncio
 import logging
 import os
-import pickle
-from typing import Any, Optional, Dict, List, Union
+import sqlite3
+import threading
+import time
+from typing import Any, Optional, Dict, List, Union, Callable, Awaitable, Tuple
 from datetime import datetime, timedelta
 import hashlib
-import redis
-from redis.exceptions import ConnectionError, TimeoutError
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+import redis.asyncio as aioredis
+from redis.exceptions import ConnectionError, TimeoutError, RedisError
 from app.core.config import settings
+from app.core.executors import run_in_pool
+from app.core.redis_pool import get_redis_binary_client, get_pool_stats
+from app.core.invalidation_bus import invalidation_bus
+from app.services.prometheus_service import get_prometheus_service
+from app.services.cache_codecs import CacheSerializer, CodecError
+from app.services.cache_telemetry import CacheTelemetry
 
 logger = logging.getLogger(__name__)
 
+# Marker for payloads that carry entry metadata (value kept from the original
+# stale-while-revalidate envelope so older Redis payloads still decode)
+_ENVELOPE_MARKER = "__swr__"
+
+# Collects the age of stale entries served within the current request
+_staleness_tracker: ContextVar[Optional[Dict[str, float]]] = ContextVar("cache_staleness_tracker", default=None)
+
+class LocalLRUCache:
+    """Bounded in-process cache tier with O(1) LRU eviction
+    
+    Entries expire lazily on access. The tier is bounded by entry count, by an
+    approximate byte budget and by optional per-namespace byte quotas, so one
+    large tenancy listing cannot push out every small hot key.
+    """
+    
+    def __init__(self, max_entries: int, max_bytes: int, namespace_quotas: Optional[Dict[str, int]] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.namespace_quotas = namespace_quotas or {}
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        # Per-namespace recency order, so quota eviction is O(1) as well
+        self._namespace_keys: Dict[str, "OrderedDict[str, None]"] = {}
+        self._namespace_bytes: Dict[str, int] = {}
+        self.total_bytes = 0
+        self.evictions = {"capacity": 0, "bytes": 0, "quota": 0, "expired": 0, "oversized": 0, "superseded": 0}
+    
+    @staticmethod
+    def _namespace_of(cache_key: str) -> str:
+        return cache_key.split(":", 1)[0]
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, cache_key: str) -> bool:
+        return cache_key in self._entries
+    
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Return a live entry and mark it most recently used"""
+        entry = self._entries.get(cache_key)
+        if entry is None:
+            return None
+        if entry["expires_at"] <= datetime.now():
+            self._remove(cache_key)
+            self.evictions["expired"] += 1
+            return None
+        self._entries.move_to_end(cache_key)
+        self._namespace_keys[self._namespace_of(cache_key)].move_to_end(cache_key)
+        return entry
+    
+    def set(self, cache_key: str, entry: Dict[str, Any], size: int):
+        """Insert or replace an entry, evicting least recently used ones as needed"""
+        namespace = self._namespace_of(cache_key)
+        quota = self.namespace_quotas.get(namespace)
+        if size > self.max_bytes or (quota is not None and size > quota):
+            # Never let a single entry flush the whole tier
+            self.pop(cache_key)
+            self.evictions["oversized"] += 1
+            return
+        
+        self.pop(cache_key)
+        self._entries[cache_key] = entry
+        self._sizes[cache_key] = size
+        self._namespace_keys.setdefault(namespace, OrderedDict())[cache_key] = None
+        self._namespace_bytes[namespace] = self._namespace_bytes.get(namespace, 0) + size
+        self.total_bytes += size
+        
+        if quota is not None:
+            namespace_keys = self._namespace_keys[namespace]
+            while self._namespace_bytes[namespace] > quota:
+                self._remove(next(iter(namespace_keys)))
+                self.evictions["quota"] += 1
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions["capacity"] += 1
+        while self.total_bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions["bytes"] += 1
+    
+    def pop(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Remove an entry without counting it as an eviction"""
+        if cache_key not in self._entries:
+            return None
+        return self._remove(cache_key)
+    
+    def purge_superseded(self, namespace: str, current_prefix: str) -> int:
+        """Remove entries of a namespace not under its current generation prefix"""
+        keys = [k for k in self._namespace_keys.get(namespace, ()) if not k.startswith(current_prefix)]
+        for cache_key in keys:
+            self._remove(cache_key)
+        self.evictions["superseded"] += len(keys)
+        return len(keys)
+    
+    def _remove(self, cache_key: str) -> Dict[str, Any]:
+        entry = self._entries.pop(cache_key)
+        size = self._sizes.pop(cache_key)
+        namespace = self._namespace_of(cache_key)
+        namespace_keys = self._namespace_keys[namespace]
+        del namespace_keys[cache_key]
+        self._namespace_bytes[namespace] -= size
+        if not namespace_keys:
+            del self._namespace_keys[namespace]
+            del self._namespace_bytes[namespace]
+        self.total_bytes -= size
+        return entry
+    
+    def namespace_usage(self) -> Dict[str, Dict[str, int]]:
+        """Entry count and bytes held per namespace"""
+        return {
+            namespace: {"entries": len(keys), "bytes": self._namespace_bytes[namespace]}
+            for namespace, keys in self._namespace_keys.items()
+        }
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get size, budget and eviction statistics for the tier"""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "namespace_bytes": dict(self._namespace_bytes),
+            "namespace_quotas": dict(self.namespace_quotas),
+            "namespaces": self.namespace_usage(),
+            "evictions": dict(self.evictions),
+        }
+
+class PersistentCacheStore:
+    """Restart-surviving cache tier backed by a single SQLite database in WAL mode
+    
+    Rows are indexed by namespace and expiry, so namespace invalidation and TTL
+    purges are single indexed DELETEs instead of directory scans. The store is
+    bounded by ``max_bytes``; when it grows past the cap the entries closest to
+    expiry are evicted first. Methods are blocking and thread-safe, call them
+    through the ``io`` executor pool.
+    """
+    
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                cache_key TEXT PRIMARY KEY,
+                namespace TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_cache_entries_namespace ON cache_entries (namespace);
+            CREATE INDEX IF NOT EXISTS idx_cache_entries_expires_at ON cache_entries (expires_at);
+            CREATE TABLE IF NOT EXISTS namespace_generations (
+                namespace TEXT PRIMARY KEY,
+                generation INTEGER NOT NULL
+            );
+        """)
+        self.total_bytes, self.entries = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0), COUNT(*) FROM cache_entries"
+        ).fetchone()
+        # namespace -> [entries, bytes], kept in step with every insert and delete
+        self._namespace_usage: Dict[str, List[int]] = {}
+        for namespace, entries, size in self._conn.execute(
+            "SELECT namespace, COUNT(*), SUM(size) FROM cache_entries GROUP BY namespace"
+        ):
+            self._namespace_usage[namespace] = [entries, size]
+        self.evictions = {"expired": 0, "size_cap": 0, "superseded": 0}
+    
+    def get(self, cache_key: str) -> Optional[bytes]:
+        """Return the encoded payload of a live entry"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM cache_entries WHERE cache_key = ? AND expires_at > ?",
+                (cache_key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+    
+    def set(self, cache_key: str, payload: bytes, expires_at: float):
+        """Insert or replace an encoded entry, evicting others if the size cap is exceeded"""
+        size = len(payload)
+        namespace = LocalLRUCache._namespace_of(cache_key)
+        with self._lock:
+            self._delete_keys([cache_key])
+            if size > self.max_bytes:
+                self.evictions["size_cap"] += 1
+                return
+            self._conn.execute(
+                "INSERT INTO cache_entries (cache_key, namespace, payload, size, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (cache_key, namespace, payload, size, expires_at)
+            )
+            self.total_bytes += size
+            self.entries += 1
+            self._account(namespace, 1, size)
+            if self.total_bytes > self.max_bytes:
+                self._enforce_size_cap()
+    
+    def delete(self, cache_key: str):
+        """Remove one entry"""
+        with self._lock:
+            self._delete_keys([cache_key])
+    
+    def get_generation(self, namespace: str) -> int:
+        """Persisted generation of a namespace (0 if never invalidated)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT generation FROM namespace_generations WHERE namespace = ?", (namespace,)
+            ).fetchone()
+        return row[0] if row else 0
+    
+    def set_generation(self, namespace: str, generation: int):
+        """Persist the generation of a namespace so invalidations survive restarts"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO namespace_generations (namespace, generation) VALUES (?, ?)",
+                (namespace, generation)
+            )
+    
+    def purge_superseded(self, namespace: str, current_prefix: str) -> int:
+        """Remove entries of a namespace not under its current generation prefix"""
+        where = "namespace = ? AND substr(cache_key, 1, ?) != ?"
+        args = (namespace, len(current_prefix), current_prefix)
+        with self._lock:
+            freed, removed = self._conn.execute(
+                f"SELECT COALESCE(SUM(size), 0), COUNT(*) FROM cache_entries WHERE {where}", args
+            ).fetchone()
+            if removed:
+                self._conn.execute(f"DELETE FROM cache_entries WHERE {where}", args)
+                self.total_bytes -= freed
+                self.entries -= removed
+                self._account(namespace, -removed, -freed)
+                self.evictions["superseded"] += removed
+        return removed
+    
+    def purge_expired(self) -> int:
+        """Remove every expired entry, returning how many were removed"""
+        now = time.time()
+        removed = 0
+        with self._lock:
+            expired = self._conn.execute(
+                "SELECT namespace, COUNT(*), SUM(size) FROM cache_entries WHERE expires_at <= ? GROUP BY namespace",
+                (now,)
+            ).fetchall()
+            if expired:
+                self._conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+                for namespace, entries, freed in expired:
+                    self.total_bytes -= freed
+                    self.entries -= entries
+                    self._account(namespace, -entries, -freed)
+                    removed += entries
+                self.evictions["expired"] += removed
+        return removed
+    
+    def _delete_keys(self, cache_keys: List[str]):
+        for cache_key in cache_keys:
+            row = self._conn.execute(
+                "SELECT namespace, size FROM cache_entries WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+            if row:
+                self._conn.execute("DELETE FROM cache_entries WHERE cache_key = ?", (cache_key,))
+                self.total_bytes -= row[1]
+                self.entries -= 1
+                self._account(row[0], -1, -row[1])
+    
+    def _enforce_size_cap(self):
+        # Evict down to 90% of the cap so a full store does not evict on every write
+        target = int(self.max_bytes * 0.9)
+        evicted = []
+        freed = 0
+        for cache_key, namespace, size in self._conn.execute(
+            "SELECT cache_key, namespace, size FROM cache_entries ORDER BY expires_at"
+        ):
+            if self.total_bytes - freed <= target:
+                break
+            evicted.append(cache_key)
+            freed += size
+            self._account(namespace, -1, -size)
+        self._conn.executemany("DELETE FROM cache_entries WHERE cache_key = ?", [(k,) for k in evicted])
+        self.total_bytes -= freed
+        self.entries -= len(evicted)
+        self.evictions["size_cap"] += len(evicted)
+    
+    def _account(self, namespace: str, entries: int, size: int):
+        usage = self._namespace_usage.setdefault(namespace, [0, 0])
+        usage[0] += entries
+        usage[1] += size
+        if usage[0] <= 0:
+            del self._namespace_usage[namespace]
+    
+    def namespace_usage(self) -> Dict[str, Dict[str, int]]:
+        """Entry count and bytes stored per namespace"""
+        with self._lock:
+            return {ns: {"entries": entries, "bytes": size} for ns, (entries, size) in self._namespace_usage.items()}
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get size, cap and eviction statistics for the tier"""
+        return {
+            "entries": self.entries,
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "namespaces": self.namespace_usage(),
+            "evictions": dict(self.evictions),
+        }
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class CircuitBreaker:
+    """Circuit breaker for a remote tier
+    
+    Closed: calls pass. Open: calls are skipped until the backoff elapses.
+    Half-open: a single probe call decides whether to close or re-open;
+    each failed probe doubles the backoff up to ``max_reset_timeout``.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float, max_reset_timeout: float,
+                 on_transition: Optional[Callable[[str, str], None]] = None):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max(reset_timeout, max_reset_timeout)
+        self.on_transition = on_transition
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.current_reset_timeout = reset_timeout
+        self.opened_at: Optional[float] = None
+        self.rejected_calls = 0
+        self.transitions = {self.OPEN: 0, self.HALF_OPEN: 0, self.CLOSED: 0}
+        self._probe_in_flight = False
+    
+    def allow_request(self) -> bool:
+        """Whether a call may go to the protected tier now"""
+        if self.state == self.CLOSED:
+            return True
+        
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.current_reset_timeout:
+            self._transition(self.HALF_OPEN)
+        
+        if self.state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        
+        self.rejected_calls += 1
+        return False
+    
+    def record_success(self):
+        """Record a call that reached the tier"""
+        self._probe_in_flight = False
+        self.consecutive_failures = 0
+        if self.state != self.CLOSED:
+            self.current_reset_timeout = self.reset_timeout
+            self._transition(self.CLOSED)
+    
+    def record_failure(self):
+        """Record a call that failed to reach the tier"""
+        self._probe_in_flight = False
+        if self.state == self.HALF_OPEN:
+            self.current_reset_timeout = min(self.current_reset_timeout * 2, self.max_reset_timeout)
+            self._open()
+            return
+        
+        self.consecutive_failures += 1
+        if self.state == self.CLOSED and self.consecutive_failures >= self.failure_threshold:
+            self._open()
+    
+    def release_probe(self):
+        """Let another call probe when the current probe was abandoned (e.g. cancelled)"""
+        self._probe_in_flight = False
+    
+    def _open(self):
+        self.opened_at = time.monotonic()
+        self._transition(self.OPEN)
+    
+    def _transition(self, state: str):
+        previous, self.state = self.state, state
+        self.transitions[state] += 1
+        logger.warning(f"🔌 Circuit '{self.name}' {previous} -> {state}")
+        if self.on_transition:
+            try:
+                self.on_transition(self.name, state)
+            except Exception as e:
+                logger.debug(f"Circuit transition hook failed: {e}")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get state, backoff and transition counts"""
+        retry_in = None
+        if self.state == self.OPEN:
+            retry_in = max(0.0, self.current_reset_timeout - (time.monotonic() - self.opened_at))
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "reset_timeout_seconds": self.current_reset_timeout,
+            "retry_in_seconds": round(retry_in, 2) if retry_in is not None else None,
+            "rejected_calls": self.rejected_calls,
+            "transitions": dict(self.transitions),
+        }
+
 class CacheService:
     """Centralized caching service with Redis backend and File-Based fallback mechanisms"""
     
-    def __init__(self):
-        self.redis_client: Optional[redis.Redis] = None
-        self.local_cache: Dict[str, Dict[str, Any]] = {}
-        self.cache_dir = os.path.join(os.getcwd(), '.cache')
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.redis_client: Optional[aioredis.Redis] = None
+        self.redis_breaker = CircuitBreaker(
+            "redis",
+            failure_threshold=settings.REDIS_CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=settings.REDIS_CIRCUIT_RESET_TIMEOUT,
+            max_reset_timeout=settings.REDIS_CIRCUIT_MAX_RESET_TIMEOUT,
+            on_transition=self._report_circuit_transition
+        )
+        self.local_cache = LocalLRUCache(
+            max_entries=settings.CACHE_LOCAL_MAX_ENTRIES,
+            max_bytes=settings.CACHE_LOCAL_MAX_BYTES,
+            namespace_quotas=settings.CACHE_NAMESPACE_QUOTAS
+        )
+        self.serializer = CacheSerializer(
+            default_codec=settings.CACHE_CODEC,
+            namespace_codecs=settings.CACHE_NAMESPACE_CODECS,
+            compression=settings.CACHE_COMPRESSION,
+            compression_min_bytes=settings.CACHE_COMPRESSION_MIN_BYTES
+        )
+        self.telemetry = CacheTelemetry()
+        self.cache_dir = cache_dir or os.path.join(os.getcwd(), '.cache')
+        self.file_store: Optional[PersistentCacheStore] = None
         self.cache_stats = {
             "hits": 0,
             "misses": 0,
             "errors": 0,
+            "coalesced": 0,
+            "stale_hits": 0,
+            "stale_age_total_seconds": 0.0,
+            "max_stale_age_seconds": 0.0,
+            "background_refreshes": 0,
+            "background_refresh_errors": 0,
             "redis_available": False,
             "file_cache_available": False
         }
         
         # Cache configuration
         self.default_ttl = 300  # 5 minutes
-        self.max_local_cache_size = 1000
+        
+        # In-flight producers keyed by cache key (single-flight per process)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # Strong references to stale-while-revalidate refresh tasks
+        self._background_tasks: set = set()
+        # Periodic purge of expired rows in the persistent tier, started on first use
+        self._janitor_task: Optional[asyncio.Task] = None
+        self.janitor_interval = settings.CACHE_FILE_JANITOR_INTERVAL
+        
+        # Namespace generations embedded in cache keys: namespace -> (generation, last read)
+        self._generations: Dict[str, Tuple[int, float]] = {}
+        self.generation_refresh_interval = settings.CACHE_GENERATION_REFRESH_SECONDS
+        # Namespaces invalidated since the last janitor run: namespace -> current generation
+        self._superseded: Dict[str, int] = {}
         
         self._initialize_fs_cache()
         self._initialize_redis()
     
     def _initialize_fs_cache(self):
-        """Initialize filesystem cache directory"""
+        """Initialize the persistent cache store"""
         try:
             if not os.path.exists(self.cache_dir):
                 os.makedirs(self.cache_dir)
+            self.file_store = PersistentCacheStore(
+                os.path.join(self.cache_dir, "cache.db"),
+                max_bytes=settings.CACHE_FILE_MAX_BYTES
+            )
             self.cache_stats["file_cache_available"] = True
         except Exception as e:
-            logger.warning(f"Failed to create cache directory: {e}")
+            logger.warning(f"Failed to open persistent cache store: {e}")
+            self.file_store = None
             self.cache_stats["file_cache_available"] = False
+    
+    def _ensure_janitor(self):
+        """Start the expiry janitor once an event loop is running"""
+        if self.file_store is None or self.janitor_interval <= 0:
+            return
+        if self._janitor_task and not self._janitor_task.done():
+            return
+        try:
+            self._janitor_task = asyncio.get_running_loop().create_task(self._run_janitor())
+        except RuntimeError:
+            pass
+    
+    async def _run_janitor(self):
+        """Purge expired entries and entries of superseded namespace generations periodically"""
+        await run_in_pool("io", self._remove_legacy_pickle_files)
+        while True:
+            try:
+                removed = await run_in_pool("io", self.file_store.purge_expired)
+                if removed:
+                    logger.debug(f"🧹 Cache janitor purged {removed} expired entries")
+                
+                superseded, self._superseded = self._superseded, {}
+                for namespace, generation in superseded.items():
+                    prefix = self._generation_prefix(namespace, generation)
+                    self.local_cache.purge_superseded(namespace, prefix)
+                    await run_in_pool("io", self.file_store.purge_superseded, namespace, prefix)
+            except Exception as e:
+                logger.warning(f"Cache janitor error: {e}")
+            await asyncio.sleep(self.janitor_interval)
+    
+    def _remove_legacy_pickle_files(self):
+        """Delete per-key pickle files left by the previous file tier"""
+        try:
+            with os.scandir(self.cache_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".pickle"):
+                        os.remove(entry.path)
+        except OSError as e:
+            logger.warning(f"Failed to remove legacy cache files: {e}")
+    
+    async def close(self):
+        """Stop the janitor and close the persistent store"""
+        if self._janitor_task:
+            self._janitor_task.cancel()
+            self._janitor_task = None
+        if self.file_store:
+            self.file_store.close()
+            self.file_store = None
 
     def _initialize_redis(self):
-        """Initialize Redis connection with proper error handling"""
+        """Attach to the shared async Redis pool (connections are opened lazily)"""
         if not settings.REDIS_ENABLED:
             logger.info("Redis caching disabled via configuration")
             return
             
         try:
-            self.redis_client = redis.Redis(
-                host=settings.REDIS_HOST,
-                port=settings.REDIS_PORT,
-                db=settings.REDIS_DB,
-                decode_responses=True,
-                socket_timeout=0.5,  # Reduced from 5s to prevent blocking
-                socket_connect_timeout=0.5,  # Reduced from 5s to prevent blocking
-                retry_on_timeout=False,  # Don't retry during startup
-                health_check_interval=30
-            )
-            
-            # Test connection removed for lazy loading
-            # self.redis_client.ping()
+            self.redis_client = get_redis_binary_client()
             self.cache_stats["redis_available"] = True
             logger.info("✅ Centralized cache service initialized with Redis (lazy)")
             
@@ -72,9 +565,46 @@ class CacheService:
             self.redis_client = None
             self.cache_stats["redis_available"] = False
     
-    def _generate_cache_key(self, namespace: str, key: str, params: Optional[Dict] = None) -> str:
+    def _report_circuit_transition(self, name: str, state: str):
+        """Export circuit breaker transitions to Prometheus"""
+        get_prometheus_service().record_circuit_transition(name, state)
+    
+    async def _call_redis(self, operation: str, command: Callable[[], Awaitable[Any]],
+                          namespace: Optional[str] = None) -> Any:
+        """Run a Redis command through the circuit breaker
+        
+        Returns None when Redis is disabled, the circuit is open or the call cannot
+        reach the server, so callers fall through to the local tiers without waiting
+        on socket timeouts. Failures are attributed to ``namespace`` in the telemetry.
+        """
+        if not self.redis_client or not self.redis_breaker.allow_request():
+            return None
+        
+        try:
+            result = await command()
+        except (ConnectionError, TimeoutError, OSError) as e:
+            self.redis_breaker.record_failure()
+            get_prometheus_service().record_redis_operation(operation, "error")
+            if namespace:
+                self.telemetry.record_error(namespace, "redis", operation)
+            logger.warning(f"Redis {operation} failed: {e}")
+            return None
+        except RedisError:
+            # The server answered, so the tier itself is reachable
+            self.redis_breaker.record_success()
+            raise
+        except asyncio.CancelledError:
+            self.redis_breaker.release_probe()
+            raise
+        
+        self.redis_breaker.record_success()
+        get_prometheus_service().record_redis_operation(operation, "success")
+        return result
+    
+    def _generate_cache_key(self, namespace: str, key: str, params: Optional[Dict] = None,
+                            generation: int = 0) -> str:
         """Generate a standardized cache key"""
-        key_parts = [namespace, key]
+        key_parts = [namespace, f"#{generation}", key] if generation else [namespace, key]
         
         if params:
             # Sort params for consistent key generation
@@ -85,203 +615,529 @@ class CacheService:
         
         return ":".join(key_parts)
     
-    def _get_file_path(self, cache_key: str) -> str:
-        """Generate safe file path for a cache key"""
-        # Hash the key to avoid invalid filename characters
-        safe_filename = hashlib.md5(cache_key.encode()).hexdigest() + ".pickle"
-        return os.path.join(self.cache_dir, safe_filename)
-
+    async def _cache_key(self, namespace: str, key: str, params: Optional[Dict] = None) -> str:
+        """Generate the cache key under the namespace's current generation"""
+        return self._generate_cache_key(namespace, key, params, await self._namespace_generation(namespace))
+    
+    @staticmethod
+    def _generation_prefix(namespace: str, generation: int) -> str:
+        return f"{namespace}:#{generation}:" if generation else f"{namespace}:"
+    
+    @staticmethod
+    def _generation_key(namespace: str) -> str:
+        return f"cache_generation:{namespace}"
+    
+    async def _namespace_generation(self, namespace: str) -> int:
+        """Current generation of a namespace
+        
+        Served from memory; re-read from Redis at most every
+        ``generation_refresh_interval`` seconds so invalidations made by other
+        processes are picked up without a round trip per request.
+        """
+        cached = self._generations.get(namespace)
+        now = time.monotonic()
+        if cached is not None and (self.redis_client is None or now - cached[1] < self.generation_refresh_interval):
+            return cached[0]
+        
+        if cached is not None:
+            generation = cached[0]
+        elif self.file_store:
+            generation = await run_in_pool("io", self.file_store.get_generation, namespace)
+        else:
+            generation = 0
+        
+        remote = await self._call_redis("get", lambda: self.redis_client.get(self._generation_key(namespace)))
+        if remote is not None:
+            generation = max(generation, int(remote))
+        
+        self._generations[namespace] = (generation, now)
+        return generation
+    
     async def get(self, namespace: str, key: str, params: Optional[Dict] = None) -> Optional[Any]:
         """Get cached data with fallback mechanisms (Redis -> Memory -> File)"""
-        cache_key = self._generate_cache_key(namespace, key, params)
-        
+        try:
+            cache_key = await self._cache_key(namespace, key, params)
+        except Exception as e:
+            logger.error(f"Cache get error: {e}")
+            self.cache_stats["errors"] += 1
+            self.telemetry.record_error(namespace, None, "get")
+            return None
+        entry = await self._lookup(cache_key)
+        return entry["data"] if entry is not None else None
+    
+    def _observe_get(self, namespace: str, tier: Optional[str], started: float, found: int, total: int = 1):
+        """Record a lookup against one tier (or the whole request when ``tier`` is None)"""
+        self.telemetry.record_get(namespace, tier, found, total - found, time.perf_counter() - started)
+    
+    def _observe_set(self, namespace: str, tier: Optional[str], started: float, count: int = 1):
+        """Record a write to one tier (or the whole request when ``tier`` is None)"""
+        self.telemetry.record_set(namespace, tier, time.perf_counter() - started, count)
+    
+    async def _lookup(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Find the entry for a cache key across tiers, including its freshness metadata"""
+        namespace = LocalLRUCache._namespace_of(cache_key)
+        started = time.perf_counter()
         try:
             # 1. Try Redis first
             if self.redis_client:
-                try:
-                    data = await asyncio.get_event_loop().run_in_executor(
-                        None, self.redis_client.get, cache_key
-                    )
-                    if data:
-                        self.cache_stats["hits"] += 1
-                        return json.loads(data)
-                except (ConnectionError, TimeoutError) as e:
-                    logger.warning(f"Redis get failed: {e}")
-            
-            # 2. Try Memory Cache
-            if cache_key in self.local_cache:
-                entry = self.local_cache[cache_key]
-                if entry["expires_at"] > datetime.now():
+                redis_started = time.perf_counter()
+                payload = await self._call_redis("get", lambda: self.redis_client.get(cache_key), namespace)
+                entry = self._decode_entry(cache_key, payload) if payload else None
+                self._observe_get(namespace, "redis", redis_started, entry is not None)
+                if entry is not None:
                     self.cache_stats["hits"] += 1
-                    return entry["data"]
-                else:
-                    # Expired entry
-                    del self.local_cache[cache_key]
+                    self._observe_get(namespace, None, started, 1)
+                    return entry
             
-            # 3. Try File Cache (Persistence)
-            file_path = self._get_file_path(cache_key)
-            if os.path.exists(file_path):
-                try:
-                    # Simple lock for file read to prevent race conditions if multiple async tasks try to read/delete
-                    async with asyncio.Lock(): 
-                         data = await asyncio.to_thread(self._read_pickle, file_path)
-                         
-                    if data and data["expires_at"] > datetime.now():
-                        # Populate memory cache for next time
-                        self.local_cache[cache_key] = data
-                        self.cache_stats["hits"] += 1
-                        return data["data"]
-                    elif data:
-                        # Expired file, remove it
-                        await asyncio.to_thread(os.remove, file_path)
-                except Exception as e:
-                    logger.warning(f"File cache read error: {e}")
+            # 2. Memory, then file
+            entry = await self._lookup_local(cache_key)
+            if entry is not None:
+                self.cache_stats["hits"] += 1
+                self._observe_get(namespace, None, started, 1)
+                return entry
 
             self.cache_stats["misses"] += 1
+            self._observe_get(namespace, None, started, 0)
             return None
             
         except Exception as e:
             logger.error(f"Cache get error: {e}")
             self.cache_stats["errors"] += 1
+            self.telemetry.record_error(namespace, None, "get")
             return None
     
-    def _read_pickle(self, path: str):
-        with open(path, 'rb') as f:
-            return pickle.load(f)
-
-    def _write_pickle(self, path: str, data: Any):
-        with open(path, 'wb') as f:
-            pickle.dump(data, f)
-
-    async def set(self, namespace: str, key: str, data: Any, ttl: Optional[int] = None, params: Optional[Dict] = None):
-        """Set cached data (Redis + Memory + File)"""
-        cache_key = self._generate_cache_key(namespace, key, params)
-        ttl = ttl or self.default_ttl
+    async def _lookup_local(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Find an entry in the memory tier, falling back to the file tier"""
+        namespace = LocalLRUCache._namespace_of(cache_key)
+        
+        # Memory Cache (expired entries are dropped on access)
+        started = time.perf_counter()
+        entry = self.local_cache.get(cache_key)
+        self._observe_get(namespace, "memory", started, entry is not None)
+        if entry is not None:
+            return entry
+        
+        # Persistent store (expired rows are filtered by the query and purged by the janitor)
+        if self.file_store:
+            self._ensure_janitor()
+            started = time.perf_counter()
+            try:
+                payload = await run_in_pool("io", self.file_store.get, cache_key)
+                if payload is not None:
+                    entry = self._decode_entry(cache_key, payload)
+                    if entry is None:
+                        # Unreadable row (e.g. written by an older build); drop it
+                        await run_in_pool("io", self.file_store.delete, cache_key)
+                    elif entry.get("expires_at"):
+                        self._observe_get(namespace, "file", started, 1)
+                        # Populate memory cache for next time
+                        self.local_cache.set(cache_key, entry, len(payload))
+                        return entry
+                self._observe_get(namespace, "file", started, 0)
+            except Exception as e:
+                logger.warning(f"File cache read error: {e}")
+                self.telemetry.record_error(namespace, "file", "get")
+        return None
+    
+    async def get_many(self, namespace: str, keys: List[str], params: Optional[Dict] = None) -> Dict[str, Any]:
+        """Get several keys of a namespace, using one pipelined Redis MGET
+        
+        Returns a dict of key -> data containing only the keys that were found.
+        """
+        if not keys:
+            return {}
+        started = time.perf_counter()
+        found: Dict[str, Any] = {}
         
         try:
-            serialized_data = json.dumps(data, default=str)
-            expiration = datetime.now() + timedelta(seconds=ttl)
-            
-            # 1. Set Redis
+            generation = await self._namespace_generation(namespace)
+            cache_keys = [self._generate_cache_key(namespace, key, params, generation) for key in keys]
             if self.redis_client:
-                try:
-                    await asyncio.get_event_loop().run_in_executor(
-                        None, self.redis_client.setex, cache_key, ttl, serialized_data
-                    )
-                except (ConnectionError, TimeoutError) as e:
-                    logger.warning(f"Redis set failed: {e}")
+                redis_started = time.perf_counter()
+                values = await self._call_redis("mget", lambda: self.redis_client.mget(cache_keys), namespace)
+                for key, cache_key, payload in zip(keys, cache_keys, values or []):
+                    entry = self._decode_entry(cache_key, payload) if payload else None
+                    if entry is not None:
+                        found[key] = entry["data"]
+                self._observe_get(namespace, "redis", redis_started, len(found), len(keys))
             
-            # 2. Set Memory
-            cache_entry = {
-                "data": data,
-                "expires_at": expiration,
-                "created_at": datetime.now()
-            }
-            self._set_local_cache(cache_key, cache_entry)
+            for key, cache_key in zip(keys, cache_keys):
+                if key in found:
+                    continue
+                entry = await self._lookup_local(cache_key)
+                if entry is not None:
+                    found[key] = entry["data"]
             
-            # 3. Set File
-            file_path = self._get_file_path(cache_key)
+            self.cache_stats["hits"] += len(found)
+            self.cache_stats["misses"] += len(keys) - len(found)
+            self._observe_get(namespace, None, started, len(found), len(keys))
+            return found
+            
+        except Exception as e:
+            logger.error(f"Cache get_many error: {e}")
+            self.cache_stats["errors"] += 1
+            self.telemetry.record_error(namespace, None, "get")
+            return found
+    
+    def _decode_entry(self, cache_key: str, payload: bytes) -> Optional[Dict[str, Any]]:
+        """Convert an encoded Redis/file payload into a cache entry (None if undecodable)"""
+        try:
+            envelope = self.serializer.decode(payload)
+        except CodecError as e:
+            logger.warning(f"Discarding undecodable cache entry {cache_key}: {e}")
+            return None
+        
+        if not (isinstance(envelope, dict) and envelope.get(_ENVELOPE_MARKER)):
+            # Plain JSON written before entries carried metadata
+            return {"data": envelope, "created_at": None, "fresh_until": None}
+        
+        fresh_until = envelope.get("fresh_until")
+        expires_at = envelope.get("expires_at")
+        return {
+            "data": envelope["data"],
+            "expires_at": datetime.fromtimestamp(expires_at) if expires_at else None,
+            "created_at": datetime.fromtimestamp(envelope["created_at"]),
+            "fresh_until": datetime.fromtimestamp(fresh_until) if fresh_until else None
+        }
+    
+    def _prepare_entry(self, namespace: str, data: Any, ttl: Optional[int],
+                       hard_ttl: Optional[int]) -> Tuple[Dict[str, Any], bytes, int, int]:
+        """Build the memory entry, the encoded Redis/file payload, the storage TTL and the raw size
+        
+        When ``hard_ttl`` exceeds ``ttl`` the entry is kept until the hard TTL and
+        treated as stale (served while revalidating) once the soft ``ttl`` passes.
+        """
+        ttl = ttl or self.default_ttl
+        stale_while_revalidate = bool(hard_ttl and hard_ttl > ttl)
+        storage_ttl = hard_ttl if stale_while_revalidate else ttl
+        
+        now = datetime.now()
+        fresh_until = now + timedelta(seconds=ttl) if stale_while_revalidate else None
+        
+        expires_at = now + timedelta(seconds=storage_ttl)
+        
+        payload, raw_size = self.serializer.encode(namespace, {
+            _ENVELOPE_MARKER: True,
+            "data": data,
+            "created_at": now.timestamp(),
+            "fresh_until": fresh_until.timestamp() if fresh_until else None,
+            "expires_at": expires_at.timestamp()
+        })
+        
+        cache_entry = {
+            "data": data,
+            "expires_at": expires_at,
+            "created_at": now,
+            "fresh_until": fresh_until
+        }
+        return cache_entry, payload, storage_ttl, raw_size
+    
+    async def _store_local(self, cache_key: str, cache_entry: Dict[str, Any], payload: bytes, raw_size: int):
+        """Write an entry to the memory and file tiers"""
+        namespace = LocalLRUCache._namespace_of(cache_key)
+        
+        # Uncompressed encoded length approximates the entry's footprint for the byte budget
+        started = time.perf_counter()
+        self.local_cache.set(cache_key, cache_entry, raw_size)
+        self._observe_set(namespace, "memory", started)
+        
+        if self.file_store:
+            self._ensure_janitor()
+            started = time.perf_counter()
             try:
-                await asyncio.to_thread(self._write_pickle, file_path, cache_entry)
+                await run_in_pool(
+                    "io", self.file_store.set, cache_key, payload, cache_entry["expires_at"].timestamp()
+                )
+                self._observe_set(namespace, "file", started)
             except Exception as e:
                 logger.warning(f"File cache write failed: {e}")
+                self.telemetry.record_error(namespace, "file", "set")
+
+    async def set(self, namespace: str, key: str, data: Any, ttl: Optional[int] = None,
+                  params: Optional[Dict] = None, hard_ttl: Optional[int] = None):
+        """Set cached data (Redis + Memory + File)
+        
+        ``hard_ttl`` enables stale-while-revalidate, see ``get_or_compute``.
+        """
+        started = time.perf_counter()
+        
+        try:
+            cache_key = await self._cache_key(namespace, key, params)
+            cache_entry, payload, storage_ttl, raw_size = self._prepare_entry(namespace, data, ttl, hard_ttl)
+            
+            # 1. Set Redis
+            if self.redis_client:
+                redis_started = time.perf_counter()
+                stored = await self._call_redis(
+                    "set", lambda: self.redis_client.setex(cache_key, storage_ttl, payload), namespace
+                )
+                if stored is not None:
+                    self._observe_set(namespace, "redis", redis_started)
+            
+            # 2. Set Memory and File
+            await self._store_local(cache_key, cache_entry, payload, raw_size)
+            self._observe_set(namespace, None, started)
             
         except Exception as e:
             logger.error(f"Cache set error: {e}")
             self.cache_stats["errors"] += 1
+            self.telemetry.record_error(namespace, None, "set")
     
-    def _set_local_cache(self, cache_key: str, entry: Dict[str, Any]):
-        """Set data in local cache with size management"""
-        # Clean up expired entries and manage size
-        if len(self.local_cache) >= self.max_local_cache_size:
-            self._cleanup_local_cache()
+    async def set_many(self, namespace: str, items: Dict[str, Any], ttl: Optional[int] = None,
+                       params: Optional[Dict] = None, hard_ttl: Optional[int] = None):
+        """Set several keys of a namespace, using one pipelined round trip to Redis"""
+        if not items:
+            return
         
-        self.local_cache[cache_key] = entry
+        started = time.perf_counter()
+        try:
+            generation = await self._namespace_generation(namespace)
+            prepared = [
+                (self._generate_cache_key(namespace, key, params, generation),
+                 *self._prepare_entry(namespace, data, ttl, hard_ttl))
+                for key, data in items.items()
+            ]
+            
+            async def write_pipeline():
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    for cache_key, _, payload, storage_ttl, _ in prepared:
+                        pipe.setex(cache_key, storage_ttl, payload)
+                    return await pipe.execute()
+            
+            if self.redis_client:
+                redis_started = time.perf_counter()
+                if await self._call_redis("set_many", write_pipeline, namespace) is not None:
+                    self._observe_set(namespace, "redis", redis_started, len(prepared))
+            
+            for cache_key, cache_entry, payload, _, raw_size in prepared:
+                await self._store_local(cache_key, cache_entry, payload, raw_size)
+            self._observe_set(namespace, None, started, len(prepared))
+                
+        except Exception as e:
+            logger.error(f"Cache set_many error: {e}")
+            self.cache_stats["errors"] += 1
+            self.telemetry.record_error(namespace, None, "set")
     
-    def _cleanup_local_cache(self):
-        """Clean up expired entries and enforce size limits"""
-        now = datetime.now()
-        expired = [k for k, v in self.local_cache.items() if v["expires_at"] <= now]
-        for k in expired: del self.local_cache[k]
+    async def get_or_compute(self, namespace: str, key: str, producer: Callable[[], Awaitable[Any]],
+                             ttl: Optional[int] = None, params: Optional[Dict] = None,
+                             hard_ttl: Optional[int] = None) -> Any:
+        """Get cached data or compute it, allowing only one in-flight producer per key.
+        
+        Concurrent callers that miss on the same key await the running producer
+        instead of starting their own, so an expiring hot key triggers a single
+        upstream call. Producer exceptions are propagated to every waiter and
+        nothing is cached; a ``None`` result is returned but not cached.
+        
+        With ``hard_ttl`` (stale-while-revalidate), an entry older than ``ttl`` but
+        younger than ``hard_ttl`` is returned immediately while one background task
+        refreshes it. The age of stale entries served is reported to
+        ``track_staleness`` and in ``get_stats``.
+        """
+        try:
+            cache_key = await self._cache_key(namespace, key, params)
+        except Exception as e:
+            # Without a key the value cannot be cached or shared; compute it directly
+            logger.error(f"Cache get error: {e}")
+            self.cache_stats["errors"] += 1
+            self.telemetry.record_error(namespace, None, "get")
+            return await producer()
+        entry = await self._lookup(cache_key)
+        if entry is not None and entry["data"] is not None:
+            fresh_until = entry.get("fresh_until")
+            if fresh_until is not None and fresh_until <= datetime.now():
+                self._record_stale_hit(cache_key, entry)
+                if cache_key not in self._inflight:
+                    self._spawn_refresh(namespace, key, cache_key, producer, ttl, params, hard_ttl)
+            return entry["data"]
+        
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            self.cache_stats["coalesced"] += 1
+            # Shield so a cancelled waiter does not cancel the shared producer
+            return await asyncio.shield(inflight)
+        
+        future = self._start_flight(cache_key)
+        return await self._complete_flight(future, namespace, key, cache_key, producer, ttl, params, hard_ttl)
+    
+    def _start_flight(self, cache_key: str) -> asyncio.Future:
+        """Register an in-flight producer for a key before it starts running"""
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        return future
+    
+    async def _complete_flight(self, future: asyncio.Future, namespace: str, key: str, cache_key: str,
+                               producer: Callable[[], Awaitable[Any]], ttl: Optional[int],
+                               params: Optional[Dict], hard_ttl: Optional[int]) -> Any:
+        """Run a registered producer, cache its result and release its waiters"""
+        try:
+            data = await producer()
+            if data is not None:
+                await self.set(namespace, key, data, ttl=ttl, params=params, hard_ttl=hard_ttl)
+            future.set_result(data)
+            return data
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Mark as retrieved so an unawaited future does not log a warning
+                future.exception()
+            raise
+        finally:
+            self._inflight.pop(cache_key, None)
+    
+    def _spawn_refresh(self, namespace: str, key: str, cache_key: str,
+                       producer: Callable[[], Awaitable[Any]], ttl: Optional[int],
+                       params: Optional[Dict], hard_ttl: Optional[int]):
+        """Refresh a stale entry in the background, sharing the single-flight slot"""
+        future = self._start_flight(cache_key)
+        task = asyncio.create_task(
+            self._complete_flight(future, namespace, key, cache_key, producer, ttl, params, hard_ttl)
+        )
+        self.cache_stats["background_refreshes"] += 1
+        self._background_tasks.add(task)
+        task.add_done_callback(lambda t: self._on_refresh_done(cache_key, t))
+    
+    def _on_refresh_done(self, cache_key: str, task: asyncio.Task):
+        """Log failed background refreshes; the stale entry stays until its hard TTL"""
+        self._background_tasks.discard(task)
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            self.cache_stats["background_refresh_errors"] += 1
+            logger.warning(f"Background refresh failed for {cache_key}: {error}")
+    
+    def _record_stale_hit(self, cache_key: str, entry: Dict[str, Any]):
+        """Account for a stale entry being served"""
+        created_at = entry.get("created_at")
+        age = (datetime.now() - created_at).total_seconds() if created_at else 0.0
+        self.cache_stats["stale_hits"] += 1
+        self.cache_stats["stale_age_total_seconds"] += age
+        self.cache_stats["max_stale_age_seconds"] = max(self.cache_stats["max_stale_age_seconds"], age)
         
-        # If still too large, remove oldest entries
-        if len(self.local_cache) >= self.max_local_cache_size:
-            sorted_entries = sorted(self.local_cache.items(), key=lambda x: x[1]["created_at"])
-            to_remove = len(sorted_entries) - self.max_local_cache_size + 100 # Remove a batch
-            for i in range(to_remove):
-                if i < len(sorted_entries):
-                    del self.local_cache[sorted_entries[i][0]]
+        tracker = _staleness_tracker.get()
+        if tracker is not None:
+            tracker[cache_key] = max(tracker.get(cache_key, 0.0), age)
+    
+    @contextmanager
+    def track_staleness(self):
+        """Collect the age in seconds of every stale entry served inside the block
+        
+        Yields a dict of cache key -> age. The dict is shared with tasks spawned
+        inside the block (e.g. via ``asyncio.gather``), so fan-out is covered.
+        """
+        tracker: Dict[str, float] = {}
+        token = _staleness_tracker.set(tracker)
+        try:
+            yield tracker
+        finally:
+            _staleness_tracker.reset(token)
     
     async def delete(self, namespace: str, key: str, params: Optional[Dict] = None):
         """Delete cached data"""
-        cache_key = self._generate_cache_key(namespace, key, params)
-        
         try:
+            cache_key = await self._cache_key(namespace, key, params)
+            
             # Delete from Redis
-            if self.redis_client:
-                try:
-                    await asyncio.get_event_loop().run_in_executor(
-                        None, self.redis_client.delete, cache_key
-                    )
-                except (ConnectionError, TimeoutError) as e:
-                    logger.warning(f"Redis delete failed: {e}")
+            await self._call_redis("delete", lambda: self.redis_client.delete(cache_key))
             
             # Delete from local cache
-            if cache_key in self.local_cache:
-                del self.local_cache[cache_key]
+            self.local_cache.pop(cache_key)
+            
+            # Delete from persistent store
+            if self.file_store:
+                await run_in_pool("io", self.file_store.delete, cache_key)
             
-            # Delete from file cache
-            file_path = self._get_file_path(cache_key)
-            if os.path.exists(file_path):
-                await asyncio.to_thread(os.remove, file_path)
+            # Drop the key from other workers' local tiers
+            await invalidation_bus.publish("cache", action="delete", cache_keys=[cache_key])
                 
         except Exception as e:
             logger.error(f"Cache delete error: {e}")
     
-    async def clear_namespace(self, namespace: str):
-        """Clear all cache entries for a namespace (Best effort for file/memory)"""
+    async def clear_namespace(self, namespace: str) -> Optional[int]:
+        """Invalidate every entry of a namespace across all tiers in O(1)
+        
+        Bumps the namespace generation embedded in cache keys (a single Redis
+        INCR), so older entries become unreachable at once. They then expire
+        through their TTL in Redis and are purged from the memory and persistent
+        tiers by the janitor. Returns the new generation.
+        """
         try:
-            # Clear from Redis
-            if self.redis_client:
-                try:
-                    pattern = f"{namespace}:*"
-                    keys = await asyncio.get_event_loop().run_in_executor(
-                        None, self.redis_client.keys, pattern
-                    )
-                    if keys:
-                        await asyncio.get_event_loop().run_in_executor(
-                            None, self.redis_client.delete, *keys
-                        )
-                except (ConnectionError, TimeoutError) as e:
-                    logger.warning(f"Redis namespace clear failed: {e}")
+            generation = await self._namespace_generation(namespace) + 1
             
-            # Clear from local cache
-            keys_to_delete_local = [
-                key for key in self.local_cache.keys()
-                if key.startswith(f"{namespace}:")
-            ]
-            for key in keys_to_delete_local:
-                del self.local_cache[key]
+            remote = await self._call_redis("incr", lambda: self.redis_client.incr(self._generation_key(namespace)))
+            if remote is not None:
+                generation = max(generation, remote)
+            
+            self._generations[namespace] = (generation, time.monotonic())
+            if self.file_store:
+                await run_in_pool("io", self.file_store.set_generation, namespace, generation)
             
-            # Clear from file cache (best effort, requires scanning files)
-            # For simplicity and performance, we won't scan all files for namespace prefix.
-            # Individual deletes are handled by _get_file_path hashing.
-            # A full namespace clear for file cache would involve iterating through the cache_dir
-            # and checking the original cache_key (if stored) or re-generating it.
-            # For now, we rely on individual deletes and TTL for file cache cleanup.
+            self._superseded[namespace] = generation
+            self._ensure_janitor()
+            
+            # Other workers switch generation immediately instead of at their next refresh
+            await invalidation_bus.publish("cache", action="clear", namespace=namespace, generation=generation)
+            return generation
                 
         except Exception as e:
             logger.error(f"Cache namespace clear error: {e}")
+            return None
+    
+    async def handle_invalidation(self, message: Dict[str, Any]):
+        """Apply an invalidation published by another worker to the local tiers"""
+        action = message.get("action")
+        if action == "delete":
+            for cache_key in message.get("cache_keys", []):
+                self.local_cache.pop(cache_key)
+                if self.file_store:
+                    await run_in_pool("io", self.file_store.delete, cache_key)
+        elif action == "clear":
+            namespace, generation = message["namespace"], int(message["generation"])
+            current = self._generations.get(namespace, (0, 0.0))[0]
+            if generation > current:
+                self._generations[namespace] = (generation, time.monotonic())
+                self._superseded[namespace] = generation
+                self._ensure_janitor()
+    
+    def update_usage_metrics(self) -> Dict[str, Dict[str, Dict[str, int]]]:
+        """Export per-namespace entry counts and bytes of the local tiers to Prometheus
+        
+        Redis is shared between workers and not sized per namespace here.
+        """
+        usage = {"memory": self.local_cache.namespace_usage()}
+        if self.file_store:
+            usage["file"] = self.file_store.namespace_usage()
+        
+        prometheus = get_prometheus_service()
+        for tier, tier_usage in usage.items():
+            prometheus.update_cache_usage(tier, tier_usage)
+        return usage
     
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
         total_requests = self.cache_stats["hits"] + self.cache_stats["misses"]
         hit_rate = (self.cache_stats["hits"] / total_requests * 100) if total_requests > 0 else 0
         
+        stale_hits = self.cache_stats["stale_hits"]
+        avg_stale_age = self.cache_stats["stale_age_total_seconds"] / stale_hits if stale_hits else 0
+        
         return {
             **self.cache_stats,
             "hit_rate_percent": round(hit_rate, 2),
+            "avg_stale_age_seconds": round(avg_stale_age, 2),
+            "background_refreshes_running": len(self._background_tasks),
             "local_cache_size": len(self.local_cache),
+            "local_cache": self.local_cache.get_stats(),
+            "file_cache": self.file_store.get_stats() if self.file_store else None,
+            "codecs": self.serializer.get_stats(),
+            "namespaces": self.telemetry.get_stats(self.update_usage_metrics()),
+            "inflight_producers": len(self._inflight),
+            "namespace_generations": {ns: gen for ns, (gen, _) in self._generations.items()},
+            "redis_pool": get_pool_stats(),
+            "redis_circuit": self.redis_breaker.get_stats(),
+            "invalidation_bus": invalidation_bus.get_stats(),
             "total_requests": total_requests
         }
     
@@ -292,23 +1148,23 @@ class CacheService:
             "local_cache_available": True, # Memory cache is always available
             "file_cache_available": self.cache_stats["file_cache_available"],
             "redis_latency_ms": None,
+            "redis_pool": get_pool_stats(),
+            "redis_circuit": self.redis_breaker.get_stats(),
             "status": "unhealthy"
         }
         
-        # Test Redis
+        # Test Redis (skipped while the circuit is open)
         if self.redis_client:
             try:
                 start_time = datetime.now()
-                await asyncio.get_event_loop().run_in_executor(
-                    None, self.redis_client.ping
-                )
-                latency = (datetime.now() - start_time).total_seconds() * 1000
-                
-                health_status["redis_available"] = True
-                health_status["redis_latency_ms"] = round(latency, 2)
+                if await self._call_redis("ping", self.redis_client.ping):
+                    latency = (datetime.now() - start_time).total_seconds() * 1000
+                    health_status["redis_available"] = True
+                    health_status["redis_latency_ms"] = round(latency, 2)
                 
             except Exception as e:
                 logger.warning(f"Redis health check failed: {e}")
+            health_status["redis_circuit"] = self.redis_breaker.get_stats()
         
         # Overall status
         if health_status["redis_available"] or health_status["local_cache_available"] or health_status["file_cache_available"]:
@@ -317,4 +1173,6 @@ class CacheService:
         return health_status
 
 # Global cache service instance
-cache_service = CacheService()
\ No newline at end of file
+cache_service = CacheService()
+invalidation_bus.subscribe("cache", cache_service.handle_invalidation)
+invalidation_bus.route_through(cache_service._call_redis)
\ No newline at end of file
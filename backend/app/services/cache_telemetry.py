@@ -0,0 +1,162 @@
+"""
+Cache telemetry
+Per-namespace, per-tier hit/miss/error counters and get/set latency histograms for
+CacheService. Observations are mirrored to PrometheusMetricsService as labeled metrics.
+"""
+
+import bisect
+from typing import Any, Dict, Optional, Tuple
+
+from app.services.prometheus_service import get_prometheus_service
+
+TIERS = ("redis", "memory", "file")
+
+# Upper bounds in seconds; cache tiers answer in microseconds (memory) to milliseconds (Redis/SQLite)
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with approximate quantiles"""
+
+    __slots__ = ("counts", "count", "total")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound (seconds) of the bucket holding the q-th observation"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, bucket_count in zip(LATENCY_BUCKETS, self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def to_dict(self) -> Dict[str, Any]:
+        def ms(value: Optional[float]) -> Optional[float]:
+            return None if value is None or value == float("inf") else round(value * 1000, 3)
+
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 3) if self.count else 0,
+            "p50_ms": ms(self.quantile(0.5)),
+            "p95_ms": ms(self.quantile(0.95)),
+            "p99_ms": ms(self.quantile(0.99)),
+            "buckets_ms": {
+                **{str(bound * 1000): n for bound, n in zip(LATENCY_BUCKETS, self.counts)},
+                "+Inf": self.counts[-1],
+            },
+        }
+
+
+class _Counters:
+    __slots__ = ("hits", "misses", "errors", "get_latency", "set_latency")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.get_latency = LatencyHistogram()
+        self.set_latency = LatencyHistogram()
+
+    def to_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate_percent": round(self.hits / lookups * 100, 2) if lookups else 0,
+            "get_latency": self.get_latency.to_dict(),
+            "set_latency": self.set_latency.to_dict(),
+        }
+
+
+class CacheTelemetry:
+    """Collects cache outcomes and latencies by namespace, overall and per tier
+
+    The namespace-level counters describe what the caller saw (a hit in any tier
+    or a miss in all of them); tier counters describe each tier consulted, so a
+    namespace falling through Redis to the file tier shows up as Redis misses
+    and file hits.
+    """
+
+    def __init__(self):
+        self._namespaces: Dict[str, _Counters] = {}
+        self._tiers: Dict[Tuple[str, str], _Counters] = {}
+
+    def _namespace(self, namespace: str) -> _Counters:
+        counters = self._namespaces.get(namespace)
+        if counters is None:
+            counters = self._namespaces[namespace] = _Counters()
+        return counters
+
+    def _tier(self, namespace: str, tier: str) -> _Counters:
+        counters = self._tiers.get((namespace, tier))
+        if counters is None:
+            counters = self._tiers[(namespace, tier)] = _Counters()
+        return counters
+
+    def record_get(self, namespace: str, tier: Optional[str], hits: int, misses: int, seconds: float):
+        """Record one (possibly batched) lookup
+
+        ``tier`` is the tier consulted, or None for the result seen by the caller.
+        """
+        counters = self._namespace(namespace) if tier is None else self._tier(namespace, tier)
+        counters.hits += hits
+        counters.misses += misses
+        counters.get_latency.observe(seconds)
+
+        prometheus = get_prometheus_service()
+        label = tier or "all"
+        if hits:
+            prometheus.record_cache_operation(namespace, label, "get", "hit", count=hits)
+        if misses:
+            prometheus.record_cache_operation(namespace, label, "get", "miss", count=misses)
+        prometheus.observe_cache_latency(namespace, label, "get", seconds)
+
+    def record_set(self, namespace: str, tier: Optional[str], seconds: float, count: int = 1):
+        """Record a write to one tier, or across all tiers when ``tier`` is None"""
+        counters = self._namespace(namespace) if tier is None else self._tier(namespace, tier)
+        counters.set_latency.observe(seconds)
+        prometheus = get_prometheus_service()
+        prometheus.record_cache_operation(namespace, tier or "all", "set", "success", count=count)
+        prometheus.observe_cache_latency(namespace, tier or "all", "set", seconds)
+
+    def record_error(self, namespace: str, tier: Optional[str], operation: str):
+        """Record a failed operation against one tier, or the whole request when ``tier`` is None"""
+        counters = self._namespace(namespace) if tier is None else self._tier(namespace, tier)
+        counters.errors += 1
+        get_prometheus_service().record_cache_operation(namespace, tier or "all", operation, "error")
+
+    def get_stats(self, usage: Optional[Dict[str, Dict[str, Dict[str, int]]]] = None) -> Dict[str, Any]:
+        """Get counters and latency histograms keyed by namespace, with a per-tier breakdown
+
+        ``usage`` (tier -> namespace -> entries/bytes) is merged in, so namespaces
+        that only hold persisted entries are listed too.
+        """
+        usage = usage or {}
+        namespaces = {ns for ns, _ in self._tiers} | set(self._namespaces)
+        for tier_usage in usage.values():
+            namespaces.update(tier_usage)
+
+        stats = {}
+        for namespace in sorted(namespaces):
+            stats[namespace] = {
+                **self._namespace(namespace).to_dict(),
+                "usage": {tier: tier_usage[namespace] for tier, tier_usage in usage.items() if namespace in tier_usage},
+                "tiers": {
+                    tier: self._tiers[(namespace, tier)].to_dict()
+                    for tier in TIERS if (namespace, tier) in self._tiers
+                },
+            }
+        return stats
@@ -10,6 +10,7 @@ import time
 from langchain_core.messages import HumanMessage
 
 from app.core.database import get_db
+from app.core.invalidation_bus import invalidation_bus
 from app.models.chatbot import (
     Conversation, ConversationMessage, ConversationIntent, QueryTemplate,
     ConversationAnalytics, ChatbotFeedback, MessageRole, IntentType, ConversationStatus
@@ -29,8 +30,11 @@ class ResourceContextCache:
     """
     Thread-safe cache for OCI resource context with TTL.
     Prevents repeated API calls and maintains performance.
+    Invalidations are published on the invalidation bus so every worker drops its copy.
     """
     
+    BUS_NAME = "chatbot_resource_context"
+    
     def __init__(self, ttl_seconds: int = 60):
         self._cache: Dict[str, Any] = {}
         self._timestamps: Dict[str, float] = {}
@@ -56,14 +60,37 @@ class ResourceContextCache:
             self._cache[key] = value
             self._timestamps[key] = time.time()
     
+    async def invalidate(self, key: Optional[str] = None):
+        """Drop one entry (or every entry when no key is given) in every worker"""
+        self._drop(key)
+        await invalidation_bus.publish(self.BUS_NAME, key=key)
+    
+    def handle_invalidation(self, message: Dict[str, Any]):
+        """Apply an invalidation published by another worker"""
+        self._drop(message.get("key"))
+    
+    def _drop(self, key: Optional[str]):
+        if key is None:
+            self.clear()
+            return
+        self._cache.pop(key, None)
+        self._timestamps.pop(key, None)
+    
     def clear(self):
         """Clear all cached entries"""
         self._cache.clear()
         self._timestamps.clear()
 
 
-# Global resource context cache - 60 second TTL for balance of freshness and performance
-_resource_cache = ResourceContextCache(ttl_seconds=60)
+# Global resource context cache - inventory changes invalidate it, so the TTL only bounds
+# the staleness of the alert part of the context
+_resource_cache = ResourceContextCache(ttl_seconds=300)
+invalidation_bus.subscribe(ResourceContextCache.BUS_NAME, _resource_cache.handle_invalidation)
+
+
+async def invalidate_resource_context(changes: Optional[List[Dict[str, Any]]] = None):
+    """Drop the cached resource context in every worker (inventory sync change handler)"""
+    await _resource_cache.invalidate()
 
 
 class IntentRecognitionService:
@@ -673,48 +700,52 @@ Note: For specific infrastructure questions (like "show my instances"), suggest
             )
             logger.info(f"Fetching resources for context from compartment: {compartment_id[:20]}...")
             
-            # Fetch all resources using the existing parallel method
+            # Refresh the inventory, then read counts and samples from its index
             try:
-                all_resources = await oci_service.get_all_resources(compartment_id)
-                resources = all_resources.get('resources', {})
+                await oci_service.get_all_resources(compartment_id)
+                index = oci_service.inventory_index
+                is_tenancy_root = bool(oci_service.config) and compartment_id == oci_service.config.get('tenancy')
+                scope = None if is_tenancy_root else compartment_id
                 
                 # Process compute instances
-                instances = resources.get('compute_instances', [])
-                if instances:
+                instance_count = index.count(scope, 'compute_instances')
+                if instance_count:
+                    running = index.count(scope, 'compute_instances', 'lifecycle_state', 'RUNNING')
                     context["resources"]["compute_instances"] = {
-                        "count": len(instances),
+                        "count": instance_count,
                         "items": [
                             {
                                 "name": inst.get("display_name", "Unknown"),
                                 "state": inst.get("lifecycle_state", "UNKNOWN"),
                                 "shape": inst.get("shape", "Unknown")
                             }
-                            for inst in instances[:15]  # Limit for token efficiency
+                            for inst in index.query(scope, 'compute_instances', limit=15)  # Limit for token efficiency
                         ],
-                        "summary": f"{len(instances)} instances ({sum(1 for i in instances if i.get('lifecycle_state') == 'RUNNING')} running)"
+                        "summary": f"{instance_count} instances ({running} running)"
                     }
                 
                 # Process databases
-                databases = resources.get('databases', [])
-                if databases:
+                database_count = index.count(scope, 'databases')
+                if database_count:
                     context["resources"]["databases"] = {
-                        "count": len(databases),
+                        "count": database_count,
                         "items": [
                             {
                                 "name": db.get("display_name", "Unknown"),
                                 "state": db.get("lifecycle_state", "UNKNOWN"),
                                 "type": db.get("db_workload", "Unknown")
                             }
-                            for db in databases[:10]
+                            for db in index.query(scope, 'databases', limit=10)
                         ],
-                        "summary": f"{len(databases)} databases"
+                        "summary": f"{database_count} databases"
                     }
                 
                 # Process VCNs/Networks
-                vcns = resources.get('vcns', [])
-                if vcns:
+                vcn_count = index.count(scope, 'network_resources', 'resource_type', 'VCN')
+                if vcn_count:
+                    vcns = [r for r in index.query(scope, 'network_resources') if r.get("resource_type") == "VCN"]
                     context["resources"]["networks"] = {
-                        "count": len(vcns),
+                        "count": vcn_count,
                         "items": [
                             {
                                 "name": vcn.get("display_name", "Unknown"),
@@ -723,17 +754,17 @@ Note: For specific infrastructure questions (like "show my instances"), suggest
                             }
                             for vcn in vcns[:5]
                         ],
-                        "summary": f"{len(vcns)} VCNs"
+                        "summary": f"{vcn_count} VCNs"
                     }
                 
                 # Process storage (buckets + block volumes)
-                buckets = resources.get('object_storage_buckets', [])
-                block_volumes = resources.get('block_volumes', [])
-                if buckets or block_volumes:
+                bucket_count = index.count(scope, 'object_storage_buckets')
+                volume_count = index.count(scope, 'block_volumes')
+                if bucket_count or volume_count:
                     context["resources"]["storage"] = {
-                        "buckets": len(buckets),
-                        "block_volumes": len(block_volumes),
-                        "summary": f"{len(buckets)} buckets, {len(block_volumes)} block volumes"
+                        "buckets": bucket_count,
+                        "block_volumes": volume_count,
+                        "summary": f"{bucket_count} buckets, {volume_count} block volumes"
                     }
                 
                 logger.info(f"Successfully fetched OCI context: {len(context['resources'])} resource types")
@@ -764,7 +795,7 @@ Note: For specific infrastructure questions (like "show my instances"), suggest
             except Exception as e:
                 logger.warning(f"Failed to fetch alerts: {e}")
             
-            # Cache the result for 60 seconds
+            # Cache the result until the inventory changes
             if context.get("resources"):
                 await _resource_cache.set(cache_key, context)
             
@@ -1,15 +1,23 @@
 import asyncio
+import hashlib
 import oci
 import json
 import logging
 import os
-import random
-from typing import Dict, List, Any, Optional, Union
+import time
+from contextlib import aclosing
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Any, Optional, Union
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 from enum import Enum
 from app.core.exceptions import ExternalServiceError, NotFoundError
+from app.core.oci_governor import oci_governor
 from app.services.cache_service import cache_service
+from app.services.resource_search_inventory import RESOURCE_SEARCH_AVAILABLE, ResourceSearchInventory
+from app.services.inventory_sync import InventorySyncEngine
+from app.services.inventory_index import InventoryIndex
+from app.services.compartment_tree import CompartmentTree
+from app.services.metric_batcher import MetricBatcher
 
 logger = logging.getLogger(__name__)
 
@@ -125,6 +133,32 @@ class OCIService:
         self.clients = {}
         self.oci_available = False
         self.config = None
+        # Listings older than their TTL are served stale (and refreshed in the
+        # background) until this hard TTL, so expiry never blocks a request
+        self.inventory_hard_ttl = 3600
+        # Pagination of list calls: page size passed as ``limit`` (0 = service default)
+        # and an optional cap on items per listing
+        self.list_page_size = settings.OCI_LIST_PAGE_SIZE
+        self.list_max_items = settings.OCI_LIST_MAX_ITEMS or None
+        self.pagination_stats: Dict[str, Dict[str, Any]] = {}
+        # Shared limit on concurrent child calls of fan-outs (subnets per VCN, bucket
+        # details, ...) across every listing in flight, with a timeout per child
+        self.fanout_limit = asyncio.Semaphore(settings.OCI_FANOUT_CONCURRENCY)
+        self.fanout_timeout = settings.OCI_FANOUT_TIMEOUT
+        # Tenancy-wide inventory: "search" (Resource Search, falling back to the
+        # per-compartment listing on failure) or "compartments" (listing only)
+        self.inventory_backend = settings.OCI_INVENTORY_BACKEND
+        self.search_inventory = ResourceSearchInventory(self, enrich=settings.OCI_INVENTORY_SEARCH_ENRICH)
+        # Compartment hierarchy, refreshed incrementally from the cached listing
+        self.compartment_tree = CompartmentTree()
+        self._compartment_tree_digest: Optional[str] = None
+        # OCID/compartment/category/state index of every listing this service returns
+        self.inventory_index = InventoryIndex()
+        # Background delta sync; once it has reconciled, the getters serve from its snapshot
+        self.inventory_sync = InventorySyncEngine(self)
+        self.discovery_stream_workers = settings.OCI_DISCOVERY_STREAM_WORKERS
+        # Compartment-wide Monitoring queries grouped by resourceId
+        self.metric_batcher = MetricBatcher(self)
         # If dummy mode is enabled, keep OCI unavailable and skip client init
         if getattr(settings, 'USE_DUMMY_OCI', False):
             logger.info("USE_DUMMY_OCI is True - skipping OCI client initialization and using mock data")
@@ -182,6 +216,7 @@ class OCIService:
             'object_storage': lambda: oci.object_storage.ObjectStorageClient(self.config),
             'api_gateway': lambda: oci.apigateway.GatewayClient(self.config),
             'usage_api': lambda: oci.usage_api.UsageapiClient(self.config),
+            'resource_search': lambda: oci.resource_search.ResourceSearchClient(self.config),
             'vault': lambda: oci.vault.VaultsClient(self.config),
             'kms_vault': lambda: oci.key_management.KmsVaultClient(self.config),
             # Phase 3: Audit and Monitoring for lifecycle/activity tracking
@@ -210,12 +245,7 @@ class OCIService:
         try:
             # Test the connection with a simple call using asyncio
             identity_client = self._get_client('identity')
-            loop = asyncio.get_event_loop()
-            
-            tenancy = await loop.run_in_executor(
-                None,
-                lambda: identity_client.get_tenancy(self.config['tenancy'])
-            )
+            tenancy = await oci_governor.call(identity_client.get_tenancy, self.config['tenancy'])
             
             logger.info(f"✅ OCI connection test successful. Tenancy: {tenancy.data.name}")
             return True
@@ -226,33 +256,107 @@ class OCIService:
             return False
 
     async def _make_oci_call(self, client_method, *args, **kwargs):
-        """Make OCI API call with retry logic"""
-        retries = 5
-        base_delay = 1.0
+        """Make OCI API call through the shared rate governor (which retries 429s)"""
+        try:
+            return await oci_governor.call(client_method, *args, **kwargs)
+        except oci.exceptions.ServiceError as e:
+            logger.error(f"OCI API error: {e}")
+            raise ExternalServiceError(f"OCI API call failed: {e.message}")
+        except Exception as e:
+            logger.error(f"Unexpected error in OCI call: {e}")
+            raise
+
+    @staticmethod
+    def _page_items(data: Any) -> List[Any]:
+        """Items of a list response (some services wrap them in a collection)"""
+        if data is None:
+            return []
+        if isinstance(data, list):
+            return data
+        return list(getattr(data, 'items', None) or [])
+
+    async def _iter_pages(self, client_method, *args, max_pages: Optional[int] = None,
+                          max_items: Optional[int] = None, **kwargs) -> AsyncIterator[List[Any]]:
+        """Yield the items of every page of an OCI list call, following ``opc-next-page``
         
-        for i in range(retries):
-            try:
-                # Create a wrapper function to handle kwargs properly
-                def call_with_kwargs():
-                    return client_method(*args, **kwargs)
+        Pages are tokenized, so they are fetched in order, but the next page is
+        requested while the caller processes the current one; at most two pages
+        are held at a time. ``max_pages`` and ``max_items`` (default
+        ``OCI_LIST_MAX_ITEMS``) stop early, and such listings are counted as
+        truncated in ``get_pagination_stats``. Use ``contextlib.aclosing`` when
+        breaking out of the loop so the prefetch is cancelled promptly.
+        """
+        operation = getattr(client_method, '__name__', 'list')
+        max_items = max_items if max_items is not None else self.list_max_items
+        if self.list_page_size and 'limit' not in kwargs:
+            kwargs['limit'] = self.list_page_size
+        
+        stats = self.pagination_stats.setdefault(operation, {
+            "calls": 0, "pages": 0, "items": 0, "seconds": 0.0, "max_page_seconds": 0.0, "truncated": 0
+        })
+        stats["calls"] += 1
+        
+        async def fetch(page: Optional[str]):
+            started = time.perf_counter()
+            response = await self._make_oci_call(client_method, *args, **({**kwargs, 'page': page} if page else kwargs))
+            elapsed = time.perf_counter() - started
+            stats["pages"] += 1
+            stats["seconds"] += elapsed
+            stats["max_page_seconds"] = max(stats["max_page_seconds"], elapsed)
+            return response
+        
+        pending: Optional[asyncio.Future] = asyncio.ensure_future(fetch(None))
+        pages = items = 0
+        try:
+            while pending is not None:
+                response = await pending
+                pending = None
+                page_items = self._page_items(response.data)
+                next_page = getattr(response, 'next_page', None)
+                pages += 1
                 
-                return await asyncio.get_event_loop().run_in_executor(
-                    None, call_with_kwargs
-                )
-            except oci.exceptions.ServiceError as e:
-                # Handle 429 Too Many Requests
-                if e.status == 429:
-                    if i < retries - 1:
-                        delay = base_delay * (2 ** i) + random.uniform(0, 1.0)
-                        logger.warning(f"⚠️ OCI Throttling (429) on {client_method.__name__ if hasattr(client_method, '__name__') else 'API call'}. Retrying in {delay:.2f}s...")
-                        await asyncio.sleep(delay)
-                        continue
+                if max_items is not None and items + len(page_items) >= max_items:
+                    if items + len(page_items) > max_items or next_page:
+                        stats["truncated"] += 1
+                    page_items = page_items[:max_items - items]
+                    next_page = None
+                elif next_page and max_pages is not None and pages >= max_pages:
+                    stats["truncated"] += 1
+                    next_page = None
                 
-                logger.error(f"OCI API error: {e}")
-                raise ExternalServiceError(f"OCI API call failed: {e.message}")
-            except Exception as e:
-                logger.error(f"Unexpected error in OCI call: {e}")
-                raise
+                if next_page:
+                    pending = asyncio.ensure_future(fetch(next_page))
+                items += len(page_items)
+                stats["items"] += len(page_items)
+                yield page_items
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    async def _fan_out(self, items: List[Any], call: Callable[[Any], Awaitable[Any]]) -> List[Any]:
+        """Run ``call(item)`` for every item concurrently under the shared fan-out limit
+        
+        Results keep the order of ``items``. A child that fails or exceeds
+        ``fanout_timeout`` yields its exception in place instead of failing the
+        others. Children must not fan out themselves, since they hold a slot of
+        the shared limit while running.
+        """
+        async def run(item):
+            async with self.fanout_limit:
+                return await asyncio.wait_for(call(item), self.fanout_timeout)
+        
+        return await asyncio.gather(*(run(item) for item in items), return_exceptions=True)
+
+    def get_pagination_stats(self) -> Dict[str, Any]:
+        """Get per-operation page counts, latency and truncation of list calls"""
+        return {
+            operation: {
+                **stats,
+                "avg_pages_per_call": round(stats["pages"] / stats["calls"], 2) if stats["calls"] else 0,
+                "avg_page_ms": round(stats["seconds"] / stats["pages"] * 1000, 2) if stats["pages"] else 0,
+            }
+            for operation, stats in self.pagination_stats.items()
+        }
 
     # ===== Phase 3: Stopped Duration via Monitoring API =====
     
@@ -273,36 +377,13 @@ class OCIService:
             return None
         
         try:
-            monitoring_client = self._get_client('monitoring')
-            
-            end_time = datetime.utcnow()
-            start_time = end_time - timedelta(days=days_back)
-            
-            # Build the MQL query for CPU utilization
-            query = f'CpuUtilization[1d]{{resourceId = "{instance_id}"}}.mean()'
-            
-            from oci.monitoring.models import SummarizeMetricsDataDetails
-            
-            summarize_details = SummarizeMetricsDataDetails(
-                namespace="oci_computeagent",
-                query=query,
-                start_time=start_time,
-                end_time=end_time,
+            # Daily CPU means of every instance in the compartment in one query, shared
+            # by all instances checked within the hour
+            series = await self.metric_batcher.fetch(
+                compartment_id, "CpuUtilization", timedelta(days=days_back), interval="1d", ttl=3600
             )
-            
-            response = await self._make_oci_call(
-                monitoring_client.summarize_metrics_data,
-                compartment_id=compartment_id,
-                summarize_metrics_data_details=summarize_details
-            )
-            
-            # Find the most recent datapoint timestamp
-            last_activity = None
-            for metric_data in response.data:
-                for datapoint in metric_data.aggregated_datapoints:
-                    if datapoint.timestamp:
-                        if last_activity is None or datapoint.timestamp > last_activity:
-                            last_activity = datapoint.timestamp
+            points = series.get(instance_id)
+            last_activity = datetime.fromisoformat(points[-1][0]) if points else None
             
             if last_activity:
                 logger.info(f"✅ Found last activity for {instance_id[:30]}... at {last_activity}")
@@ -359,18 +440,11 @@ class OCIService:
 
     async def get_compartments(self) -> List[Dict[str, Any]]:
         """Get all compartments in tenancy with caching"""
-        cache_key = "oci:compartments"
-        
-        # Try global cache service first
-        cached = await cache_service.get("oci", "compartments:v2")
-        if cached:
-            return cached
-
-        try:
-            if not self.oci_available:
-                logger.warning("OCI identity unavailable - returning mock compartments")
-                return [{"id": "ocid1.compartment.oc1..mock", "name": "Mock Compartment", "lifecycle_state": "ACTIVE"}]
+        if not self.oci_available:
+            logger.warning("OCI identity unavailable - returning mock compartments")
+            return [{"id": "ocid1.compartment.oc1..mock", "name": "Mock Compartment", "lifecycle_state": "ACTIVE"}]
 
+        async def fetch_compartments() -> List[Dict[str, Any]]:
             # Fetch root compartment (Tenancy)
             tenancy_id = self.config['tenancy']
             
@@ -379,13 +453,15 @@ class OCIService:
             
             async def fetch_sub_compartments(parent_id):
                 try:
-                    response = await self._make_oci_call(
+                    compartments = []
+                    async for page in self._iter_pages(
                         self._get_client('identity').list_compartments,
                         parent_id,
                         compartment_id_in_subtree=True,
                         access_level="ACCESSIBLE"
-                    )
-                    return response.data
+                    ):
+                        compartments.extend(page)
+                    return compartments
                 except Exception as e:
                     logger.error(f"Failed to fetch sub-compartments for {parent_id}: {e}")
                     return []
@@ -420,50 +496,57 @@ class OCIService:
                     })
             
             logger.info(f"Found {len(all_compartments)} active compartments")
-            
-            # Cache the result
-            await cache_service.set("oci", "compartments:v2", all_compartments, ttl=86400)
-            
             return all_compartments
+
+        try:
+            # Single-flight: concurrent misses share one identity listing
+            return await cache_service.get_or_compute(
+                "oci", "compartments:v2", fetch_compartments, ttl=86400, hard_ttl=7 * 86400
+            )
             
         except Exception as e:
             logger.error(f"Failed to get compartments: {e}")
             return []
 
+    async def get_compartment_tree(self) -> CompartmentTree:
+        """Compartment hierarchy with O(1) ancestry checks and subtree sets"""
+        compartments = await self.get_compartments()
+        # Redis hands back a fresh copy on every read, so compare content rather than identity
+        digest = hashlib.sha256(json.dumps(compartments, sort_keys=True, default=str).encode()).hexdigest()
+        if digest != self._compartment_tree_digest:
+            self.compartment_tree.apply(compartments)
+            self._compartment_tree_digest = digest
+        return self.compartment_tree
+
     async def get_compute_instances(self, compartment_id: str) -> List[Dict[str, Any]]:
         """Get compute instances in a compartment"""
-        cache_key = f"compute_instances:{compartment_id}"
-        
-        # Use global cache service
-        cached = await cache_service.get("oci", cache_key)
-        if cached:
-            return cached
-        
-        try:
-            if not self.oci_available:
-                logger.error("OCI compute unavailable")
-                return []
+        snapshot = self.inventory_sync.lookup('compute_instances', compartment_id)
+        if snapshot is not None:
+            return snapshot
+        if not self.oci_available:
+            logger.error("OCI compute unavailable")
+            return []
 
-            
-            response = await self._make_oci_call(
-                self._get_client('compute').list_instances,
-                compartment_id
-            )
-            
+        async def fetch_instances() -> List[Dict[str, Any]]:
             instances = []
-            for instance in response.data:
-                instances.append({
-                    "id": instance.id,
-                    "display_name": instance.display_name,
-                    "lifecycle_state": instance.lifecycle_state,
-                    "shape": instance.shape,
-                    "availability_domain": instance.availability_domain,
-                    "time_created": instance.time_created.isoformat() if instance.time_created else None,
-                    "region": instance.region if hasattr(instance, 'region') else self.config.get('region')
-                })
+            async for page in self._iter_pages(self._get_client('compute').list_instances, compartment_id):
+                for instance in page:
+                    instances.append({
+                        "id": instance.id,
+                        "display_name": instance.display_name,
+                        "lifecycle_state": instance.lifecycle_state,
+                        "shape": instance.shape,
+                        "availability_domain": instance.availability_domain,
+                        "time_created": instance.time_created.isoformat() if instance.time_created else None,
+                        "region": instance.region if hasattr(instance, 'region') else self.config.get('region')
+                    })
             
-            await cache_service.set("oci", cache_key, instances, ttl=600)  # 5 minutes cache
             return instances
+
+        try:
+            return await cache_service.get_or_compute(
+                "oci", f"compute_instances:{compartment_id}", fetch_instances, ttl=600, hard_ttl=self.inventory_hard_ttl
+            )
             
         except Exception as e:
             logger.error(f"Failed to get compute instances: {e}")
@@ -472,28 +555,84 @@ class OCIService:
 
     async def get_databases(self, compartment_id: str) -> List[Dict[str, Any]]:
         """Get database services in a compartment (both DB Systems and Autonomous Databases)"""
-        cache_key = f"databases:{compartment_id}"
-        cached = await cache_service.get("oci", cache_key)
-        if cached:
-            return cached
-        
-        try:
-            if not self.oci_available:
-                logger.error("OCI database unavailable")
-                return []
+        snapshot = self.inventory_sync.lookup('databases', compartment_id)
+        if snapshot is not None:
+            return snapshot
+        if not self.oci_available:
+            logger.error("OCI database unavailable")
+            return []
 
+        async def fetch_databases() -> List[Dict[str, Any]]:
+            database_client = self._get_client('database')
             
-            databases = []
-            
-            # Get Database Systems (VM and Bare Metal DB systems)
-            try:
-                db_systems_response = await self._make_oci_call(
-                    self._get_client('database').list_db_systems,
-                    compartment_id=compartment_id
-                )
+            async def fetch_db_systems() -> List[Dict[str, Any]]:
+                # Get Database Systems (VM and Bare Metal DB systems)
+                db_systems = []
+                try:
+                    async for page in self._iter_pages(database_client.list_db_systems, compartment_id=compartment_id):
+                        db_systems.extend(page)
+                except Exception as e:
+                    logger.warning(f"Failed to get DB systems: {e}")
+                    return []
+                
+                async def list_db_homes(db_system):
+                    homes = []
+                    async for page in self._iter_pages(
+                        database_client.list_db_homes,
+                        compartment_id=compartment_id,
+                        db_system_id=db_system.id
+                    ):
+                        homes.extend(page)
+                    return homes
                 
-                for db_system in db_systems_response.data:
-                    databases.append({
+                async def list_home_databases(db_home):
+                    home_databases = []
+                    async for page in self._iter_pages(
+                        database_client.list_databases,
+                        compartment_id=compartment_id,
+                        db_home_id=db_home.id
+                    ):
+                        home_databases.extend(page)
+                    return home_databases
+                
+                # DB Homes of every system, then databases of every home, each stage fanned out
+                homes_per_system = await self._fan_out(db_systems, list_db_homes)
+                for db_system, homes in zip(db_systems, homes_per_system):
+                    if isinstance(homes, BaseException):
+                        logger.warning(f"Failed to get DB homes for DB system {db_system.id}: {homes}")
+                all_homes = [
+                    (db_system, db_home)
+                    for db_system, homes in zip(db_systems, homes_per_system)
+                    if not isinstance(homes, BaseException)
+                    for db_home in homes
+                ]
+                databases_per_home = await self._fan_out([home for _, home in all_homes], list_home_databases)
+                
+                databases_by_system: Dict[str, List[Dict[str, Any]]] = {}
+                for (db_system, db_home), home_databases in zip(all_homes, databases_per_home):
+                    if isinstance(home_databases, BaseException):
+                        logger.warning(f"Failed to get databases for DB home {db_home.id}: {home_databases}")
+                        continue
+                    for db in home_databases:
+                        databases_by_system.setdefault(db_system.id, []).append({
+                            "id": db.id,
+                            "display_name": f"  └─ {db.db_name} (Database)",
+                            "db_name": db.db_name,
+                            "lifecycle_state": db.lifecycle_state,
+                            "db_workload": getattr(db, 'db_workload', 'Unknown'),
+                            "character_set": getattr(db, 'character_set', 'Unknown'),
+                            "pdb_name": getattr(db, 'pdb_name', None),
+                            "is_cdb": getattr(db, 'is_cdb', False),
+                            "resource_type": "DATABASE",
+                            "db_system_id": db_system.id,
+                            "db_home_id": db_home.id,
+                            "time_created": db.time_created.isoformat() if db.time_created else None
+                        })
+                
+                # Each DB system is followed by its databases
+                results = []
+                for db_system in db_systems:
+                    results.append({
                         "id": db_system.id,
                         "display_name": db_system.display_name,
                         "lifecycle_state": db_system.lifecycle_state,
@@ -506,74 +645,43 @@ class OCIService:
                         "resource_type": "DB_SYSTEM",
                         "time_created": db_system.time_created.isoformat() if db_system.time_created else None
                     })
-                    
-                    # Get DB Homes within each DB system, then databases within each DB Home
-                    try:
-                        # First get DB Homes for this DB System
-                        db_homes_response = await self._make_oci_call(
-                            self._get_client('database').list_db_homes,
-                            compartment_id=compartment_id,
-                            db_system_id=db_system.id
-                        )
-                        
-                        for db_home in db_homes_response.data:
-                            # Then get databases within each DB Home
-                            try:
-                                databases_response = await self._make_oci_call(
-                                    self._get_client('database').list_databases,
-                                    compartment_id=compartment_id,
-                                    db_home_id=db_home.id
-                                )
-                                
-                                for db in databases_response.data:
-                                    databases.append({
-                                        "id": db.id,
-                                        "display_name": f"  └─ {db.db_name} (Database)",
-                                        "db_name": db.db_name,
-                                        "lifecycle_state": db.lifecycle_state,
-                                        "db_workload": getattr(db, 'db_workload', 'Unknown'),
-                                        "character_set": getattr(db, 'character_set', 'Unknown'),
-                                        "pdb_name": getattr(db, 'pdb_name', None),
-                                        "is_cdb": getattr(db, 'is_cdb', False),
-                                        "resource_type": "DATABASE",
-                                        "db_system_id": db_system.id,
-                                        "db_home_id": db_home.id,
-                                        "time_created": db.time_created.isoformat() if db.time_created else None
-                                    })
-                            except Exception as db_error:
-                                logger.warning(f"Failed to get databases for DB home {db_home.id}: {db_error}")
-                                
-                    except Exception as db_home_error:
-                        logger.warning(f"Failed to get DB homes for DB system {db_system.id}: {db_home_error}")
-                        
-            except Exception as e:
-                logger.warning(f"Failed to get DB systems: {e}")
+                    results.extend(databases_by_system.get(db_system.id, []))
+                return results
             
-            # Also get Autonomous Databases
-            try:
-                autonomous_response = await self._make_oci_call(
-                    self._get_client('database').list_autonomous_databases,
-                    compartment_id=compartment_id
-                )
-                
-                for db in autonomous_response.data:
-                    databases.append({
-                        "id": db.id,
-                        "db_name": getattr(db, 'db_name', 'Unknown'),
-                        "display_name": db.display_name,
-                        "lifecycle_state": db.lifecycle_state,
-                        "db_workload": getattr(db, 'db_workload', 'Unknown'),
-                        "cpu_core_count": getattr(db, 'cpu_core_count', 0),
-                        "data_storage_size_in_tbs": getattr(db, 'data_storage_size_in_tbs', 0),
-                        "resource_type": "AUTONOMOUS_DATABASE",
-                        "time_created": db.time_created.isoformat() if db.time_created else None
-                    })
-            except Exception as e:
-                logger.warning(f"Failed to get Autonomous databases: {e}")
+            async def fetch_autonomous_databases() -> List[Dict[str, Any]]:
+                autonomous = []
+                try:
+                    async for page in self._iter_pages(
+                        database_client.list_autonomous_databases,
+                        compartment_id=compartment_id
+                    ):
+                        for db in page:
+                            autonomous.append({
+                                "id": db.id,
+                                "db_name": getattr(db, 'db_name', 'Unknown'),
+                                "display_name": db.display_name,
+                                "lifecycle_state": db.lifecycle_state,
+                                "db_workload": getattr(db, 'db_workload', 'Unknown'),
+                                "cpu_core_count": getattr(db, 'cpu_core_count', 0),
+                                "data_storage_size_in_tbs": getattr(db, 'data_storage_size_in_tbs', 0),
+                                "resource_type": "AUTONOMOUS_DATABASE",
+                                "time_created": db.time_created.isoformat() if db.time_created else None
+                            })
+                except Exception as e:
+                    logger.warning(f"Failed to get Autonomous databases: {e}")
+                return autonomous
+            
+            # DB systems and Autonomous Databases are listed side by side
+            db_systems, autonomous = await asyncio.gather(fetch_db_systems(), fetch_autonomous_databases())
+            databases = db_systems + autonomous
             
             logger.info(f"Found {len(databases)} total database resources in compartment")
-            await cache_service.set("oci", cache_key, databases, ttl=300)
             return databases
+
+        try:
+            return await cache_service.get_or_compute(
+                "oci", f"databases:{compartment_id}", fetch_databases, ttl=300, hard_ttl=self.inventory_hard_ttl
+            )
             
         except Exception as e:
             logger.error(f"Failed to get databases: {e}")
@@ -581,34 +689,34 @@ class OCIService:
 
     async def get_oke_clusters(self, compartment_id: str) -> List[Dict[str, Any]]:
         """Get OKE clusters in a compartment"""
-        cache_key = f"oke:{compartment_id}"
-        cached = await cache_service.get("oci", cache_key)
-        if cached:
-            return cached
-        
-        try:
-            if not self.oci_available:
-                logger.error("OCI container engine unavailable")
-                return []
+        snapshot = self.inventory_sync.lookup('oke_clusters', compartment_id)
+        if snapshot is not None:
+            return snapshot
+        if not self.oci_available:
+            logger.error("OCI container engine unavailable")
+            return []
 
-            
-            response = await self._make_oci_call(
+        async def fetch_clusters() -> List[Dict[str, Any]]:
+            clusters = []
+            async for page in self._iter_pages(
                 self._get_client('container_engine').list_clusters,
                 compartment_id
-            )
-            
-            clusters = []
-            for cluster in response.data:
-                clusters.append({
-                    "id": cluster.id,
-                    "name": cluster.name,
-                    "lifecycle_state": cluster.lifecycle_state,
-                    "kubernetes_version": cluster.kubernetes_version,
-                    "vcn_id": cluster.vcn_id
-                })
+            ):
+                for cluster in page:
+                    clusters.append({
+                        "id": cluster.id,
+                        "name": cluster.name,
+                        "lifecycle_state": cluster.lifecycle_state,
+                        "kubernetes_version": cluster.kubernetes_version,
+                        "vcn_id": cluster.vcn_id
+                    })
             
-            await cache_service.set("oci", cache_key, clusters, ttl=300)
             return clusters
+
+        try:
+            return await cache_service.get_or_compute(
+                "oci", f"oke:{compartment_id}", fetch_clusters, ttl=300, hard_ttl=self.inventory_hard_ttl
+            )
             
         except Exception as e:
             logger.error(f"Failed to get OKE clusters: {e}")
@@ -616,33 +724,31 @@ class OCIService:
 
     async def get_api_gateways(self, compartment_id: str) -> List[Dict[str, Any]]:
         """Get API Gateways in a compartment"""
-        cache_key = f"api_gateways:{compartment_id}"
-        cached = await cache_service.get("oci", cache_key)
-        if cached:
-            return cached
-        
-        try:
-            if not self.oci_available:
-                logger.debug("OCI API gateway unavailable")
-                return []
+        snapshot = self.inventory_sync.lookup('api_gateways', compartment_id)
+        if snapshot is not None:
+            return snapshot
+        if not self.oci_available:
+            logger.debug("OCI API gateway unavailable")
+            return []
 
-            response = await self._make_oci_call(
-                self._get_client('api_gateway').list_gateways,
-                compartment_id
-            )
-            
+        async def fetch_gateways() -> List[Dict[str, Any]]:
             gateways = []
-            gateway_list = response.data.items if hasattr(response.data, 'items') else response.data
-            for gateway in gateway_list:
-                gateways.append({
-                    "id": gateway.id,
-                    "display_name": gateway.display_name,
-                    "lifecycle_state": gateway.lifecycle_state,
-                    "hostname": getattr(gateway, 'hostname', 'N/A')
-                })
+            # Gateways come wrapped in a collection; _iter_pages unwraps its items
+            async for page in self._iter_pages(self._get_client('api_gateway').list_gateways, compartment_id):
+                for gateway in page:
+                    gateways.append({
+                        "id": gateway.id,
+                        "display_name": gateway.display_name,
+                        "lifecycle_state": gateway.lifecycle_state,
+                        "hostname": getattr(gateway, 'hostname', 'N/A')
+                    })
             
-            await cache_service.set("oci", cache_key, gateways, ttl=300)
             return gateways
+
+        try:
+            return await cache_service.get_or_compute(
+                "oci", f"api_gateways:{compartment_id}", fetch_gateways, ttl=300, hard_ttl=self.inventory_hard_ttl
+            )
             
         except Exception as e:
             logger.error(f"Failed to get API gateways: {e}")
@@ -650,33 +756,34 @@ class OCIService:
 
     async def get_load_balancers(self, compartment_id: str) -> List[Dict[str, Any]]:
         """Get load balancers in a compartment"""
-        cache_key = f"load_balancers:{compartment_id}"
-        cached = await cache_service.get("oci", cache_key)
-        if cached:
-            return cached
-        
-        try:
-            if not self.oci_available:
-                logger.debug("OCI load balancer unavailable")
-                return []
-            
-            response = await self._make_oci_call(
+        snapshot = self.inventory_sync.lookup('load_balancers', compartment_id)
+        if snapshot is not None:
+            return snapshot
+        if not self.oci_available:
+            logger.debug("OCI load balancer unavailable")
+            return []
+
+        async def fetch_load_balancers() -> List[Dict[str, Any]]:
+            load_balancers = []
+            async for page in self._iter_pages(
                 self._get_client('load_balancer').list_load_balancers,
                 compartment_id
-            )
-            
-            load_balancers = []
-            for lb in response.data:
-                load_balancers.append({
-                    "id": lb.id,
-                    "display_name": lb.display_name,
-                    "lifecycle_state": lb.lifecycle_state,
-                    "shape_name": lb.shape_name,
-                    "is_private": lb.is_private
-                })
+            ):
+                for lb in page:
+                    load_balancers.append({
+                        "id": lb.id,
+                        "display_name": lb.display_name,
+                        "lifecycle_state": lb.lifecycle_state,
+                        "shape_name": lb.shape_name,
+                        "is_private": lb.is_private
+                    })
             
-            await cache_service.set("oci", cache_key, load_balancers, ttl=300)
             return load_balancers
+
+        try:
+            return await cache_service.get_or_compute(
+                "oci", f"load_balancers:{compartment_id}", fetch_load_balancers, ttl=300, hard_ttl=self.inventory_hard_ttl
+            )
             
         except Exception as e:
             logger.error(f"Failed to get load balancers: {e}")
@@ -684,24 +791,32 @@ class OCIService:
 
     async def get_network_resources(self, compartment_id: str) -> List[Dict[str, Any]]:
         """Get network resources (VCNs, subnets, etc.) in a compartment"""
-        cache_key = f"network:{compartment_id}"
-        cached = await cache_service.get("oci", cache_key)
-        if cached:
-            return cached
-        
-        try:
-            if not self.oci_available:
-                logger.debug("OCI virtual network unavailable")
-                return []
+        snapshot = self.inventory_sync.lookup('network_resources', compartment_id)
+        if snapshot is not None:
+            return snapshot
+        if not self.oci_available:
+            logger.debug("OCI virtual network unavailable")
+            return []
+
+        async def fetch_networks() -> List[Dict[str, Any]]:
+            network_client = self._get_client('virtual_network')
             
             # Get VCNs
-            vcn_response = await self._make_oci_call(
-                self._get_client('virtual_network').list_vcns,
-                compartment_id
-            )
+            vcns = []
+            async for page in self._iter_pages(network_client.list_vcns, compartment_id):
+                vcns.extend(page)
+            
+            async def list_vcn_subnets(vcn):
+                subnets = []
+                async for page in self._iter_pages(network_client.list_subnets, compartment_id, vcn_id=vcn.id):
+                    subnets.extend(page)
+                return subnets
+            
+            # Get subnets for every VCN concurrently
+            subnets_per_vcn = await self._fan_out(vcns, list_vcn_subnets)
             
             networks = []
-            for vcn in vcn_response.data:
+            for vcn, subnets in zip(vcns, subnets_per_vcn):
                 networks.append({
                     "id": vcn.id,
                     "display_name": vcn.display_name,
@@ -711,29 +826,26 @@ class OCIService:
                     "time_created": vcn.time_created.isoformat() if vcn.time_created else None
                 })
                 
-                # Get subnets for each VCN
-                try:
-                    subnet_response = await self._make_oci_call(
-                        self._get_client('virtual_network').list_subnets,
-                        compartment_id,
-                        vcn_id=vcn.id
-                    )
-                    
-                    for subnet in subnet_response.data:
-                        networks.append({
-                            "id": subnet.id,
-                            "display_name": f"  └─ {subnet.display_name}",
-                            "lifecycle_state": subnet.lifecycle_state,
-                            "cidr_block": subnet.cidr_block,
-                            "resource_type": "Subnet",
-                            "vcn_id": vcn.id,
-                            "time_created": subnet.time_created.isoformat() if subnet.time_created else None
-                        })
-                except Exception as e:
-                    logger.warning(f"Failed to get subnets for VCN {vcn.id}: {e}")
+                if isinstance(subnets, BaseException):
+                    logger.warning(f"Failed to get subnets for VCN {vcn.id}: {subnets}")
+                    continue
+                for subnet in subnets:
+                    networks.append({
+                        "id": subnet.id,
+                        "display_name": f"  └─ {subnet.display_name}",
+                        "lifecycle_state": subnet.lifecycle_state,
+                        "cidr_block": subnet.cidr_block,
+                        "resource_type": "Subnet",
+                        "vcn_id": vcn.id,
+                        "time_created": subnet.time_created.isoformat() if subnet.time_created else None
+                    })
             
-            await cache_service.set("oci", cache_key, networks, ttl=300)
             return networks
+
+        try:
+            return await cache_service.get_or_compute(
+                "oci", f"network:{compartment_id}", fetch_networks, ttl=300, hard_ttl=self.inventory_hard_ttl
+            )
             
         except Exception as e:
             logger.error(f"Failed to get network resources: {e}")
@@ -741,36 +853,37 @@ class OCIService:
 
     async def get_block_volumes(self, compartment_id: str) -> List[Dict[str, Any]]:
         """Get block volumes in a compartment"""
-        cache_key = f"block_volumes:{compartment_id}"
-        cached = await cache_service.get("oci", cache_key)
-        if cached:
-            return cached
-        
-        try:
-            if not self.oci_available:
-                logger.debug("OCI block storage unavailable")
-                return []
-            
-            response = await self._make_oci_call(
+        snapshot = self.inventory_sync.lookup('block_volumes', compartment_id)
+        if snapshot is not None:
+            return snapshot
+        if not self.oci_available:
+            logger.debug("OCI block storage unavailable")
+            return []
+
+        async def fetch_volumes() -> List[Dict[str, Any]]:
+            volumes = []
+            async for page in self._iter_pages(
                 self._get_client('block_storage').list_volumes,
                 compartment_id=compartment_id
-            )
-            
-            volumes = []
-            for volume in response.data:
-                volumes.append({
-                    "id": volume.id,
-                    "display_name": volume.display_name,
-                    "lifecycle_state": volume.lifecycle_state,
-                    "size_in_gbs": volume.size_in_gbs,
-                    "availability_domain": volume.availability_domain,
-                    "volume_group_id": getattr(volume, 'volume_group_id', None),
-                    "is_hydrated": getattr(volume, 'is_hydrated', True),
-                    "time_created": volume.time_created.isoformat() if volume.time_created else None
-                })
+            ):
+                for volume in page:
+                    volumes.append({
+                        "id": volume.id,
+                        "display_name": volume.display_name,
+                        "lifecycle_state": volume.lifecycle_state,
+                        "size_in_gbs": volume.size_in_gbs,
+                        "availability_domain": volume.availability_domain,
+                        "volume_group_id": getattr(volume, 'volume_group_id', None),
+                        "is_hydrated": getattr(volume, 'is_hydrated', True),
+                        "time_created": volume.time_created.isoformat() if volume.time_created else None
+                    })
             
-            await cache_service.set("oci", cache_key, volumes, ttl=300)
             return volumes
+
+        try:
+            return await cache_service.get_or_compute(
+                "oci", f"block_volumes:{compartment_id}", fetch_volumes, ttl=300, hard_ttl=self.inventory_hard_ttl
+            )
             
         except Exception as e:
             logger.error(f"Failed to get block volumes: {e}")
@@ -778,49 +891,55 @@ class OCIService:
 
     async def get_file_systems(self, compartment_id: str) -> List[Dict[str, Any]]:
         """Get file systems in a compartment"""
-        cache_key = f"file_systems:{compartment_id}"
-        cached = await cache_service.get("oci", cache_key)
-        if cached:
-            return cached
-        
-        try:
-            if not self.oci_available:
-                logger.debug("OCI file storage unavailable")
-                return []
-            
+        snapshot = self.inventory_sync.lookup('file_systems', compartment_id)
+        if snapshot is not None:
+            return snapshot
+        if not self.oci_available:
+            logger.debug("OCI file storage unavailable")
+            return []
+
+        async def fetch_file_systems() -> List[Dict[str, Any]]:
             # Get availability domains first
             identity_client = self._get_client('identity')
             ads_response = await self._make_oci_call(
                 identity_client.list_availability_domains,
                 compartment_id=self.config['tenancy']
             )
-            
+            ads = ads_response.data
+            
+            async def list_ad_file_systems(ad):
+                ad_file_systems = []
+                async for page in self._iter_pages(
+                    self._get_client('file_storage').list_file_systems,
+                    compartment_id=compartment_id,
+                    availability_domain=ad.name
+                ):
+                    ad_file_systems.extend(page)
+                return ad_file_systems
+            
+            # Query file systems in every availability domain concurrently
             file_systems = []
-            # Query file systems in each availability domain
-            for ad in ads_response.data:
-                try:
-                    response = await self._make_oci_call(
-                        self._get_client('file_storage').list_file_systems,
-                        compartment_id=compartment_id,
-                        availability_domain=ad.name
-                    )
-                    
-                    for fs in response.data:
-                        file_systems.append({
-                            "id": fs.id,
-                            "display_name": fs.display_name,
-                            "lifecycle_state": fs.lifecycle_state,
-                            "availability_domain": fs.availability_domain,
-                            "metered_bytes": getattr(fs, 'metered_bytes', 0),
-                            "source_details": getattr(fs, 'source_details', None),
-                            "time_created": fs.time_created.isoformat() if fs.time_created else None
-                        })
-                except Exception as ad_error:
-                    logger.warning(f"Failed to get file systems in AD {ad.name}: {ad_error}")
+            for ad, ad_file_systems in zip(ads, await self._fan_out(ads, list_ad_file_systems)):
+                if isinstance(ad_file_systems, BaseException):
+                    logger.warning(f"Failed to get file systems in AD {ad.name}: {ad_file_systems}")
                     continue
+                for fs in ad_file_systems:
+                    file_systems.append({
+                        "id": fs.id,
+                        "display_name": fs.display_name,
+                        "lifecycle_state": fs.lifecycle_state,
+                        "availability_domain": fs.availability_domain,
+                        "metered_bytes": getattr(fs, 'metered_bytes', 0),
+                        "source_details": getattr(fs, 'source_details', None),
+                        "time_created": fs.time_created.isoformat() if fs.time_created else None
+                    })
             
-            await cache_service.set("oci", cache_key, file_systems, ttl=300)
             return file_systems
+
+        try:
+            return await cache_service.get_or_compute(
+                "oci", f"file_systems:{compartment_id}", fetch_file_systems, ttl=300, hard_ttl=self.inventory_hard_ttl
+            )
             
         except Exception as e:
             logger.error(f"Failed to get file systems: {e}")
@@ -828,16 +947,14 @@ class OCIService:
 
     async def get_object_storage_buckets(self, compartment_id: str) -> List[Dict[str, Any]]:
         """Get Object Storage buckets in a compartment"""
-        cache_key = f"buckets:{compartment_id}"
-        cached = await cache_service.get("oci", cache_key)
-        if cached:
-            return cached
-        
-        try:
-            if not self.oci_available:
-                logger.debug("OCI object storage unavailable")
-                return []
-            
+        snapshot = self.inventory_sync.lookup('object_storage_buckets', compartment_id)
+        if snapshot is not None:
+            return snapshot
+        if not self.oci_available:
+            logger.debug("OCI object storage unavailable")
+            return []
+
+        async def fetch_buckets() -> List[Dict[str, Any]]:
             # Get the namespace first
             object_storage_client = self._get_client('object_storage')
             namespace_response = await self._make_oci_call(
@@ -847,37 +964,29 @@ class OCIService:
             namespace = namespace_response.data
             
             # List buckets in the compartment
-            response = await self._make_oci_call(
+            bucket_summaries = []
+            async for page in self._iter_pages(
                 object_storage_client.list_buckets,
                 namespace_name=namespace,
                 compartment_id=compartment_id
-            )
+            ):
+                bucket_summaries.extend(page)
+            
+            async def get_bucket_details(bucket):
+                response = await self._make_oci_call(
+                    object_storage_client.get_bucket,
+                    namespace_name=namespace,
+                    bucket_name=bucket.name
+                )
+                return response.data
+            
+            # Get bucket details for more info, concurrently
+            details = await self._fan_out(bucket_summaries, get_bucket_details)
             
             buckets = []
-            for bucket in response.data:
-                # Get bucket details for more info
-                try:
-                    bucket_details = await self._make_oci_call(
-                        object_storage_client.get_bucket,
-                        namespace_name=namespace,
-                        bucket_name=bucket.name
-                    )
-                    bd = bucket_details.data
-                    buckets.append({
-                        "id": bd.id if hasattr(bd, 'id') else f"bucket:{namespace}:{bucket.name}",
-                        "display_name": bucket.name,
-                        "namespace": namespace,
-                        "storage_tier": getattr(bd, 'storage_tier', 'Standard'),
-                        "approximate_size": getattr(bd, 'approximate_size', 0),
-                        "approximate_count": getattr(bd, 'approximate_count', 0),
-                        "public_access_type": getattr(bd, 'public_access_type', 'NoPublicAccess'),
-                        "versioning": getattr(bd, 'versioning', 'Disabled'),
-                        "lifecycle_state": "ACTIVE",
-                        "resource_type": "OBJECT_STORAGE_BUCKET",
-                        "time_created": bucket.time_created.isoformat() if bucket.time_created else None
-                    })
-                except Exception as bucket_error:
-                    logger.warning(f"Failed to get bucket details for {bucket.name}: {bucket_error}")
+            for bucket, bd in zip(bucket_summaries, details):
+                if isinstance(bd, BaseException):
+                    logger.warning(f"Failed to get bucket details for {bucket.name}: {bd}")
                     buckets.append({
                         "id": f"bucket:{namespace}:{bucket.name}",
                         "display_name": bucket.name,
@@ -886,10 +995,28 @@ class OCIService:
                         "resource_type": "OBJECT_STORAGE_BUCKET",
                         "time_created": bucket.time_created.isoformat() if bucket.time_created else None
                     })
+                    continue
+                buckets.append({
+                    "id": bd.id if hasattr(bd, 'id') else f"bucket:{namespace}:{bucket.name}",
+                    "display_name": bucket.name,
+                    "namespace": namespace,
+                    "storage_tier": getattr(bd, 'storage_tier', 'Standard'),
+                    "approximate_size": getattr(bd, 'approximate_size', 0),
+                    "approximate_count": getattr(bd, 'approximate_count', 0),
+                    "public_access_type": getattr(bd, 'public_access_type', 'NoPublicAccess'),
+                    "versioning": getattr(bd, 'versioning', 'Disabled'),
+                    "lifecycle_state": "ACTIVE",
+                    "resource_type": "OBJECT_STORAGE_BUCKET",
+                    "time_created": bucket.time_created.isoformat() if bucket.time_created else None
+                })
             
             logger.info(f"Found {len(buckets)} Object Storage buckets in compartment")
-            await cache_service.set("oci", cache_key, buckets, ttl=300)
             return buckets
+
+        try:
+            return await cache_service.get_or_compute(
+                "oci", f"buckets:{compartment_id}", fetch_buckets, ttl=300, hard_ttl=self.inventory_hard_ttl
+            )
             
         except Exception as e:
             logger.error(f"Failed to get Object Storage buckets: {e}")
@@ -897,64 +1024,61 @@ class OCIService:
 
     async def get_vaults(self, compartment_id: str) -> List[Dict[str, Any]]:
         """Get Vaults and their secrets in a compartment"""
-        cache_key = f"vaults:{compartment_id}"
-        cached = await cache_service.get("oci", cache_key)
-        if cached:
-            return cached
-        
-        try:
-            if not self.oci_available:
-                logger.debug("OCI vault unavailable")
-                return []
-            
+        snapshot = self.inventory_sync.lookup('vaults', compartment_id)
+        if snapshot is not None:
+            return snapshot
+        if not self.oci_available:
+            logger.debug("OCI vault unavailable")
+            return []
+
+        async def fetch_vaults() -> List[Dict[str, Any]]:
             kms_vault_client = self._get_client('kms_vault')
             
             # List vaults in the compartment
-            response = await self._make_oci_call(
-                kms_vault_client.list_vaults,
-                compartment_id=compartment_id
-            )
-            
             vaults = []
-            for vault in response.data:
-                vault_info = {
-                    "id": vault.id,
-                    "display_name": vault.display_name,
-                    "lifecycle_state": vault.lifecycle_state,
-                    "vault_type": getattr(vault, 'vault_type', 'DEFAULT'),
-                    "crypto_endpoint": getattr(vault, 'crypto_endpoint', None),
-                    "management_endpoint": getattr(vault, 'management_endpoint', None),
-                    "resource_type": "VAULT",
-                    "time_created": vault.time_created.isoformat() if vault.time_created else None
-                }
-                vaults.append(vault_info)
+            async for page in self._iter_pages(kms_vault_client.list_vaults, compartment_id=compartment_id):
+                for vault in page:
+                    vault_info = {
+                        "id": vault.id,
+                        "display_name": vault.display_name,
+                        "lifecycle_state": vault.lifecycle_state,
+                        "vault_type": getattr(vault, 'vault_type', 'DEFAULT'),
+                        "crypto_endpoint": getattr(vault, 'crypto_endpoint', None),
+                        "management_endpoint": getattr(vault, 'management_endpoint', None),
+                        "resource_type": "VAULT",
+                        "time_created": vault.time_created.isoformat() if vault.time_created else None
+                    }
+                    vaults.append(vault_info)
                 
-                # Try to list secrets if vault is active
-                if vault.lifecycle_state == "ACTIVE":
-                    try:
-                        secrets_client = self._get_client('vault')
-                        secrets_response = await self._make_oci_call(
-                            secrets_client.list_secrets,
-                            compartment_id=compartment_id,
-                            vault_id=vault.id
-                        )
-                        
-                        for secret in secrets_response.data:
-                            vaults.append({
-                                "id": secret.id,
-                                "display_name": f"  └─ {secret.secret_name} (Secret)",
-                                "secret_name": secret.secret_name,
-                                "lifecycle_state": secret.lifecycle_state,
-                                "vault_id": vault.id,
-                                "resource_type": "SECRET",
-                                "time_created": secret.time_created.isoformat() if secret.time_created else None
-                            })
-                    except Exception as secret_error:
-                        logger.warning(f"Failed to list secrets for vault {vault.display_name}: {secret_error}")
+                    # Try to list secrets if vault is active
+                    if vault.lifecycle_state == "ACTIVE":
+                        try:
+                            secrets_client = self._get_client('vault')
+                            async for secret_page in self._iter_pages(
+                                secrets_client.list_secrets,
+                                compartment_id=compartment_id,
+                                vault_id=vault.id
+                            ):
+                                for secret in secret_page:
+                                    vaults.append({
+                                        "id": secret.id,
+                                        "display_name": f"  └─ {secret.secret_name} (Secret)",
+                                        "secret_name": secret.secret_name,
+                                        "lifecycle_state": secret.lifecycle_state,
+                                        "vault_id": vault.id,
+                                        "resource_type": "SECRET",
+                                        "time_created": secret.time_created.isoformat() if secret.time_created else None
+                                    })
+                        except Exception as secret_error:
+                            logger.warning(f"Failed to list secrets for vault {vault.display_name}: {secret_error}")
             
             logger.info(f"Found {len(vaults)} vault resources (vaults + secrets) in compartment")
-            await cache_service.set("oci", cache_key, vaults, ttl=300)
             return vaults
+
+        try:
+            return await cache_service.get_or_compute(
+                "oci", f"vaults:{compartment_id}", fetch_vaults, ttl=300, hard_ttl=self.inventory_hard_ttl
+            )
             
         except Exception as e:
             logger.error(f"Failed to get vaults: {e}")
@@ -962,26 +1086,21 @@ class OCIService:
 
     async def get_resource_metrics(self, resource_id: str, resource_type: str) -> Dict[str, Any]:
         """Get real-time metrics for a resource"""
-        cache_key = f"metrics:{resource_id}:{resource_type}"
-        cached = await cache_service.get("oci", cache_key)
-        if cached:
-            return cached
-        
-        try:
-            if not self.oci_available or 'monitoring' not in self.clients:
-                logger.debug("OCI monitoring unavailable")
-                return {
-                    "resource_id": resource_id,
-                    "metrics": {
-                        "cpu_utilization": 0,
-                        "memory_utilization": 0,
-                        "network_bytes_in": 0,
-                        "network_bytes_out": 0
-                    },
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "health_status": "UNKNOWN"
-                }
-            
+        if not self.oci_available or 'monitoring' not in self.clients:
+            logger.debug("OCI monitoring unavailable")
+            return {
+                "resource_id": resource_id,
+                "metrics": {
+                    "cpu_utilization": 0,
+                    "memory_utilization": 0,
+                    "network_bytes_in": 0,
+                    "network_bytes_out": 0
+                },
+                "timestamp": datetime.utcnow().isoformat(),
+                "health_status": "UNKNOWN"
+            }
+
+        async def fetch_metrics() -> Dict[str, Any]:
             # This is a placeholder for real metrics implementation
             end_time = datetime.utcnow()
             
@@ -997,8 +1116,10 @@ class OCIService:
                 "health_status": "UNKNOWN"
             }
             
-            await cache_service.set("oci", cache_key, metrics_data, ttl=60)
             return metrics_data
+
+        try:
+            return await cache_service.get_or_compute("oci", f"metrics:{resource_id}:{resource_type}", fetch_metrics, ttl=60)
             
         except Exception as e:
             logger.error(f"Failed to get metrics for {resource_id}: {e}")
@@ -1010,19 +1131,56 @@ class OCIService:
             # If compartment_id is a tenancy root, query all compartments
             is_tenancy_root = compartment_id == self.config.get('tenancy') if self.config else False
             
-            if is_tenancy_root:
-                logger.info("🔍 Querying all compartments for resources...")
-                return await self._get_all_resources_from_all_compartments(resource_filter)
-            else:
-                logger.info(f"🔍 Querying single compartment for resources: {compartment_id}")
-                return await self._get_all_resources_from_single_compartment(compartment_id, resource_filter)
+            with cache_service.track_staleness() as stale_entries:
+                if is_tenancy_root:
+                    logger.info("🔍 Querying all compartments for resources...")
+                    result = await self._get_all_resources_from_all_compartments(resource_filter)
+                else:
+                    logger.info(f"🔍 Querying single compartment for resources: {compartment_id}")
+                    result = await self._get_all_resources_from_single_compartment(compartment_id, resource_filter)
+            
+            # Report how old any stale-while-revalidate listings in this response are
+            result["stale_entries"] = len(stale_entries)
+            result["staleness_seconds"] = round(max(stale_entries.values()), 1) if stale_entries else 0.0
+            return result
             
         except Exception as e:
             logger.error(f"Failed to get all resources: {e}")
             raise ExternalServiceError("Unable to retrieve compartment resources")
 
+    def category_getters(self) -> Dict[str, Callable[[str], Awaitable[List[Dict[str, Any]]]]]:
+        """Per-compartment getter of every inventory category"""
+        return {
+            'compute_instances': self.get_compute_instances,
+            'databases': self.get_databases,
+            'oke_clusters': self.get_oke_clusters,
+            'api_gateways': self.get_api_gateways,
+            'load_balancers': self.get_load_balancers,
+            'network_resources': self.get_network_resources,
+            'block_volumes': self.get_block_volumes,
+            'file_systems': self.get_file_systems,
+            'object_storage_buckets': self.get_object_storage_buckets,
+            'vaults': self.get_vaults,
+        }
+
     async def _get_all_resources_from_all_compartments(self, resource_filter: Optional[List[str]] = None) -> Dict[str, Any]:
-        """Get resources from all compartments in the tenancy - TENANCY AGNOSTIC"""
+        """Get resources from all compartments in the tenancy - TENANCY AGNOSTIC
+        
+        Serves the inventory sync snapshot once it is ready, otherwise uses Resource
+        Search when enabled, and the per-compartment listing when search is disabled,
+        unavailable or fails.
+        """
+        if self.inventory_sync.ready:
+            return self.inventory_sync.all_resources(await self.get_compartments(), resource_filter)
+        if self.inventory_backend == "search" and RESOURCE_SEARCH_AVAILABLE:
+            try:
+                return await self.search_inventory.get_all_resources(resource_filter)
+            except Exception as e:
+                logger.warning(f"⚠️ Resource Search inventory failed, listing compartments instead: {e}")
+        return await self._list_resources_by_compartment(resource_filter)
+
+    async def _list_resources_by_compartment(self, resource_filter: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get resources from all compartments by listing every type in every compartment"""
         try:
             # Get all compartments
             compartments = await self.get_compartments()
@@ -1032,24 +1190,18 @@ class OCIService:
             compartment_tasks = []
             compartment_map = {} # Map ID to Name for quick lookup
             
-            # Limit concurrency to avoid timeouts
-            semaphore = asyncio.Semaphore(5)
-            
-            async def protected_task(comp_id, resource_filter):
-                async with semaphore:
-                    return await self._get_all_resources_from_single_compartment(comp_id, resource_filter)
-
+            # Every call is paced per operation by the shared OCI rate governor,
+            # so compartments are no longer throttled here
             for comp in compartments:
                 comp_id = comp['id']
                 comp_name = comp['name']
                 compartment_map[comp_id] = comp_name
                 
-                # Create protected task
-                task = protected_task(comp_id, resource_filter)
+                task = self._get_all_resources_from_single_compartment(comp_id, resource_filter)
                 compartment_tasks.append(task)
             
-            # Execute all compartment queries in parallel (throttled)
-            logger.info(f"🚀 Launching parallel queries for {len(compartment_tasks)} compartments (throttled)...")
+            # Execute all compartment queries in parallel (rate-governed)
+            logger.info(f"🚀 Launching parallel queries for {len(compartment_tasks)} compartments (rate-governed)...")
             results_list = await asyncio.gather(*compartment_tasks, return_exceptions=True)
             
             # Initialize aggregated results
@@ -1098,7 +1250,8 @@ class OCIService:
                 "resources": aggregated_results,
                 "total_resources": total_resources,
                 "last_updated": datetime.utcnow().isoformat(),
-                "compartments_queried": len(compartments)
+                "compartments_queried": len(compartments),
+                "inventory_backend": "compartments"
             }
             
         except Exception as e:
@@ -1108,37 +1261,11 @@ class OCIService:
     async def _get_all_resources_from_single_compartment(self, compartment_id: str, resource_filter: Optional[List[str]] = None) -> Dict[str, Any]:
         """Get all resources from a single compartment"""
         # Get all resource types in parallel
-        tasks = []
-        
-        if not resource_filter or 'compute_instances' in resource_filter:
-            tasks.append(('compute_instances', self.get_compute_instances(compartment_id)))
-        
-        if not resource_filter or 'databases' in resource_filter:
-            tasks.append(('databases', self.get_databases(compartment_id)))
-        
-        if not resource_filter or 'oke_clusters' in resource_filter:
-            tasks.append(('oke_clusters', self.get_oke_clusters(compartment_id)))
-        
-        if not resource_filter or 'api_gateways' in resource_filter:
-            tasks.append(('api_gateways', self.get_api_gateways(compartment_id)))
-        
-        if not resource_filter or 'load_balancers' in resource_filter:
-            tasks.append(('load_balancers', self.get_load_balancers(compartment_id)))
-        
-        if not resource_filter or 'network_resources' in resource_filter:
-            tasks.append(('network_resources', self.get_network_resources(compartment_id)))
-        
-        if not resource_filter or 'block_volumes' in resource_filter:
-            tasks.append(('block_volumes', self.get_block_volumes(compartment_id)))
-        
-        if not resource_filter or 'file_systems' in resource_filter:
-            tasks.append(('file_systems', self.get_file_systems(compartment_id)))
-        
-        if not resource_filter or 'object_storage_buckets' in resource_filter:
-            tasks.append(('object_storage_buckets', self.get_object_storage_buckets(compartment_id)))
-        
-        if not resource_filter or 'vaults' in resource_filter:
-            tasks.append(('vaults', self.get_vaults(compartment_id)))
+        tasks = [
+            (name, getter(compartment_id))
+            for name, getter in self.category_getters().items()
+            if not resource_filter or name in resource_filter
+        ]
         
         # Execute all tasks in parallel using asyncio.gather
         results = {}
@@ -1166,6 +1293,7 @@ class OCIService:
                 results[name] = []
             else:
                 results[name] = result
+                self.inventory_index.replace_pair(compartment_id, name, result)
                 logger.info(f"✅ {name}: {len(result)} resources found")
         
         return {
@@ -1175,6 +1303,85 @@ class OCIService:
             "last_updated": datetime.utcnow().isoformat()
         }
 
+    async def stream_all_resources(self, compartment_id: str,
+                                   resource_filter: Optional[List[str]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Discover resources as a stream of events instead of one response
+        
+        Yields ``start``, then per compartment/type listing a ``resources`` chunk (when
+        non-empty, or ``error``) followed by ``progress``, and finally ``summary``. A
+        fixed set of workers feeds a bounded queue, so at most a few listings are held
+        while the consumer is slow and the full inventory is never accumulated.
+        """
+        started = time.perf_counter()
+        categories = [rt for rt in self.category_getters() if not resource_filter or rt in resource_filter]
+        compartments = await self.get_compartments()
+        compartment_names = {comp['id']: comp['name'] for comp in compartments}
+        is_tenancy_root = bool(self.config) and compartment_id == self.config.get('tenancy')
+        if not is_tenancy_root:
+            compartments = [{'id': compartment_id, 'name': compartment_names.get(compartment_id, compartment_id)}]
+            compartment_names = {compartment_id: compartments[0]['name']}
+
+        pairs = [(comp['id'], category) for comp in compartments for category in categories]
+        backend = "compartments"
+        if is_tenancy_root and self.inventory_backend == "search" and RESOURCE_SEARCH_AVAILABLE:
+            try:
+                # Only list the compartment/type pairs search found non-empty
+                found = {(s['compartment_id'], s['category']) for s in await self.search_inventory.search(categories)}
+                pairs = [pair for pair in pairs if pair in found]
+                backend = "search"
+            except Exception as e:
+                logger.warning(f"⚠️ Resource Search failed, streaming every compartment/type listing: {e}")
+
+        getters = self.category_getters()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.discovery_stream_workers)
+        pending = iter(pairs)
+
+        async def worker():
+            # Workers share one iterator, so each pair is listed exactly once
+            for pair_compartment_id, category in pending:
+                try:
+                    await queue.put((pair_compartment_id, category, await getters[category](pair_compartment_id), None))
+                except Exception as e:
+                    await queue.put((pair_compartment_id, category, None, e))
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(self.discovery_stream_workers, len(pairs)))]
+        by_type = {category: 0 for category in categories}
+        failed = 0
+        try:
+            yield {"event": "start", "compartments": len(compartments), "listings": len(pairs),
+                   "inventory_backend": backend}
+            for completed in range(1, len(pairs) + 1):
+                pair_compartment_id, category, items, error = await queue.get()
+                if error is not None:
+                    failed += 1
+                    yield {"event": "error", "compartment_id": pair_compartment_id, "resource_type": category,
+                           "message": str(error)}
+                else:
+                    self.inventory_index.replace_pair(pair_compartment_id, category, items)
+                    by_type[category] += len(items)
+                    if items:
+                        yield {"event": "resources", "compartment_id": pair_compartment_id,
+                               "source_compartment": compartment_names[pair_compartment_id],
+                               "resource_type": category, "count": len(items), "items": items}
+                yield {"event": "progress", "completed": completed, "total": len(pairs),
+                       "resources": sum(by_type.values())}
+        finally:
+            for task in workers:
+                task.cancel()
+
+        yield {
+            "event": "summary",
+            "compartment_id": "all_compartments" if is_tenancy_root else compartment_id,
+            "total_resources": sum(by_type.values()),
+            "by_type": by_type,
+            "compartments_queried": len(compartments),
+            "listings": len(pairs),
+            "failed_listings": failed,
+            "inventory_backend": backend,
+            "elapsed_seconds": round(time.perf_counter() - started, 3),
+            "last_updated": datetime.utcnow().isoformat(),
+        }
+
     async def get_instance_start_stop_events(
         self, 
         compartment_id: str, 
@@ -1195,16 +1402,11 @@ class OCIService:
         Returns:
             List of start/stop events with timestamps and resource details
         """
-        cache_key = f"audit_events:{compartment_id}:{instance_id or 'all'}:{days_back}"
-        cached = await cache_service.get("oci", cache_key)
-        if cached:
-            return cached
-        
-        try:
-            if not self.oci_available:
-                logger.debug("OCI audit service unavailable")
-                return []
-            
+        if not self.oci_available:
+            logger.debug("OCI audit service unavailable")
+            return []
+
+        async def fetch_events() -> List[Dict[str, Any]]:
             from datetime import timezone
             
             # Define time window
@@ -1213,103 +1415,77 @@ class OCIService:
             
             audit_client = self._get_client('audit')
             
-            # Call Audit API with pagination
+            # Call Audit API with pagination - limited to 2 pages for speed
             all_events = []
-            page = None
-            
-            while True:
-                if page:
-                    response = await self._make_oci_call(
-                        audit_client.list_events,
-                        compartment_id=compartment_id,
-                        start_time=start_time,
-                        end_time=end_time,
-                        page=page
-                    )
-                else:
-                    response = await self._make_oci_call(
-                        audit_client.list_events,
-                        compartment_id=compartment_id,
-                        start_time=start_time,
-                        end_time=end_time
-                    )
-                
-                # Process events
-                for event in response.data:
-                    event_data = event.data if hasattr(event, 'data') else None
-                    if not event_data:
-                        continue
+            async with aclosing(self._iter_pages(
+                audit_client.list_events,
+                compartment_id=compartment_id,
+                start_time=start_time,
+                end_time=end_time,
+                max_pages=2
+            )) as pages:
+                async for page in pages:
+                    for event in page:
+                        event_data = event.data if hasattr(event, 'data') else None
+                        if not event_data:
+                            continue
                     
-                    event_name = getattr(event_data, 'event_name', None) or ''
-                    resource_id = getattr(event_data, 'resource_id', None) or ''
+                        event_name = getattr(event_data, 'event_name', None) or ''
+                        resource_id = getattr(event_data, 'resource_id', None) or ''
                     
-                    # Filter for instance start/stop events
-                    is_start_stop = event_name in (
-                        'StartInstance', 'StopInstance', 'InstanceAction',
-                        'LaunchInstance', 'TerminateInstance'
-                    )
+                        # Filter for instance start/stop events
+                        is_start_stop = event_name in (
+                            'StartInstance', 'StopInstance', 'InstanceAction',
+                            'LaunchInstance', 'TerminateInstance'
+                        )
                     
-                    # If specific instance requested, filter for it
-                    if instance_id and resource_id != instance_id:
-                        continue
+                        # If specific instance requested, filter for it
+                        if instance_id and resource_id != instance_id:
+                            continue
                     
-                    if is_start_stop:
-                        # Determine action type
-                        action_type = 'unknown'
-                        if event_name == 'StartInstance' or event_name == 'LaunchInstance':
-                            action_type = 'start'
-                        elif event_name == 'StopInstance':
-                            action_type = 'stop'
-                        elif event_name == 'TerminateInstance':
-                            action_type = 'terminate'
-                        elif event_name == 'InstanceAction':
-                            # Check request parameters for action type
-                            request = getattr(event_data, 'request', None)
-                            if request:
-                                params = getattr(request, 'parameters', {}) or {}
-                                action = params.get('action', '').upper()
-                                if action in ('START', 'RESET'):
-                                    action_type = 'start'
-                                elif action in ('STOP', 'SOFTSTOP'):
-                                    action_type = 'stop'
+                        if is_start_stop:
+                            # Determine action type
+                            action_type = 'unknown'
+                            if event_name == 'StartInstance' or event_name == 'LaunchInstance':
+                                action_type = 'start'
+                            elif event_name == 'StopInstance':
+                                action_type = 'stop'
+                            elif event_name == 'TerminateInstance':
+                                action_type = 'terminate'
+                            elif event_name == 'InstanceAction':
+                                # Check request parameters for action type
+                                request = getattr(event_data, 'request', None)
+                                if request:
+                                    params = getattr(request, 'parameters', {}) or {}
+                                    action = params.get('action', '').upper()
+                                    if action in ('START', 'RESET'):
+                                        action_type = 'start'
+                                    elif action in ('STOP', 'SOFTSTOP'):
+                                        action_type = 'stop'
                         
-                        all_events.append({
-                            'event_time': event.event_time.isoformat() if hasattr(event, 'event_time') else None,
-                            'event_name': event_name,
-                            'action_type': action_type,
-                            'resource_id': resource_id,
-                            'compartment_id': compartment_id
-                        })
-                
-                # Handle pagination - limit to 2 pages max for speed
-                page_count = getattr(self, '_audit_page_count', 0) + 1
-                self._audit_page_count = page_count
-                
-                if page_count >= 2:
-                    logger.debug("Audit API: reached 2 page limit, stopping pagination")
-                    break
+                            all_events.append({
+                                'event_time': event.event_time.isoformat() if hasattr(event, 'event_time') else None,
+                                'event_name': event_name,
+                                'action_type': action_type,
+                                'resource_id': resource_id,
+                                'compartment_id': compartment_id
+                            })
                     
-                if hasattr(response, 'has_next_page') and response.has_next_page:
-                    page = response.next_page
-                else:
-                    break
-                
-                # Safety limit events
-                if len(all_events) > 100:
-                    logger.warning("Audit events limit reached (100), truncating results")
-                    break
-            
-            # Reset page counter
-            self._audit_page_count = 0
+                    # Safety limit events
+                    if len(all_events) > 100:
+                        logger.warning("Audit events limit reached (100), truncating results")
+                        break
             
             # Sort by event time (most recent first)
             all_events.sort(key=lambda x: x.get('event_time', ''), reverse=True)
             
             logger.info(f"Retrieved {len(all_events)} start/stop events from Audit API")
-            
-            # Cache for 5 minutes
-            await cache_service.set("oci", cache_key, all_events, ttl=300)
             return all_events
+
+        try:
+            # Cache for 5 minutes
+            cache_key = f"audit_events:{compartment_id}:{instance_id or 'all'}:{days_back}"
+            return await cache_service.get_or_compute("oci", cache_key, fetch_events, ttl=300)
             
         except Exception as e:
             logger.error(f"Failed to get audit events: {e}")
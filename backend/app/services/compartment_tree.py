@@ -0,0 +1,202 @@
+"""
+Compartment hierarchy
+Tree of the tenancy's compartments with parent pointers, precomputed depths and
+subtree ID sets, so "is X under Y" and subtree enumeration are constant-time lookups
+instead of parent/child walks over the flat ``get_compartments`` list. ``apply``
+refreshes the tree incrementally from a new listing.
+"""
+
+import logging
+from typing import Any, Dict, FrozenSet, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class CompartmentTree:
+    """Compartment hierarchy built from ``OCIService.get_compartments`` items
+
+    The tenancy (the item without a ``compartment_id``) is the root. A compartment
+    whose parent is not listed (inaccessible or deleted) hangs off the root.
+    """
+
+    def __init__(self):
+        self.root_id: Optional[str] = None
+        self._nodes: Dict[str, Dict[str, Any]] = {}
+        self._parent: Dict[str, Optional[str]] = {}
+        self._children: Dict[str, Set[str]] = {}
+        self._depth: Dict[str, int] = {}
+        # Compartment -> itself and every compartment below it
+        self._subtree: Dict[str, Set[str]] = {}
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, compartment_id: str) -> bool:
+        return compartment_id in self._nodes
+
+    # Building
+
+    def _parent_in(self, item: Dict[str, Any], ids: Set[str]) -> Optional[str]:
+        parent = item.get("compartment_id")
+        if parent is None or parent == item["id"]:
+            return None
+        return parent if parent in ids else self.root_id
+
+    def apply(self, compartments: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+        """Bring the tree in line with a compartment listing; returns what changed
+
+        Renames only update the nodes. Additions, removals and moves touch just the
+        ancestors of the compartments concerned, unless the root itself changes.
+        """
+        listed = {item["id"]: item for item in compartments}
+        root_id = next((cid for cid, item in listed.items() if not item.get("compartment_id")), self.root_id)
+        if root_id != self.root_id or not self._nodes:
+            self._rebuild(root_id, listed)
+            return {"added": list(listed), "removed": [], "moved": [], "updated": []}
+
+        ids = set(listed)
+        added = [cid for cid in listed if cid not in self._nodes]
+        removed = [cid for cid in self._nodes if cid not in listed]
+        moved = [cid for cid in listed if cid in self._nodes and self._parent[cid] != self._parent_in(listed[cid], ids)]
+        updated = [cid for cid in listed if cid in self._nodes and listed[cid] != self._nodes[cid]]
+
+        for cid in removed:
+            self._detach(cid)
+            for child in list(self._children.get(cid, ())):
+                # Orphans hang off the root until their new parent is listed
+                self._move(child, self.root_id)
+            self._parent.pop(cid, None)
+            self._children.pop(cid, None)
+            self._depth.pop(cid, None)
+            self._subtree.pop(cid, None)
+            self._nodes.pop(cid, None)
+        for cid in self._parents_first(added, listed, ids):
+            self._nodes[cid] = listed[cid]
+            self._parent[cid] = None
+            self._children[cid] = set()
+            self._subtree[cid] = {cid}
+            self._depth[cid] = 0
+            self._attach(cid, self._parent_in(listed[cid], ids))
+        for cid in moved:
+            if cid in self._nodes:
+                self._move(cid, self._parent_in(listed[cid], ids))
+        for cid in updated:
+            self._nodes[cid] = listed[cid]
+
+        if added or removed or moved or updated:
+            self.version += 1
+            logger.info(
+                f"🌳 Compartment tree refreshed: {len(added)} added, {len(removed)} removed, "
+                f"{len(moved)} moved, {len(updated)} updated"
+            )
+        return {"added": added, "removed": removed, "moved": moved, "updated": updated}
+
+    def _rebuild(self, root_id: Optional[str], listed: Dict[str, Dict[str, Any]]):
+        version = self.version
+        self.__init__()
+        self.root_id, self.version = root_id, version
+        ids = set(listed)
+        for cid in self._parents_first(list(listed), listed, ids):
+            self._nodes[cid] = listed[cid]
+            self._children[cid] = set()
+            self._subtree[cid] = {cid}
+            self._parent[cid] = None
+            self._depth[cid] = 0
+            self._attach(cid, None if cid == root_id else self._parent_in(listed[cid], ids))
+        self.version += 1
+
+    def _parents_first(self, cids: List[str], listed: Dict[str, Dict[str, Any]], ids: Set[str]) -> List[str]:
+        """Order new compartments so every parent is attached before its children"""
+        pending, ordered, placed = set(cids), [], set(self._nodes)
+        while pending:
+            ready = [cid for cid in pending
+                     if cid == self.root_id or self._parent_in(listed[cid], ids) in placed | {None}]
+            if not ready:
+                ready = list(pending)  # Cycle in the listing: attach the rest as they come
+            for cid in ready:
+                pending.discard(cid)
+                placed.add(cid)
+                ordered.append(cid)
+        return ordered
+
+    def ancestors(self, compartment_id: str) -> List[str]:
+        """Parent, grandparent, ... up to the root"""
+        chain = []
+        parent = self._parent.get(compartment_id)
+        while parent is not None:
+            chain.append(parent)
+            parent = self._parent.get(parent)
+        return chain
+
+    def _attach(self, cid: str, parent: Optional[str]):
+        if parent is None or parent not in self._nodes or parent in self._subtree[cid]:
+            parent = None if cid == self.root_id else (self.root_id if self.root_id in self._nodes else None)
+        self._parent[cid] = parent
+        if parent is not None:
+            self._children[parent].add(cid)
+        offset = (self._depth[parent] + 1 if parent is not None else 0) - self._depth[cid]
+        for node in self._subtree[cid]:
+            self._depth[node] += offset
+        for ancestor in self.ancestors(cid):
+            self._subtree[ancestor] |= self._subtree[cid]
+
+    def _detach(self, cid: str):
+        for ancestor in self.ancestors(cid):
+            self._subtree[ancestor] -= self._subtree[cid]
+        parent = self._parent.get(cid)
+        if parent is not None:
+            self._children[parent].discard(cid)
+        self._parent[cid] = None
+
+    def _move(self, cid: str, parent: Optional[str]):
+        self._detach(cid)
+        self._attach(cid, parent)
+
+    # Queries
+
+    def get(self, compartment_id: str) -> Optional[Dict[str, Any]]:
+        return self._nodes.get(compartment_id)
+
+    def name(self, compartment_id: str, default: str = "Unknown") -> str:
+        node = self._nodes.get(compartment_id)
+        return node.get("name", default) if node else default
+
+    def parent(self, compartment_id: str) -> Optional[str]:
+        return self._parent.get(compartment_id)
+
+    def children(self, compartment_id: str) -> List[str]:
+        return sorted(self._children.get(compartment_id, ()), key=self.name)
+
+    def depth(self, compartment_id: str) -> Optional[int]:
+        return self._depth.get(compartment_id)
+
+    def subtree(self, compartment_id: str) -> FrozenSet[str]:
+        """The compartment and every compartment below it (empty when unknown)"""
+        return frozenset(self._subtree.get(compartment_id, ()))
+
+    def is_under(self, compartment_id: str, ancestor_id: str) -> bool:
+        """True when ``compartment_id`` is ``ancestor_id`` or lies below it"""
+        return compartment_id in self._subtree.get(ancestor_id, ())
+
+    def path(self, compartment_id: str) -> List[str]:
+        """Names from the root down to the compartment"""
+        return [self.name(cid) for cid in reversed([compartment_id] + self.ancestors(compartment_id))]
+
+    def to_dict(self, compartment_id: Optional[str] = None, max_depth: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Nested ``{id, name, depth, children}`` view of a subtree (the whole tree by default)"""
+        compartment_id = compartment_id or self.root_id
+        if compartment_id not in self._nodes:
+            return None
+        node = self._nodes[compartment_id]
+        result = {
+            "id": compartment_id,
+            "name": node.get("name"),
+            "lifecycle_state": node.get("lifecycle_state"),
+            "depth": self._depth[compartment_id],
+            "descendant_count": len(self._subtree[compartment_id]) - 1,
+            "children": [],
+        }
+        if max_depth is None or self._depth[compartment_id] < max_depth:
+            result["children"] = [self.to_dict(child, max_depth) for child in self.children(compartment_id)]
+        return result
@@ -21,6 +21,7 @@ from app.schemas.cost_analyzer import (
     CostAnalysisRequest, TopCostlyResourcesRequest, CostAnalysisResponse
 )
 from app.core.exceptions import ExternalServiceError
+from app.core.oci_governor import oci_governor
 from app.services.cloud_service import get_oci_service
 from app.services.cache_service import cache_service
 import oci
@@ -78,28 +79,8 @@ class CostAnalyzerService:
         return oci_service._get_client('usage_api')
 
     async def _execute_with_retry(self, func, *args, **kwargs):
-        """Execute OCI call with retry logic for 429 Throttling"""
-        retries = 3
-        base_delay = 1.0
-        
-        for i in range(retries):
-            try:
-                loop = asyncio.get_event_loop()
-                return await loop.run_in_executor(None, lambda: func(*args, **kwargs))
-            except Exception as e:
-                # Basic check for OCI ServiceError 429
-                is_throttle = False
-                if hasattr(e, 'status') and e.status == 429:
-                    is_throttle = True
-                elif '429' in str(e) or 'TooManyRequests' in str(e):
-                    is_throttle = True
-                
-                if is_throttle and i < retries - 1:
-                    delay = base_delay * (2 ** i) + random.uniform(0, 0.5)
-                    self.logger.warning(f"OCI Throttling (429), retrying in {delay:.2f}s...")
-                    await asyncio.sleep(delay)
-                    continue
-                raise e
+        """Execute OCI call through the shared rate governor (which retries 429 Throttling)"""
+        return await oci_governor.call(func, *args, **kwargs)
 
     async def _check_oci_billing_connection(self) -> bool:
         """Check OCI billing API connection"""
@@ -125,76 +106,37 @@ class CostAnalyzerService:
         if not oci_service.oci_available:
             return
 
-        # Limit concurrent name resolution calls to 10
-        semaphore = asyncio.Semaphore(10)
+        # Lookup methods by OCID type for resources missing from the inventory index;
+        # pacing is left to the shared OCI rate governor
+        lookups = (
+            ('instance', 'compute', 'get_instance'),
+            ('dbsystem', 'database', 'get_db_system'),
+            ('autonomousdatabase', 'database', 'get_autonomous_database'),
+            ('volume', 'block_storage', 'get_volume'),
+        )
 
         async def fetch_name(res: ResourceCostSchema):
-            async with semaphore:
-                try:
-                    # Basic caching to avoid repeated lookups for same resource in same request
-                    rid = res.resource_id
-                    if not rid or not rid.startswith('ocid1.'):
+            try:
+                rid = res.resource_id
+                if not rid or not rid.startswith('ocid1.'):
+                    return
+
+                # Resources already discovered are named from the inventory index
+                indexed = oci_service.inventory_index.get(rid)
+                if indexed and indexed.get('display_name'):
+                    res.resource_name = indexed['display_name']
+                    return
+
+                for marker, client_name, method in lookups:
+                    if marker in rid:
+                        client = oci_service._get_client(client_name)
+                        response = await oci_governor.call(getattr(client, method), rid)
+                        if response and response.data and response.data.display_name:
+                            res.resource_name = response.data.display_name
                         return
-
-                    name = None
-                    
-                    # Compute Instances
-                    if 'instance' in rid:
-                        try:
-                            loop = asyncio.get_event_loop()
-                            response = await loop.run_in_executor(
-                                None, 
-                                lambda: oci_service._get_client('compute').get_instance(rid)
-                            )
-                            if response and response.data:
-                                name = response.data.display_name
-                        except Exception:
-                            pass
-
-                    # Database Systems
-                    elif 'dbsystem' in rid:
-                        try:
-                            loop = asyncio.get_event_loop()
-                            response = await loop.run_in_executor(
-                                 None,
-                                 lambda: oci_service._get_client('database').get_db_system(rid)
-                            )
-                            if response and response.data:
-                                 name = response.data.display_name
-                        except Exception:
-                            pass
-                             
-                    # Autonomous Databases
-                    elif 'autonomousdatabase' in rid:
-                        try:
-                             loop = asyncio.get_event_loop()
-                             response = await loop.run_in_executor(
-                                 None,
-                                 lambda: oci_service._get_client('database').get_autonomous_database(rid)
-                             )
-                             if response and response.data:
-                                 name = response.data.display_name
-                        except Exception:
-                            pass
-                    
-                    elif 'volume' in rid:
-                        try:
-                             loop = asyncio.get_event_loop()
-                             response = await loop.run_in_executor(
-                                 None,
-                                 lambda: oci_service._get_client('block_storage').get_volume(rid)
-                             )
-                             if response and response.data:
-                                 name = response.data.display_name
-                        except Exception:
-                            pass
-
-                    if name:
-                        res.resource_name = name
-
-                except Exception:
-                    # Ignore lookup errors, keep original name
-                    pass
+            except Exception:
+                # Ignore lookup errors, keep original name
+                pass
         
         # Execute lookups in parallel
         await asyncio.gather(*[fetch_name(r) for r in resources])
@@ -209,6 +151,16 @@ class CostAnalyzerService:
         except Exception:
              return {}
 
+    async def _get_compartment_scope(self, compartment_ids: List[str]) -> Optional[frozenset]:
+        """Compartments selected by a filter, including everything below them (None = all)"""
+        if not compartment_ids or 'all' in compartment_ids:
+            return None
+        tree = await get_oci_service().get_compartment_tree()
+        scope = set(compartment_ids)
+        for compartment_id in compartment_ids:
+            scope |= tree.subtree(compartment_id)
+        return frozenset(scope)
+
     async def get_top_costly_resources(self, request: TopCostlyResourcesRequest) -> Dict[str, Any]:
         """Get top costly resources by compartment or across tenancy"""
         try:
@@ -331,8 +283,11 @@ class CostAnalyzerService:
             # Debug logging for response
             self.logger.info(f"📊 OCI Response: {len(response.data.items)} items returned")
             
-            # Fetch compartment map for name resolution
+            # Fetch compartment map for name resolution, and the selected subtree
             comp_map = await self._get_compartment_name_map()
+            compartment_scope = await self._get_compartment_scope(
+                [request.compartment_id] if request.compartment_id else []
+            )
             
             # Process Results - AGGREGATE costs per resource_id
             # OCI returns separate line items per (resource_id, time_period)
@@ -345,10 +300,9 @@ class CostAnalyzerService:
                      if item.service not in request.resource_types:
                          continue
 
-                # Filter by compartment if provided (double check)
-                if request.compartment_id and request.compartment_id != 'all':
-                    if item.compartment_id != request.compartment_id:
-                        continue
+                # Filter by compartment if provided, sub-compartments included
+                if compartment_scope is not None and item.compartment_id not in compartment_scope:
+                    continue
 
                 r_cost = float(item.computed_amount or 0)
                 if r_cost <= 0:
@@ -499,90 +453,87 @@ class CostAnalyzerService:
             analysis_id = str(uuid.uuid4())
             self.logger.info(f"Starting cost analysis {analysis_id} for period: {request.period}")
 
-            # Generate cache key
             # Generate cache key
             comps_key = ",".join(sorted(request.compartment_ids)) if request.compartment_ids else "all"
             cache_key = f"analysis:{comps_key}:{request.period}:{request.include_forecasting}"
             
-            # 1. Check Cache
-            cached_data = await cache_service.get(self.service_name, cache_key)
-            if cached_data:
-                self.logger.info(f"Returning cached analysis for {cache_key}")
-                return cached_data
-            
-            # Generate comprehensive cost analysis data
-            compartment_breakdown = await self._generate_compartment_breakdown(request)
-            
-            # Calculate total cost early for context-aware recommendations
-            total_cost = sum(cb.total_cost for cb in compartment_breakdown)
-            
-            # Get top costly resources
-            top_resources_req = TopCostlyResourcesRequest(limit=5, period=request.period)
-            top_resources_result = await self.get_top_costly_resources(top_resources_req)
-            top_resources = top_resources_result.get("resources", [])
-            
-            cost_trends = await self._generate_cost_trends(request)
-            anomalies = await self._detect_cost_anomalies(request)
-            recommendations = await self._generate_optimization_recommendations(request, total_cost)
-            
-            # Generate forecasts if requested
-            forecasts = None
-            if request.include_forecasting:
-                forecasts = await self._generate_cost_forecasts(request)
-            
-            # Calculate overall summary
-            summary = CostSummarySchema(
-                total_cost=total_cost,
-                currency="USD",
-                period=request.period,
-                resource_count=sum(cb.resource_count for cb in compartment_breakdown),
-                compartment_count=len(compartment_breakdown),
-                cost_distribution={
-                    "compute": total_cost * 0.45,
-                    "storage": total_cost * 0.25,
-                    "networking": total_cost * 0.20,
-                    "other": total_cost * 0.10
-                },
-                optimization_potential=sum(r.estimated_savings for r in recommendations)
-            )
-            
-            # Generate dummy AI insights
-            ai_insights = await self._generate_ai_insights(
-                total_cost, len(anomalies), len(recommendations)
+            # Single-flight: concurrent requests for the same analysis share one Usage API run
+            return await cache_service.get_or_compute(
+                self.service_name, cache_key, lambda: self._build_cost_analysis(request), ttl=300
             )
             
-            # Build result as dict to match endpoint expectations
-            result = {
-                "status": "success",
-                "analysis_id": str(uuid.uuid4()),
-                "timestamp": datetime.utcnow(),
-                "period": request.period,
-                "summary": {
-                    "total_cost": total_cost,
-                    "currency": "USD",
-                    "period": request.period,
-                    "resource_count": len(top_resources) if top_resources else 0,
-                    "compartment_count": len(compartment_breakdown) if compartment_breakdown else 0,
-                    "cost_distribution": summary.cost_distribution if hasattr(summary, 'cost_distribution') else {},
-                    "optimization_potential": summary.optimization_potential if hasattr(summary, 'optimization_potential') else 0
-                },
-                "compartment_breakdown": [cb.model_dump() if hasattr(cb, 'model_dump') else cb for cb in compartment_breakdown] if compartment_breakdown else [],
-                "cost_trends": [ct.model_dump() if hasattr(ct, 'model_dump') else ct for ct in cost_trends] if cost_trends else [],
-                "anomalies": [a.model_dump() if hasattr(a, 'model_dump') else a for a in anomalies] if anomalies else [],
-                "recommendations": [r.model_dump() if hasattr(r, 'model_dump') else r for r in recommendations] if recommendations else [],
-                "forecasts": [f.model_dump() if hasattr(f, 'model_dump') else f for f in forecasts] if forecasts else None,
-                "ai_insights": ai_insights
-            }
-            
-            # Cache the result
-            await cache_service.set("cost", cache_key, result, ttl=300)
-            
-            return result
-            
         except Exception as e:
             self.logger.error(f"Failed to analyze costs: {e}")
             raise
 
+    async def _build_cost_analysis(self, request: CostAnalysisRequest) -> Dict[str, Any]:
+        """Run the Usage API queries behind a cost analysis"""
+        # Generate comprehensive cost analysis data
+        compartment_breakdown = await self._generate_compartment_breakdown(request)
+        
+        # Calculate total cost early for context-aware recommendations
+        total_cost = sum(cb.total_cost for cb in compartment_breakdown)
+        
+        # Get top costly resources
+        top_resources_req = TopCostlyResourcesRequest(limit=5, period=request.period)
+        top_resources_result = await self.get_top_costly_resources(top_resources_req)
+        top_resources = top_resources_result.get("resources", [])
+        
+        cost_trends = await self._generate_cost_trends(request)
+        anomalies = await self._detect_cost_anomalies(request)
+        recommendations = await self._generate_optimization_recommendations(request, total_cost)
+        
+        # Generate forecasts if requested
+        forecasts = None
+        if request.include_forecasting:
+            forecasts = await self._generate_cost_forecasts(request)
+        
+        # Calculate overall summary
+        summary = CostSummarySchema(
+            total_cost=total_cost,
+            currency="USD",
+            period=request.period,
+            resource_count=sum(cb.resource_count for cb in compartment_breakdown),
+            compartment_count=len(compartment_breakdown),
+            cost_distribution={
+                "compute": total_cost * 0.45,
+                "storage": total_cost * 0.25,
+                "networking": total_cost * 0.20,
+                "other": total_cost * 0.10
+            },
+            optimization_potential=sum(r.estimated_savings for r in recommendations)
+        )
+        
+        # Generate dummy AI insights
+        ai_insights = await self._generate_ai_insights(
+            total_cost, len(anomalies), len(recommendations)
+        )
+        
+        # Build result as dict to match endpoint expectations
+        result = {
+            "status": "success",
+            "analysis_id": str(uuid.uuid4()),
+            "timestamp": datetime.utcnow(),
+            "period": request.period,
+            "summary": {
+                "total_cost": total_cost,
+                "currency": "USD",
+                "period": request.period,
+                "resource_count": len(top_resources) if top_resources else 0,
+                "compartment_count": len(compartment_breakdown) if compartment_breakdown else 0,
+                "cost_distribution": summary.cost_distribution if hasattr(summary, 'cost_distribution') else {},
+                "optimization_potential": summary.optimization_potential if hasattr(summary, 'optimization_potential') else 0
+            },
+            "compartment_breakdown": [cb.model_dump() if hasattr(cb, 'model_dump') else cb for cb in compartment_breakdown] if compartment_breakdown else [],
+            "cost_trends": [ct.model_dump() if hasattr(ct, 'model_dump') else ct for ct in cost_trends] if cost_trends else [],
+            "anomalies": [a.model_dump() if hasattr(a, 'model_dump') else a for a in anomalies] if anomalies else [],
+            "recommendations": [r.model_dump() if hasattr(r, 'model_dump') else r for r in recommendations] if recommendations else [],
+            "forecasts": [f.model_dump() if hasattr(f, 'model_dump') else f for f in forecasts] if forecasts else None,
+            "ai_insights": ai_insights
+        }
+        
+        return result
+
 
     async def _generate_dummy_cost_data(
         self,
@@ -712,20 +663,25 @@ class CostAnalyzerService:
             )
             
             # Aggregate results
-            comp_map_names = await self._get_compartment_name_map()
+            tree = await oci.get_compartment_tree()
             comp_map = {}
+            subtree_costs: Dict[str, float] = {}
             for item in response.data.items:
                 cid = item.compartment_id
                 if cid not in comp_map:
                     comp_map[cid] = {
                         "id": cid, 
-                        "name": comp_map_names.get(cid, "Unknown"), 
+                        "name": tree.name(cid), 
                         "cost": 0, 
                         "count": 0
                     }
                 
-                comp_map[cid]["cost"] += float(item.computed_amount or 0)
+                cost = float(item.computed_amount or 0)
+                comp_map[cid]["cost"] += cost
                 comp_map[cid]["count"] += 1 # Rough count of resources/services
+                # Roll the cost up the hierarchy
+                for ancestor in [cid] + tree.ancestors(cid):
+                    subtree_costs[ancestor] = subtree_costs.get(ancestor, 0) + cost
             
             # Convert to schema
             result = []
@@ -745,7 +701,10 @@ class CostAnalyzerService:
                     cost_percentage=round(pct, 2),
                     change_percentage=0, # Need historical comparison for this
                     top_resources=[],
-                    cost_trends=[]
+                    cost_trends=[],
+                    parent_compartment_id=tree.parent(cid),
+                    depth=tree.depth(cid),
+                    subtree_cost=round(subtree_costs.get(cid, 0), 2)
                 ))
             
             return sorted(result, key=lambda x: x.total_cost, reverse=True)
@@ -850,10 +809,11 @@ class CostAnalyzerService:
                 details
             )
 
+            compartment_scope = await self._get_compartment_scope(request.compartment_ids or [])
             trends_map = {}
             for item in response.data.items:
-                # Filter in memory if needed
-                if request.compartment_ids and item.compartment_id not in request.compartment_ids:
+                # Filter in memory if needed (selected compartments and their sub-compartments)
+                if compartment_scope is not None and item.compartment_id not in compartment_scope:
                     continue
                     
                 date_str = str(item.time_usage_started)[:10]
@@ -6,10 +6,11 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Union, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
-import redis
+import redis.asyncio as aioredis
 import httpx
 from groq import Groq
 from app.core.config import settings
+from app.core.redis_pool import get_redis_client
 from app.core.exceptions import BaseCustomException, RateLimitError, ExternalServiceError
 import logging
 
@@ -730,11 +731,11 @@ Deliver strategic recommendations with detailed implementation guidance.
 class PromptVersioning:
     """Manages prompt template versioning and A/B testing"""
     
-    def __init__(self, redis_client: Optional[redis.Redis] = None):
+    def __init__(self, redis_client: Optional[aioredis.Redis] = None):
         self.redis = redis_client
         self.versions = {}
         
-    def register_prompt_version(
+    async def register_prompt_version(
         self, 
         prompt_type: PromptType, 
         version: str, 
@@ -756,7 +757,7 @@ class PromptVersioning:
         
         if self.redis:
             try:
-                self.redis.hset(
+                await self.redis.hset(
                     "prompt_versions",
                     version_key,
                     json.dumps(version_data)
@@ -764,7 +765,7 @@ class PromptVersioning:
             except Exception as e:
                 logger.warning(f"Failed to store prompt version in Redis: {e}")
     
-    def get_prompt_version(self, prompt_type: PromptType, version: str = "latest") -> Optional[str]:
+    async def get_prompt_version(self, prompt_type: PromptType, version: str = "latest") -> Optional[str]:
         """Get a specific version of a prompt template"""
         version_key = f"{prompt_type.value}_v{version}"
         
@@ -775,7 +776,7 @@ class PromptVersioning:
         # Try Redis
         if self.redis:
             try:
-                data = self.redis.hget("prompt_versions", version_key)
+                data = await self.redis.hget("prompt_versions", version_key)
                 if data:
                     version_data = json.loads(data)
                     return version_data["template"]
@@ -799,11 +800,11 @@ class PromptVersioning:
 class PromptOptimization:
     """Handles prompt optimization and A/B testing"""
     
-    def __init__(self, redis_client: Optional[redis.Redis] = None):
+    def __init__(self, redis_client: Optional[aioredis.Redis] = None):
         self.redis = redis_client
         self.test_results = {}
         
-    def create_ab_test(
+    async def create_ab_test(
         self, 
         prompt_type: PromptType,
         variant_a: str,
@@ -832,7 +833,7 @@ class PromptOptimization:
         
         if self.redis:
             try:
-                self.redis.hset("ab_tests", test_id, json.dumps(test_config))
+                await self.redis.hset("ab_tests", test_id, json.dumps(test_config))
             except Exception as e:
                 logger.warning(f"Failed to store A/B test in Redis: {e}")
         
@@ -851,7 +852,7 @@ class PromptOptimization:
         
         return "variant_b" if assignment < test_config["traffic_split"] else "variant_a"
     
-    def record_test_result(
+    async def record_test_result(
         self, 
         test_id: str, 
         variant: str, 
@@ -879,7 +880,7 @@ class PromptOptimization:
         # Update in Redis
         if self.redis:
             try:
-                self.redis.hset("ab_tests", test_id, json.dumps(self.test_results[test_id]))
+                await self.redis.hset("ab_tests", test_id, json.dumps(self.test_results[test_id]))
             except Exception as e:
                 logger.warning(f"Failed to update A/B test results in Redis: {e}")
 
@@ -1005,14 +1006,14 @@ class PromptQualityMetrics:
 class ConversationContext:
     """Manages conversation context and history"""
     
-    def __init__(self, redis_client: redis.Redis):
+    def __init__(self, redis_client: aioredis.Redis):
         self.redis = redis_client
         
-    def get_context(self, session_id: str) -> Dict[str, Any]:
+    async def get_context(self, session_id: str) -> Dict[str, Any]:
         """Get conversation context for a session"""
         try:
             context_key = f"genai:context:{session_id}"
-            context_data = self.redis.get(context_key)
+            context_data = await self.redis.get(context_key)
             if context_data:
                 return json.loads(context_data)
             return {"messages": [], "metadata": {}}
@@ -1020,10 +1021,10 @@ class ConversationContext:
             logger.error(f"Error retrieving context: {e}")
             return {"messages": [], "metadata": {}}
     
-    def update_context(self, session_id: str, message: Dict[str, Any], max_messages: int = 10):
+    async def update_context(self, session_id: str, message: Dict[str, Any], max_messages: int = 10):
         """Update conversation context with new message"""
         try:
-            context = self.get_context(session_id)
+            context = await self.get_context(session_id)
             context["messages"].append({
                 "content": message.get("content", ""),
                 "role": message.get("role", "user"),
@@ -1035,7 +1036,7 @@ class ConversationContext:
                 context["messages"] = context["messages"][-max_messages:]
             
             context_key = f"genai:context:{session_id}"
-            self.redis.setex(
+            await self.redis.setex(
                 context_key, 
                 timedelta(hours=24), 
                 json.dumps(context)
@@ -1043,11 +1044,11 @@ class ConversationContext:
         except Exception as e:
             logger.error(f"Error updating context: {e}")
     
-    def clear_context(self, session_id: str):
+    async def clear_context(self, session_id: str):
         """Clear conversation context for a session"""
         try:
             context_key = f"genai:context:{session_id}"
-            self.redis.delete(context_key)
+            await self.redis.delete(context_key)
         except Exception as e:
             logger.error(f"Error clearing context: {e}")
 
@@ -1068,20 +1069,11 @@ class GenAIService:
             logger.warning("Groq API key not found. GenAI service will use fallback responses.")
         
         # Initialize Redis for caching and context management
-        # IMPORTANT: Use very short timeout to prevent blocking startup
+        # Shared async pool; connections are opened lazily so startup never blocks
         try:
-            self.redis = redis.Redis(
-                host=settings.REDIS_HOST,
-                port=settings.REDIS_PORT,
-                password=settings.REDIS_PASSWORD,
-                decode_responses=True,
-                socket_connect_timeout=0.5,  # Reduced from 5s to 0.5s to prevent blocking
-                socket_timeout=0.5,
-                retry_on_timeout=False
-            )
-            # Test Redis connection removed for lazy loading
-            # self.redis.ping()
-            logger.info("Connected to Redis for GenAI caching (lazy)")
+            self.redis = get_redis_client()
+            if self.redis:
+                logger.info("Connected to Redis for GenAI caching (lazy)")
         except Exception as e:
             logger.warning(f"Redis connection failed: {e}. Proceeding without caching.")
             self.redis = None
@@ -1123,11 +1115,7 @@ class GenAIService:
             
         try:
             # Test Redis connection with timeout
-            loop = asyncio.get_event_loop()
-            await asyncio.wait_for(
-                loop.run_in_executor(None, self.redis.ping),
-                timeout=2.0
-            )
+            await asyncio.wait_for(self.redis.ping(), timeout=2.0)
             logger.info("✅ Redis connection test successful")
             return True
         except Exception as e:
@@ -1172,13 +1160,13 @@ class GenAIService:
         self.rate_limiter[key] += 1
         return True
     
-    def _get_cached_response(self, cache_key: str) -> Optional[GenAIResponse]:
+    async def _get_cached_response(self, cache_key: str) -> Optional[GenAIResponse]:
         """Get cached response if available"""
         if not self.redis:
             return None
             
         try:
-            cached_data = self.redis.get(cache_key)
+            cached_data = await self.redis.get(cache_key)
             if cached_data:
                 data = json.loads(cached_data)
                 data["cached"] = True
@@ -1187,7 +1175,7 @@ class GenAIService:
             logger.error(f"Error retrieving cached response: {e}")
         return None
     
-    def _cache_response(self, cache_key: str, response: GenAIResponse):
+    async def _cache_response(self, cache_key: str, response: GenAIResponse):
         """Cache the response"""
         if not self.redis:
             return
@@ -1198,7 +1186,7 @@ class GenAIService:
             response_dict["cached"] = False
             response_dict["timestamp"] = response_dict["timestamp"].isoformat()
             
-            self.redis.setex(
+            await self.redis.setex(
                 cache_key,
                 timedelta(seconds=settings.GENAI_CACHE_TTL),
                 json.dumps(response_dict)
@@ -1217,7 +1205,7 @@ class GenAIService:
         # Check cache
         if self.enable_caching:
             cache_key = self._generate_cache_key(request)
-            cached_response = self._get_cached_response(cache_key)
+            cached_response = await self._get_cached_response(cache_key)
             if cached_response:
                 return cached_response
         
@@ -1245,15 +1233,15 @@ class GenAIService:
             
             # Cache the response
             if self.enable_caching:
-                self._cache_response(cache_key, response)
+                await self._cache_response(cache_key, response)
             
             # Update conversation context
             if request.session_id and self.context_manager:
-                self.context_manager.update_context(
+                await self.context_manager.update_context(
                     request.session_id,
                     {"role": "user", "content": request.prompt}
                 )
-                self.context_manager.update_context(
+                await self.context_manager.update_context(
                     request.session_id,
                     {"role": "assistant", "content": response.content}
                 )
@@ -1303,14 +1291,14 @@ class GenAIService:
         """Generate a formatted prompt using templates"""
         return PromptTemplate.format_prompt(prompt_type, **kwargs)
     
-    def generate_versioned_prompt(
+    async def generate_versioned_prompt(
         self, 
         prompt_type: PromptType, 
         version: str = "latest", 
         **kwargs
     ) -> str:
         """Generate a prompt using a specific version"""
-        template = self.prompt_versioning.get_prompt_version(prompt_type, version)
+        template = await self.prompt_versioning.get_prompt_version(prompt_type, version)
         if template:
             try:
                 return template.format(**kwargs)
@@ -1394,13 +1382,13 @@ class GenAIService:
             raise e
         finally:
             # Record test result
-            self.prompt_optimization.record_test_result(
+            await self.prompt_optimization.record_test_result(
                 test_id, variant, success, response_time
             )
         
         return response
     
-    def create_prompt_ab_test(
+    async def create_prompt_ab_test(
         self,
         prompt_type: PromptType,
         baseline_template: str,
@@ -1409,7 +1397,7 @@ class GenAIService:
         traffic_split: float = 0.5
     ) -> str:
         """Create a new A/B test for prompt optimization"""
-        return self.prompt_optimization.create_ab_test(
+        return await self.prompt_optimization.create_ab_test(
             prompt_type=prompt_type,
             variant_a=baseline_template,
             variant_b=variant_template,
@@ -1421,7 +1409,7 @@ class GenAIService:
         """Get results from an A/B test"""
         return self.prompt_optimization.test_results.get(test_id)
     
-    def register_prompt_version(
+    async def register_prompt_version(
         self,
         prompt_type: PromptType,
         version: str,
@@ -1429,7 +1417,7 @@ class GenAIService:
         metadata: Dict[str, Any] = None
     ):
         """Register a new version of a prompt template"""
-        self.prompt_versioning.register_prompt_version(
+        await self.prompt_versioning.register_prompt_version(
             prompt_type, version, template, metadata
         )
     
@@ -1445,7 +1433,7 @@ class GenAIService:
         # Get conversation history
         conversation_history = ""
         if self.context_manager:
-            ctx = self.context_manager.get_context(session_id)
+            ctx = await self.context_manager.get_context(session_id)
             recent_messages = ctx.get("messages", [])[-5:]  # Last 5 messages
             conversation_history = "\n".join([
                 f"{msg['role']}: {msg['content']}" for msg in recent_messages
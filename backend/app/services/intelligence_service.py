@@ -10,6 +10,8 @@ from datetime import datetime, timedelta
 from dataclasses import dataclass
 from enum import Enum
 
+from app.core.invalidation_bus import invalidation_bus
+
 logger = logging.getLogger(__name__)
 
 
@@ -128,12 +130,44 @@ class IntelligenceService:
         """
         self.oci_service = oci_service
         self._cache: Dict[str, Any] = {}
-        self._cache_ttl = timedelta(hours=1)
+        # Inventory changes drop the affected matrices, so the TTL only bounds metric staleness
+        self._cache_ttl = timedelta(hours=6)
+        invalidation_bus.subscribe("intelligence", self._handle_invalidation)
+        inventory_sync = getattr(oci_service, 'inventory_sync', None)
+        if inventory_sync is not None:
+            inventory_sync.subscribe(self._handle_inventory_changes)
     
     def _get_cache_key(self, prefix: str, compartment_id: str) -> str:
         """Generate cache key"""
         return f"intelligence:{prefix}:{compartment_id}"
     
+    async def invalidate_health_matrix(self, compartment_id: str):
+        """Drop the cached health matrix of a compartment in every worker"""
+        cache_key = self._get_cache_key('health_matrix', compartment_id)
+        self._drop_cache_key(cache_key)
+        await invalidation_bus.publish("intelligence", cache_key=cache_key)
+    
+    def _handle_invalidation(self, message: Dict[str, Any]):
+        """Apply an invalidation published by another worker"""
+        self._drop_cache_key(message["cache_key"])
+    
+    def _handle_inventory_changes(self, changes: List[Dict[str, Any]]):
+        """Drop health matrices of compartments with changed resources, and the tenancy-wide one
+        
+        Every worker runs its own inventory sync, so nothing is published.
+        """
+        compartment_ids = {change["compartment_id"] for change in changes}
+        tenancy_id = (getattr(self.oci_service, 'config', None) or {}).get('tenancy')
+        if tenancy_id:
+            compartment_ids.add(tenancy_id)
+        for compartment_id in compartment_ids:
+            self._drop_cache_key(self._get_cache_key('health_matrix', compartment_id))
+
+    def _drop_cache_key(self, cache_key: str):
+        self._cache.pop(cache_key, None)
+        self._cache.pop(f"{cache_key}:timestamp", None)
+        self._cache.pop(f"{cache_key}:by_id", None)
+    
     def _is_cache_valid(self, cache_key: str) -> bool:
         """Check if cached data is still valid"""
         if cache_key not in self._cache:
@@ -398,15 +432,25 @@ class IntelligenceService:
                     by_type[resource_type] = []
                 by_type[resource_type].append(health)
         
+        # Stopped resources come straight from the inventory index by lifecycle state
+        health_by_id = {r.resource_id: r for r in resources}
+        index = self.oci_service.inventory_index
+        is_tenancy_root = bool(self.oci_service.config) and compartment_id == self.oci_service.config.get('tenancy')
+        scope = None if is_tenancy_root else compartment_id
+        stopped = [
+            health_by_id[rid]
+            for state in ('STOPPED', 'INACTIVE')
+            for rid in index.ids(compartment_id=scope, lifecycle_state=state)
+            if rid in health_by_id
+        ]
+        
         # ===== Audit API Enrichment for stopped duration =====
         # TEMPORARILY DISABLED: Audit API causing server instability
         # TODO: Re-enable after investigating OCI Audit API performance issues
         # The code has been kept but guard with False flag
         ENABLE_AUDIT_ENRICHMENT = False
         
-        stopped_compute = [r for r in resources 
-                          if r.lifecycle_state in ('STOPPED', 'INACTIVE') 
-                          and r.resource_type == 'compute']
+        stopped_compute = [r for r in stopped if r.resource_type == 'compute']
         
         if stopped_compute and ENABLE_AUDIT_ENRICHMENT:
             logger.info(f"🔍 Fetching Audit data for {len(stopped_compute)} stopped compute instances...")
@@ -452,8 +496,7 @@ class IntelligenceService:
         # Calculate total waste
         total_waste = sum(
             r.estimated_cost * 0.2  # Assume 20% of cost is waste for stopped resources
-            for r in resources 
-            if r.lifecycle_state in ['STOPPED', 'INACTIVE']
+            for r in stopped
         )
         
         matrix = HealthMatrix(
@@ -470,6 +513,7 @@ class IntelligenceService:
         
         # Cache result
         self._cache[cache_key] = matrix
+        self._cache[f"{cache_key}:by_id"] = health_by_id
         self._cache[f"{cache_key}:timestamp"] = datetime.utcnow()
         
         logger.info(f"✅ Health matrix computed: {len(resources)} resources, "
@@ -496,13 +540,7 @@ class IntelligenceService:
         """
         cache_key = self._get_cache_key('health_matrix', compartment_id)
         
-        if cache_key in self._cache:
-            matrix: HealthMatrix = self._cache[cache_key]
-            for resource in matrix.resources:
-                if resource.resource_id == resource_id:
-                    return resource
-        
-        return None
+        return self._cache.get(f"{cache_key}:by_id", {}).get(resource_id)
     
     def to_dict(self, health: ResourceHealth) -> Dict[str, Any]:
         """Convert ResourceHealth to dictionary for JSON serialization"""
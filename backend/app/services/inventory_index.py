@@ -0,0 +1,167 @@
+"""
+In-memory inventory index
+Hash indexes over the discovered inventory by OCID, compartment, resource category and
+lifecycle state, plus facet counts (state, shape, resource type) kept up to date on
+every write, so consumers find resources and aggregates without rescanning listings
+or calling OCI.
+"""
+
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+Pair = Tuple[str, str]  # (compartment_id, category)
+
+# Item fields counted per compartment and category
+FACET_FIELDS = ("lifecycle_state", "shape", "resource_type")
+
+# Field under which the facet counters keep the resource count itself
+_TOTAL = "*"
+
+
+class InventoryIndex:
+    """Multi-key index of inventory items
+
+    Items are stored as listed by ``OCIService`` (plain dicts with ``id``). Writes go
+    through ``replace_pair``/``add``/``remove``; lookups and counts are O(1), filtered
+    queries cost the size of the smallest matching index.
+    """
+
+    def __init__(self):
+        self._items: Dict[str, Dict[str, Any]] = {}
+        self._pair_of: Dict[str, Pair] = {}
+        self._by_pair: Dict[Pair, Set[str]] = {}
+        self._by_compartment: Dict[str, Set[str]] = {}
+        self._by_category: Dict[str, Set[str]] = {}
+        self._by_state: Dict[str, Set[str]] = {}
+        # (compartment_id | None, category | None) -> field -> value -> count
+        self._counts: Dict[Tuple[Optional[str], Optional[str]], Dict[str, Dict[Any, int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, resource_id: str) -> bool:
+        return resource_id in self._items
+
+    # Writes
+
+    def _count(self, compartment_id: str, category: str, item: Dict[str, Any], delta: int):
+        values = [(_TOTAL, None)] + [(field, item.get(field)) for field in FACET_FIELDS if item.get(field) is not None]
+        for scope in ((compartment_id, category), (None, category), (compartment_id, None), (None, None)):
+            fields = self._counts.get(scope)
+            if fields is None:
+                fields = self._counts[scope] = {}
+            for field, value in values:
+                counter = fields.get(field)
+                if counter is None:
+                    counter = fields[field] = {}
+                count = counter.get(value, 0) + delta
+                if count > 0:
+                    counter[value] = count
+                else:
+                    counter.pop(value, None)
+
+    def add(self, compartment_id: str, category: str, item: Dict[str, Any]):
+        """Index one item, replacing any previous version of the same OCID"""
+        resource_id = item["id"]
+        self.remove(resource_id)
+        pair = (compartment_id, category)
+        self._items[resource_id] = item
+        self._pair_of[resource_id] = pair
+        self._by_pair.setdefault(pair, set()).add(resource_id)
+        self._by_compartment.setdefault(compartment_id, set()).add(resource_id)
+        self._by_category.setdefault(category, set()).add(resource_id)
+        self._by_state.setdefault(item.get("lifecycle_state"), set()).add(resource_id)
+        self._count(compartment_id, category, item, 1)
+
+    def remove(self, resource_id: str):
+        """Drop one item (no-op when it is not indexed)"""
+        item = self._items.pop(resource_id, None)
+        if item is None:
+            return
+        compartment_id, category = pair = self._pair_of.pop(resource_id)
+        for index, key in ((self._by_pair, pair), (self._by_compartment, compartment_id),
+                           (self._by_category, category), (self._by_state, item.get("lifecycle_state"))):
+            ids = index[key]
+            ids.discard(resource_id)
+            if not ids:
+                del index[key]
+        self._count(compartment_id, category, item, -1)
+
+    def replace_pair(self, compartment_id: str, category: str, items: List[Dict[str, Any]]):
+        """Make ``items`` the full content of one compartment/category listing"""
+        for resource_id in self._by_pair.get((compartment_id, category), set()) - {item["id"] for item in items}:
+            self.remove(resource_id)
+        pair = (compartment_id, category)
+        for item in items:
+            # Re-listing unchanged resources (the common case) costs one comparison
+            current = self._items.get(item["id"])
+            if current is not None and (current is item or current == item) and self._pair_of[item["id"]] == pair:
+                continue
+            self.add(compartment_id, category, item)
+
+    def pairs(self) -> List[Pair]:
+        """Compartment/category pairs holding at least one item"""
+        return list(self._by_pair)
+
+    def clear(self):
+        self.__init__()
+
+    # Lookups
+
+    def get(self, resource_id: str) -> Optional[Dict[str, Any]]:
+        """Item by OCID"""
+        return self._items.get(resource_id)
+
+    def locate(self, resource_id: str) -> Optional[Pair]:
+        """(compartment_id, category) an OCID was listed under"""
+        return self._pair_of.get(resource_id)
+
+    def ids(self, compartment_id: Optional[str] = None, category: Optional[str] = None,
+            lifecycle_state: Optional[str] = None) -> Set[str]:
+        """OCIDs matching every given key (intersection starting from the smallest index)"""
+        if compartment_id is not None and category is not None:
+            candidates = [self._by_pair.get((compartment_id, category), set())]
+        else:
+            candidates = []
+            if compartment_id is not None:
+                candidates.append(self._by_compartment.get(compartment_id, set()))
+            if category is not None:
+                candidates.append(self._by_category.get(category, set()))
+        if lifecycle_state is not None:
+            candidates.append(self._by_state.get(lifecycle_state, set()))
+        if not candidates:
+            return set(self._items)
+        candidates.sort(key=len)
+        return candidates[0].intersection(*candidates[1:])
+
+    def query(self, compartment_id: Optional[str] = None, category: Optional[str] = None,
+              lifecycle_state: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Items matching every given key, up to ``limit``"""
+        items = []
+        for resource_id in self.ids(compartment_id, category, lifecycle_state):
+            if limit is not None and len(items) >= limit:
+                break
+            items.append(self._items[resource_id])
+        return items
+
+    # Aggregates
+
+    def count(self, compartment_id: Optional[str] = None, category: Optional[str] = None,
+              field: Optional[str] = None, value: Any = None) -> int:
+        """Number of items in a compartment and/or category, optionally with ``field == value``"""
+        counters = self._counts.get((compartment_id, category), {})
+        if field is None:
+            return counters.get(_TOTAL, {}).get(None, 0)
+        return counters.get(field, {}).get(value, 0)
+
+    def facets(self, compartment_id: Optional[str] = None, category: Optional[str] = None) -> Dict[str, Dict[Any, int]]:
+        """Counts of every facet value in a compartment and/or category"""
+        counters = self._counts.get((compartment_id, category), {})
+        return {field: dict(counters.get(field, {})) for field in FACET_FIELDS}
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "resources": len(self._items),
+            "compartments": len(self._by_compartment),
+            "by_category": {category: len(ids) for category, ids in self._by_category.items()},
+            "by_state": {str(state): len(ids) for state, ids in self._by_state.items()},
+        }
@@ -0,0 +1,427 @@
+"""
+Incremental inventory sync
+A background engine keeps a persistent snapshot of the tenancy inventory keyed by OCID.
+Each cycle asks Resource Search only for resources created or updated since the last
+sync (``timeCreated``/``timeUpdated`` filters), compares lifecycle states with the
+snapshot, and re-lists just the compartment/type pairs that changed. A full reconcile
+against an unfiltered search runs on a slow interval to catch anything deltas missed.
+Per-resource change events are published to in-process subscribers and WebSocket clients.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.executors import run_in_pool
+from app.services.cache_service import cache_service
+from app.services.resource_search_inventory import (
+    RESOURCE_SEARCH_AVAILABLE, RESOURCE_TYPES, TERMINAL_STATES
+)
+
+logger = logging.getLogger(__name__)
+
+Pair = Tuple[str, str]  # (compartment_id, category)
+ChangeHandler = Callable[[List[Dict[str, Any]]], Any]
+
+# Set while the engine re-lists a pair, so the getters call OCI instead of reading the snapshot
+_live_fetch: ContextVar[bool] = ContextVar("inventory_live_fetch", default=False)
+
+# Cache key prefix of each category's per-compartment listing in OCIService
+CATEGORY_CACHE_KEYS = {
+    'compute_instances': 'compute_instances',
+    'databases': 'databases',
+    'oke_clusters': 'oke',
+    'api_gateways': 'api_gateways',
+    'load_balancers': 'load_balancers',
+    'network_resources': 'network',
+    'block_volumes': 'block_volumes',
+    'file_systems': 'file_systems',
+    'object_storage_buckets': 'buckets',
+    'vaults': 'vaults',
+}
+
+# Deltas overlap the previous cycle so clock skew and search indexing lag lose nothing
+DELTA_OVERLAP = timedelta(minutes=2)
+
+
+class InventorySnapshotStore:
+    """SQLite table of inventory items keyed by OCID, with their listing position
+
+    Methods are blocking and thread-safe, call them through the ``io`` executor pool.
+    """
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS inventory_resources (
+                id TEXT PRIMARY KEY,
+                compartment_id TEXT NOT NULL,
+                category TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                payload TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_inventory_pair ON inventory_resources (compartment_id, category);
+            CREATE TABLE IF NOT EXISTS inventory_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+        """)
+
+    def load(self) -> List[Tuple[str, str, str, Dict[str, Any]]]:
+        """Every stored item as (id, compartment_id, category, item), in listing order"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, compartment_id, category, payload FROM inventory_resources "
+                "ORDER BY compartment_id, category, position"
+            ).fetchall()
+        return [(rid, compartment_id, category, json.loads(payload)) for rid, compartment_id, category, payload in rows]
+
+    def replace_pair(self, compartment_id: str, category: str, items: List[Dict[str, Any]]):
+        """Replace the items of one compartment/type pair in a single transaction"""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute(
+                    "DELETE FROM inventory_resources WHERE compartment_id = ? AND category = ?",
+                    (compartment_id, category)
+                )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO inventory_resources (id, compartment_id, category, position, payload) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [(item["id"], compartment_id, category, position, json.dumps(item, default=str))
+                     for position, item in enumerate(items)]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM inventory_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO inventory_meta (key, value) VALUES (?, ?)", (key, value))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class InventorySyncEngine:
+    """Background delta sync of the tenancy inventory into an OCID-keyed snapshot"""
+
+    def __init__(self, oci_service, path: Optional[str] = None):
+        self.oci_service = oci_service
+        self.path = path or os.path.join(cache_service.cache_dir, "inventory.db")
+        self.interval = settings.OCI_INVENTORY_SYNC_INTERVAL
+        self.reconcile_interval = settings.OCI_INVENTORY_RECONCILE_INTERVAL
+
+        self.store: Optional[InventorySnapshotStore] = None
+        # OCID -> item, OCID -> pair, pair -> OCIDs in listing order
+        self._items: Dict[str, Dict[str, Any]] = {}
+        self._pair_of: Dict[str, Pair] = {}
+        self._pairs: Dict[Pair, List[str]] = {}
+        self.ready = False
+        self.last_sync: Optional[datetime] = None
+        self.last_reconcile: Optional[datetime] = None
+        # Pairs whose refresh failed, with their expected OCIDs, retried by the next cycle
+        self._failed: Dict[Pair, Set[str]] = {}
+
+        self._handlers: List[ChangeHandler] = []
+        self._task: Optional[asyncio.Task] = None
+        self._sync_lock: Optional[asyncio.Lock] = None
+        self.stats = {"delta_syncs": 0, "reconciles": 0, "pairs_refreshed": 0, "events": 0, "errors": 0}
+
+    # Snapshot reads
+
+    def lookup(self, category: str, compartment_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Items of one compartment/type pair, or None when the snapshot cannot answer"""
+        if not self.ready or _live_fetch.get():
+            return None
+        return [self._items[rid] for rid in self._pairs.get((compartment_id, category), ())]
+
+    def get(self, resource_id: str) -> Optional[Dict[str, Any]]:
+        """One item by OCID"""
+        return self._items.get(resource_id) if self.ready else None
+
+    def all_resources(self, compartments: List[Dict[str, Any]],
+                      resource_filter: Optional[List[str]] = None) -> Dict[str, Any]:
+        """All-compartments inventory from the snapshot, in the listing response shape"""
+        compartment_names = {comp['id']: comp['name'] for comp in compartments}
+        compartment_order = {comp['id']: index for index, comp in enumerate(compartments)}
+        pairs = sorted(
+            (pair for pair in self._pairs
+             if pair[0] in compartment_names and (not resource_filter or pair[1] in resource_filter)),
+            key=lambda pair: (compartment_order[pair[0]], RESOURCE_TYPES.index(pair[1]))
+        )
+
+        aggregated_results = {rt: [] for rt in RESOURCE_TYPES}
+        for compartment_id, category in pairs:
+            source = compartment_names[compartment_id]
+            aggregated_results[category].extend(
+                {**self._items[rid], 'source_compartment': source} for rid in self._pairs[(compartment_id, category)]
+            )
+
+        total_resources = sum(len(resources) for resources in aggregated_results.values())
+        return {
+            "compartment_id": "all_compartments",
+            "resources": aggregated_results,
+            "total_resources": total_resources,
+            "last_updated": self.last_sync.isoformat() if self.last_sync else None,
+            "compartments_queried": len(compartments),
+            "inventory_backend": "snapshot",
+        }
+
+    # Change events
+
+    def subscribe(self, handler: ChangeHandler):
+        """Register a handler (sync or async) called with each batch of change events"""
+        self._handlers.append(handler)
+
+    async def _publish(self, changes: List[Dict[str, Any]]):
+        if not changes:
+            return
+        self.stats["events"] += len(changes)
+        for handler in self._handlers:
+            try:
+                result = handler(changes)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.warning(f"Inventory change handler failed: {e}")
+        try:
+            from app.core.websocket import get_websocket_manager
+            await get_websocket_manager().broadcast_resource_changes(changes)
+        except Exception as e:
+            logger.debug(f"Inventory change broadcast failed: {e}")
+
+    # Sync
+
+    async def load(self):
+        """Open the persistent snapshot; a snapshot from an earlier run is served right away"""
+        if self.store is not None:
+            return
+        self.store = await run_in_pool("io", InventorySnapshotStore, self.path)
+        rows = await run_in_pool("io", self.store.load)
+        for rid, compartment_id, category, item in rows:
+            self._index(rid, (compartment_id, category), item)
+        for compartment_id, category in self._pairs:
+            self.oci_service.inventory_index.replace_pair(
+                compartment_id, category, [self._items[rid] for rid in self._pairs[(compartment_id, category)]]
+            )
+        last_sync = await run_in_pool("io", self.store.get_meta, "last_sync")
+        last_reconcile = await run_in_pool("io", self.store.get_meta, "last_reconcile")
+        self.last_sync = datetime.fromisoformat(last_sync) if last_sync else None
+        self.last_reconcile = datetime.fromisoformat(last_reconcile) if last_reconcile else None
+        failed = await run_in_pool("io", self.store.get_meta, "failed_pairs")
+        self._failed = {(compartment_id, category): set(expected)
+                        for compartment_id, category, expected in json.loads(failed or "[]")}
+        self.ready = self.last_reconcile is not None
+        if rows:
+            logger.info(f"📦 Inventory snapshot loaded: {len(rows)} resources")
+
+    def _index(self, rid: str, pair: Pair, item: Dict[str, Any]):
+        self._items[rid] = item
+        self._pair_of[rid] = pair
+        self._pairs.setdefault(pair, []).append(rid)
+
+    def _live_ids(self, pair: Pair) -> Set[str]:
+        return {rid for rid in self._pairs.get(pair, ()) if self._items[rid].get("lifecycle_state") not in TERMINAL_STATES}
+
+    def _dirty_pairs(self, summaries: List[Dict[str, Any]], full: bool) -> Dict[Pair, Set[str]]:
+        """Pairs whose listing must be refreshed, with the live OCIDs search reported in each"""
+        dirty: Set[Pair] = set()
+        seen: Dict[Pair, Set[str]] = {}
+        for summary in summaries:
+            rid, pair = summary["id"], (summary["compartment_id"], summary["category"])
+            known_pair = self._pair_of.get(rid)
+            item = self._items.get(rid)
+            if summary["lifecycle_state"] in TERMINAL_STATES:
+                if known_pair is not None and item.get("lifecycle_state") != summary["lifecycle_state"]:
+                    dirty.add(known_pair)
+                continue
+            seen.setdefault(pair, set()).add(rid)
+            if known_pair is None or item.get("lifecycle_state") != summary["lifecycle_state"]:
+                dirty.add(pair)
+            elif known_pair != pair:
+                dirty.update((known_pair, pair))
+            elif not full:
+                # Returned by the timeUpdated filter: changed in ways search does not show
+                dirty.add(pair)
+
+        if full:
+            # Resources that vanished from search, or pairs whose membership drifted
+            for pair in set(self._pairs) | set(seen):
+                if self._live_ids(pair) != seen.get(pair, set()):
+                    dirty.add(pair)
+        return {pair: seen.get(pair, set()) for pair in dirty}
+
+    async def _refresh_pair(self, pair: Pair, expected: Set[str]) -> List[Dict[str, Any]]:
+        """Re-list one pair from OCI, update the snapshot and return its change events"""
+        compartment_id, category = pair
+        _live_fetch.set(True)
+        await cache_service.delete("oci", f"{CATEGORY_CACHE_KEYS[category]}:{compartment_id}")
+        items = await self.oci_service.category_getters()[category](compartment_id)
+        if not items and expected:
+            # The getters swallow errors and return []; never read that as mass deletion
+            raise RuntimeError(f"listing returned nothing but search found {len(expected)} resources")
+
+        old_ids = self._pairs.pop(pair, [])
+        old_items = {rid: self._items[rid] for rid in old_ids}
+        changes = []
+        for item in items:
+            rid = item["id"]
+            previous = old_items.pop(rid, None)
+            moved_from = self._pair_of.get(rid) if previous is None else None
+            if moved_from is not None and moved_from != pair:
+                # Moved between compartments: drop it from its old pair
+                self._pairs[moved_from] = [i for i in self._pairs.get(moved_from, []) if i != rid]
+                previous = self._items.get(rid)
+            if previous is None:
+                event = "created"
+            elif previous.get("lifecycle_state") != item.get("lifecycle_state"):
+                event = "state_changed"
+            elif previous != item:
+                event = "updated"
+            else:
+                event = None
+            if event:
+                changes.append({
+                    "event": event, "id": rid, "category": category, "compartment_id": compartment_id,
+                    "lifecycle_state": item.get("lifecycle_state"),
+                    "previous_state": previous.get("lifecycle_state") if previous else None,
+                })
+        for rid, previous in old_items.items():
+            if self._pair_of.get(rid) != pair:
+                continue  # Moved and already re-listed under its new pair
+            self._items.pop(rid, None)
+            self._pair_of.pop(rid, None)
+            changes.append({
+                "event": "deleted", "id": rid, "category": category, "compartment_id": compartment_id,
+                "lifecycle_state": None, "previous_state": previous.get("lifecycle_state"),
+            })
+
+        for item in items:
+            self._index(item["id"], pair, item)
+        self.oci_service.inventory_index.replace_pair(compartment_id, category, items)
+        if not self._pairs.get(pair):
+            self._pairs.pop(pair, None)
+        await run_in_pool("io", self.store.replace_pair, compartment_id, category, items)
+        return changes
+
+    async def sync_once(self, full: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """Run one delta sync, or a full reconcile when due (or forced with ``full``)"""
+        if self._sync_lock is None:
+            self._sync_lock = asyncio.Lock()
+        async with self._sync_lock:
+            await self.load()
+            now = datetime.now(timezone.utc)
+            if full is None:
+                full = (self.last_sync is None or self.last_reconcile is None
+                        or (now - self.last_reconcile).total_seconds() >= self.reconcile_interval)
+
+            search = self.oci_service.search_inventory
+            if full:
+                summaries = await search.search_summaries(RESOURCE_TYPES)
+            else:
+                since = (self.last_sync - DELTA_OVERLAP).strftime("%Y-%m-%dT%H:%M:%SZ")
+                summaries = await search.search_summaries(
+                    RESOURCE_TYPES, condition=f"timeCreated >= '{since}' || timeUpdated >= '{since}'",
+                    include_terminated=True
+                )
+
+            dirty = self._dirty_pairs(summaries, full)
+            # last_sync moves past the changes of pairs that failed, so retry them until they succeed
+            for pair, expected in self._failed.items():
+                dirty.setdefault(pair, expected)
+            results = await asyncio.gather(
+                *[self._refresh_pair(pair, expected) for pair, expected in dirty.items()], return_exceptions=True
+            )
+            changes = []
+            failed: Dict[Pair, Set[str]] = {}
+            for pair, result in zip(dirty, results):
+                if isinstance(result, BaseException):
+                    self.stats["errors"] += 1
+                    failed[pair] = dirty[pair]
+                    logger.warning(f"Inventory refresh failed for {pair[1]} in {pair[0]}: {result}")
+                    continue
+                changes.extend(result)
+
+            if failed or self._failed:
+                await run_in_pool("io", self.store.set_meta, "failed_pairs", json.dumps(
+                    [[compartment_id, category, sorted(expected)] for (compartment_id, category), expected in failed.items()]
+                ))
+            self._failed = failed
+            self.last_sync = now
+            await run_in_pool("io", self.store.set_meta, "last_sync", now.isoformat())
+            if full:
+                self.last_reconcile = now
+                await run_in_pool("io", self.store.set_meta, "last_reconcile", now.isoformat())
+                self.ready = True
+            self.stats["reconciles" if full else "delta_syncs"] += 1
+            self.stats["pairs_refreshed"] += len(dirty)
+            logger.info(
+                f"🔄 Inventory {'reconcile' if full else 'delta sync'}: {len(summaries)} search hits, "
+                f"{len(dirty)} pairs refreshed, {len(changes)} changes"
+            )
+
+        await self._publish(changes)
+        return changes
+
+    async def _run(self):
+        while True:
+            try:
+                await self.sync_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"Inventory sync failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """Start the background sync (no-op without OCI, Resource Search or when disabled)"""
+        if not (settings.OCI_INVENTORY_SYNC_ENABLED and self.oci_service.oci_available and RESOURCE_SEARCH_AVAILABLE):
+            return
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info(f"📦 Inventory sync started (every {self.interval}s, reconcile every {self.reconcile_interval}s)")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        if self.store is not None:
+            await run_in_pool("io", self.store.close)
+            self.store = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "ready": self.ready,
+            "running": bool(self._task and not self._task.done()),
+            "resources": len(self._items),
+            "pairs": len(self._pairs),
+            "failed_pairs": len(self._failed),
+            "last_sync": self.last_sync.isoformat() if self.last_sync else None,
+            "last_reconcile": self.last_reconcile.isoformat() if self.last_reconcile else None,
+        }
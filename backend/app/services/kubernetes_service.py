@@ -17,7 +17,7 @@ from kubernetes.config import ConfigException
 # Core app imports
 from app.core.config import settings
 from app.core.exceptions import BaseCustomException, ExternalServiceError
-import redis
+from app.core.redis_pool import get_redis_client
 
 logger = logging.getLogger(__name__)
 
@@ -97,22 +97,13 @@ class KubernetesService:
         
     def _setup_redis(self):
         """Setup Redis caching if available"""
-        if settings.REDIS_ENABLED:
-            try:
-                self.redis_client = redis.Redis(
-                    host=settings.REDIS_HOST,
-                    port=settings.REDIS_PORT,
-                    db=settings.REDIS_DB,
-                    decode_responses=True,
-                    socket_connect_timeout=0.5,
-                    socket_timeout=0.5,
-                    retry_on_timeout=False
-                )
-                # self.redis_client.ping()
+        try:
+            self.redis_client = get_redis_client()
+            if self.redis_client:
                 logger.info("Kubernetes service initialized with Redis caching (lazy)")
-            except Exception as e:
-                logger.info(f"Redis not available for Kubernetes service: {e}")
-                self.redis_client = None
+        except Exception as e:
+            logger.info(f"Redis not available for Kubernetes service: {e}")
+            self.redis_client = None
 
     async def configure_cluster(self, kubeconfig_content: str, cluster_name: str = "default") -> bool:
         """
@@ -250,7 +241,7 @@ class KubernetesService:
         # Check cache
         if self.redis_client:
             try:
-                cached = self.redis_client.get(cache_key)
+                cached = await self.redis_client.get(cache_key)
                 if cached:
                     return json.loads(cached)
             except Exception as e:
@@ -282,7 +273,7 @@ class KubernetesService:
             # Cache for 5 minutes
             if self.redis_client:
                 try:
-                    self.redis_client.setex(cache_key, 300, json.dumps(result, default=str))
+                    await self.redis_client.setex(cache_key, 300, json.dumps(result, default=str))
                 except Exception as e:
                     logger.debug(f"Cache write error: {e}")
             
@@ -0,0 +1,125 @@
+"""
+Batched Monitoring queries
+One ``summarize_metrics_data`` call per metric per compartment, grouped by
+``resourceId`` (``CpuUtilization[5m].groupBy(resourceId).mean()``), split into
+per-resource series client-side. Alerting and activity checks read their instances
+from the split result instead of issuing one query per instance and metric.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.cache_service import cache_service
+
+logger = logging.getLogger(__name__)
+
+try:
+    from oci.monitoring.models import SummarizeMetricsDataDetails
+    MONITORING_AVAILABLE = True
+except ImportError:
+    SummarizeMetricsDataDetails = None
+    MONITORING_AVAILABLE = False
+
+# resource id -> [(ISO timestamp, value), ...] in time order
+Series = Dict[str, List[Tuple[str, float]]]
+
+
+def build_query(metric: str, interval: str, statistic: str = "mean", group_by: str = "resourceId") -> str:
+    """MQL for one metric across every resource of a compartment, one stream per ``group_by``"""
+    return f"{metric}[{interval}].groupBy({group_by}).{statistic}()"
+
+
+def summarize(points: List[Tuple[str, float]]) -> Dict[str, Any]:
+    """Average, max, min and count of one resource's datapoints"""
+    values = [value for _, value in points]
+    if not values:
+        return {}
+    return {
+        "average": sum(values) / len(values),
+        "max": max(values),
+        "min": min(values),
+        "data_points": len(values),
+    }
+
+
+class MetricBatcher:
+    """Fetches a metric for every resource of a compartment in a single query
+
+    Results are cached per (namespace, metric, interval, statistic, compartment,
+    window) with single-flight, so concurrent alarm refreshes share one call.
+    """
+
+    def __init__(self, oci_service, namespace: str = "oci_computeagent", cache_ttl: int = 60):
+        self.oci_service = oci_service
+        self.namespace = namespace
+        self.cache_ttl = cache_ttl
+        self.stats = {"queries": 0, "series": 0, "datapoints": 0, "errors": 0}
+
+    async def fetch(self, compartment_id: str, metric: str, window: timedelta, interval: str = "5m",
+                    statistic: str = "mean", namespace: Optional[str] = None,
+                    ttl: Optional[int] = None) -> Series:
+        """Per-resource series of ``metric`` over the last ``window``
+
+        Raises when Monitoring is unavailable or the query fails; callers decide
+        whether a missing metric is an error.
+        """
+        namespace = namespace or self.namespace
+        key = f"{namespace}:{metric}[{interval}].{statistic}:{compartment_id}:{int(window.total_seconds())}"
+
+        async def produce() -> Series:
+            return await self._summarize(compartment_id, namespace, build_query(metric, interval, statistic),
+                                         window, interval)
+
+        return await cache_service.get_or_compute("metrics", key, produce, ttl=ttl or self.cache_ttl)
+
+    async def fetch_summaries(self, compartment_id: str, metric: str, window: timedelta,
+                              **kwargs) -> Dict[str, Dict[str, Any]]:
+        """``summarize`` of every resource's series"""
+        series = await self.fetch(compartment_id, metric, window, **kwargs)
+        return {resource_id: summarize(points) for resource_id, points in series.items() if points}
+
+    async def _summarize(self, compartment_id: str, namespace: str, query: str,
+                         window: timedelta, interval: str) -> Series:
+        if not self.oci_service.oci_available or not MONITORING_AVAILABLE:
+            raise RuntimeError("OCI Monitoring not available")
+
+        monitoring_client = self.oci_service._get_client('monitoring')
+        end_time = datetime.utcnow()
+        details = SummarizeMetricsDataDetails(
+            namespace=namespace,
+            query=query,
+            start_time=end_time - window,
+            end_time=end_time,
+            resolution=interval,
+        )
+        self.stats["queries"] += 1
+        try:
+            response = await self.oci_service._make_oci_call(
+                monitoring_client.summarize_metrics_data,
+                compartment_id=compartment_id,
+                summarize_metrics_data_details=details
+            )
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+
+        series: Series = {}
+        for metric_data in response.data or []:
+            resource_id = (metric_data.dimensions or {}).get("resourceId")
+            if not resource_id:
+                continue
+            points = series.setdefault(resource_id, [])
+            for datapoint in metric_data.aggregated_datapoints or []:
+                if datapoint.value is not None and datapoint.timestamp is not None:
+                    points.append((datapoint.timestamp.isoformat(), datapoint.value))
+        for points in series.values():
+            points.sort()
+
+        self.stats["series"] += len(series)
+        self.stats["datapoints"] += sum(len(points) for points in series.values())
+        logger.info(f"📈 {query} in {compartment_id[:30]}...: {len(series)} resources in one query")
+        return series
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats)
@@ -0,0 +1,338 @@
+"""
+Local metric time-series store
+Keeps Monitoring datapoints per (namespace, metric, resource) in NumPy ring buffers:
+raw 1-minute points plus 5-minute and 1-hour rollups. A windowed query fetches from
+OCI only the part of the window earlier queries have not covered, then serves
+points, aggregates and percentiles from memory, so a sliding dashboard window
+downloads just its newest minutes on each refresh.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Safe import guard for optional dependency
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Bucket size in seconds -> MQL interval
+INTERVALS = {60: "1m", 300: "5m", 3600: "1h"}
+
+# Queries serialize their fetches on one of this many locks, picked by hashing the query
+LOCK_STRIPES = 64
+
+SeriesKey = Tuple[str, str, str]  # (namespace, metric, resource)
+QueryKey = Tuple[str, str, str, Optional[str]]  # (compartment_id, namespace, metric, resource_group)
+
+# Fetches [start, end) at the given interval: resource -> [(timestamp, value), ...]
+Fetch = Callable[[datetime, datetime, str], Awaitable[Dict[str, List[Tuple[datetime, float]]]]]
+
+
+def epoch(value: datetime) -> int:
+    """Seconds since the epoch; naive datetimes are taken as UTC"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def from_epoch(seconds: int) -> datetime:
+    return datetime.fromtimestamp(seconds, tz=timezone.utc)
+
+
+class Window(NamedTuple):
+    """Buckets of one series inside a query window (only buckets holding data)"""
+    timestamps: "np.ndarray"  # Bucket start, seconds since the epoch
+    means: "np.ndarray"
+    sums: "np.ndarray"
+    counts: "np.ndarray"  # Minutes of data behind each bucket
+    mins: "np.ndarray"
+    maxs: "np.ndarray"
+
+
+class _Tier:
+    """Ring of consecutive ``step``-second buckets ending at ``head``
+
+    Buckets hold the sum and count (in minutes) of their datapoints, so rollups of
+    rollups keep exact means; rollup tiers also hold min and max. A zero count marks
+    an empty bucket.
+    """
+
+    __slots__ = ("step", "capacity", "head", "sum", "count", "min", "max")
+
+    def __init__(self, step: int, capacity: int, extremes: bool):
+        self.step = step
+        self.capacity = capacity
+        self.head: Optional[int] = None
+        self.sum = np.zeros(capacity, np.float32)
+        self.count = np.zeros(capacity, np.uint16)
+        self.min = np.zeros(capacity, np.float32) if extremes else None
+        self.max = np.zeros(capacity, np.float32) if extremes else None
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in (self.sum, self.count, self.min, self.max) if a is not None)
+
+    def oldest(self) -> Optional[int]:
+        return None if self.head is None else self.head - self.capacity + 1
+
+    def _advance(self, bucket: int):
+        if self.head is None:
+            self.head = bucket
+            return
+        if bucket <= self.head:
+            return
+        if bucket - self.head >= self.capacity:
+            self.count[:] = 0
+        else:
+            self.count[np.arange(self.head + 1, bucket + 1) % self.capacity] = 0
+        self.head = bucket
+
+    def write(self, buckets, sums, counts, mins, maxs):
+        """Overwrite buckets; ones older than the ring holds are dropped"""
+        self._advance(int(buckets.max()))
+        keep = buckets > self.head - self.capacity
+        slots = buckets[keep] % self.capacity
+        shape = buckets.shape
+        self.sum[slots] = np.broadcast_to(sums, shape)[keep]
+        self.count[slots] = np.broadcast_to(counts, shape)[keep]
+        if self.min is not None:
+            self.min[slots] = np.broadcast_to(mins, shape)[keep]
+            self.max[slots] = np.broadcast_to(maxs, shape)[keep]
+
+    def read(self, first: int, last: int) -> Tuple["np.ndarray", ...]:
+        """Non-empty buckets between ``first`` and ``last`` (inclusive), oldest first"""
+        if self.head is not None:
+            first, last = max(first, self.oldest()), min(last, self.head)
+        if self.head is None or first > last:
+            empty = np.empty(0, np.int64)
+            return empty, empty.astype(np.float32), empty.astype(np.uint16), empty, empty
+        buckets = np.arange(first, last + 1, dtype=np.int64)
+        slots = buckets % self.capacity
+        present = self.count[slots] > 0
+        buckets, slots = buckets[present], slots[present]
+        sums, counts = self.sum[slots], self.count[slots]
+        if self.min is None:
+            means = sums / counts
+            return buckets, sums, counts, means, means
+        return buckets, sums, counts, self.min[slots], self.max[slots]
+
+    def roll_up(self, fine: "_Tier", changed) -> "np.ndarray":
+        """Recompute the buckets covering ``changed`` fine buckets; returns the buckets rewritten
+
+        Buckets reaching back past what ``fine`` still holds keep their own data.
+        """
+        ratio = self.step // fine.step
+        groups = np.unique(changed // ratio)
+        groups = groups[groups * ratio >= fine.oldest()]
+        if not len(groups):
+            return groups
+        buckets, sums, counts, mins, maxs = fine.read(int(groups[0]) * ratio, (int(groups[-1]) + 1) * ratio - 1)
+        owner = buckets // ratio
+        keep = np.isin(owner, groups)
+        if not keep.any():
+            return owner[keep]
+        owner, sums, counts, mins, maxs = owner[keep], sums[keep], counts[keep], mins[keep], maxs[keep]
+        rolled, starts = np.unique(owner, return_index=True)
+        self.write(
+            rolled, np.add.reduceat(sums, starts), np.add.reduceat(counts, starts),
+            np.minimum.reduceat(mins, starts), np.maximum.reduceat(maxs, starts)
+        )
+        return rolled
+
+
+class MetricSeries:
+    """One metric stream at 1m, 5m and 1h resolution"""
+
+    def __init__(self, capacities: Dict[int, int]):
+        steps = sorted(capacities)
+        self.tiers = [_Tier(step, capacities[step], extremes=i > 0) for i, step in enumerate(steps)]
+        self._index = {step: i for i, step in enumerate(steps)}
+
+    @property
+    def nbytes(self) -> int:
+        return sum(tier.nbytes for tier in self.tiers)
+
+    def insert(self, timestamps, values, step: int = 60):
+        """Store datapoints fetched at ``step`` resolution and refresh the coarser rollups"""
+        if not len(timestamps):
+            return
+        index = self._index[step]
+        weight = step // 60
+        values = np.asarray(values, np.float32)
+        buckets = np.asarray(timestamps, np.int64) // step
+        self.tiers[index].write(buckets, values * weight, weight, values, values)
+        changed = np.unique(buckets)
+        for fine, coarse in zip(self.tiers[index:], self.tiers[index + 1:]):
+            changed = coarse.roll_up(fine, changed)
+            if not len(changed):
+                break
+
+    def window(self, start: int, end: int, step: int) -> Window:
+        """Buckets of the ``step`` tier starting in [start, end)"""
+        tier = self.tiers[self._index[step]]
+        buckets, sums, counts, mins, maxs = tier.read(start // step, (end - 1) // step)
+        return Window(buckets * step, sums / np.maximum(counts, 1), sums, counts, mins, maxs)
+
+
+def aggregate(windows: Iterable[Window], percentiles: Iterable[int] = (50, 95, 99)) -> Dict[str, Optional[float]]:
+    """Time-weighted mean, min, max and bucket-mean percentiles over one or more windows"""
+    windows = [w for w in windows if len(w.timestamps)]
+    result: Dict[str, Optional[float]] = {"count": sum(len(w.timestamps) for w in windows)}
+    if not windows:
+        return {**result, "mean": None, "min": None, "max": None, **{f"p{p}": None for p in percentiles}}
+    means = np.concatenate([w.means for w in windows])
+    total = float(sum(w.sums.sum(dtype=np.float64) for w in windows))
+    minutes = int(sum(w.counts.sum(dtype=np.int64) for w in windows))
+    result.update({
+        "mean": total / minutes,
+        "min": float(min(w.mins.min() for w in windows)),
+        "max": float(max(w.maxs.max() for w in windows)),
+    })
+    for p, value in zip(percentiles, np.percentile(means, list(percentiles))):
+        result[f"p{p}"] = float(value)
+    return result
+
+
+def _gaps(covered: List[List[int]], start: int, end: int) -> List[Tuple[int, int]]:
+    gaps, cursor = [], start
+    for low, high in covered:
+        if high <= cursor:
+            continue
+        if low >= end:
+            break
+        if low > cursor:
+            gaps.append((cursor, low))
+        cursor = max(cursor, high)
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+def _cover(covered: List[List[int]], start: int, end: int):
+    covered.append([start, end])
+    covered.sort()
+    merged = [covered[0]]
+    for low, high in covered[1:]:
+        if low <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], high)
+        else:
+            merged.append([low, high])
+    covered[:] = merged
+
+
+class MetricStore:
+    """Per-series ring buffers plus the time ranges each Monitoring query has covered
+
+    ``retention`` maps bucket seconds (60, 300, 3600) to how many seconds each tier
+    keeps; a query is served from the finest tier whose retention reaches back to
+    its start. The most recent ``settle_seconds`` are never marked covered, since
+    Monitoring may still revise them. At most ``max_series`` series are kept (least
+    recently queried first out).
+    """
+
+    def __init__(self, retention: Dict[int, int], max_series: int = 10000, settle_seconds: int = 120):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("NumPy is required for the metric store")
+        self.retention = dict(retention)
+        self.capacities = {step: max(1, seconds // step) for step, seconds in self.retention.items()}
+        self.max_series = max_series
+        self.settle_seconds = settle_seconds
+        self._series: "OrderedDict[SeriesKey, MetricSeries]" = OrderedDict()
+        # Query -> bucket seconds -> merged [start, end) ranges already fetched
+        self._coverage: Dict[QueryKey, Dict[int, List[List[int]]]] = {}
+        self._members: Dict[QueryKey, Set[SeriesKey]] = {}
+        self._queries_of: Dict[SeriesKey, Set[QueryKey]] = {}
+        self._locks: List[asyncio.Lock] = [asyncio.Lock() for _ in range(LOCK_STRIPES)]
+        self.stats = {"queries": 0, "local_hits": 0, "fetches": 0, "points_inserted": 0,
+                      "seconds_fetched": 0, "seconds_served": 0, "evictions": 0}
+
+    def step_for(self, start: int, now: int) -> int:
+        """Finest bucket size whose retention still reaches back to ``start``"""
+        for step in sorted(self.retention):
+            if start >= now - self.retention[step]:
+                return step
+        return max(self.retention)
+
+    def series(self, key: SeriesKey) -> MetricSeries:
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = MetricSeries(self.capacities)
+            while len(self._series) > self.max_series:
+                self._evict(next(iter(self._series)))
+        else:
+            self._series.move_to_end(key)
+        return series
+
+    def _evict(self, key: SeriesKey):
+        self._series.pop(key, None)
+        self.stats["evictions"] += 1
+        # The queries it belonged to have to refetch their ranges
+        for query in self._queries_of.pop(key, ()):
+            self._coverage.pop(query, None)
+            for member in self._members.pop(query, ()):
+                if member != key:
+                    self._queries_of.get(member, set()).discard(query)
+
+    def insert(self, query: QueryKey, resource: str, points: List[Tuple[datetime, float]], step: int = 60):
+        """Store one fetched stream of ``query``"""
+        key = (query[1], query[2], resource)
+        self._members.setdefault(query, set()).add(key)
+        self._queries_of.setdefault(key, set()).add(query)
+        if points:
+            timestamps = [ts.timestamp() if ts.tzinfo is not None else epoch(ts) for ts, _ in points]
+            self.series(key).insert(timestamps, [value for _, value in points], step)
+            self.stats["points_inserted"] += len(points)
+
+    async def query(self, query: QueryKey, start: datetime, end: datetime, fetch: Fetch,
+                    now: Optional[datetime] = None) -> Tuple[int, Dict[str, Window]]:
+        """Windows of every series of ``query`` over [start, end); returns (bucket seconds, windows)
+
+        Only the parts of the window not covered by earlier calls are fetched.
+        """
+        now_s = epoch(now or datetime.utcnow())
+        start_s, end_s = epoch(start), min(epoch(end), now_s)
+        step = self.step_for(start_s, now_s)
+        start_s = start_s // step * step
+        self.stats["queries"] += 1
+
+        async with self._locks[hash(query) % LOCK_STRIPES]:
+            covered = self._coverage.setdefault(query, {}).setdefault(step, [])
+            floor = now_s - self.retention[step]
+            covered[:] = [[max(low, floor), high] for low, high in covered if high > floor]
+            gaps = _gaps(covered, start_s, end_s)
+            settled = (now_s - self.settle_seconds) // step * step
+            for gap_start, gap_end in gaps:
+                streams = await fetch(from_epoch(gap_start), from_epoch(gap_end), INTERVALS[step])
+                self.stats["fetches"] += 1
+                self.stats["seconds_fetched"] += gap_end - gap_start
+                for resource, points in streams.items():
+                    self.insert(query, resource, points, step)
+                if min(gap_end, settled) > gap_start:
+                    _cover(covered, gap_start, min(gap_end, settled))
+            if not gaps:
+                self.stats["local_hits"] += 1
+            self.stats["seconds_served"] += max(0, end_s - start_s)
+
+            windows = {}
+            for key in self._members.get(query, ()):
+                series = self._series.get(key)
+                if series is not None:
+                    self._series.move_to_end(key)
+                    windows[key[2]] = series.window(start_s, end_s, step)
+        return step, windows
+
+    def get_stats(self) -> Dict[str, object]:
+        return {
+            **self.stats,
+            "series": len(self._series),
+            "tracked_queries": len(self._coverage),
+            "memory_bytes": sum(series.nbytes for series in self._series.values()),
+        }
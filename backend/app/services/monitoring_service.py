@@ -1,18 +1,27 @@
 import asyncio
+import hashlib
 import logging
+import time
 import oci
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, List, Any, Optional
 from dataclasses import dataclass, asdict
 from enum import Enum
 import json
 
+from app.core.config import settings
 from app.core.exceptions import ExternalServiceError
 from app.services.cloud_service import get_oci_service
 from app.services.cache_service import cache_service
+from app.services.alarm_status import AlarmStatusView, count_alarms, definition_to_dict, status_to_dict
+from app.services.alert_rules import AlertRuleEngine, MetricFrame
+from app.services.metric_store import INTERVALS, NUMPY_AVAILABLE, MetricStore, aggregate
 
 logger = logging.getLogger(__name__)
 
+# OCI alarm severities (CRITICAL, ERROR, WARNING, INFO) in terms of AlertSeverity
+OCI_ALARM_SEVERITIES = {"ERROR": "HIGH", "WARNING": "MEDIUM"}
+
 class AlertSeverity(Enum):
     """Alert severity levels"""
     CRITICAL = "CRITICAL"
@@ -65,6 +74,23 @@ class MonitoringService:
     def __init__(self):
         self.oci_service = get_oci_service()
         self.cache_ttl = 300  # 5 minutes default cache
+        # Sliding metric windows are served locally; only uncovered ranges hit OCI
+        self.metric_store = MetricStore(
+            retention={
+                60: settings.METRIC_STORE_RAW_HOURS * 3600,
+                300: settings.METRIC_STORE_5M_HOURS * 3600,
+                3600: settings.METRIC_STORE_1H_DAYS * 86400,
+            },
+            max_series=settings.METRIC_STORE_MAX_SERIES
+        ) if NUMPY_AVAILABLE else None
+        # Metric alert rules with firing/resolved state kept between evaluations
+        self.alert_engine = AlertRuleEngine() if NUMPY_AVAILABLE else None
+        # Compartment -> (start time, task) of this worker's latest rule evaluation
+        self._metric_evaluations: Dict[str, tuple] = {}
+        # Tenancy-wide alarm view and a digest of the cached listings it was built from
+        self._alarm_view: Optional[AlarmStatusView] = None
+        self._alarm_view_digest: Optional[str] = None
+        self._alarm_ids_refreshed: set = set()
         
     def _get_monitoring_client(self):
         """Get OCI monitoring client or None in dummy mode"""
@@ -84,63 +110,158 @@ class MonitoringService:
             return None
         return self.oci_service._get_client('log_search')
 
-    async def get_alarm_status(self, compartment_id: str) -> List[Dict[str, Any]]:
-        """Get all alarms from OCI plus resource-based alerts"""
-        cache_key = f"alarm_status_{compartment_id}"
-        cached_data = await cache_service.get("monitoring", cache_key)
-        if cached_data:
-            logger.info(f"🔄 Using cached alarm status for compartment {compartment_id}")
-            return cached_data
+    async def _list_alarm_definitions(self) -> List[Dict[str, Any]]:
+        """Alarm definitions of the whole tenancy, following every page"""
+        monitoring_client = self._get_monitoring_client()
+        definitions = []
+        async for page in self.oci_service._iter_pages(
+            monitoring_client.list_alarms,
+            compartment_id=self.oci_service.config['tenancy'],
+            compartment_id_in_subtree=True
+        ):
+            definitions.extend(definition_to_dict(alarm) for alarm in page)
+        logger.info(f"📊 Listed {len(definitions)} OCI alarm definitions across the tenancy")
+        return definitions
+
+    async def _list_alarm_statuses(self) -> List[Dict[str, Any]]:
+        """Firing status of every alarm in the tenancy, following every page"""
+        monitoring_client = self._get_monitoring_client()
+        statuses = []
+        async for page in self.oci_service._iter_pages(
+            monitoring_client.list_alarms_status,
+            compartment_id=self.oci_service.config['tenancy'],
+            compartment_id_in_subtree=True
+        ):
+            statuses.extend(status_to_dict(status) for status in page)
+        firing = sum(1 for status in statuses if status["status"] == "FIRING")
+        logger.info(f"📊 Listed status of {len(statuses)} OCI alarms ({firing} firing)")
+        return statuses
+
+    async def get_alarm_view(self) -> AlarmStatusView:
+        """Tenancy-wide alarm definitions merged with their status, indexed by compartment
+        
+        Definitions and statuses are cached separately (``ALARM_DEFINITIONS_TTL`` and
+        ``ALARM_STATUS_TTL``) and the view is rebuilt only when either listing changes.
+        Statuses of alarms created since the definitions were listed refresh the
+        definitions once.
+        """
+        definitions = await cache_service.get_or_compute(
+            "monitoring", "alarm_definitions", self._list_alarm_definitions, ttl=settings.ALARM_DEFINITIONS_TTL
+        )
+        statuses = await cache_service.get_or_compute(
+            "monitoring", "alarm_statuses", self._list_alarm_statuses, ttl=settings.ALARM_STATUS_TTL
+        )
+        # Redis hands back fresh copies on every read, so compare content rather than identity
+        digest = self._listing_digest(definitions, statuses)
+        if self._alarm_view is not None and digest == self._alarm_view_digest:
+            return self._alarm_view
+
+        view = AlarmStatusView(definitions, statuses)
+        unknown = set(view.unknown_ids) - self._alarm_ids_refreshed
+        if unknown:
+            logger.info(f"🔄 {len(unknown)} alarms have status but no cached definition - refreshing definitions")
+            self._alarm_ids_refreshed |= unknown
+            await cache_service.delete("monitoring", "alarm_definitions")
+            definitions = await cache_service.get_or_compute(
+                "monitoring", "alarm_definitions", self._list_alarm_definitions, ttl=settings.ALARM_DEFINITIONS_TTL
+            )
+            view = AlarmStatusView(definitions, statuses)
+            digest = self._listing_digest(definitions, statuses)
+        self._alarm_view, self._alarm_view_digest = view, digest
+        return view
+
+    @staticmethod
+    def _listing_digest(definitions: List[Dict[str, Any]], statuses: List[Dict[str, Any]]) -> str:
+        return hashlib.sha256(json.dumps([definitions, statuses], sort_keys=True, default=str).encode()).hexdigest()
+
+    async def _list_compartment_alarms(self, compartment_id: str) -> List[Dict[str, Any]]:
+        """Alarm definitions of one compartment (without status)"""
+        logger.info(f"🔍 Fetching alarms for compartment {compartment_id}")
+        response = await self.oci_service._make_oci_call(
+            self._get_monitoring_client().list_alarms,
+            compartment_id=compartment_id
+        )
+        logger.info(f"📊 Found {len(response.data)} OCI alarms in compartment {compartment_id}")
+        return [definition_to_dict(alarm) for alarm in response.data]
+
+    async def _get_oci_alarms(self, compartment_id: str, include_subtree: bool = False):
+        """OCI alarms of the compartment (or its subtree) with their status, and their counts
+        
+        Read from the tenancy-wide view; when that cannot be listed (e.g. no
+        tenancy-level permission) the compartment's own alarms are listed without status.
+        """
+        try:
+            view = await self.get_alarm_view()
+            scope = [compartment_id]
+            if include_subtree:
+                tree = await self.oci_service.get_compartment_tree()
+                scope = tree.subtree(compartment_id) or scope
+            return view.alarms(scope), view.counts(scope)
+        except Exception as e:
+            logger.warning(f"⚠️ Tenancy-wide alarm status unavailable, listing compartment alarms: {e}")
+            alarms = await cache_service.get_or_compute(
+                "monitoring", f"alarm_status_{compartment_id}",
+                lambda: self._list_compartment_alarms(compartment_id), ttl=self.cache_ttl
+            )
+            return alarms, count_alarms(alarms)
+
+    async def _get_resource_alerts(self, compartment_id: str) -> List[Dict[str, Any]]:
+        """State-based alerts (evaluated at most once per interval) plus firing metric alerts"""
+        # Single-flight: concurrent dashboard refreshes, on every worker, share one resource evaluation
+        resource_alerts = await cache_service.get_or_compute(
+            "monitoring", f"resource_alerts_{compartment_id}",
+            lambda: self._generate_resource_alerts(compartment_id),
+            ttl=settings.ALERT_EVALUATION_INTERVAL
+        )
+        # The rule engine's state is per worker, so each worker evaluates its metric rules itself
+        await self._refresh_metric_alerts(compartment_id)
+        return resource_alerts + self._get_metric_alerts(compartment_id)
+
+    async def _refresh_metric_alerts(self, compartment_id: str):
+        """Evaluate this worker's metric rules for a compartment at most once per interval
+
+        Concurrent callers share the running evaluation. The metric data comes from
+        the shared cache, so workers evaluating the same compartment query OCI once.
+        """
+        if self.alert_engine is None:
+            return
+        now = time.monotonic()
+        started, evaluation = self._metric_evaluations.get(compartment_id, (0.0, None))
+        if evaluation is None or (evaluation.done() and now - started >= settings.ALERT_EVALUATION_INTERVAL):
+            evaluation = asyncio.create_task(self._evaluate_compartment_rules(compartment_id))
+            self._metric_evaluations[compartment_id] = (now, evaluation)
+        await asyncio.shield(evaluation)
+
+    async def _evaluate_compartment_rules(self, compartment_id: str):
+        try:
+            instances = await self.oci_service.get_compute_instances(compartment_id)
+            # Every running instance is evaluated, which also resolves alerts of instances gone
+            running = [instance for instance in instances if instance["lifecycle_state"] == "RUNNING"]
+            await self._evaluate_metric_rules(compartment_id, running)
+        except Exception as e:
+            logger.error(f"❌ Failed to evaluate metric alert rules for compartment {compartment_id}: {e}")
 
+    async def get_alarm_status(self, compartment_id: str, include_subtree: bool = False) -> List[Dict[str, Any]]:
+        """Get OCI alarms with their firing status plus resource-based alerts
+        
+        With ``include_subtree``, OCI alarms of every compartment below are included;
+        resource alerts are always those of the compartment itself.
+        """
         if not self.oci_service.oci_available:
             logger.error("OCI unavailable - cannot fetch alarms")
             return []
 
-
-        monitoring_client = self._get_monitoring_client()
-        if not monitoring_client:
+        if not self._get_monitoring_client():
             # In dummy mode, already handled above; extra guard here
             logger.info("Monitoring client not available - returning empty list")
             return []
-        
-        logger.info(f"🔍 Fetching alarm status for compartment {compartment_id}")
-        
+
         try:
-            # Get OCI-configured alarms
-            response = await self.oci_service._make_oci_call(
-                monitoring_client.list_alarms,
-                compartment_id=compartment_id
-            )
-            
-            logger.info(f"📊 Found {len(response.data)} OCI alarms in compartment {compartment_id}")
-            
-            alarms = []
-            for alarm in response.data:
-                alarm_data = {
-                    "id": alarm.id,
-                    "display_name": alarm.display_name,
-                    "severity": alarm.severity or "MEDIUM",
-                    "lifecycle_state": alarm.lifecycle_state,
-                    "is_enabled": alarm.is_enabled,
-                    "metric_compartment_id": alarm.metric_compartment_id,
-                    "namespace": alarm.namespace,
-                    "query": alarm.query,
-                    "rule_name": getattr(alarm, 'rule_name', ''),
-                    "time_created": alarm.time_created.isoformat() if alarm.time_created else None,
-                    "time_updated": alarm.time_updated.isoformat() if alarm.time_updated else None,
-                    "source": "oci_alarm"
-                }
-                alarms.append(alarm_data)
-                logger.debug(f"  📋 OCI Alarm: {alarm.display_name} | State: {alarm.lifecycle_state} | Enabled: {alarm.is_enabled}")
+            alarms, counts = await self._get_oci_alarms(compartment_id, include_subtree)
+            resource_alerts = await self._get_resource_alerts(compartment_id)
             
-            # Generate resource-based alerts (the CRITICAL addition!)
-            resource_alerts = await self._generate_resource_alerts(compartment_id)
-            alarms.extend(resource_alerts)
-            
-            # Cache the results
-            await cache_service.set("monitoring", cache_key, alarms, ttl=self.cache_ttl)
-            logger.info(f"✅ Successfully retrieved {len(response.data)} OCI alarms + {len(resource_alerts)} resource alerts = {len(alarms)} total alerts")
-            return alarms
+            logger.info(f"✅ Retrieved {len(alarms)} OCI alarms ({counts['firing']} firing) + {len(resource_alerts)} resource alerts")
+            return alarms + resource_alerts
             
         except Exception as e:
             logger.error(f"❌ Failed to get alarm status for compartment {compartment_id}: {e}")
@@ -148,7 +269,10 @@ class MonitoringService:
             raise ExternalServiceError(f"Failed to fetch OCI alarms: {str(e)}")
 
     async def _generate_resource_alerts(self, compartment_id: str) -> List[Dict[str, Any]]:
-        """Generate comprehensive alerts based on resource states AND metrics"""
+        """Generate alerts based on resource states
+        
+        Metric alerts are evaluated per worker (see ``_refresh_metric_alerts``).
+        """
         resource_alerts = []
         current_time = datetime.utcnow()
         
@@ -156,10 +280,6 @@ class MonitoringService:
             # 1. COMPUTE INSTANCE MONITORING
             instances = await self.oci_service.get_compute_instances(compartment_id)
             
-            # Prepare tasks for parallel metric fetching
-            metric_tasks = []
-            running_instances = []
-            
             for instance in instances:
                 # State-based alerts (Fast, keep sequential)
                 if instance["lifecycle_state"] == "STOPPED":
@@ -190,23 +310,6 @@ class MonitoringService:
                         current_time=current_time
                     )
                     resource_alerts.append(alert)
-                
-                # Metrics-based alerts for RUNNING instances (Slow, needs parallelization)
-                elif instance["lifecycle_state"] == "RUNNING":
-                    metric_tasks.append(self._generate_compute_metrics_alerts(instance, compartment_id, current_time))
-                    running_instances.append(instance)
-
-            # Execute metric tasks in parallel
-            if metric_tasks:
-                logger.info(f"🚀 Launching parallel metric checks for {len(metric_tasks)} instances...")
-                metric_results = await asyncio.gather(*metric_tasks, return_exceptions=True)
-                
-                for i, result in enumerate(metric_results):
-                    if isinstance(result, Exception):
-                        instance_name = running_instances[i]['display_name']
-                        logger.error(f"Failed to check metrics for {instance_name}: {result}")
-                    elif result: # result is a list of alerts
-                        resource_alerts.extend(result)
 
             # 2. DATABASE MONITORING
             databases = await self.oci_service.get_databases(compartment_id)
@@ -231,7 +334,7 @@ class MonitoringService:
             storage_alerts = await self._generate_storage_alerts(compartment_id, current_time)
             resource_alerts.extend(storage_alerts)
 
-            logger.info(f"✅ Generated {len(resource_alerts)} comprehensive resource alerts (state + metrics)")
+            logger.info(f"✅ Generated {len(resource_alerts)} resource state alerts")
             return resource_alerts
             
         except Exception as e:
@@ -262,85 +365,59 @@ class MonitoringService:
             "description": description
         }
 
-    async def _generate_compute_metrics_alerts(self, instance: Dict[str, Any], compartment_id: str, current_time: datetime) -> List[Dict[str, Any]]:
-        """Generate CPU and memory utilization alerts for running compute instances"""
-        alerts = []
+    async def _evaluate_metric_rules(self, compartment_id: str, instances: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Evaluate the alert rules over the instances' metrics; returns and broadcasts the transitions"""
+        if self.alert_engine is None:
+            return []
+        resources = {instance['id']: instance['display_name'] for instance in instances}
+        metrics = sorted(self.alert_engine.metrics) if resources else []
+        window = timedelta(minutes=10)
+        results = await asyncio.gather(
+            *(self.oci_service.metric_batcher.fetch(compartment_id, metric, window) for metric in metrics),
+            return_exceptions=True
+        )
         
-        try:
-            # Get real-time metrics for the instance
-            end_time = current_time
-            start_time = end_time - timedelta(minutes=10)  # Last 10 minutes
-            
-            # CPU Utilization Monitoring
-            cpu_metrics = await self._get_instance_cpu_metrics(instance['id'], compartment_id, start_time, end_time)
-            if cpu_metrics and 'average_cpu' in cpu_metrics:
-                cpu_avg = cpu_metrics['average_cpu']
-                
-                # CPU threshold alerts
-                if cpu_avg > 90:
-                    alerts.append(self._create_resource_alert(
-                        resource_id=instance['id'],
-                        resource_name=instance['display_name'],
-                        resource_type="compute_instance",
-                        alert_type="CPU_CRITICAL",
-                        severity="CRITICAL",
-                        compartment_id=compartment_id,
-                        description=f"CPU utilization critically high: {cpu_avg:.1f}% (threshold: 90%)",
-                        namespace="oci_computeagent",
-                        current_time=current_time
-                    ))
-                elif cpu_avg > 80:
-                    alerts.append(self._create_resource_alert(
-                        resource_id=instance['id'],
-                        resource_name=instance['display_name'],
-                        resource_type="compute_instance",
-                        alert_type="CPU_HIGH",
-                        severity="HIGH",
-                        compartment_id=compartment_id,
-                        description=f"CPU utilization high: {cpu_avg:.1f}% (threshold: 80%)",
-                        namespace="oci_computeagent",
-                        current_time=current_time
-                    ))
-
-            # Memory Utilization Monitoring
-            memory_metrics = await self._get_instance_memory_metrics(instance['id'], compartment_id, start_time, end_time)
-            if memory_metrics and 'average_memory' in memory_metrics:
-                memory_avg = memory_metrics['average_memory']
-                
-                # Memory threshold alerts
-                if memory_avg > 95:
-                    alerts.append(self._create_resource_alert(
-                        resource_id=instance['id'],
-                        resource_name=instance['display_name'],
-                        resource_type="compute_instance",
-                        alert_type="MEMORY_CRITICAL",
-                        severity="CRITICAL",
-                        compartment_id=compartment_id,
-                        description=f"Memory utilization critically high: {memory_avg:.1f}% (threshold: 95%)",
-                        namespace="oci_computeagent",
-                        current_time=current_time
-                    ))
-                elif memory_avg > 85:
-                    alerts.append(self._create_resource_alert(
-                        resource_id=instance['id'],
-                        resource_name=instance['display_name'],
-                        resource_type="compute_instance",
-                        alert_type="MEMORY_HIGH",
-                        severity="HIGH",
-                        compartment_id=compartment_id,
-                        description=f"Memory utilization high: {memory_avg:.1f}% (threshold: 85%)",
-                        namespace="oci_computeagent",
-                        current_time=current_time
-                    ))
-
-            if alerts:
-                logger.info(f"📊 Generated {len(alerts)} metrics-based alerts for instance {instance['display_name']}")
-            
-            return alerts
-            
-        except Exception as e:
-            logger.error(f"❌ Failed to generate compute metrics alerts for {instance['display_name']}: {e}")
+        frames = {}
+        for metric, result in zip(metrics, results):
+            if isinstance(result, Exception):
+                # Rules on this metric keep their state until the next evaluation
+                logger.debug(f"Could not fetch {metric} for compartment {compartment_id}: {result}")
+                continue
+            frames[metric] = MetricFrame(list(resources), result)
+        
+        transitions = self.alert_engine.evaluate(compartment_id, resources, frames)
+        if transitions:
+            try:
+                from app.core.websocket import get_websocket_manager
+                await get_websocket_manager().broadcast_alert({
+                    "compartment_id": compartment_id,
+                    "transitions": transitions
+                })
+            except Exception as e:
+                logger.debug(f"Alert transition broadcast failed: {e}")
+        return transitions
+
+    def _get_metric_alerts(self, compartment_id: str) -> List[Dict[str, Any]]:
+        """Firing metric alerts of the compartment, as kept by the rule engine"""
+        if self.alert_engine is None:
             return []
+        alerts = []
+        for active in self.alert_engine.active(compartment_id):
+            rule = active["rule"]
+            alert = self._create_resource_alert(
+                resource_id=active['resource_id'],
+                resource_name=active['resource_name'],
+                resource_type=rule.resource_type,
+                alert_type=rule.name,
+                severity=rule.severity,
+                compartment_id=compartment_id,
+                description=active['description'],
+                namespace=rule.namespace,
+                current_time=active['fired_at']
+            )
+            alert.update(metric_name=rule.metric, threshold_value=rule.threshold, current_value=active['value'])
+            alerts.append(alert)
+        return alerts
 
     async def _generate_storage_alerts(self, compartment_id: str, current_time: datetime) -> List[Dict[str, Any]]:
         """Generate block storage utilization alerts"""
@@ -365,96 +442,6 @@ class MonitoringService:
             logger.error(f"❌ Failed to generate storage alerts: {e}")
             return []
 
-    async def _get_instance_cpu_metrics(self, instance_id: str, compartment_id: str, start_time: datetime, end_time: datetime) -> Dict[str, Any]:
-        """Get real CPU metrics from OCI Monitoring"""
-        try:
-            monitoring_client = self._get_monitoring_client()
-            if not monitoring_client:
-                return {}
-            
-            # Build CPU utilization query
-            query = f'CpuUtilization[1m]{{resourceId="{instance_id}"}}.mean()'
-            
-            metrics_request = oci.monitoring.models.SummarizeMetricsDataDetails(
-                namespace="oci_computeagent",
-                query=query,
-                compartment_id=compartment_id,
-                start_time=start_time,
-                end_time=end_time,
-                resolution="1m"
-            )
-            
-            response = await self.oci_service._make_oci_call(
-                monitoring_client.summarize_metrics_data,
-                summarize_metrics_data_details=metrics_request
-            )
-            
-            # Process CPU data
-            cpu_values = []
-            for metric in response.data:
-                for data_point in metric.aggregated_datapoints:
-                    if data_point.value is not None:
-                        cpu_values.append(data_point.value)
-            
-            if cpu_values:
-                return {
-                    "average_cpu": sum(cpu_values) / len(cpu_values),
-                    "max_cpu": max(cpu_values),
-                    "min_cpu": min(cpu_values),
-                    "data_points": len(cpu_values)
-                }
-            
-            return {}
-            
-        except Exception as e:
-            logger.debug(f"Could not fetch CPU metrics for {instance_id}: {e}")
-            return {}
-
-    async def _get_instance_memory_metrics(self, instance_id: str, compartment_id: str, start_time: datetime, end_time: datetime) -> Dict[str, Any]:
-        """Get real memory metrics from OCI Monitoring"""
-        try:
-            monitoring_client = self._get_monitoring_client()
-            if not monitoring_client:
-                return {}
-            
-            # Build memory utilization query
-            query = f'MemoryUtilization[1m]{{resourceId="{instance_id}"}}.mean()'
-            
-            metrics_request = oci.monitoring.models.SummarizeMetricsDataDetails(
-                namespace="oci_computeagent",
-                query=query,
-                compartment_id=compartment_id,
-                start_time=start_time,
-                end_time=end_time,
-                resolution="1m"
-            )
-            
-            response = await self.oci_service._make_oci_call(
-                monitoring_client.summarize_metrics_data,
-                summarize_metrics_data_details=metrics_request
-            )
-            
-            # Process memory data
-            memory_values = []
-            for metric in response.data:
-                for data_point in metric.aggregated_datapoints:
-                    if data_point.value is not None:
-                        memory_values.append(data_point.value)
-            
-            if memory_values:
-                return {
-                    "average_memory": sum(memory_values) / len(memory_values),
-                    "max_memory": max(memory_values),
-                    "min_memory": min(memory_values),
-                    "data_points": len(memory_values)
-                }
-            
-            return {}
-            
-        except Exception as e:
-            logger.debug(f"Could not fetch memory metrics for {instance_id}: {e}")
-            return {}
-
     async def get_alarm_history(self, compartment_id: str, start_time: datetime, end_time: datetime) -> List[Dict[str, Any]]:
         """Get alarm history from OCI Monitoring"""
         cache_key = f"alarm_history_{compartment_id}_{start_time.isoformat()}_{end_time.isoformat()}"
@@ -474,41 +461,52 @@ class MonitoringService:
         
         logger.info(f"🔍 Fetching alarm history for compartment {compartment_id} from {start_time} to {end_time}")
         
+        def in_range(timestamp: Optional[str]) -> bool:
+            if not timestamp:
+                return False
+            moment = datetime.fromisoformat(timestamp)
+            if moment.tzinfo is not None:
+                moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+            return start_time <= moment <= end_time
+        
         try:
-            # Get all alarms first
-            response = await self.oci_service._make_oci_call(
-                monitoring_client.list_alarms,
-                compartment_id=compartment_id
-            )
+            # Alarms and their status come from the tenancy-wide view
+            alarms, _ = await self._get_oci_alarms(compartment_id)
             
             history = []
-            for alarm in response.data:
+            for alarm in alarms:
+                entry = {
+                    "alarm_id": alarm["id"],
+                    "alarm_name": alarm["display_name"],
+                    "suppressed": not alarm["is_enabled"],
+                    "severity": alarm["severity"],
+                    "namespace": alarm["namespace"]
+                }
+                # Alarms that started firing within the time range
+                if alarm.get("status") == "FIRING" and in_range(alarm.get("timestamp_triggered")):
+                    history.append({
+                        **entry,
+                        "status": "FIRING",
+                        "timestamp": alarm["timestamp_triggered"],
+                        "summary": f"Alarm {alarm['display_name']} firing - {alarm['severity']}"
+                    })
                 # Filter alarms updated within the time range
-                if alarm.time_updated and start_time <= alarm.time_updated <= end_time:
-                    history_entry = {
-                        "alarm_id": alarm.id,
-                        "alarm_name": alarm.display_name,
-                        "status": "FIRING" if alarm.is_enabled and alarm.lifecycle_state == "ACTIVE" else "OK",
-                        "timestamp": alarm.time_updated.isoformat(),
-                        "summary": f"Alarm {alarm.display_name} - {alarm.severity}",
-                        "suppressed": not alarm.is_enabled,
-                        "severity": alarm.severity,
-                        "namespace": alarm.namespace
-                    }
-                    history.append(history_entry)
+                elif in_range(alarm.get("time_updated")):
+                    history.append({
+                        **entry,
+                        "status": alarm.get("status") or ("FIRING" if alarm["is_enabled"] and alarm["lifecycle_state"] == "ACTIVE" else "OK"),
+                        "timestamp": alarm["time_updated"],
+                        "summary": f"Alarm {alarm['display_name']} - {alarm['severity']}"
+                    })
                 # Also include creation events if they fall in the time range
-                elif alarm.time_created and start_time <= alarm.time_created <= end_time:
-                    history_entry = {
-                        "alarm_id": alarm.id,
-                        "alarm_name": alarm.display_name,
+                elif in_range(alarm.get("time_created")):
+                    history.append({
+                        **entry,
                         "status": "CREATED",
-                        "timestamp": alarm.time_created.isoformat(),
-                        "summary": f"Alarm {alarm.display_name} created - {alarm.severity}",
-                        "suppressed": False,
-                        "severity": alarm.severity,
-                        "namespace": alarm.namespace
-                    }
-                    history.append(history_entry)
+                        "timestamp": alarm["time_created"],
+                        "summary": f"Alarm {alarm['display_name']} created - {alarm['severity']}",
+                        "suppressed": False
+                    })
             
             # Sort by timestamp (newest first)
             history.sort(key=lambda x: x['timestamp'], reverse=True)
@@ -522,41 +520,49 @@ class MonitoringService:
             logger.error(f"❌ Failed to get alarm history for compartment {compartment_id}: {e}")
             raise ExternalServiceError(f"Failed to fetch OCI alarm history: {str(e)}")
 
+    async def _fetch_metric_streams(self, compartment_id: str, namespace: str, metric_name: str,
+                                    start_time: datetime, end_time: datetime, interval: str = "1m",
+                                    resource_group: Optional[str] = None) -> Dict[str, List[tuple]]:
+        """One Monitoring query; datapoints per stream, keyed by resourceId (or the stream's dimensions)"""
+        monitoring_client = self._get_monitoring_client()
+        
+        # Build query
+        query = f"'{metric_name}'[{interval}].mean()"
+        if resource_group:
+            query = f"'{metric_name}'[{interval}]{{resourceGroup=\"{resource_group}\"}}.mean()"
+        
+        metrics_request = oci.monitoring.models.SummarizeMetricsDataDetails(
+            namespace=namespace,
+            query=query,
+            start_time=start_time,
+            end_time=end_time,
+            resolution=interval
+        )
+        
+        response = await self.oci_service._make_oci_call(
+            monitoring_client.summarize_metrics_data,
+            compartment_id=compartment_id,
+            summarize_metrics_data_details=metrics_request
+        )
+        
+        streams: Dict[str, List[tuple]] = {}
+        for metric in response.data:
+            dimensions = metric.dimensions or {}
+            stream = dimensions.get("resourceId") or json.dumps(dimensions, sort_keys=True)
+            points = streams.setdefault(stream, [])
+            for data_point in metric.aggregated_datapoints:
+                if data_point.value is not None:
+                    points.append((data_point.timestamp, data_point.value))
+        return streams
+
     async def get_metrics_data(self, compartment_id: str, namespace: str, metric_name: str, 
                               start_time: datetime, end_time: datetime, 
                               resource_group: Optional[str] = None) -> Dict[str, Any]:
-        """Get metrics data from OCI Monitoring"""
+        """Get metrics data from OCI Monitoring, served from the local time-series store"""
         try:
-            cache_key = f"metrics_{compartment_id}_{namespace}_{metric_name}_{start_time.isoformat()}"
-            cached_data = await cache_service.get("monitoring", cache_key)
-            if cached_data:
-                return cached_data
-
             if not self.oci_service.oci_available:
                 raise ExternalServiceError("OCI service not available")
 
-            monitoring_client = self._get_monitoring_client()
-            
-            # Build query
-            query = f"'{metric_name}'[1m].mean()"
-            if resource_group:
-                query = f"'{metric_name}'[1m]{{resourceGroup=\"{resource_group}\"}}.mean()"
-            
-            # Get metrics data
-            metrics_request = oci.monitoring.models.SummarizeMetricsDataDetails(
-                namespace=namespace,
-                query=query,
-                compartment_id=compartment_id,
-                start_time=start_time,
-                end_time=end_time,
-                resolution="1m"
-            )
-            
-            response = await self.oci_service._make_oci_call(
-                monitoring_client.summarize_metrics_data,
-                summarize_metrics_data_details=metrics_request
-            )
-            
             metrics_data = {
                 "namespace": namespace,
                 "metric_name": metric_name,
@@ -565,16 +571,39 @@ class MonitoringService:
                 "start_time": start_time.isoformat(),
                 "end_time": end_time.isoformat()
             }
-            
-            for metric in response.data:
-                for data_point in metric.aggregated_datapoints:
-                    metrics_data["data_points"].append({
-                        "timestamp": data_point.timestamp.isoformat(),
-                        "value": data_point.value
-                    })
-            
-            # Cache the results
-            await cache_service.set("monitoring", cache_key, metrics_data, ttl=self.cache_ttl)
+
+            if self.metric_store is None:
+                streams = await self._fetch_metric_streams(
+                    compartment_id, namespace, metric_name, start_time, end_time, resource_group=resource_group
+                )
+                for resource_id, points in streams.items():
+                    for timestamp, value in points:
+                        metrics_data["data_points"].append({
+                            "timestamp": timestamp.isoformat(),
+                            "value": value,
+                            "resource_id": resource_id
+                        })
+                metrics_data["resolution"] = "1m"
+            else:
+                async def fetch(start: datetime, end: datetime, interval: str):
+                    return await self._fetch_metric_streams(
+                        compartment_id, namespace, metric_name, start, end, interval, resource_group
+                    )
+
+                step, windows = await self.metric_store.query(
+                    (compartment_id, namespace, metric_name, resource_group), start_time, end_time, fetch
+                )
+                for resource_id, window in windows.items():
+                    for timestamp, value in zip(window.timestamps.tolist(), window.means.tolist()):
+                        metrics_data["data_points"].append({
+                            "timestamp": datetime.utcfromtimestamp(timestamp).isoformat() + "Z",
+                            "value": value,
+                            "resource_id": resource_id
+                        })
+                metrics_data["resolution"] = INTERVALS[step]
+                metrics_data["aggregates"] = aggregate(windows.values())
+
+            metrics_data["data_points"].sort(key=lambda point: point["timestamp"])
             logger.info(f"✅ Retrieved {len(metrics_data['data_points'])} metrics data points")
             return metrics_data
             
@@ -582,66 +611,154 @@ class MonitoringService:
             logger.error(f"❌ Failed to get metrics data for {namespace}.{metric_name}: {e}")
             raise ExternalServiceError(f"Failed to get OCI metrics data: {str(e)}")
 
+    def _log_search_key(self, compartment_id: str, search_query: str, start_time: datetime,
+                        end_time: datetime, limit: int, page: Optional[str]) -> str:
+        """Cache key from a digest of every search parameter, identical across workers and restarts"""
+        params = json.dumps(
+            [compartment_id, search_query, start_time.isoformat(), end_time.isoformat(), limit, page]
+        )
+        return f"logs_{hashlib.sha256(params.encode()).hexdigest()[:32]}"
+
+    def _log_entry_to_dict(self, log_entry: Any, compartment_id: str) -> Dict[str, Any]:
+        # Search results carry their data as a dict; older responses as an object
+        data = log_entry.data
+        fields = data if isinstance(data, dict) else getattr(data, '__dict__', {})
+        return {
+            "id": fields.get('id', ''),
+            "timestamp": fields.get('datetime', ''),
+            "message": fields.get('logContent', {}),
+            "source": fields.get('source', ''),
+            "compartment_id": compartment_id,
+            "log_group_id": fields.get('logGroup', ''),
+            "fields": fields
+        }
+
+    async def stream_logs(self, compartment_id: str, search_query: str, start_time: datetime,
+                          end_time: datetime, max_results: Optional[int] = None,
+                          time_budget: Optional[float] = None,
+                          page: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Search logs page by page, following ``opc-next-page``
+        
+        Yields a ``logs`` event per page as it arrives and a final ``summary``. The
+        search stops at ``max_results`` (capped by ``MAX_LOG_SEARCH_RESULTS``) or once
+        ``time_budget`` seconds (default ``LOG_SEARCH_TIME_BUDGET_SECONDS``) are spent;
+        the summary then carries the ``next_page`` cursor to resume from (``page``).
+        """
+        if not self.oci_service.oci_available:
+            raise ExternalServiceError("OCI service not available")
+
+        log_search_client = self._get_log_search_client()
+        max_results = min(max_results or settings.MAX_LOG_SEARCH_RESULTS, settings.MAX_LOG_SEARCH_RESULTS)
+        time_budget = time_budget if time_budget is not None else settings.LOG_SEARCH_TIME_BUDGET_SECONDS
+        search_request = oci.loggingsearch.models.SearchLogsDetails(
+            time_start=start_time,
+            time_end=end_time,
+            search_query=search_query,
+            is_return_field_info=True
+        )
+        
+        started = time.perf_counter()
+        total = pages = 0
+        stopped = None
+        while True:
+            remaining = time_budget - (time.perf_counter() - started)
+            if total >= max_results:
+                stopped = "max_results"
+            elif remaining <= 0:
+                stopped = "time_budget"
+            if stopped:
+                break
+            try:
+                response = await asyncio.wait_for(
+                    self.oci_service._make_oci_call(
+                        log_search_client.search_logs,
+                        search_logs_details=search_request,
+                        limit=min(settings.LOG_SEARCH_PAGE_SIZE, max_results - total),
+                        **({'page': page} if page else {})
+                    ),
+                    timeout=remaining
+                )
+            except asyncio.TimeoutError:
+                # The cursor of the page that did not arrive in time resumes the search
+                stopped = "time_budget"
+                break
+            
+            logs = [self._log_entry_to_dict(entry, compartment_id) for entry in response.data.results or []]
+            page = getattr(response, 'next_page', None)
+            pages += 1
+            total += len(logs)
+            yield {"event": "logs", "page": pages, "count": len(logs), "items": logs, "next_page": page}
+            if not page:
+                break
+        
+        elapsed = time.perf_counter() - started
+        logger.info(f"✅ Retrieved {total} log entries in {pages} pages ({elapsed:.2f}s)"
+                    + (f", stopped at {stopped}" if stopped else ""))
+        yield {
+            "event": "summary",
+            "compartment_id": compartment_id,
+            "total_results": total,
+            "pages": pages,
+            "truncated": stopped is not None,
+            "stopped_by": stopped,
+            "next_page": page if stopped else None,
+            "elapsed_seconds": round(elapsed, 3),
+        }
+
     async def search_logs(self, compartment_id: str, search_query: str, 
                          start_time: datetime, end_time: datetime, 
-                         limit: int = 1000) -> List[Dict[str, Any]]:
-        """Search logs using OCI Log Search API"""
+                         limit: int = 1000, page: Optional[str] = None,
+                         time_budget: Optional[float] = None) -> Dict[str, Any]:
+        """Search logs using OCI Log Search API
+        
+        Collects ``stream_logs`` into ``{"results", "next_page", "truncated", ...}``.
+        Complete searches and searches cut at ``limit`` are cached; searches cut by the
+        time budget are not, as they depend on how fast OCI answered.
+        """
         try:
-            cache_key = f"logs_{compartment_id}_{hash(search_query)}_{start_time.isoformat()}"
+            cache_key = self._log_search_key(compartment_id, search_query, start_time, end_time, limit, page)
             cached_data = await cache_service.get("monitoring", cache_key)
             if cached_data:
                 return cached_data
 
-            if not self.oci_service.oci_available:
-                raise ExternalServiceError("OCI service not available")
-
-            log_search_client = self._get_log_search_client()
-            
-            # Search logs
-            search_request = oci.loggingsearch.models.SearchLogsDetails(
-                time_start=start_time,
-                time_end=end_time,
-                search_query=search_query,
-                is_return_field_info=True
-            )
-            
-            response = await self.oci_service._make_oci_call(
-                log_search_client.search_logs,
-                search_logs_details=search_request,
-                limit=limit
-            )
-            
-            logs = []
-            for log_entry in response.data.results:
-                log_data = {
-                    "id": getattr(log_entry.data, 'id', ''),
-                    "timestamp": getattr(log_entry.data, 'datetime', ''),
-                    "message": getattr(log_entry.data, 'logContent', {}),
-                    "source": getattr(log_entry.data, 'source', ''),
-                    "compartment_id": compartment_id,
-                    "log_group_id": getattr(log_entry.data, 'logGroup', ''),
-                    "fields": log_entry.data.__dict__ if hasattr(log_entry.data, '__dict__') else {}
-                }
-                logs.append(log_data)
-            
-            # Cache the results
-            await cache_service.set("monitoring", cache_key, logs, ttl=self.cache_ttl)
-            logger.info(f"✅ Retrieved {len(logs)} log entries")
-            return logs
+            results: List[Dict[str, Any]] = []
+            async for event in self.stream_logs(compartment_id, search_query, start_time, end_time,
+                                                max_results=limit, time_budget=time_budget, page=page):
+                if event["event"] == "logs":
+                    results.extend(event["items"])
+                else:
+                    summary = event
+            
+            search = {
+                "results": results,
+                "next_page": summary["next_page"],
+                "truncated": summary["truncated"],
+                "stopped_by": summary["stopped_by"],
+            }
+            if summary["stopped_by"] != "time_budget":
+                await cache_service.set("monitoring", cache_key, search, ttl=self.cache_ttl)
+            return search
             
         except Exception as e:
             logger.error(f"❌ Failed to search logs for compartment {compartment_id}: {e}")
             raise ExternalServiceError(f"Failed to search OCI logs: {str(e)}")
 
-    async def get_alert_summary(self, compartment_id: str) -> Dict[str, Any]:
-        """Get alert summary including both OCI alarms and resource-based alerts"""
+    async def get_alert_summary(self, compartment_id: str, include_subtree: bool = False) -> Dict[str, Any]:
+        """Get alert summary including both OCI alarms and resource-based alerts
+        
+        OCI alarms are counted from the tenancy-wide view; only firing alarms
+        (and every resource alert) count towards the severity breakdown.
+        """
         try:
-            # Get all alerts (OCI alarms + resource alerts)
-            alarms = await self.get_alarm_status(compartment_id)
+            alarms, counts = await self._get_oci_alarms(compartment_id, include_subtree)
+            alerts = await self._get_resource_alerts(compartment_id)
+            firing = [alarm for alarm in alarms if alarm.get('status') == 'FIRING']
             
             # Count different types of alerts
-            total_alarms = len(alarms)
-            active_alarms = len([a for a in alarms if a.get('is_enabled', False) and a.get('lifecycle_state') == 'ACTIVE'])
+            oci_alarms = counts["total"]
+            resource_alerts = len(alerts)
+            total_alarms = oci_alarms + resource_alerts
+            active_alarms = counts["active"]
             
             # Count by severity
             severity_breakdown = {
@@ -651,21 +768,14 @@ class MonitoringService:
                 "LOW": 0,
                 "INFO": 0
             }
-            
-            # Count by source type
-            oci_alarms = 0
-            resource_alerts = 0
-            
-            for alarm in alarms:
-                severity = alarm.get('severity', 'MEDIUM')
+            for severity, count in counts["firing_by_severity"].items():
+                severity = OCI_ALARM_SEVERITIES.get(severity, severity)
+                if severity in severity_breakdown:
+                    severity_breakdown[severity] += count
+            for alert in alerts:
+                severity = alert.get('severity', 'MEDIUM')
                 if severity in severity_breakdown:
                     severity_breakdown[severity] += 1
-                
-                # Count by source
-                if alarm.get('source') == 'oci_alarm':
-                    oci_alarms += 1
-                elif alarm.get('source') == 'resource_monitoring':
-                    resource_alerts += 1
 
             # Calculate health score based on severity distribution
             total_weight = 0
@@ -690,12 +800,12 @@ class MonitoringService:
             else:
                 health_score = 1.0  # No alerts = perfect health
             
-            # Get top 5 most severe alerts
+            # Get top 5 most severe firing alarms and resource alerts
             top_alerts = sorted(
-                alarms,
+                firing + alerts,
                 key=lambda x: {
                     'CRITICAL': 5, 'HIGH': 4, 'MEDIUM': 3, 'LOW': 2, 'INFO': 1
-                }.get(x.get('severity', 'MEDIUM'), 3),
+                }.get(OCI_ALARM_SEVERITIES.get(x.get('severity'), x.get('severity', 'MEDIUM')), 3),
                 reverse=True
             )[:5]
 
@@ -703,9 +813,10 @@ class MonitoringService:
                 "compartment_id": compartment_id,
                 "total_alarms": total_alarms,
                 "active_alarms": active_alarms,
+                "firing_alarms": len(firing),
                 "severity_breakdown": severity_breakdown,
                 "recent_activity": {
-                    "summary": f"{oci_alarms} OCI alarms + {resource_alerts} resource alerts",
+                    "summary": f"{oci_alarms} OCI alarms ({len(firing)} firing) + {resource_alerts} resource alerts",
                     "oci_alarms": oci_alarms,
                     "resource_alerts": resource_alerts,
                     "last_updated": datetime.utcnow().isoformat(),
@@ -730,6 +841,7 @@ class MonitoringService:
                 "compartment_id": compartment_id,
                 "total_alarms": 0,
                 "active_alarms": 0,
+                "firing_alarms": 0,
                 "severity_breakdown": {"CRITICAL": 0, "HIGH": 0, "MEDIUM": 0, "LOW": 0, "INFO": 0},
                 "recent_activity": {
                     "summary": "Unable to fetch alert data",
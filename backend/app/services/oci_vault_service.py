@@ -24,6 +24,7 @@ except ImportError:
     logging.warning("OCI SDK not available. OCI Vault integration will be disabled.")
 
 from ..core.config import settings
+from ..core.invalidation_bus import invalidation_bus
 
 
 class SecretType(Enum):
@@ -80,7 +81,8 @@ class OCIVaultService:
         
         # Cache for secrets (in-memory with TTL)
         self._secret_cache: Dict[str, SecretValue] = {}
-        self._cache_ttl = timedelta(minutes=15)  # Default cache TTL
+        self._cache_ttl = timedelta(minutes=settings.VAULT_CACHE_TTL_MINUTES)
+        invalidation_bus.subscribe("vault", self._handle_invalidation)
         
         # OCI configuration
         self.compartment_id = getattr(settings, 'OCI_COMPARTMENT_ID', '')
@@ -133,6 +135,10 @@ class OCIVaultService:
             Secret value or None if not found
         """
         try:
+            # A forced refresh also drops the copies held by other workers
+            if force_refresh:
+                await self._invalidate_secret(secret_name)
+            
             # Check cache first (unless force refresh)
             if not force_refresh and secret_name in self._secret_cache:
                 cached_secret = self._secret_cache[secret_name]
@@ -274,8 +280,7 @@ class OCIVaultService:
             response = self._secrets_client.create_secret(secret_details)
             
             # Remove from cache to force refresh
-            if secret_name in self._secret_cache:
-                del self._secret_cache[secret_name]
+            await self._invalidate_secret(secret_name)
             
             self.logger.info(f"Successfully stored secret '{secret_name}' in vault")
             return True
@@ -325,8 +330,7 @@ class OCIVaultService:
             self._secrets_client.update_secret(secret.id, update_details)
             
             # Remove from cache
-            if secret_name in self._secret_cache:
-                del self._secret_cache[secret_name]
+            await self._invalidate_secret(secret_name)
             
             self.logger.info(f"Successfully rotated secret '{secret_name}'")
             return True
@@ -382,8 +386,7 @@ class OCIVaultService:
                 )
             
             # Remove from cache
-            if secret_name in self._secret_cache:
-                del self._secret_cache[secret_name]
+            await self._invalidate_secret(secret_name)
             
             self.logger.info(f"Successfully deleted secret '{secret_name}'")
             return True
@@ -444,9 +447,23 @@ class OCIVaultService:
             self.logger.error(f"Error listing secrets: {str(e)}")
             return []
     
-    def clear_cache(self):
-        """Clear the secret cache"""
+    async def _invalidate_secret(self, secret_name: str):
+        """Drop a cached secret in this and every other worker"""
+        self._secret_cache.pop(secret_name, None)
+        await invalidation_bus.publish("vault", secret_name=secret_name)
+    
+    def _handle_invalidation(self, message: Dict[str, Any]):
+        """Apply an invalidation published by another worker"""
+        secret_name = message.get("secret_name")
+        if secret_name is None:
+            self._secret_cache.clear()
+        else:
+            self._secret_cache.pop(secret_name, None)
+    
+    async def clear_cache(self):
+        """Clear the secret cache in every worker"""
         self._secret_cache.clear()
+        await invalidation_bus.publish("vault", secret_name=None)
         self.logger.info("Secret cache cleared")
     
     def get_cache_stats(self) -> Dict[str, Any]:
@@ -8,6 +8,7 @@ from dataclasses import dataclass
 from sqlalchemy import text
 from app.services.cache_service import cache_service
 from app.core.config import settings
+from app.core.executors import run_in_pool
 
 logger = logging.getLogger(__name__)
 
@@ -240,7 +241,7 @@ class PerformanceService:
         """Collect and store performance metrics"""
         try:
             # Get system metrics
-            system_metrics = self.system_monitor.get_system_metrics()
+            system_metrics = await run_in_pool("io", self.system_monitor.get_system_metrics)
             process_metrics = await self.system_monitor.get_process_metrics()
             cache_stats = cache_service.get_stats()
             
@@ -273,7 +274,7 @@ class PerformanceService:
         """Get comprehensive performance summary"""
         try:
             # Current metrics
-            current_system = self.system_monitor.get_system_metrics()
+            current_system = await run_in_pool("io", self.system_monitor.get_system_metrics)
             current_process = await self.system_monitor.get_process_metrics()
             cache_stats = cache_service.get_stats()
             db_stats = await self.db_optimizer.get_connection_pool_stats()
@@ -488,7 +489,7 @@ class PerformanceService:
                 "performance_summary": await self.get_performance_summary(),
                 "database_optimization": await self.db_optimizer.optimize_database_indexes(),
                 "slow_queries": await self.db_optimizer.analyze_slow_queries(),
-                "system_health": self.system_monitor.get_system_metrics(),
+                "system_health": await run_in_pool("io", self.system_monitor.get_system_metrics),
                 "cache_analysis": cache_service.get_stats()
             }
         except Exception as e:
@@ -43,6 +43,7 @@ except Exception as e:
         return CONTENT_TYPE_LATEST
 
 from app.core.config import settings
+from app.core.executors import run_in_pool
 
 logger = logging.getLogger(__name__)
 
@@ -77,11 +78,14 @@ class PrometheusMetricsService:
         self.registry = registry or (REGISTRY if PROMETHEUS_AVAILABLE else None)
         self.metrics = {}
         self.custom_metrics = {}
+        self._cache_usage_namespaces: Dict[str, set] = {}
         
         if self.enabled:
             self._initialize_core_metrics()
             self._initialize_genai_metrics()
             self._initialize_oci_metrics()
+            self._initialize_cache_metrics()
+            self._initialize_executor_metrics()
             self._initialize_kubernetes_metrics()
             self._initialize_business_metrics()
             logger.info("Prometheus metrics service initialized")
@@ -157,6 +161,21 @@ class PrometheusMetricsService:
             'Active Redis connections',
             registry=self.registry
         )
+        
+        # Circuit breaker metrics
+        self.metrics['circuit_state'] = Gauge(
+            'genai_cloudops_circuit_breaker_state',
+            'Circuit breaker state (0=closed, 1=half_open, 2=open)',
+            ['circuit'],
+            registry=self.registry
+        )
+        
+        self.metrics['circuit_transitions'] = Counter(
+            'genai_cloudops_circuit_breaker_transitions_total',
+            'Circuit breaker state transitions',
+            ['circuit', 'state'],
+            registry=self.registry
+        )
     
     def _initialize_genai_metrics(self):
         """Initialize GenAI service metrics"""
@@ -226,6 +245,29 @@ class PrometheusMetricsService:
             registry=self.registry
         )
         
+        # OCI rate governor metrics
+        self.metrics['oci_queue_wait'] = Histogram(
+            'genai_cloudops_oci_queue_wait_seconds',
+            'Time OCI calls waited for the rate governor',
+            ['service', 'operation'],
+            buckets=[0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0],
+            registry=self.registry
+        )
+        
+        self.metrics['oci_throttles'] = Counter(
+            'genai_cloudops_oci_throttles_total',
+            'OCI calls rejected with 429 TooManyRequests',
+            ['service', 'operation'],
+            registry=self.registry
+        )
+        
+        self.metrics['oci_rate_limit'] = Gauge(
+            'genai_cloudops_oci_rate_limit_per_second',
+            'Current adaptive OCI request rate limit',
+            ['service', 'operation'],
+            registry=self.registry
+        )
+        
         # OCI Resource metrics
         self.metrics['oci_resources_discovered'] = Gauge(
             'genai_cloudops_oci_resources_discovered',
@@ -256,6 +298,64 @@ class PrometheusMetricsService:
             registry=self.registry
         )
     
+    def _initialize_cache_metrics(self):
+        """Initialize cache tier metrics"""
+        
+        # tier: redis, memory, file, or "all" for the result seen by the caller
+        self.metrics['cache_operations'] = Counter(
+            'genai_cloudops_cache_operations_total',
+            'Total cache operations',
+            ['namespace', 'tier', 'operation', 'outcome'],
+            registry=self.registry
+        )
+        
+        self.metrics['cache_operation_duration'] = Histogram(
+            'genai_cloudops_cache_operation_duration_seconds',
+            'Cache operation duration in seconds',
+            ['namespace', 'tier', 'operation'],
+            buckets=[0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0],
+            registry=self.registry
+        )
+        
+        self.metrics['cache_entries'] = Gauge(
+            'genai_cloudops_cache_entries',
+            'Cached entries',
+            ['namespace', 'tier'],
+            registry=self.registry
+        )
+        
+        self.metrics['cache_bytes'] = Gauge(
+            'genai_cloudops_cache_bytes',
+            'Cached payload size in bytes',
+            ['namespace', 'tier'],
+            registry=self.registry
+        )
+    
+    def _initialize_executor_metrics(self):
+        """Initialize named thread pool metrics"""
+        
+        self.metrics['executor_queue_depth'] = Gauge(
+            'genai_cloudops_executor_queue_depth',
+            'Calls waiting for a thread in a named executor pool',
+            ['pool'],
+            registry=self.registry
+        )
+        
+        self.metrics['executor_active_threads'] = Gauge(
+            'genai_cloudops_executor_active_threads',
+            'Threads running a call in a named executor pool',
+            ['pool'],
+            registry=self.registry
+        )
+        
+        self.metrics['executor_queue_wait'] = Histogram(
+            'genai_cloudops_executor_queue_wait_seconds',
+            'Time calls waited for a thread in a named executor pool',
+            ['pool'],
+            buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0],
+            registry=self.registry
+        )
+    
     def _initialize_kubernetes_metrics(self):
         """Initialize Kubernetes/OKE metrics"""
         
@@ -413,6 +513,87 @@ class PrometheusMetricsService:
             service=service, operation=operation
         ).observe(duration)
     
+    def observe_oci_queue_wait(self, service: str, operation: str, duration: float):
+        """Record how long an OCI call waited for the rate governor"""
+        if not self.enabled:
+            return
+            
+        self.metrics['oci_queue_wait'].labels(service=service, operation=operation).observe(duration)
+    
+    def record_oci_throttle(self, service: str, operation: str):
+        """Record an OCI 429 response"""
+        if not self.enabled:
+            return
+            
+        self.metrics['oci_throttles'].labels(service=service, operation=operation).inc()
+    
+    def update_oci_rate_limit(self, service: str, operation: str, rate: float):
+        """Update the adaptive rate limit gauge of an OCI operation"""
+        if not self.enabled:
+            return
+            
+        self.metrics['oci_rate_limit'].labels(service=service, operation=operation).set(rate)
+    
+    def update_executor_state(self, pool: str, queued: int, active: int, queue_wait: Optional[float] = None):
+        """Update queue depth and active threads of an executor pool, and record a queue wait"""
+        if not self.enabled:
+            return
+            
+        self.metrics['executor_queue_depth'].labels(pool=pool).set(queued)
+        self.metrics['executor_active_threads'].labels(pool=pool).set(active)
+        if queue_wait is not None:
+            self.metrics['executor_queue_wait'].labels(pool=pool).observe(queue_wait)
+    
+    def record_redis_operation(self, operation: str, status: str):
+        """Record a Redis command outcome"""
+        if not self.enabled:
+            return
+            
+        self.metrics['redis_operations'].labels(operation=operation, status=status).inc()
+    
+    def record_circuit_transition(self, circuit: str, state: str):
+        """Record a circuit breaker state change"""
+        if not self.enabled:
+            return
+            
+        state_values = {"closed": 0, "half_open": 1, "open": 2}
+        self.metrics['circuit_state'].labels(circuit=circuit).set(state_values.get(state, 0))
+        self.metrics['circuit_transitions'].labels(circuit=circuit, state=state).inc()
+    
+    def record_cache_operation(self, namespace: str, tier: str, operation: str, outcome: str, count: int = 1):
+        """Record cache operation outcomes"""
+        if not self.enabled:
+            return
+            
+        self.metrics['cache_operations'].labels(
+            namespace=namespace, tier=tier, operation=operation, outcome=outcome
+        ).inc(count)
+    
+    def observe_cache_latency(self, namespace: str, tier: str, operation: str, duration: float):
+        """Record the duration of a cache operation"""
+        if not self.enabled:
+            return
+            
+        self.metrics['cache_operation_duration'].labels(
+            namespace=namespace, tier=tier, operation=operation
+        ).observe(duration)
+    
+    def update_cache_usage(self, tier: str, usage: Dict[str, Dict[str, int]]):
+        """Update entry count and byte size gauges of a cache tier, keyed by namespace"""
+        if not self.enabled:
+            return
+            
+        # Namespaces that emptied since the last update are reported as zero
+        previous = self._cache_usage_namespaces.get(tier, set())
+        for namespace in previous - usage.keys():
+            self.metrics['cache_entries'].labels(namespace=namespace, tier=tier).set(0)
+            self.metrics['cache_bytes'].labels(namespace=namespace, tier=tier).set(0)
+        self._cache_usage_namespaces[tier] = set(usage)
+        
+        for namespace, values in usage.items():
+            self.metrics['cache_entries'].labels(namespace=namespace, tier=tier).set(values["entries"])
+            self.metrics['cache_bytes'].labels(namespace=namespace, tier=tier).set(values["bytes"])
+    
     def update_oci_resource_metrics(
         self, 
         compartment: str, 
@@ -553,7 +734,7 @@ class PrometheusMetricsService:
         
         while True:
             try:
-                self.update_system_metrics()
+                await run_in_pool("io", self.update_system_metrics)
                 await asyncio.sleep(interval)
             except Exception as e:
                 logger.error(f"Error in system monitoring: {e}")
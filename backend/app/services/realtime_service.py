@@ -12,6 +12,7 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, List
 from dataclasses import dataclass
 
+from app.core.executors import run_in_pool
 from app.core.websocket import get_websocket_manager, SubscriptionType
 
 logger = logging.getLogger(__name__)
@@ -86,7 +87,7 @@ class RealTimeDataService:
         """Stream system metrics every few seconds"""
         while self.is_running:
             try:
-                metrics = self._generate_system_metrics()
+                metrics = await run_in_pool("io", self._generate_system_metrics)
                 
                 # Broadcast to dashboard metrics subscribers
                 await self.websocket_manager.broadcast_metrics({
@@ -0,0 +1,168 @@
+"""
+Tenancy-wide inventory through OCI Resource Search
+One structured query (``query instance, volume, ... resources``) enumerates every
+resource of the inventory types across the tenancy in a few pages. Fields search does
+not return (shapes, CIDR blocks, sizes, ...) are filled in by the per-type listings,
+but only for the compartment/type pairs search found to be non-empty, instead of
+listing every type in every compartment.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.cache_service import cache_service
+
+logger = logging.getLogger(__name__)
+
+try:
+    from oci.resource_search.models import StructuredSearchDetails
+    RESOURCE_SEARCH_AVAILABLE = True
+except ImportError:
+    StructuredSearchDetails = None
+    RESOURCE_SEARCH_AVAILABLE = False
+
+# Resource Search type -> (inventory category, resource_type label used by the listings)
+SEARCH_TYPES: Dict[str, Tuple[str, Optional[str]]] = {
+    "instance": ("compute_instances", None),
+    "dbsystem": ("databases", "DB_SYSTEM"),
+    "database": ("databases", "DATABASE"),
+    "autonomousdatabase": ("databases", "AUTONOMOUS_DATABASE"),
+    "clusterscluster": ("oke_clusters", None),
+    "apigateway": ("api_gateways", None),
+    "loadbalancer": ("load_balancers", None),
+    "vcn": ("network_resources", "VCN"),
+    "subnet": ("network_resources", "Subnet"),
+    "volume": ("block_volumes", None),
+    "filesystem": ("file_systems", None),
+    "bucket": ("object_storage_buckets", "OBJECT_STORAGE_BUCKET"),
+    "vault": ("vaults", "VAULT"),
+    "vaultsecret": ("vaults", "SECRET"),
+}
+
+RESOURCE_TYPES = [
+    'compute_instances', 'databases', 'oke_clusters', 'api_gateways',
+    'load_balancers', 'network_resources', 'block_volumes', 'file_systems',
+    'object_storage_buckets', 'vaults'
+]
+
+# Resources being torn down are still indexed by search for a while
+TERMINAL_STATES = ("TERMINATED", "DELETED")
+
+
+class ResourceSearchInventory:
+    """Builds the all-compartments inventory from Resource Search plus targeted listings"""
+
+    def __init__(self, oci_service, enrich: bool = True, cache_ttl: int = 300):
+        self.oci_service = oci_service
+        # When False, items are built from search summaries alone (no per-type listings)
+        self.enrich = enrich
+        self.cache_ttl = cache_ttl
+
+    @staticmethod
+    def build_query(categories: List[str], condition: Optional[str] = None, include_terminated: bool = False) -> str:
+        """Structured query covering the search types of the requested categories"""
+        search_types = [t for t, (category, _) in SEARCH_TYPES.items() if category in categories]
+        clauses = [] if include_terminated else [f"lifecycleState != '{state}'" for state in TERMINAL_STATES]
+        if condition:
+            clauses.append(f"({condition})")
+        query = f"query {', '.join(search_types)} resources"
+        return f"{query} where {' && '.join(clauses)}" if clauses else query
+
+    async def search_summaries(self, categories: List[str], condition: Optional[str] = None,
+                               include_terminated: bool = False) -> List[Dict[str, Any]]:
+        """Run one search (uncached) and return matching resources as plain summary dicts"""
+        client = self.oci_service._get_client('resource_search')
+        query = self.build_query(categories, condition, include_terminated)
+        details = StructuredSearchDetails(type="Structured", query=query, matching_context_type="NONE")
+        summaries = []
+        async for page in self.oci_service._iter_pages(client.search_resources, details):
+            for resource in page:
+                mapped = SEARCH_TYPES.get((resource.resource_type or "").lower())
+                if mapped is None:
+                    continue
+                summaries.append({
+                    "id": resource.identifier,
+                    "category": mapped[0],
+                    "resource_type": mapped[1],
+                    "compartment_id": resource.compartment_id,
+                    "display_name": resource.display_name,
+                    "lifecycle_state": resource.lifecycle_state,
+                    "availability_domain": resource.availability_domain,
+                    "time_created": resource.time_created.isoformat() if resource.time_created else None,
+                })
+        return summaries
+
+    async def search(self, categories: List[str]) -> List[Dict[str, Any]]:
+        """Every live resource of the categories in the tenancy (cached)"""
+        return await cache_service.get_or_compute(
+            "oci", f"inventory_search:{','.join(sorted(categories))}", lambda: self.search_summaries(categories),
+            ttl=self.cache_ttl, hard_ttl=self.oci_service.inventory_hard_ttl
+        )
+
+    @staticmethod
+    def _from_summary(summary: Dict[str, Any]) -> Dict[str, Any]:
+        item = {
+            "id": summary["id"],
+            "display_name": summary["display_name"],
+            "lifecycle_state": summary["lifecycle_state"],
+            "availability_domain": summary["availability_domain"],
+            "time_created": summary["time_created"],
+        }
+        if summary["resource_type"]:
+            item["resource_type"] = summary["resource_type"]
+        return item
+
+    async def get_all_resources(self, resource_filter: Optional[List[str]] = None) -> Dict[str, Any]:
+        """All-compartments inventory in the same shape as the per-compartment listing"""
+        categories = [rt for rt in RESOURCE_TYPES if not resource_filter or rt in resource_filter]
+        compartments, summaries = await asyncio.gather(
+            self.oci_service.get_compartments(), self.search(categories)
+        )
+        compartment_names = {comp['id']: comp['name'] for comp in compartments}
+        compartment_order = {comp['id']: index for index, comp in enumerate(compartments)}
+
+        # Group search hits by (compartment, category); only these pairs are listed in detail
+        found: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for summary in summaries:
+            if summary["compartment_id"] in compartment_names:
+                found.setdefault((summary["compartment_id"], summary["category"]), []).append(summary)
+
+        pairs = sorted(found, key=lambda pair: (compartment_order[pair[0]], RESOURCE_TYPES.index(pair[1])))
+        if self.enrich:
+            getters = self.oci_service.category_getters()
+            detailed = await asyncio.gather(
+                *[getters[category](compartment_id) for compartment_id, category in pairs],
+                return_exceptions=True
+            )
+        else:
+            detailed = [None] * len(pairs)
+
+        index = self.oci_service.inventory_index
+        for compartment_id, category in index.pairs():
+            if category in categories and (compartment_id, category) not in found:
+                index.replace_pair(compartment_id, category, [])
+
+        aggregated_results = {rt: [] for rt in RESOURCE_TYPES}
+        for (compartment_id, category), items in zip(pairs, detailed):
+            if isinstance(items, BaseException) or not items:
+                # Listing failed or was skipped: fall back to what search returned
+                items = [self._from_summary(summary) for summary in found[(compartment_id, category)]]
+            index.replace_pair(compartment_id, category, items)
+            source = compartment_names[compartment_id]
+            aggregated_results[category].extend({**item, 'source_compartment': source} for item in items)
+
+        total_resources = sum(len(resources) for resources in aggregated_results.values())
+        logger.info(
+            f"🔎 Resource Search inventory: {len(summaries)} hits, {len(pairs)} compartment/type listings, "
+            f"{total_resources} resources"
+        )
+        return {
+            "compartment_id": "all_compartments",
+            "resources": aggregated_results,
+            "total_resources": total_resources,
+            "last_updated": datetime.utcnow().isoformat(),
+            "compartments_queried": len(compartments),
+            "inventory_backend": "search",
+        }
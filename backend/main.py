@@ -5,6 +5,12 @@ from app.api.routes import api_router
 print("MAIN.PY: api_router imported - checking for k8s routes")
 from app.core.config import settings
 from app.core.database import create_tables, init_default_roles
+from app.core.redis_pool import close_redis_client
+from app.core.executors import shutdown_executors
+from app.core.invalidation_bus import invalidation_bus
+from app.services.cache_service import cache_service
+from app.services.cloud_service import get_oci_service
+from app.services.chatbot_service import invalidate_resource_context
 from app.core.middleware import (
     LoggingMiddleware, 
     ErrorHandlingMiddleware, 
@@ -41,6 +47,11 @@ async def lifespan(app: FastAPI):
         # print("Performance monitoring service started")
         print("Performance monitoring DISABLED for debugging")
         
+        invalidation_bus.start()
+        inventory_sync = get_oci_service().inventory_sync
+        inventory_sync.subscribe(invalidate_resource_context)
+        inventory_sync.start()
+        
         yield
     except Exception as e:
         print(f"Failed to start services: {e}")
@@ -54,6 +65,15 @@ async def lifespan(app: FastAPI):
             
             await performance_service.stop_monitoring()
             print("Performance monitoring service stopped")
+            
+            await invalidation_bus.stop()
+            await get_oci_service().inventory_sync.stop()
+            await cache_service.close()
+            await close_redis_client()
+            print("Redis connection pool closed")
+            
+            shutdown_executors()
+            print("Executor pools stopped")
         except Exception as e:
             print(f"Error during shutdown: {e}")
 
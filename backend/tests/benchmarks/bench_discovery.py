@@ -0,0 +1,95 @@
+"""
+Discovery benchmark: get_all_resources, get_databases and get_network_resources
+Runs each operation with cold caches against a synthetic tenancy (with optional
+latency and 429 injection), a recorded fixture or the live tenancy, and reports SDK
+calls per run, p50/p99 latency and peak traced memory.
+
+    python -m tests.benchmarks.bench_discovery --compartments 50 --populated 10 --throttle-rate 0.05
+    python -m tests.benchmarks.bench_discovery --record tenancy.json --live
+    python -m tests.benchmarks.bench_discovery --replay tenancy.json
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+import tracemalloc
+from typing import Awaitable, Callable, List
+
+from app.services import cloud_service
+from tests.benchmarks.harness import Source, add_source_arguments, summarize, unthrottle_governor, use_cold_cache
+
+Run = Callable[[cloud_service.OCIService], Awaitable[List[float]]]
+
+
+async def timed(call: Awaitable) -> float:
+    started = time.perf_counter()
+    await call
+    return time.perf_counter() - started
+
+
+def per_compartment(getter_name: str) -> Run:
+    """One sample per compartment (caches start cold on every iteration)"""
+    async def run(service):
+        compartments = [comp['id'] for comp in await service.get_compartments()]
+        samples = []
+        for compartment_id in compartments:
+            samples.append(await timed(getattr(service, getter_name)(compartment_id)))
+        return samples
+    return run
+
+
+async def all_resources(service) -> List[float]:
+    return [await timed(service.get_all_resources(service.config['tenancy']))]
+
+
+SCENARIOS = {
+    "get_all_resources": all_resources,
+    "get_databases": per_compartment("get_databases"),
+    "get_network_resources": per_compartment("get_network_resources"),
+}
+
+
+async def run_scenario(name: str, run: Run, source: Source, iterations: int) -> dict:
+    service = source.service()
+    samples, calls = [], 0
+    for _ in range(iterations):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = use_cold_cache(cache_dir)
+            before = source.calls()
+            samples.extend(await run(service))
+            calls += source.calls() - before
+            await cache.close()
+
+    # Separate pass for memory: tracing slows allocation-heavy code down
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = use_cold_cache(cache_dir)
+        tracemalloc.start()
+        await run(service)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        await cache.close()
+
+    return {"scenario": name, "samples": len(samples), "calls": calls / iterations,
+            "peak_mib": peak / 2 ** 20, "throttled": source.throttled(), **summarize(samples)}
+
+
+async def main(args):
+    if not args.keep_governor:
+        unthrottle_governor()
+    source = Source(args)
+    print(f"Source: {source.describe()}; {args.iterations} iteration(s) per scenario, cold caches")
+    print(f"{'scenario':<24}{'samples':>8}{'calls/run':>11}{'p50 ms':>10}{'p99 ms':>10}{'peak MiB':>10}{'429s':>7}")
+    for name in args.scenarios:
+        row = await run_scenario(name, SCENARIOS[name], source, args.iterations)
+        print(f"{row['scenario']:<24}{row['samples']:>8}{row['calls']:>11.0f}{row['p50_ms']:>10.1f}"
+              f"{row['p99_ms']:>10.1f}{row['peak_mib']:>10.2f}{row['throttled']:>7}")
+    source.finish()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    add_source_arguments(parser)
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    asyncio.run(main(parser.parse_args()))
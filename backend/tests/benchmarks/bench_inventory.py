@@ -0,0 +1,61 @@
+"""
+Tenancy-wide inventory benchmark: Resource Search vs per-compartment listing
+Runs both strategies of ``OCIService._get_all_resources_from_all_compartments``
+against the fake OCI SDK with cold caches and reports SDK calls and wall time.
+
+    python -m tests.benchmarks.bench_inventory --compartments 200 --populated 20 --latency-ms 20
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+
+from app.services import cloud_service
+from tests.benchmarks.harness import unthrottle_governor, use_cold_cache
+from tests.fakes.fake_oci import FakeTenancy
+
+
+async def run_strategy(backend: str, args) -> dict:
+    tenancy = FakeTenancy(
+        compartments=args.compartments, populated=args.populated,
+        resources_per_type=args.resources, page_size=args.page_size, latency=args.latency_ms / 1000
+    )
+    service = tenancy.install(cloud_service.OCIService())
+    service.inventory_backend = backend
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        use_cold_cache(cache_dir)
+        started = time.perf_counter()
+        result = await service._get_all_resources_from_all_compartments()
+        elapsed = time.perf_counter() - started
+        await cloud_service.cache_service.close()
+
+    return {
+        "backend": result.get("inventory_backend", backend),
+        "resources": result["total_resources"],
+        "calls": tenancy.total_calls(),
+        "seconds": elapsed,
+        "top_operations": tenancy.calls.most_common(3),
+    }
+
+
+async def main(args):
+    unthrottle_governor()
+    print(f"Tenancy: {args.compartments} compartments, {args.populated} populated, "
+          f"{args.resources} resources/type, {args.latency_ms} ms/call")
+    print(f"{'strategy':<14}{'resources':>10}{'calls':>8}{'wall s':>9}  top operations")
+    for backend in ("compartments", "search"):
+        row = await run_strategy(backend, args)
+        top = ", ".join(f"{op}={n}" for op, n in row["top_operations"])
+        print(f"{row['backend']:<14}{row['resources']:>10}{row['calls']:>8}{row['seconds']:>9.2f}  {top}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--compartments", type=int, default=100)
+    parser.add_argument("--populated", type=int, default=10)
+    parser.add_argument("--resources", type=int, default=5, help="resources per type in populated compartments")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,86 @@
+"""
+Inventory index benchmark: indexed lookups vs rescanning resource lists
+Builds a synthetic inventory and times OCID, state and compartment lookups and
+facet counts against the linear scans consumers used before.
+
+    python -m tests.benchmarks.bench_inventory_index --resources 100000
+"""
+
+import argparse
+import random
+import time
+
+from app.services.inventory_index import InventoryIndex
+from app.services.resource_search_inventory import RESOURCE_TYPES
+
+STATES = ["RUNNING", "STOPPED", "AVAILABLE", "TERMINATED"]
+SHAPES = ["VM.Standard.E4.Flex", "VM.Standard3.Flex", "BM.Standard.E5"]
+
+
+def build_inventory(resources: int, compartments: int):
+    """Listings per (compartment, category), like OCIService returns them"""
+    rng = random.Random(7)
+    listings = {}
+    for n in range(resources):
+        pair = (f"ocid1.compartment.oc1..{n % compartments}", RESOURCE_TYPES[n % len(RESOURCE_TYPES)])
+        listings.setdefault(pair, []).append({
+            "id": f"ocid1.resource.oc1..{n}", "display_name": f"resource-{n}",
+            "lifecycle_state": rng.choice(STATES), "shape": rng.choice(SHAPES),
+        })
+    return listings
+
+
+def per_call_us(func, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def main(args):
+    listings = build_inventory(args.resources, args.compartments)
+    flat = [item for items in listings.values() for item in items]
+    index = InventoryIndex()
+    started = time.perf_counter()
+    for (compartment_id, category), items in listings.items():
+        index.replace_pair(compartment_id, category, items)
+    build_s = time.perf_counter() - started
+    started = time.perf_counter()
+    for (compartment_id, category), items in listings.items():
+        index.replace_pair(compartment_id, category, [dict(item) for item in items])
+    relist_s = time.perf_counter() - started
+
+    rng = random.Random(11)
+    target = rng.choice(flat)["id"]
+    compartment = "ocid1.compartment.oc1..3"
+    cases = [
+        ("get by OCID",
+         lambda: index.get(target),
+         lambda: next(r for r in flat if r["id"] == target)),
+        ("stopped compute in compartment",
+         lambda: index.ids(compartment, "compute_instances", "STOPPED"),
+         lambda: [r for (c, t), items in listings.items() if c == compartment and t == "compute_instances"
+                  for r in items if r["lifecycle_state"] == "STOPPED"]),
+        ("running count (tenancy)",
+         lambda: index.count(None, None, "lifecycle_state", "RUNNING"),
+         lambda: sum(1 for r in flat if r["lifecycle_state"] == "RUNNING")),
+        ("shape facets of compute",
+         lambda: index.facets(category="compute_instances"),
+         lambda: [r["shape"] for (c, t), items in listings.items() if t == "compute_instances" for r in items]),
+    ]
+
+    print(f"Inventory: {args.resources} resources in {args.compartments} compartments, "
+          f"index built in {build_s:.2f}s, unchanged re-listing applied in {relist_s:.2f}s")
+    print(f"{'lookup':<34}{'index us':>12}{'scan us':>14}{'speedup':>10}")
+    for name, indexed, scan in cases:
+        index_us = per_call_us(indexed, args.repeat)
+        scan_us = per_call_us(scan, max(1, args.repeat // 100))
+        print(f"{name:<34}{index_us:>12.2f}{scan_us:>14.1f}{scan_us / index_us:>9.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--resources", type=int, default=100_000)
+    parser.add_argument("--compartments", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=1000)
+    main(parser.parse_args())
@@ -0,0 +1,102 @@
+"""
+Metric store benchmark: memory and windowed query latency at 10k series
+Fills the store with synthetic 1-minute streams (one query per compartment, many
+resources each), then times windowed queries served locally, sliding refreshes
+that fetch only the new minutes, and aggregates with percentiles.
+
+    python -m tests.benchmarks.bench_metric_store --series 10000 --per-query 100
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+import psutil
+
+from app.services.metric_store import MetricStore, aggregate, epoch
+from tests.benchmarks.harness import summarize
+
+STEPS = {"1m": 60, "5m": 300, "1h": 3600}
+NOW = datetime(2026, 1, 1, 12, 0)
+
+
+def synthetic_fetch(compartment: str, resources: int, counter: dict):
+    """Every resource reports a sawtooth value per interval (with timezone-aware timestamps,
+    as the SDK returns them); counts the points handed out"""
+    async def fetch(start, end, interval):
+        step = STEPS[interval]
+        times = [datetime.fromtimestamp(t, timezone.utc) for t in range(epoch(start) // step * step, epoch(end), step)]
+        streams = {f"{compartment}-resource-{r}": [(t, float((i + r) % 100)) for i, t in enumerate(times)]
+                   for r in range(resources)}
+        counter["points"] += len(times) * resources
+        return streams
+    return fetch
+
+
+async def timed(call) -> float:
+    started = time.perf_counter()
+    await call
+    return time.perf_counter() - started
+
+
+async def main(args):
+    queries = [(f"compartment-{q}", "oci_computeagent", "CpuUtilization", None)
+               for q in range(args.series // args.per_query)]
+    store = MetricStore({60: args.raw_hours * 3600, 300: 86400, 3600: 14 * 86400}, max_series=args.series)
+    counter = {"points": 0}
+    fetches = {query: synthetic_fetch(query[0], args.per_query, counter) for query in queries}
+
+    rss_before = psutil.Process().memory_info().rss
+    started = time.perf_counter()
+    for query in queries:
+        await store.query(query, NOW - timedelta(hours=args.raw_hours), NOW, fetches[query], now=NOW)
+    fill_s = time.perf_counter() - started
+    rss_growth = psutil.Process().memory_info().rss - rss_before
+    stats = store.get_stats()
+    print(f"Store: {stats['series']} series, {counter['points']} points filled in {fill_s:.1f}s; "
+          f"ring buffers {stats['memory_bytes'] / 2 ** 20:.1f} MiB "
+          f"({stats['memory_bytes'] / stats['series'] / 1024:.1f} KiB/series), process RSS +{rss_growth / 2 ** 20:.0f} MiB")
+
+    settled = NOW - timedelta(minutes=5)
+    windows = [("1h window, 1m (local)", timedelta(hours=1)), ("24h window, 5m (local)", timedelta(hours=23))]
+    print(f"{'query (' + str(args.per_query) + ' series each)':<36}{'p50 ms':>10}{'p99 ms':>10}{'points fetched':>16}")
+    for name, span in windows:
+        # First pass fetches what the tier lacks (the 5m tier starts empty); time the second
+        for query in queries:
+            await store.query(query, settled - span, settled, fetches[query], now=NOW)
+        before = counter["points"]
+        samples = [
+            await timed(store.query(query, settled - span, settled, fetches[query], now=NOW))
+            for query in queries[:args.repeat]
+        ]
+        row = summarize(samples)
+        print(f"{name:<36}{row['p50_ms']:>10.2f}{row['p99_ms']:>10.2f}{counter['points'] - before:>16}")
+
+    # Dashboard refresh: one query's 1h window slides forward a minute per refresh
+    query, before, samples = queries[0], counter["points"], []
+    for i in range(args.repeat):
+        now = NOW + timedelta(minutes=i + 1)
+        samples.append(await timed(store.query(query, now - timedelta(hours=1), now, fetches[query], now=now)))
+    row = summarize(samples)
+    naive = args.repeat * 60 * args.per_query
+    print(f"{'sliding 1h refresh (+1m)':<36}{row['p50_ms']:>10.2f}{row['p99_ms']:>10.2f}{counter['points'] - before:>16}"
+          f"   (full refetch: {naive})")
+
+    samples = []
+    for query in queries[:args.repeat]:
+        _, series = await store.query(query, settled - timedelta(hours=1), settled, fetches[query], now=NOW)
+        started = time.perf_counter()
+        aggregate(series.values())
+        samples.append(time.perf_counter() - started)
+    row = summarize(samples)
+    print(f"{'aggregate + p50/p95/p99 over 1h':<36}{row['p50_ms']:>10.2f}{row['p99_ms']:>10.2f}{0:>16}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--series", type=int, default=10_000)
+    parser.add_argument("--per-query", type=int, default=100, help="resources returned by one Monitoring query")
+    parser.add_argument("--raw-hours", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
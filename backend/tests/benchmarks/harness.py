@@ -0,0 +1,104 @@
+"""
+Shared helpers for the discovery benchmarks: governor and cache setup, sources
+(synthetic fake tenancy, recorded fixture or live tenancy) and latency statistics
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.core.oci_governor import oci_governor
+from app.services import cloud_service, inventory_sync, resource_search_inventory
+from app.services.cache_service import CacheService
+from tests.fakes.fake_oci import FakeTenancy
+from tests.fakes.recording import Recorder, Replayer
+
+
+def unthrottle_governor():
+    """Lift the rate governor's limits so timings reflect the strategy, not pacing"""
+    oci_governor.initial_rate = oci_governor.max_rate = oci_governor.burst = 1e6
+    oci_governor._buckets.clear()
+    oci_governor._stats.clear()
+
+
+def use_cold_cache(cache_dir: str) -> CacheService:
+    """Point every discovery module at an empty cache"""
+    cache = CacheService(cache_dir=cache_dir)
+    cache.janitor_interval = 0
+    for module in (cloud_service, resource_search_inventory, inventory_sync):
+        module.cache_service = cache
+    return cache
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class Source:
+    """Where SDK calls go: a synthetic tenancy, a recorded fixture or the live tenancy"""
+
+    def __init__(self, args):
+        self.args = args
+        self.tenancy: Optional[FakeTenancy] = None
+        self.replayer: Optional[Replayer] = Replayer.load(args.replay) if args.replay else None
+        self.recorder: Optional[Recorder] = Recorder() if args.record else None
+        self.config: Dict[str, Any] = {}
+
+    def service(self) -> cloud_service.OCIService:
+        """A fresh OCIService wired to this source (and to the recorder, if recording)"""
+        service = cloud_service.OCIService()
+        if self.replayer is not None:
+            self.replayer.install(service)
+        elif not self.args.live:
+            self.tenancy = FakeTenancy(
+                compartments=self.args.compartments, populated=self.args.populated,
+                resources_per_type=self.args.resources, page_size=self.args.page_size,
+                latency=self.args.latency_ms / 1000, throttle_rate=self.args.throttle_rate, seed=self.args.seed,
+            )
+            self.tenancy.install(service)
+        if self.recorder is not None:
+            self.recorder.install(service)
+        self.config = {"tenancy": (service.config or {}).get("tenancy")}
+        return service
+
+    def calls(self) -> int:
+        if self.replayer is not None:
+            return self.replayer.total_calls()
+        return self.tenancy.total_calls() if self.tenancy else 0
+
+    def throttled(self) -> int:
+        return sum(self.tenancy.throttled.values()) if self.tenancy else 0
+
+    def describe(self) -> str:
+        if self.replayer is not None:
+            return f"replay of {self.args.replay}"
+        if self.args.live:
+            return "live tenancy (call counts unavailable)"
+        a = self.args
+        return (f"synthetic: {a.compartments} compartments, {a.populated} populated, {a.resources} resources/type, "
+                f"page size {a.page_size}, {a.latency_ms} ms/call, {a.throttle_rate:.0%} throttled")
+
+    def finish(self):
+        if self.recorder is not None:
+            self.recorder.save(self.args.record, self.config)
+
+
+def add_source_arguments(parser):
+    parser.add_argument("--compartments", type=int, default=100)
+    parser.add_argument("--populated", type=int, default=10)
+    parser.add_argument("--resources", type=int, default=5, help="resources per type in populated compartments")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of calls answered with 429")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--replay", metavar="FIXTURE", help="serve a recorded fixture instead of a synthetic tenancy")
+    parser.add_argument("--live", action="store_true", help="call the tenancy of the configured OCI profile")
+    parser.add_argument("--record", metavar="FIXTURE", help="save every response to a replayable fixture")
+    parser.add_argument("--keep-governor", action="store_true", help="keep the configured rate governor limits")
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    return {"p50_ms": percentile(samples, 50) * 1000, "p99_ms": percentile(samples, 99) * 1000}
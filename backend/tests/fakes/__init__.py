@@ -0,0 +1 @@
+# Fake external services for tests and benchmarks
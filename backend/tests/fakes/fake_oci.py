@@ -0,0 +1,409 @@
+"""
+Fake OCI SDK
+A synthetic tenancy served through client objects with the same method names and
+paging behaviour as the OCI SDK. ``install`` plugs the clients into an
+``OCIService`` (``_get_client`` returns them), so discovery code runs unchanged
+and every SDK call is counted per operation. Calls can be slowed down and
+answered with 429 Throttling at a configurable rate; ``tests.fakes.recording``
+records and replays responses through the same hook.
+"""
+
+import random
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from oci.exceptions import ServiceError
+
+AVAILABILITY_DOMAINS = ["AD-1", "AD-2", "AD-3"]
+
+# Resource Search type names as returned by the service
+SEARCH_TYPE_NAMES = {
+    "instance": "Instance", "volume": "Volume", "vcn": "Vcn", "subnet": "Subnet",
+    "dbsystem": "DbSystem", "database": "Database", "autonomousdatabase": "AutonomousDatabase",
+    "clusterscluster": "ClustersCluster", "apigateway": "ApiGateway", "loadbalancer": "LoadBalancer",
+    "filesystem": "FileSystem", "bucket": "Bucket", "vault": "Vault", "vaultsecret": "VaultSecret",
+}
+
+
+class FakeTenancy:
+    """Synthetic tenancy: ``compartments`` compartments, of which ``populated`` hold
+    ``resources_per_type`` resources of every inventory type
+
+    Listings page at ``page_size`` items and every call sleeps ``latency`` seconds
+    (in the calling thread, like a real HTTP round trip). A ``throttle_rate``
+    fraction of calls fails with a 429, drawn from a ``seed``-ed generator.
+    """
+
+    def __init__(self, compartments: int = 20, populated: int = 5, resources_per_type: int = 3,
+                 page_size: int = 100, latency: float = 0.0, throttle_rate: float = 0.0, seed: int = 0):
+        self.tenancy_id = "ocid1.tenancy.oc1..fake"
+        self.page_size = page_size
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.calls: Counter = Counter()
+        self.throttled: Counter = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._created = datetime(2024, 1, 1)
+        # Monitoring: metric name -> resource id -> datapoint values, oldest first
+        self.metrics: Dict[str, Dict[str, List[float]]] = {}
+        # Monitoring: alarm definitions and alarm id -> FIRING / OK / SUSPENDED
+        self.alarms: List[SimpleNamespace] = []
+        self.alarm_status: Dict[str, str] = {}
+        # Logging Search: log records (search result data) returned for every query
+        self.logs: List[Dict[str, Any]] = []
+
+        self.compartments = [
+            self._resource("compartment", i, name=f"compartment-{i}", description="", compartment_id=self.tenancy_id)
+            for i in range(compartments)
+        ]
+        # kind -> parent id (compartment, VCN, DB system, ...) -> resources
+        self.resources: Dict[str, Dict[str, List[SimpleNamespace]]] = {}
+        for comp in self.compartments[:populated]:
+            for n in range(resources_per_type):
+                self._populate(comp.id, n)
+
+    def _resource(self, kind: str, n: Any, **fields) -> SimpleNamespace:
+        resource = SimpleNamespace(
+            id=f"ocid1.{kind}.oc1..{n}", display_name=f"{kind}-{n}", lifecycle_state="ACTIVE",
+            time_created=self._created, time_updated=self._created, availability_domain=AVAILABILITY_DOMAINS[0]
+        )
+        resource.__dict__.update(fields)
+        return resource
+
+    def _add(self, kind: str, parent_id: str, resource: SimpleNamespace) -> SimpleNamespace:
+        self.resources.setdefault(kind, {}).setdefault(parent_id, []).append(resource)
+        return resource
+
+    def _populate(self, compartment_id: str, n: int):
+        key = f"{compartment_id.rsplit('.', 1)[-1]}-{n}"
+        self._add("instance", compartment_id, self._resource(
+            "instance", key, compartment_id=compartment_id, shape="VM.Standard.E4.Flex", region="eu-frankfurt-1"))
+        self._add("volume", compartment_id, self._resource(
+            "volume", key, compartment_id=compartment_id, size_in_gbs=50, volume_group_id=None, is_hydrated=True))
+        vcn = self._add("vcn", compartment_id, self._resource(
+            "vcn", key, compartment_id=compartment_id, cidr_block="10.0.0.0/16"))
+        for s in range(2):
+            self._add("subnet", vcn.id, self._resource(
+                "subnet", f"{key}-{s}", compartment_id=compartment_id, cidr_block=f"10.0.{s}.0/24", vcn_id=vcn.id))
+        db_system = self._add("dbsystem", compartment_id, self._resource(
+            "dbsystem", key, compartment_id=compartment_id, shape="VM.Standard2.1", database_edition="ENTERPRISE_EDITION",
+            cpu_core_count=1, data_storage_size_in_gbs=256, node_count=1))
+        db_home = self._add("dbhome", db_system.id, self._resource("dbhome", key, compartment_id=compartment_id))
+        self._add("database", db_home.id, self._resource(
+            "database", key, compartment_id=compartment_id, db_name=f"DB{n}", db_workload="OLTP",
+            character_set="AL32UTF8", pdb_name=None, is_cdb=False))
+        self._add("autonomousdatabase", compartment_id, self._resource(
+            "autonomousdatabase", key, compartment_id=compartment_id, db_name=f"ADB{n}", db_workload="OLTP",
+            cpu_core_count=1, data_storage_size_in_tbs=1))
+        self._add("cluster", compartment_id, self._resource(
+            "cluster", key, compartment_id=compartment_id, name=f"oke-{key}", kubernetes_version="v1.29.1",
+            vcn_id=vcn.id))
+        self._add("gateway", compartment_id, self._resource(
+            "gateway", key, compartment_id=compartment_id, hostname=f"gw-{key}.example.com"))
+        self._add("loadbalancer", compartment_id, self._resource(
+            "loadbalancer", key, compartment_id=compartment_id, shape_name="flexible", is_private=False))
+        self._add("filesystem", compartment_id, self._resource(
+            "filesystem", key, compartment_id=compartment_id, metered_bytes=1024, source_details=None))
+        self._add("bucket", compartment_id, self._resource(
+            "bucket", key, compartment_id=compartment_id, name=f"bucket-{key}", storage_tier="Standard",
+            approximate_size=0, approximate_count=0, public_access_type="NoPublicAccess", versioning="Disabled"))
+        vault = self._add("vault", compartment_id, self._resource(
+            "vault", key, compartment_id=compartment_id, vault_type="DEFAULT", crypto_endpoint=None,
+            management_endpoint=None))
+        self._add("secret", vault.id, self._resource(
+            "secret", key, compartment_id=compartment_id, secret_name=f"secret-{key}", vault_id=vault.id))
+
+    def launch_instance(self, compartment_id: str, n: Any) -> SimpleNamespace:
+        """Create an instance now, as seen by search's ``timeCreated`` filter"""
+        now = datetime.utcnow()
+        return self._add("instance", compartment_id, self._resource(
+            "instance", n, compartment_id=compartment_id, shape="VM.Standard.E4.Flex", region="eu-frankfurt-1",
+            time_created=now, time_updated=now))
+
+    def update(self, resource: SimpleNamespace, **fields):
+        """Change a resource now, as seen by search's ``timeUpdated`` filter"""
+        resource.__dict__.update(fields, time_updated=datetime.utcnow())
+
+    def set_metric(self, resource: SimpleNamespace, metric: str, *values: float):
+        """Datapoints Monitoring reports for ``resource`` (one per interval, up to now)"""
+        self.metrics.setdefault(metric, {})[resource.id] = list(values)
+
+    def add_alarm(self, compartment_id: str, n: Any, severity: str = "CRITICAL", status: str = "OK") -> SimpleNamespace:
+        """Alarm defined in ``compartment_id`` (``AlarmSummary`` has no time fields)"""
+        alarm = SimpleNamespace(
+            id=f"ocid1.alarm.oc1..{n}", display_name=f"alarm-{n}", compartment_id=compartment_id,
+            metric_compartment_id=compartment_id, namespace="oci_computeagent",
+            query="CpuUtilization[1m].mean() > 90", severity=severity, is_enabled=True,
+            lifecycle_state="ACTIVE", rule_name="BASE", destinations=[], suppression=None
+        )
+        self.alarms.append(alarm)
+        self.alarm_status[alarm.id] = status
+        return alarm
+
+    def add_logs(self, count: int, source: str = "app"):
+        """``count`` log records, as Logging Search returns them in a result's ``data``"""
+        start = len(self.logs)
+        self.logs.extend(
+            {"id": f"log-{i}", "datetime": (self._created + timedelta(seconds=i)).isoformat(), "source": source,
+             "logContent": {"data": {"message": f"request {i}"}}, "logGroup": "ocid1.loggroup.oc1..fake"}
+            for i in range(start, start + count)
+        )
+
+    def subtree(self, compartment_id: str) -> set:
+        """The compartment and every compartment below it"""
+        ids, grown = {compartment_id}, True
+        while grown:
+            below = {c.id for c in self.compartments if c.compartment_id in ids}
+            grown = not below <= ids
+            ids |= below
+        return ids
+
+    def children(self, kind: str, parent_id: str) -> List[SimpleNamespace]:
+        return self.resources.get(kind, {}).get(parent_id, [])
+
+    def all_of(self, kind: str) -> List[SimpleNamespace]:
+        return [r for resources in self.resources.get(kind, {}).values() for r in resources]
+
+    def record(self, operation: str):
+        with self._lock:
+            self.calls[operation] += 1
+            throttled = self.throttle_rate > 0 and self._rng.random() < self.throttle_rate
+            if throttled:
+                self.throttled[operation] += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if throttled:
+            raise ServiceError(429, "TooManyRequests", {"retry-after": "0"}, "Tenancy request-rate limit exceeded")
+
+    def page(self, items: List[Any], page: Optional[str], limit: Optional[int]) -> SimpleNamespace:
+        size = limit or self.page_size
+        start = int(page) if page else 0
+        end = start + size
+        return SimpleNamespace(data=items[start:end], next_page=str(end) if end < len(items) else None)
+
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def clients(self) -> Dict[str, Any]:
+        """Fake clients keyed by the names ``OCIService._get_client`` uses"""
+        return {
+            'identity': FakeIdentityClient(self),
+            'compute': FakeComputeClient(self),
+            'database': FakeDatabaseClient(self),
+            'container_engine': FakeContainerEngineClient(self),
+            'api_gateway': FakeGatewayClient(self),
+            'load_balancer': FakeLoadBalancerClient(self),
+            'virtual_network': FakeVirtualNetworkClient(self),
+            'block_storage': FakeBlockstorageClient(self),
+            'file_storage': FakeFileStorageClient(self),
+            'object_storage': FakeObjectStorageClient(self),
+            'kms_vault': FakeKmsVaultClient(self),
+            'vault': FakeVaultsClient(self),
+            'resource_search': FakeResourceSearchClient(self),
+            'monitoring': FakeMonitoringClient(self),
+            'log_search': FakeLogSearchClient(self),
+        }
+
+    def install(self, oci_service):
+        """Make ``oci_service`` talk to this tenancy"""
+        oci_service.oci_available = True
+        oci_service.config = {"tenancy": self.tenancy_id, "region": "eu-frankfurt-1"}
+        oci_service.clients = self.clients()
+        return oci_service
+
+
+class _FakeClient:
+    def __init__(self, tenancy: FakeTenancy):
+        self.tenancy = tenancy
+
+    def _list(self, operation: str, items: List[Any], page: Optional[str] = None, limit: Optional[int] = None):
+        self.tenancy.record(operation)
+        return self.tenancy.page(items, page, limit)
+
+    def _get(self, operation: str, data: Any):
+        self.tenancy.record(operation)
+        return SimpleNamespace(data=data, next_page=None)
+
+
+class FakeIdentityClient(_FakeClient):
+    def get_tenancy(self, tenancy_id, **kwargs):
+        return self._get("get_tenancy", SimpleNamespace(id=tenancy_id, name="fake-tenancy", description=""))
+
+    def list_compartments(self, compartment_id, page=None, limit=None, **kwargs):
+        return self._list("list_compartments", self.tenancy.compartments, page, limit)
+
+    def list_availability_domains(self, compartment_id, **kwargs):
+        return self._get("list_availability_domains", [SimpleNamespace(name=ad) for ad in AVAILABILITY_DOMAINS])
+
+
+class FakeComputeClient(_FakeClient):
+    def list_instances(self, compartment_id, page=None, limit=None, **kwargs):
+        return self._list("list_instances", self.tenancy.children("instance", compartment_id), page, limit)
+
+    def get_instance(self, instance_id, **kwargs):
+        match = [r for r in self.tenancy.all_of("instance") if r.id == instance_id]
+        return self._get("get_instance", match[0] if match else None)
+
+
+class FakeDatabaseClient(_FakeClient):
+    def list_db_systems(self, compartment_id, page=None, limit=None, **kwargs):
+        return self._list("list_db_systems", self.tenancy.children("dbsystem", compartment_id), page, limit)
+
+    def list_db_homes(self, compartment_id=None, db_system_id=None, page=None, limit=None, **kwargs):
+        return self._list("list_db_homes", self.tenancy.children("dbhome", db_system_id), page, limit)
+
+    def list_databases(self, compartment_id=None, db_home_id=None, page=None, limit=None, **kwargs):
+        return self._list("list_databases", self.tenancy.children("database", db_home_id), page, limit)
+
+    def list_autonomous_databases(self, compartment_id, page=None, limit=None, **kwargs):
+        items = self.tenancy.children("autonomousdatabase", compartment_id)
+        return self._list("list_autonomous_databases", items, page, limit)
+
+
+class FakeContainerEngineClient(_FakeClient):
+    def list_clusters(self, compartment_id, page=None, limit=None, **kwargs):
+        return self._list("list_clusters", self.tenancy.children("cluster", compartment_id), page, limit)
+
+
+class FakeGatewayClient(_FakeClient):
+    def list_gateways(self, compartment_id, page=None, limit=None, **kwargs):
+        response = self._list("list_gateways", self.tenancy.children("gateway", compartment_id), page, limit)
+        # Gateways come wrapped in a collection
+        response.data = SimpleNamespace(items=response.data)
+        return response
+
+
+class FakeLoadBalancerClient(_FakeClient):
+    def list_load_balancers(self, compartment_id, page=None, limit=None, **kwargs):
+        return self._list("list_load_balancers", self.tenancy.children("loadbalancer", compartment_id), page, limit)
+
+
+class FakeVirtualNetworkClient(_FakeClient):
+    def list_vcns(self, compartment_id, page=None, limit=None, **kwargs):
+        return self._list("list_vcns", self.tenancy.children("vcn", compartment_id), page, limit)
+
+    def list_subnets(self, compartment_id, vcn_id=None, page=None, limit=None, **kwargs):
+        return self._list("list_subnets", self.tenancy.children("subnet", vcn_id), page, limit)
+
+
+class FakeBlockstorageClient(_FakeClient):
+    def list_volumes(self, compartment_id=None, page=None, limit=None, **kwargs):
+        return self._list("list_volumes", self.tenancy.children("volume", compartment_id), page, limit)
+
+
+class FakeFileStorageClient(_FakeClient):
+    def list_file_systems(self, compartment_id, availability_domain, page=None, limit=None, **kwargs):
+        items = [fs for fs in self.tenancy.children("filesystem", compartment_id)
+                 if fs.availability_domain == availability_domain]
+        return self._list("list_file_systems", items, page, limit)
+
+
+class FakeObjectStorageClient(_FakeClient):
+    def get_namespace(self, **kwargs):
+        return self._get("get_namespace", "fakens")
+
+    def list_buckets(self, namespace_name, compartment_id, page=None, limit=None, **kwargs):
+        return self._list("list_buckets", self.tenancy.children("bucket", compartment_id), page, limit)
+
+    def get_bucket(self, namespace_name, bucket_name, **kwargs):
+        match = [b for b in self.tenancy.all_of("bucket") if b.name == bucket_name]
+        return self._get("get_bucket", match[0] if match else None)
+
+
+class FakeKmsVaultClient(_FakeClient):
+    def list_vaults(self, compartment_id, page=None, limit=None, **kwargs):
+        return self._list("list_vaults", self.tenancy.children("vault", compartment_id), page, limit)
+
+
+class FakeVaultsClient(_FakeClient):
+    def list_secrets(self, compartment_id, vault_id=None, page=None, limit=None, **kwargs):
+        return self._list("list_secrets", self.tenancy.children("secret", vault_id), page, limit)
+
+
+def _search_matches(resource: SimpleNamespace, query: str) -> bool:
+    """Evaluate the ``where`` clauses the inventory code emits: excluded lifecycle
+    states and a ``timeCreated >= '...' || timeUpdated >= '...'`` window"""
+    if resource.lifecycle_state in re.findall(r"lifecycleState != '(\w+)'", query):
+        return False
+    since = re.search(r"timeCreated >= '([^']+)'", query)
+    if since:
+        since = datetime.strptime(since.group(1), "%Y-%m-%dT%H:%M:%SZ")
+        return resource.time_created >= since or resource.time_updated >= since
+    return True
+
+
+class FakeResourceSearchClient(_FakeClient):
+    # Fake kind -> search type
+    KINDS = {
+        "instance": "instance", "volume": "volume", "vcn": "vcn", "dbsystem": "dbsystem",
+        "database": "database", "autonomousdatabase": "autonomousdatabase", "cluster": "clusterscluster",
+        "gateway": "apigateway", "loadbalancer": "loadbalancer", "filesystem": "filesystem",
+        "bucket": "bucket", "vault": "vault", "secret": "vaultsecret", "subnet": "subnet",
+    }
+
+    def search_resources(self, search_details, page=None, limit=None, **kwargs):
+        match = re.match(r"query\s+(.+?)\s+resources", search_details.query, re.IGNORECASE)
+        wanted = {t.strip().lower() for t in match.group(1).split(",")} if match else set()
+        summaries = [
+            SimpleNamespace(
+                resource_type=SEARCH_TYPE_NAMES[search_type], identifier=r.id, compartment_id=r.compartment_id,
+                display_name=getattr(r, "name", None) or r.display_name, lifecycle_state=r.lifecycle_state,
+                availability_domain=r.availability_domain, time_created=r.time_created,
+            )
+            for kind, search_type in self.KINDS.items() if search_type in wanted
+            for r in self.tenancy.all_of(kind) if _search_matches(r, search_details.query)
+        ]
+        return self._list("search_resources", summaries, page, limit)
+
+
+class FakeMonitoringClient(_FakeClient):
+    def _alarms(self, compartment_id, compartment_id_in_subtree):
+        scope = self.tenancy.subtree(compartment_id) if compartment_id_in_subtree else {compartment_id}
+        return [alarm for alarm in self.tenancy.alarms if alarm.compartment_id in scope]
+
+    def list_alarms(self, compartment_id, compartment_id_in_subtree=False, page=None, limit=None, **kwargs):
+        return self._list("list_alarms", self._alarms(compartment_id, compartment_id_in_subtree), page, limit)
+
+    def list_alarms_status(self, compartment_id, compartment_id_in_subtree=False, page=None, limit=None, **kwargs):
+        statuses = [
+            SimpleNamespace(
+                id=alarm.id, display_name=alarm.display_name, severity=alarm.severity, rule_name=alarm.rule_name,
+                status=self.tenancy.alarm_status[alarm.id], suppression=None, alarm_summary=None,
+                timestamp_triggered=datetime.now(timezone.utc) if self.tenancy.alarm_status[alarm.id] == "FIRING" else None
+            )
+            for alarm in self._alarms(compartment_id, compartment_id_in_subtree)
+        ]
+        return self._list("list_alarms_status", statuses, page, limit)
+
+    def summarize_metrics_data(self, compartment_id, summarize_metrics_data_details, **kwargs):
+        """One stream per instance of the compartment with datapoints for the queried metric"""
+        details = summarize_metrics_data_details
+        metric = re.match(r"'?(\w+)'?\[", details.query).group(1)
+        values = self.tenancy.metrics.get(metric, {})
+        streams = [
+            SimpleNamespace(
+                namespace=details.namespace, name=metric, compartment_id=compartment_id,
+                dimensions={"resourceId": instance.id},
+                aggregated_datapoints=[
+                    SimpleNamespace(timestamp=details.end_time - timedelta(minutes=len(values[instance.id]) - i),
+                                    value=value)
+                    for i, value in enumerate(values[instance.id])
+                ],
+            )
+            for instance in self.tenancy.children("instance", compartment_id) if instance.id in values
+        ]
+        return self._get("summarize_metrics_data", streams)
+
+
+class FakeLogSearchClient(_FakeClient):
+    def search_logs(self, search_logs_details, limit=None, page=None, **kwargs):
+        """Every log record matches; results come wrapped in a ``SearchResponse``"""
+        response = self._list("search_logs", [SimpleNamespace(data=log) for log in self.tenancy.logs], page, limit)
+        response.data = SimpleNamespace(results=response.data, summary=SimpleNamespace(result_count=len(response.data)))
+        return response
@@ -0,0 +1,52 @@
+"""
+Fixtures for tests against the fake OCI SDK
+``fake_oci`` isolates a test from process-wide state: every service module gets a
+private cache under ``tmp_path`` and the rate governor is unthrottled. Import it
+into a test module to use it.
+"""
+
+import pytest
+
+from app.core.oci_governor import oci_governor
+from app.services import (
+    cloud_service, inventory_sync, metric_batcher, monitoring_service, resource_search_inventory
+)
+from app.services.cache_service import CacheService
+from app.services.cloud_service import OCIService
+
+# Modules holding their own reference to the global cache_service
+CACHE_USERS = (cloud_service, resource_search_inventory, inventory_sync, metric_batcher, monitoring_service)
+
+
+class FakeOCI:
+    """Private cache and unthrottled governor; builds services on fake (or replayed) tenancies"""
+
+    def __init__(self, tmp_path, monkeypatch):
+        self.tmp_path = tmp_path
+        self.monkeypatch = monkeypatch
+        monkeypatch.setattr(oci_governor, "burst", 1000.0)
+        monkeypatch.setattr(oci_governor, "max_rate", 1e6)
+        monkeypatch.setattr(oci_governor, "_buckets", {})
+        monkeypatch.setattr(oci_governor, "_stats", {})
+        self.cache = self.fresh_cache()
+
+    def fresh_cache(self, name: str = "cache") -> CacheService:
+        """Swap an empty cache into every service module"""
+        cache = CacheService(cache_dir=str(self.tmp_path / name))
+        cache.janitor_interval = 0
+        for module in CACHE_USERS:
+            self.monkeypatch.setattr(module, "cache_service", cache)
+        self.cache = cache
+        return cache
+
+    def install(self, source) -> OCIService:
+        """New OCIService talking to ``source`` (a ``FakeTenancy`` or ``Replayer``); it is
+        also what ``monitoring_service.get_oci_service`` returns"""
+        service = source.install(OCIService())
+        self.monkeypatch.setattr(monitoring_service, "get_oci_service", lambda: service)
+        return service
+
+
+@pytest.fixture
+def fake_oci(tmp_path, monkeypatch) -> FakeOCI:
+    return FakeOCI(tmp_path, monkeypatch)
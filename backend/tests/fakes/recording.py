@@ -0,0 +1,193 @@
+"""
+Record and replay OCI SDK responses
+``Recorder`` wraps the clients ``OCIService._get_client`` hands out (live SDK clients
+or the fake tenancy) and saves every response, keyed by operation and arguments, to a
+JSON fixture. ``Replayer`` serves a fixture back through the same hook, so a
+recorded tenancy can be benchmarked or tested offline.
+
+    recorder = Recorder().install(oci_service)
+    ... run discovery ...
+    recorder.save("tenancy.json")
+
+    Replayer.load("tenancy.json").install(OCIService())
+"""
+
+import json
+import threading
+import types
+from collections import Counter
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List
+
+from oci.exceptions import ServiceError
+
+
+def encode(value: Any) -> Any:
+    """JSON-safe form of SDK models, SimpleNamespaces, datetimes and containers"""
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, (list, tuple)):
+        return [encode(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): encode(v) for k, v in value.items()}
+    fields = getattr(value, "swagger_types", None)
+    if fields is not None:
+        return {"__object__": {name: encode(getattr(value, name, None)) for name in fields}}
+    if isinstance(value, SimpleNamespace):
+        return {"__object__": {name: encode(v) for name, v in vars(value).items()}}
+    return value
+
+
+def decode(value: Any) -> Any:
+    """Inverse of ``encode``; models come back as SimpleNamespaces with the same attributes"""
+    if isinstance(value, list):
+        return [decode(v) for v in value]
+    if isinstance(value, dict):
+        if "__datetime__" in value:
+            return datetime.fromisoformat(value["__datetime__"])
+        if "__object__" in value:
+            return SimpleNamespace(**{name: decode(v) for name, v in value["__object__"].items()})
+        return {k: decode(v) for k, v in value.items()}
+    return value
+
+
+def call_key(operation: str, args: tuple, kwargs: dict) -> str:
+    """Stable key of one call: operation plus encoded arguments (page tokens included)"""
+    return json.dumps([operation, encode(list(args)), encode(kwargs)], sort_keys=True, default=str)
+
+
+def _client_class(class_name: str, base: type) -> type:
+    # Proxies carry the wrapped client's class name, so the rate governor and its
+    # metrics label calls exactly as for the real client
+    return type(class_name, (base,), {})
+
+
+class _RecordingClient:
+    def __init__(self, client_name: str, client: Any, recorder: "Recorder"):
+        self._client_name = client_name
+        self._client = client
+        self._recorder = recorder
+
+    def __getattr__(self, operation: str):
+        target = getattr(self._client, operation)
+        if not callable(target):
+            return target
+        recorder, client_name = self._recorder, self._client_name
+
+        def call(proxy, *args, **kwargs):
+            key = call_key(operation, args, kwargs)
+            try:
+                response = target(*args, **kwargs)
+            except ServiceError as e:
+                recorder.add(client_name, key, {"error": {"status": e.status, "code": e.code, "message": e.message}})
+                raise
+            recorder.add(client_name, key, {
+                "data": encode(getattr(response, "data", None)),
+                "next_page": getattr(response, "next_page", None),
+            })
+            return response
+
+        call.__name__ = operation
+        return types.MethodType(call, self)
+
+
+class Recorder:
+    """Captures SDK responses from an ``OCIService`` into a replayable fixture"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.classes: Dict[str, str] = {}
+        # client name -> call key -> responses in call order
+        self.responses: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+
+    def add(self, client_name: str, key: str, response: Dict[str, Any]):
+        with self._lock:
+            self.responses.setdefault(client_name, {}).setdefault(key, []).append(response)
+
+    def install(self, oci_service) -> "Recorder":
+        """Wrap every client ``oci_service`` creates from now on"""
+        get_client: Callable[[str], Any] = oci_service._get_client
+        proxies: Dict[str, Any] = {}
+
+        def recording_get_client(client_name: str):
+            if client_name not in proxies:
+                client = get_client(client_name)
+                self.classes[client_name] = type(client).__name__
+                proxies[client_name] = _client_class(self.classes[client_name], _RecordingClient)(
+                    client_name, client, self
+                )
+            return proxies[client_name]
+
+        oci_service._get_client = recording_get_client
+        return self
+
+    def save(self, path: str, config: Dict[str, Any] = None):
+        with open(path, "w") as f:
+            json.dump({"config": config or {}, "classes": self.classes, "responses": self.responses}, f)
+
+
+class _ReplayClient:
+    def __init__(self, client_name: str, replayer: "Replayer"):
+        self._client_name = client_name
+        self._replayer = replayer
+
+    def __getattr__(self, operation: str):
+        replayer, client_name = self._replayer, self._client_name
+
+        def call(proxy, *args, **kwargs):
+            return replayer.respond(client_name, call_key(operation, args, kwargs))
+
+        call.__name__ = operation
+        return types.MethodType(call, self)
+
+
+class Replayer:
+    """Serves a recorded fixture through ``OCIService._get_client``
+
+    Identical calls get their recorded responses in order, the last one repeating.
+    An unrecorded call raises a 404 ``ServiceError``, as a missing resource would.
+    """
+
+    def __init__(self, fixture: Dict[str, Any]):
+        self.config = fixture.get("config") or {}
+        self.classes: Dict[str, str] = fixture.get("classes", {})
+        self.responses: Dict[str, Dict[str, List[Dict[str, Any]]]] = fixture.get("responses", {})
+        self.calls: Counter = Counter()
+        self.misses: Counter = Counter()
+        self._served: Counter = Counter()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str) -> "Replayer":
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def respond(self, client_name: str, key: str) -> SimpleNamespace:
+        operation = json.loads(key)[0]
+        with self._lock:
+            self.calls[operation] += 1
+            recorded = self.responses.get(client_name, {}).get(key)
+            if not recorded:
+                self.misses[operation] += 1
+                raise ServiceError(404, "NotRecorded", {}, f"No recorded response for {client_name}.{operation}")
+            index = min(self._served[key], len(recorded) - 1)
+            self._served[key] += 1
+        response = recorded[index]
+        if "error" in response:
+            error = response["error"]
+            raise ServiceError(error["status"], error["code"], {}, error["message"])
+        return SimpleNamespace(data=decode(response["data"]), next_page=response["next_page"])
+
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def install(self, oci_service):
+        """Make ``oci_service`` talk to the recording"""
+        clients = {
+            name: _client_class(class_name, _ReplayClient)(name, self) for name, class_name in self.classes.items()
+        }
+        oci_service.oci_available = True
+        oci_service.config = {"region": "replay", **self.config}
+        oci_service.clients = clients
+        return oci_service
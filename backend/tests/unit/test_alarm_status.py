@@ -0,0 +1,90 @@
+"""
+Unit tests for the tenancy-wide alarm status view
+Tests that alarm definitions and firing status are listed once for the whole tenancy,
+cached separately, and aggregated per compartment subtree
+"""
+
+import copy
+
+import pytest
+
+from app.services.monitoring_service import MonitoringService
+from tests.fakes.fake_oci import FakeTenancy
+from tests.fakes.fixtures import fake_oci  # noqa: F401 (pytest fixture)
+
+
+@pytest.fixture
+def fake_service(fake_oci):
+    """Fake tenancy where compartment-1 and compartment-2 sit below compartment-0"""
+    tenancy = FakeTenancy(compartments=4, populated=0)
+    parent, child, grandchild, other = tenancy.compartments
+    child.compartment_id, grandchild.compartment_id = parent.id, child.id
+    tenancy.add_alarm(parent.id, "p", severity="WARNING", status="FIRING")
+    tenancy.add_alarm(child.id, "c1", severity="CRITICAL", status="FIRING")
+    tenancy.add_alarm(child.id, "c2", severity="ERROR", status="OK")
+    tenancy.add_alarm(grandchild.id, "g", severity="CRITICAL", status="SUSPENDED")
+    tenancy.add_alarm(other.id, "o", severity="CRITICAL", status="FIRING")
+    fake_oci.install(tenancy)
+    return tenancy, fake_oci.cache
+
+
+@pytest.mark.unit
+class TestAlarmStatusView:
+    """Test suite for tenancy-wide alarm status."""
+
+    @pytest.mark.asyncio
+    async def test_subtree_status_and_summary_from_one_listing(self, fake_service):
+        """Test compartment, subtree and summary reads share one listing of each kind."""
+        tenancy, _ = fake_service
+        parent, child = tenancy.compartments[:2]
+        monitoring = MonitoringService()
+
+        own = await monitoring.get_alarm_status(child.id)
+        subtree = await monitoring.get_alarm_status(parent.id, include_subtree=True)
+        summary = await monitoring.get_alert_summary(parent.id, include_subtree=True)
+
+        assert sorted((a["display_name"], a["status"]) for a in own) == [("alarm-c1", "FIRING"), ("alarm-c2", "OK")]
+        assert sorted(a["display_name"] for a in subtree) == ["alarm-c1", "alarm-c2", "alarm-g", "alarm-p"]
+        assert summary["total_alarms"] == 4 and summary["firing_alarms"] == 2
+        assert summary["severity_breakdown"]["CRITICAL"] == 1 and summary["severity_breakdown"]["MEDIUM"] == 1
+        assert tenancy.calls["list_alarms"] == 1 and tenancy.calls["list_alarms_status"] == 1
+
+    @pytest.mark.asyncio
+    async def test_status_refreshes_without_relisting_definitions(self, fake_service):
+        """Test a status refresh reuses cached definitions unless it reports an unknown alarm."""
+        tenancy, cache = fake_service
+        parent, child = tenancy.compartments[:2]
+        monitoring = MonitoringService()
+        await monitoring.get_alarm_status(child.id)
+
+        tenancy.alarm_status["ocid1.alarm.oc1..c2"] = "FIRING"
+        await cache.delete("monitoring", "alarm_statuses")
+        refreshed = await monitoring.get_alarm_status(child.id)
+        assert all(a["status"] == "FIRING" for a in refreshed)
+        assert tenancy.calls["list_alarms"] == 1 and tenancy.calls["list_alarms_status"] == 2
+
+        tenancy.add_alarm(parent.id, "new", status="FIRING")
+        await cache.delete("monitoring", "alarm_statuses")
+        alarms = await monitoring.get_alarm_status(parent.id)
+        assert sorted(a["display_name"] for a in alarms) == ["alarm-new", "alarm-p"]
+        assert tenancy.calls["list_alarms"] == 2
+
+    @pytest.mark.asyncio
+    async def test_view_is_reused_while_listings_are_unchanged(self, fake_service, monkeypatch):
+        """Test equal listings decoded afresh on every read (as from Redis) reuse the built view."""
+        tenancy, cache = fake_service
+        child = tenancy.compartments[1]
+        get_or_compute = cache.get_or_compute
+
+        async def decoded_copy(*args, **kwargs):
+            return copy.deepcopy(await get_or_compute(*args, **kwargs))
+
+        monkeypatch.setattr(cache, "get_or_compute", decoded_copy)
+        monitoring = MonitoringService()
+        view = await monitoring.get_alarm_view()
+        assert await monitoring.get_alarm_view() is view
+
+        tenancy.alarm_status["ocid1.alarm.oc1..c2"] = "FIRING"
+        await cache.delete("monitoring", "alarm_statuses")
+        assert await monitoring.get_alarm_view() is not view
+        assert all(a["status"] == "FIRING" for a in await monitoring.get_alarm_status(child.id))
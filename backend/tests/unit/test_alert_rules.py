@@ -0,0 +1,60 @@
+"""
+Unit tests for the alert rule engine
+Tests rule kinds, grouping, held-for durations and firing/resolved transitions
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.alert_rules import AlertRule, AlertRuleEngine, MetricFrame, RuleKind
+
+T0 = datetime(2026, 1, 1, 12, 0)
+
+
+def series(*values):
+    """Points one minute apart ending at T0"""
+    return [((T0 - timedelta(minutes=len(values) - 1 - i)).isoformat(), v) for i, v in enumerate(values)]
+
+
+@pytest.mark.unit
+class TestAlertRuleEngine:
+    """Test suite for the alert rule engine."""
+
+    def test_held_rule_fires_once_then_resolves(self):
+        """Test a for-duration rule emits one firing and one resolved transition."""
+        engine = AlertRuleEngine([AlertRule("CPU_HIGH", "CpuUtilization", threshold=80, for_seconds=120)])
+        resources = {"i1": "web-1", "i2": "web-2"}
+        hot = {"CpuUtilization": MetricFrame(list(resources), {"i1": series(85, 95), "i2": series(10, 20)})}
+
+        events = [engine.evaluate("c1", resources, hot, now=T0 + timedelta(minutes=m)) for m in (0, 1, 2, 3)]
+        assert [len(e) for e in events] == [0, 0, 1, 0]
+        assert events[2][0]["event"] == "firing" and events[2][0]["resource_id"] == "i1"
+        assert [a["resource_id"] for a in engine.active("c1")] == ["i1"]
+
+        # A failed fetch (no frame) keeps the state; recovered metrics resolve it
+        assert engine.evaluate("c1", resources, {}, now=T0 + timedelta(minutes=4)) == []
+        cool = {"CpuUtilization": MetricFrame(list(resources), {"i1": series(30, 40)})}
+        resolved = engine.evaluate("c1", resources, cool, now=T0 + timedelta(minutes=5))
+        assert [(e["event"], e["resource_id"]) for e in resolved] == [("resolved", "i1")]
+        assert engine.active("c1") == []
+
+    def test_rule_kinds_and_groups(self):
+        """Test threshold groups, rate of change and absent data across all resources at once."""
+        engine = AlertRuleEngine([
+            AlertRule("CPU_CRITICAL", "CpuUtilization", threshold=90, severity="CRITICAL", group="cpu"),
+            AlertRule("CPU_HIGH", "CpuUtilization", threshold=80, group="cpu"),
+            AlertRule("CPU_RISING", "CpuUtilization", kind=RuleKind.RATE_OF_CHANGE, threshold=10),
+            AlertRule("AGENT_SILENT", "CpuUtilization", kind=RuleKind.ABSENT),
+        ])
+        resources = {"a": "a", "b": "b", "c": "c", "d": "d"}
+        frame = MetricFrame(list(resources), {"a": series(95, 96), "b": series(84, 85), "c": series(10, 40)})
+
+        fired = engine.evaluate("c1", resources, {"CpuUtilization": frame}, now=T0)
+
+        assert sorted((e["resource_id"], e["alert_type"]) for e in fired) == [
+            ("a", "CPU_CRITICAL"), ("b", "CPU_HIGH"), ("c", "CPU_RISING"), ("d", "AGENT_SILENT")
+        ]
+        # Resources no longer listed resolve
+        resolved = engine.evaluate("c1", {"a": "a"}, {"CpuUtilization": MetricFrame(["a"], {"a": series(95)})}, now=T0)
+        assert sorted(e["resource_id"] for e in resolved) == ["b", "c", "d"]
@@ -0,0 +1,461 @@
+"""
+Unit tests for Cache Service
+Tests tiered get/set, single-flight computation, the local LRU tier and statistics
+"""
+
+import asyncio
+import json
+import time
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.cache_codecs import CacheSerializer
+from app.services.cache_service import CacheService, CircuitBreaker, LocalLRUCache, PersistentCacheStore
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create a cache service without Redis, backed by a temporary directory."""
+    with patch('app.services.cache_service.settings') as mock_settings:
+        mock_settings.REDIS_ENABLED = False
+        mock_settings.CACHE_LOCAL_MAX_ENTRIES = 1000
+        mock_settings.CACHE_LOCAL_MAX_BYTES = 1024 * 1024
+        mock_settings.CACHE_NAMESPACE_QUOTAS = {}
+        mock_settings.REDIS_CIRCUIT_FAILURE_THRESHOLD = 2
+        mock_settings.REDIS_CIRCUIT_RESET_TIMEOUT = 5.0
+        mock_settings.REDIS_CIRCUIT_MAX_RESET_TIMEOUT = 60.0
+        mock_settings.CACHE_FILE_MAX_BYTES = 1024 * 1024
+        mock_settings.CACHE_FILE_JANITOR_INTERVAL = 0
+        mock_settings.CACHE_GENERATION_REFRESH_SECONDS = 2.0
+        mock_settings.CACHE_CODEC = "auto"
+        mock_settings.CACHE_NAMESPACE_CODECS = {}
+        mock_settings.CACHE_COMPRESSION = "zstd"
+        mock_settings.CACHE_COMPRESSION_MIN_BYTES = 1024
+        service = CacheService(cache_dir=str(tmp_path))
+    return service
+
+
+@pytest.mark.unit
+class TestCacheService:
+    """Test suite for Cache Service functionality."""
+
+    @pytest.mark.asyncio
+    async def test_set_and_get_round_trip(self, cache):
+        """Test data written with set is returned by get."""
+        await cache.set("oci", "compute_instances:c1", [{"id": "i1"}], ttl=60)
+
+        result = await cache.get("oci", "compute_instances:c1")
+
+        assert result == [{"id": "i1"}]
+        assert cache.get_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_get_or_compute_coalesces_concurrent_callers(self, cache):
+        """Test concurrent misses on one key run the producer only once."""
+        calls = 0
+        release = asyncio.Event()
+
+        async def producer():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return ["value"]
+
+        tasks = [
+            asyncio.create_task(cache.get_or_compute("oci", "compartments:v2", producer, ttl=60))
+            for _ in range(10)
+        ]
+        await asyncio.sleep(0.05)
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert calls == 1
+        assert all(r == ["value"] for r in results)
+        assert cache.get_stats()["coalesced"] == 9
+        assert cache.get_stats()["inflight_producers"] == 0
+
+    @pytest.mark.asyncio
+    async def test_get_or_compute_uses_cached_value(self, cache):
+        """Test the producer is skipped when the key is already cached."""
+        await cache.set("oci", "k", {"cached": True}, ttl=60)
+
+        async def producer():
+            raise AssertionError("producer should not run")
+
+        assert await cache.get_or_compute("oci", "k", producer) == {"cached": True}
+
+    @pytest.mark.asyncio
+    async def test_get_or_compute_propagates_errors_without_caching(self, cache):
+        """Test producer errors reach every waiter and nothing is cached."""
+        release = asyncio.Event()
+
+        async def failing_producer():
+            await release.wait()
+            raise RuntimeError("throttled")
+
+        tasks = [
+            asyncio.create_task(cache.get_or_compute("oci", "k", failing_producer))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0.05)
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert await cache.get("oci", "k") is None
+
+        async def producer():
+            return "recovered"
+
+        assert await cache.get_or_compute("oci", "k", producer) == "recovered"
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_producer(self, cache):
+        """Test cancelling one waiter leaves the shared producer running."""
+        release = asyncio.Event()
+
+        async def producer():
+            await release.wait()
+            return "done"
+
+        owner = asyncio.create_task(cache.get_or_compute("oci", "k", producer))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(cache.get_or_compute("oci", "k", producer))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        release.set()
+
+        assert await owner == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_while_revalidating(self, cache):
+        """Test a soft-expired entry is returned at once and refreshed in the background."""
+        await cache.set("oci", "k", ["old"], ttl=60, hard_ttl=3600)
+        cache_key = cache._generate_cache_key("oci", "k")
+        # Age the entry past its soft TTL
+        entry = cache.local_cache.get(cache_key)
+        entry["created_at"] -= timedelta(seconds=120)
+        entry["fresh_until"] -= timedelta(seconds=120)
+
+        refreshed = asyncio.Event()
+
+        async def producer():
+            refreshed.set()
+            return ["new"]
+
+        with cache.track_staleness() as stale_entries:
+            result = await cache.get_or_compute("oci", "k", producer, ttl=60, hard_ttl=3600)
+
+        assert result == ["old"]
+        assert stale_entries[cache_key] >= 120
+        await asyncio.wait_for(refreshed.wait(), timeout=1)
+        await asyncio.sleep(0.01)
+
+        assert await cache.get("oci", "k") == ["new"]
+        stats = cache.get_stats()
+        assert stats["stale_hits"] == 1
+        assert stats["background_refreshes"] == 1
+        assert stats["max_stale_age_seconds"] >= 120
+
+    @pytest.mark.asyncio
+    async def test_fresh_entry_does_not_refresh(self, cache):
+        """Test entries inside their soft TTL are served without a refresh."""
+        await cache.set("oci", "k", ["value"], ttl=60, hard_ttl=3600)
+
+        async def producer():
+            raise AssertionError("producer should not run")
+
+        assert await cache.get_or_compute("oci", "k", producer, ttl=60, hard_ttl=3600) == ["value"]
+        assert cache.get_stats()["background_refreshes"] == 0
+
+    @pytest.mark.asyncio
+    async def test_set_many_and_get_many_local_tiers(self, cache):
+        """Test batch writes are readable in one batch read, reporting only found keys."""
+        await cache.set_many("oci", {"a": [1], "b": {"x": 2}}, ttl=60)
+
+        result = await cache.get_many("oci", ["a", "b", "missing"])
+
+        assert result == {"a": [1], "b": {"x": 2}}
+        stats = cache.get_stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_operations_use_one_redis_round_trip(self, cache):
+        """Test get_many issues a single MGET and set_many a single pipeline execute."""
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[True, True])
+        pipe.__aenter__ = AsyncMock(return_value=pipe)
+        pipe.__aexit__ = AsyncMock(return_value=False)
+        redis_client = MagicMock()
+        redis_client.pipeline.return_value = pipe
+        redis_client.mget = AsyncMock(return_value=[b'{"id": "r1"}', None])
+        redis_client.get = AsyncMock(return_value=None)
+        cache.redis_client = redis_client
+
+        await cache.set_many("oci", {"a": 1, "b": 2}, ttl=60)
+        result = await cache.get_many("oci", ["a", "c"])
+
+        redis_client.pipeline.assert_called_once_with(transaction=False)
+        assert pipe.setex.call_count == 2
+        pipe.execute.assert_awaited_once()
+        redis_client.mget.assert_awaited_once_with(["oci:a", "oci:c"])
+        assert result == {"a": {"id": "r1"}}
+
+    @pytest.mark.asyncio
+    async def test_clear_namespace_bumps_generation_with_single_incr(self, cache):
+        """Test clearing a namespace hides its entries via one INCR, without scanning keys."""
+        await cache.set("oci", "k", ["old"], ttl=60)
+        await cache.set("cost", "k", ["kept"], ttl=60)
+        redis_client = MagicMock()
+        redis_client.get = AsyncMock(return_value=None)
+        redis_client.setex = AsyncMock()
+        redis_client.incr = AsyncMock(return_value=1)
+        cache.redis_client = redis_client
+
+        assert await cache.clear_namespace("oci") == 1
+
+        redis_client.incr.assert_awaited_once_with("cache_generation:oci")
+        redis_client.keys.assert_not_called()
+        assert await cache.get("oci", "k") is None
+        assert await cache.get("cost", "k") == ["kept"]
+        await cache.set("oci", "k", ["new"], ttl=60)
+        assert await cache.get("oci", "k") == ["new"]
+        assert cache.get_stats()["namespace_generations"]["oci"] == 1
+
+    @pytest.mark.asyncio
+    async def test_generation_read_errors_fall_back(self, cache):
+        """Test a failing namespace generation read is absorbed like any other cache error."""
+        cache.file_store.get_generation = MagicMock(side_effect=RuntimeError("database is locked"))
+
+        await cache.set("oci", "k", ["value"], ttl=60)
+        await cache.delete("oci", "k")
+        assert await cache.get("oci", "k") is None
+        assert await cache.get_or_compute("oci", "k", AsyncMock(return_value=["computed"])) == ["computed"]
+        assert cache.get_stats()["errors"] == 3
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_skips_redis(self, cache):
+        """Test Redis is no longer called once the breaker opens, and local tiers still serve."""
+        redis_client = MagicMock()
+        redis_client.get = AsyncMock(side_effect=RedisConnectionError("down"))
+        redis_client.setex = AsyncMock(side_effect=RedisConnectionError("down"))
+        cache.redis_client = redis_client
+
+        await cache.set("oci", "k", ["value"], ttl=60)
+        assert await cache.get("oci", "k") == ["value"]
+        assert await cache.get("oci", "k") == ["value"]
+
+        assert redis_client.setex.await_count + redis_client.get.await_count == 2
+        circuit = (await cache.health_check())["redis_circuit"]
+        assert circuit["state"] == CircuitBreaker.OPEN
+        assert circuit["rejected_calls"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_telemetry_reports_namespace_and_tier_breakdown(self, cache):
+        """Test hits are attributed to the tier that served them and usage is tracked per namespace."""
+        await cache.set("oci", "k", ["value"], ttl=60)
+        assert await cache.get("oci", "k") == ["value"]
+        assert await cache.get("oci", "missing") is None
+
+        # A fresh process only finds the entry in the persistent tier
+        cache.local_cache.pop("oci:k")
+        assert await cache.get("oci", "k") == ["value"]
+
+        oci = cache.get_stats()["namespaces"]["oci"]
+        assert (oci["hits"], oci["misses"]) == (2, 1)
+        assert oci["tiers"]["memory"]["hits"] == 1
+        assert oci["tiers"]["file"]["hits"] == 1
+        assert oci["tiers"]["file"]["misses"] == 1
+        assert oci["get_latency"]["count"] == 3
+        assert oci["set_latency"]["count"] == 1
+        assert oci["usage"]["file"]["entries"] == 1
+        assert oci["usage"]["memory"]["entries"] == 1
+
+
+def _entry(data, ttl_seconds=60):
+    return {"data": data, "expires_at": datetime.now() + timedelta(seconds=ttl_seconds), "created_at": datetime.now()}
+
+
+def _store_set(store, cache_key, data, ttl_seconds=60):
+    store.set(cache_key, json.dumps(data).encode(), time.time() + ttl_seconds)
+
+
+@pytest.mark.unit
+class TestLocalLRUCache:
+    """Test suite for the bounded local cache tier."""
+
+    def test_evicts_least_recently_used_on_capacity(self):
+        """Test the least recently used entry is evicted when full."""
+        lru = LocalLRUCache(max_entries=2, max_bytes=1000)
+        lru.set("oci:a", _entry(1), 10)
+        lru.set("oci:b", _entry(2), 10)
+        lru.get("oci:a")
+        lru.set("oci:c", _entry(3), 10)
+
+        assert "oci:a" in lru
+        assert "oci:b" not in lru
+        assert lru.get_stats()["evictions"]["capacity"] == 1
+
+    def test_enforces_byte_budget(self):
+        """Test total bytes stay within the budget."""
+        lru = LocalLRUCache(max_entries=100, max_bytes=100)
+        for i in range(5):
+            lru.set(f"oci:{i}", _entry(i), 40)
+
+        assert lru.total_bytes <= 100
+        assert len(lru) == 2
+        assert lru.get_stats()["evictions"]["bytes"] == 3
+
+    def test_namespace_quota_only_evicts_own_namespace(self):
+        """Test a namespace over quota evicts its own entries, not others."""
+        lru = LocalLRUCache(max_entries=100, max_bytes=1000, namespace_quotas={"oci": 50})
+        lru.set("rate_limit:user1", _entry(1), 5)
+        lru.set("oci:a", _entry("a"), 30)
+        lru.set("oci:b", _entry("b"), 30)
+
+        assert "rate_limit:user1" in lru
+        assert "oci:a" not in lru
+        assert lru.get_stats()["namespace_bytes"] == {"rate_limit": 5, "oci": 30}
+        assert lru.get_stats()["evictions"]["quota"] == 1
+
+    def test_rejects_oversized_entries(self):
+        """Test an entry larger than the budget is not stored."""
+        lru = LocalLRUCache(max_entries=100, max_bytes=100)
+        lru.set("oci:small", _entry(1), 10)
+        lru.set("oci:huge", _entry(2), 500)
+
+        assert "oci:small" in lru
+        assert "oci:huge" not in lru
+        assert lru.get_stats()["evictions"]["oversized"] == 1
+
+    def test_expires_on_access(self):
+        """Test expired entries are dropped when read."""
+        lru = LocalLRUCache(max_entries=100, max_bytes=1000)
+        lru.set("oci:a", _entry(1, ttl_seconds=-1), 10)
+
+        assert lru.get("oci:a") is None
+        assert lru.total_bytes == 0
+        assert lru.get_stats()["evictions"]["expired"] == 1
+
+    def test_purge_superseded(self):
+        """Test purging old generations leaves the current one and other namespaces intact."""
+        lru = LocalLRUCache(max_entries=100, max_bytes=1000)
+        lru.set("oci:a", _entry(1), 10)
+        lru.set("oci:#1:b", _entry(2), 10)
+        lru.set("oci:#2:a", _entry(3), 10)
+        lru.set("cost:a", _entry(4), 10)
+
+        assert lru.purge_superseded("oci", "oci:#2:") == 2
+        assert "oci:#2:a" in lru
+        assert "cost:a" in lru
+        assert lru.total_bytes == 20
+
+
+@pytest.mark.unit
+class TestCircuitBreaker:
+    """Test suite for the circuit breaker state machine."""
+
+    def test_half_open_probe_closes_or_backs_off(self):
+        """Test a single probe is allowed after the backoff, and failed probes double it."""
+        breaker = CircuitBreaker("redis", failure_threshold=1, reset_timeout=5.0, max_reset_timeout=8.0)
+        with patch('app.services.cache_service.time.monotonic', return_value=100.0):
+            breaker.record_failure()
+            assert breaker.allow_request() is False
+
+        with patch('app.services.cache_service.time.monotonic', return_value=106.0):
+            assert breaker.allow_request() is True
+            assert breaker.allow_request() is False
+            breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.current_reset_timeout == 8.0
+
+        with patch('app.services.cache_service.time.monotonic', return_value=115.0):
+            assert breaker.allow_request() is True
+            breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.current_reset_timeout == 5.0
+        assert breaker.get_stats()["transitions"] == {"open": 2, "half_open": 2, "closed": 1}
+
+
+@pytest.mark.unit
+class TestPersistentCacheStore:
+    """Test suite for the SQLite-backed persistent tier."""
+
+    def test_round_trip_survives_reopen(self, tmp_path):
+        """Test entries and namespace generations are readable after the store is reopened."""
+        path = str(tmp_path / "cache.db")
+        store = PersistentCacheStore(path, max_bytes=1024 * 1024)
+        _store_set(store, "oci:a", {"id": "a"})
+        store.set_generation("oci", 3)
+        store.close()
+
+        reopened = PersistentCacheStore(path, max_bytes=1024 * 1024)
+        payload = reopened.get("oci:a")
+
+        assert json.loads(payload) == {"id": "a"}
+        assert reopened.get_stats()["bytes"] == len(payload)
+        assert reopened.get_generation("oci") == 3
+
+    def test_purge_superseded_and_expired(self, tmp_path):
+        """Test generation and expiry purges only touch matching rows."""
+        store = PersistentCacheStore(str(tmp_path / "cache.db"), max_bytes=1024 * 1024)
+        _store_set(store, "oci:a", 1)
+        _store_set(store, "oci:#1:b", 2)
+        _store_set(store, "oci:#2:a", 3)
+        _store_set(store, "cost:a", 4)
+        _store_set(store, "cost:old", 5, ttl_seconds=-1)
+
+        assert store.get("cost:old") is None
+        assert store.purge_superseded("oci", "oci:#2:") == 2
+        assert store.purge_expired() == 1
+        assert json.loads(store.get("oci:#2:a")) == 3
+        assert store.get_stats()["entries"] == 2
+        assert store.namespace_usage() == {
+            "oci": {"entries": 1, "bytes": 1},
+            "cost": {"entries": 1, "bytes": 1},
+        }
+
+    def test_size_cap_evicts_soonest_expiring(self, tmp_path):
+        """Test the store stays under its cap by evicting entries closest to expiry."""
+        store = PersistentCacheStore(str(tmp_path / "cache.db"), max_bytes=2000)
+        for i in range(10):
+            _store_set(store, f"oci:{i}", "x" * 300, ttl_seconds=60 + i)
+
+        assert store.total_bytes <= 2000
+        assert store.get("oci:0") is None
+        assert store.get("oci:9") is not None
+        assert store.get_stats()["evictions"]["size_cap"] > 0
+
+
+@pytest.mark.unit
+class TestCacheSerializer:
+    """Test suite for cache payload codecs."""
+
+    def test_round_trips_datetimes_and_compresses_large_payloads(self):
+        """Test datetimes keep their type and payloads over the threshold are compressed."""
+        serializer = CacheSerializer(compression="zstd", compression_min_bytes=256)
+        value = {"when": datetime(2024, 5, 1, 12, 30), "rows": ["resource"] * 100}
+
+        payload, raw_size = serializer.encode("oci", value)
+
+        assert serializer.decode(payload) == value
+        assert len(payload) < raw_size
+        stats = serializer.get_stats()["codecs"]["orjson"]
+        assert stats["compressed"] == 1
+        assert stats["compression_ratio"] > 1
+
+    def test_namespace_codec_override_and_legacy_json(self):
+        """Test per-namespace codecs are honoured and header-less JSON still decodes."""
+        serializer = CacheSerializer(namespace_codecs={"rate_limit": "json"}, compression="none")
+
+        payload, _ = serializer.encode("rate_limit", {"count": 1})
+
+        assert payload[1] == 1
+        assert serializer.decode(payload) == {"count": 1}
+        assert serializer.decode(b'{"legacy": true}') == {"legacy": True}
+        assert serializer.get_stats()["namespace_codecs"] == {"rate_limit": "json"}
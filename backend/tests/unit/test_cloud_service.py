@@ -0,0 +1,195 @@
+"""
+Unit tests for OCI Service
+Tests pagination of list calls, bounded fan-out, the Resource Search inventory and streaming discovery
+"""
+
+import asyncio
+import copy
+import pytest
+from contextlib import aclosing
+from types import SimpleNamespace
+
+from app.services.cloud_service import OCIService
+from tests.fakes.fake_oci import FakeTenancy
+from tests.fakes.fixtures import fake_oci  # noqa: F401 (pytest fixture)
+
+
+class FakeListClient:
+    """List client returning fixed pages chained by opc-next-page tokens"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+
+    def list_instances(self, compartment_id, page=None, **kwargs):
+        self.calls.append(page)
+        index = int(page) if page else 0
+        next_page = str(index + 1) if index + 1 < len(self.pages) else None
+        return SimpleNamespace(data=self.pages[index], next_page=next_page)
+
+
+@pytest.fixture
+def oci_service():
+    service = OCIService()
+    service.list_max_items = None
+    return service
+
+
+@pytest.mark.unit
+class TestOCIServicePagination:
+    """Test suite for paginated OCI list calls."""
+
+    @pytest.mark.asyncio
+    async def test_follows_every_page(self, oci_service):
+        """Test every page is fetched in order and counted in the stats."""
+        client = FakeListClient([[1, 2], [3, 4], [5]])
+
+        items = []
+        async for page in oci_service._iter_pages(client.list_instances, "c1"):
+            items.extend(page)
+
+        assert items == [1, 2, 3, 4, 5]
+        assert client.calls == [None, "1", "2"]
+        stats = oci_service.get_pagination_stats()["list_instances"]
+        assert (stats["calls"], stats["pages"], stats["items"], stats["truncated"]) == (1, 3, 5, 0)
+
+    @pytest.mark.asyncio
+    async def test_max_items_stops_early(self, oci_service):
+        """Test early termination trims the last page and stops requesting more."""
+        client = FakeListClient([[1, 2], [3, 4], [5, 6], [7]])
+
+        items = []
+        async with aclosing(oci_service._iter_pages(client.list_instances, "c1", max_items=3)) as pages:
+            async for page in pages:
+                items.extend(page)
+
+        assert items == [1, 2, 3]
+        assert len(client.calls) == 2
+        assert oci_service.get_pagination_stats()["list_instances"]["truncated"] == 1
+
+
+@pytest.mark.unit
+class TestOCIServiceFanOut:
+    """Test suite for bounded concurrent fan-out."""
+
+    @pytest.mark.asyncio
+    async def test_keeps_order_bounds_concurrency_and_times_out_children(self, oci_service):
+        """Test results follow input order, the shared limit holds and slow children time out alone."""
+        oci_service.fanout_limit = asyncio.Semaphore(2)
+        oci_service.fanout_timeout = 0.2
+        running = peak = 0
+
+        async def child(item):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            try:
+                await asyncio.sleep(1.0 if item == "slow" else 0.01 * (5 - len(item)))
+                return item.upper()
+            finally:
+                running -= 1
+
+        results = await oci_service._fan_out(["a", "bb", "slow", "ccc", "d"], child)
+
+        assert results[:2] == ["A", "BB"]
+        assert isinstance(results[2], asyncio.TimeoutError)
+        assert results[3:] == ["CCC", "D"]
+        assert peak == 2
+
+
+@pytest.mark.unit
+class TestResourceSearchInventory:
+    """Test suite for the Resource Search inventory backend."""
+
+    @pytest.mark.asyncio
+    async def test_search_matches_compartment_listing_with_fewer_calls(self, fake_oci):
+        """Test both backends find the same resources and search skips empty compartments."""
+        inventories = {}
+        calls = {}
+        for backend in ("compartments", "search"):
+            tenancy = FakeTenancy(compartments=6, populated=2, resources_per_type=2)
+            service = fake_oci.install(tenancy)
+            service.inventory_backend = backend
+            await fake_oci.cache.clear_namespace("oci")
+
+            result = await service._get_all_resources_from_all_compartments()
+
+            assert result["inventory_backend"] == backend
+            inventories[backend] = {rt: sorted(r["id"] for r in items) for rt, items in result["resources"].items()}
+            calls[backend] = tenancy.total_calls()
+
+        assert inventories["search"] == inventories["compartments"]
+        assert calls["search"] < calls["compartments"]
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_compartment_listing_when_search_fails(self, fake_oci):
+        """Test a failing search client does not fail the inventory."""
+        tenancy = FakeTenancy(compartments=2, populated=1, resources_per_type=1)
+        service = fake_oci.install(tenancy)
+        service.inventory_backend = "search"
+
+        def broken_search(*args, **kwargs):
+            raise RuntimeError("search unavailable")
+
+        service.clients['resource_search'].search_resources = broken_search
+        result = await service._get_all_resources_from_all_compartments(['compute_instances'])
+
+        assert result["inventory_backend"] == "compartments"
+        assert len(result["resources"]["compute_instances"]) == 1
+
+
+@pytest.mark.unit
+class TestResourceDiscoveryStream:
+    """Test suite for streaming resource discovery."""
+
+    @pytest.mark.asyncio
+    async def test_streams_chunks_progress_and_summary(self, fake_oci):
+        """Test the stream carries the same resources as the full response, chunk by chunk."""
+        tenancy = FakeTenancy(compartments=5, populated=2, resources_per_type=2)
+        service = fake_oci.install(tenancy)
+        service.inventory_backend = "compartments"
+        service.discovery_stream_workers = 3
+
+        async with aclosing(service.stream_all_resources(tenancy.tenancy_id)) as stream:
+            events = [event async for event in stream]
+        full = await service._get_all_resources_from_all_compartments()
+
+        kinds = [event["event"] for event in events]
+        assert kinds[0] == "start" and kinds[-1] == "summary"
+        assert kinds.count("progress") == events[0]["listings"] == events[0]["compartments"] * 10
+        streamed = {}
+        for chunk in (event for event in events if event["event"] == "resources"):
+            assert chunk["count"] == len(chunk["items"]) > 0
+            streamed.setdefault(chunk["resource_type"], []).extend(item["id"] for item in chunk["items"])
+        expected = {rt: sorted(r["id"] for r in items) for rt, items in full["resources"].items() if items}
+        assert {rt: sorted(ids) for rt, ids in streamed.items()} == expected
+        assert events[-1]["total_resources"] == full["total_resources"]
+
+
+@pytest.mark.unit
+class TestCompartmentTreeRefresh:
+    """Test suite for keeping the compartment tree in line with the cached listing."""
+
+    @pytest.mark.asyncio
+    async def test_tree_is_rebuilt_only_when_listing_content_changes(self, oci_service, monkeypatch):
+        """Test equal listings decoded afresh on every read (as from Redis) do not re-apply the tree."""
+        listing = [
+            {"id": "root", "name": "root", "compartment_id": None},
+            {"id": "child", "name": "child", "compartment_id": "root"},
+        ]
+
+        async def get_compartments():
+            return copy.deepcopy(listing)
+
+        monkeypatch.setattr(oci_service, "get_compartments", get_compartments)
+        applied = []
+        apply = oci_service.compartment_tree.apply
+        monkeypatch.setattr(oci_service.compartment_tree, "apply", lambda items: applied.append(items) or apply(items))
+
+        await oci_service.get_compartment_tree()
+        await oci_service.get_compartment_tree()
+        assert len(applied) == 1
+
+        listing[1]["name"] = "renamed"
+        tree = await oci_service.get_compartment_tree()
+        assert len(applied) == 2 and tree.name("child") == "renamed"
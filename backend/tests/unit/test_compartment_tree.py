@@ -0,0 +1,65 @@
+"""
+Unit tests for the compartment hierarchy
+Tests ancestry and subtree queries and incremental refresh
+"""
+
+import pytest
+
+from app.services.compartment_tree import CompartmentTree
+
+
+def compartment(cid, parent=None):
+    item = {"id": cid, "name": cid.upper(), "lifecycle_state": "ACTIVE"}
+    if parent:
+        item["compartment_id"] = parent
+    return item
+
+
+TENANCY = [
+    compartment("root"),
+    compartment("prod", "root"), compartment("prod-app", "prod"), compartment("prod-db", "prod"),
+    compartment("dev", "root"), compartment("dev-sandbox", "dev"),
+]
+
+
+@pytest.mark.unit
+class TestCompartmentTree:
+    """Test suite for the compartment tree."""
+
+    def test_ancestry_and_subtree_queries(self):
+        """Test depth, ancestry, subtree and nested views of a listing."""
+        tree = CompartmentTree()
+        tree.apply(TENANCY)
+
+        assert tree.root_id == "root"
+        assert tree.depth("prod-db") == 2
+        assert tree.ancestors("prod-db") == ["prod", "root"]
+        assert tree.path("dev-sandbox") == ["ROOT", "DEV", "DEV-SANDBOX"]
+        assert tree.subtree("prod") == {"prod", "prod-app", "prod-db"}
+        assert tree.is_under("prod-app", "prod") and tree.is_under("prod", "prod")
+        assert not tree.is_under("dev-sandbox", "prod")
+        assert [c["id"] for c in tree.to_dict()["children"]] == ["dev", "prod"]
+        assert tree.to_dict("prod")["descendant_count"] == 2
+
+    def test_incremental_refresh(self):
+        """Test additions, removals, moves and orphans update only what changed."""
+        tree = CompartmentTree()
+        tree.apply(TENANCY)
+        version = tree.version
+
+        assert tree.apply(TENANCY) == {"added": [], "removed": [], "moved": [], "updated": []}
+        assert tree.version == version
+
+        listing = [c for c in TENANCY if c["id"] != "dev"]  # dev-sandbox is orphaned
+        listing = [compartment("prod-db", "dev-sandbox") if c["id"] == "prod-db" else c for c in listing]
+        listing.append(compartment("prod-db-replica", "prod-db"))
+        changes = tree.apply(listing)
+
+        assert changes["added"] == ["prod-db-replica"] and changes["removed"] == ["dev"]
+        assert changes["moved"] == ["prod-db", "dev-sandbox"]
+        assert tree.parent("dev-sandbox") == "root"
+        assert tree.subtree("prod") == {"prod", "prod-app"}
+        assert tree.subtree("dev-sandbox") == {"dev-sandbox", "prod-db", "prod-db-replica"}
+        assert tree.depth("prod-db-replica") == 3
+        assert tree.subtree("root") == {c["id"] for c in listing}
+        assert tree.version == version + 1
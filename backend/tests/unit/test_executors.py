@@ -0,0 +1,62 @@
+"""
+Unit tests for the named executor pools
+Tests queue depth, active thread accounting and pool lookup
+"""
+
+import threading
+import pytest
+
+from app.core.executors import InstrumentedThreadPool, get_executor
+
+
+@pytest.mark.unit
+class TestExecutors:
+    """Test suite for named executor pools."""
+
+    def test_reports_queue_depth_and_active_threads(self):
+        """Test a saturated pool reports queued and running calls, then completions."""
+        pool = InstrumentedThreadPool("test", max_workers=1)
+        started, release = threading.Event(), threading.Event()
+
+        def blocking():
+            started.set()
+            release.wait(5)
+
+        try:
+            first = pool.submit(blocking)
+            second = pool.submit(lambda: 42)
+            assert started.wait(5)
+            stats = pool.get_stats()
+            assert (stats["active"], stats["queue_depth"]) == (1, 1)
+
+            release.set()
+            first.result(5)
+            assert second.result(5) == 42
+            stats = pool.get_stats()
+            assert (stats["active"], stats["queue_depth"], stats["completed"]) == (0, 0, 2)
+            assert stats["max_queue_wait_ms"] > 0
+        finally:
+            release.set()
+            pool.shutdown(wait=True)
+
+    def test_cancelled_queued_calls_leave_the_queue(self):
+        """Test calls cancelled before starting, directly or by shutdown, are not counted as queued."""
+        pool = InstrumentedThreadPool("test", max_workers=1)
+        started, release = threading.Event(), threading.Event()
+        blocker = pool.submit(lambda: (started.set(), release.wait(5)))
+        assert started.wait(5)
+
+        assert pool.submit(lambda: 1).cancel()
+        pool.submit(lambda: 2)
+        pool.shutdown(wait=False, cancel_futures=True)
+        release.set()
+        blocker.result(5)
+
+        stats = pool.get_stats()
+        assert (stats["queue_depth"], stats["cancelled"], stats["completed"]) == (0, 2, 1)
+
+    def test_unknown_pool_is_rejected(self):
+        """Test only the registered workload pools can be requested."""
+        assert get_executor("io") is get_executor("io")
+        with pytest.raises(ValueError):
+            get_executor("default")
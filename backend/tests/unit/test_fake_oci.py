@@ -0,0 +1,51 @@
+"""
+Unit tests for the fake OCI SDK
+Tests 429 injection and record/replay of discovery against a synthetic tenancy
+"""
+
+import pytest
+
+from tests.fakes.fake_oci import FakeTenancy
+from tests.fakes.fixtures import fake_oci  # noqa: F401 (pytest fixture)
+from tests.fakes.recording import Recorder, Replayer
+
+
+def inventory_ids(result):
+    return {rt: sorted(item["id"] for item in items) for rt, items in result["resources"].items()}
+
+
+@pytest.mark.unit
+class TestFakeOCI:
+    """Test suite for the fake OCI SDK layer."""
+
+    @pytest.mark.asyncio
+    async def test_injected_throttling_is_retried(self, fake_oci):
+        """Test a tenancy answering some calls with 429 still yields the full inventory."""
+        clean = FakeTenancy(compartments=4, populated=2, resources_per_type=2)
+        expected = await fake_oci.install(clean)._list_resources_by_compartment()
+
+        fake_oci.fresh_cache("throttled")
+        throttled = FakeTenancy(compartments=4, populated=2, resources_per_type=2, throttle_rate=0.1, seed=3)
+        result = await fake_oci.install(throttled)._list_resources_by_compartment()
+
+        assert sum(throttled.throttled.values()) > 0
+        assert throttled.total_calls() == clean.total_calls() + sum(throttled.throttled.values())
+        assert inventory_ids(result) == inventory_ids(expected)
+
+    @pytest.mark.asyncio
+    async def test_replays_recorded_discovery(self, fake_oci, tmp_path):
+        """Test a recorded discovery replays offline with the same results and calls."""
+        tenancy = FakeTenancy(compartments=3, populated=2, resources_per_type=2)
+        service = fake_oci.install(tenancy)
+        recorder = Recorder().install(service)
+        recorded = await service.get_all_resources(tenancy.tenancy_id)
+        recorder.save(str(tmp_path / "tenancy.json"), {"tenancy": tenancy.tenancy_id})
+
+        fake_oci.fresh_cache("replay")
+        replayer = Replayer.load(str(tmp_path / "tenancy.json"))
+        replayed = await fake_oci.install(replayer).get_all_resources(tenancy.tenancy_id)
+
+        assert inventory_ids(replayed) == inventory_ids(recorded)
+        assert replayer.total_calls() == tenancy.total_calls()
+        assert not replayer.misses
+        assert replayed["resources"]["compute_instances"][0]["time_created"] == "2024-01-01T00:00:00"
@@ -0,0 +1,116 @@
+"""
+Unit tests for the cache invalidation bus
+Tests message dispatch to named caches and cross-worker CacheService invalidation
+"""
+
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core.invalidation_bus import InvalidationBus
+
+
+def _cache_service(tmp_path):
+    """CacheService without Redis, backed by a temporary directory"""
+    from app.services.cache_service import CacheService
+
+    with patch('app.services.cache_service.settings') as mock_settings:
+        mock_settings.REDIS_ENABLED = False
+        mock_settings.CACHE_LOCAL_MAX_ENTRIES = 1000
+        mock_settings.CACHE_LOCAL_MAX_BYTES = 1024 * 1024
+        mock_settings.CACHE_NAMESPACE_QUOTAS = {}
+        mock_settings.REDIS_CIRCUIT_FAILURE_THRESHOLD = 3
+        mock_settings.REDIS_CIRCUIT_RESET_TIMEOUT = 5.0
+        mock_settings.REDIS_CIRCUIT_MAX_RESET_TIMEOUT = 60.0
+        mock_settings.CACHE_FILE_MAX_BYTES = 1024 * 1024
+        mock_settings.CACHE_FILE_JANITOR_INTERVAL = 0
+        mock_settings.CACHE_GENERATION_REFRESH_SECONDS = 2.0
+        mock_settings.CACHE_CODEC = "auto"
+        mock_settings.CACHE_NAMESPACE_CODECS = {}
+        mock_settings.CACHE_COMPRESSION = "zstd"
+        mock_settings.CACHE_COMPRESSION_MIN_BYTES = 1024
+        cache = CacheService(cache_dir=str(tmp_path))
+    return cache
+
+
+@pytest.mark.unit
+class TestInvalidationBus:
+    """Test suite for invalidation bus functionality."""
+
+    @pytest.mark.asyncio
+    async def test_dispatch_routes_to_named_cache_and_skips_own_messages(self):
+        """Test messages reach only their cache's handlers and never the publishing worker."""
+        bus = InvalidationBus()
+        vault_handler = MagicMock()
+        cache_handler = AsyncMock()
+        bus.subscribe("vault", vault_handler)
+        bus.subscribe("cache", cache_handler)
+
+        await bus.dispatch(json.dumps({"origin": "other", "cache": "vault", "secret_name": "db"}))
+        await bus.dispatch(json.dumps({"origin": bus.origin, "cache": "cache", "action": "delete"}))
+
+        vault_handler.assert_called_once_with({"origin": "other", "cache": "vault", "secret_name": "db"})
+        cache_handler.assert_not_awaited()
+        assert bus.get_stats()["received"] == 1
+
+    @pytest.mark.asyncio
+    async def test_publish_without_redis_is_noop(self):
+        """Test publishing is skipped when Redis is disabled."""
+        bus = InvalidationBus()
+        with patch('app.core.invalidation_bus.get_redis_client', return_value=None):
+            await bus.publish("cache", action="delete", cache_keys=["oci:k"])
+
+        assert bus.get_stats()["published"] == 0
+
+    @pytest.mark.asyncio
+    async def test_publish_skipped_while_redis_circuit_is_open(self, tmp_path):
+        """Test publishing through the cache's breaker stops calling Redis once it opens."""
+        cache = _cache_service(tmp_path)
+        cache.redis_client = MagicMock()
+        client = MagicMock()
+        client.publish = AsyncMock(side_effect=ConnectionError("down"))
+        bus = InvalidationBus()
+        bus.route_through(cache._call_redis)
+
+        with patch('app.core.invalidation_bus.get_redis_client', return_value=client):
+            for _ in range(5):
+                await bus.publish("cache", action="delete", cache_keys=["oci:k"])
+
+        assert client.publish.await_count == 3  # REDIS_CIRCUIT_FAILURE_THRESHOLD
+        assert bus.get_stats()["publish_errors"] == 5 and bus.get_stats()["published"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cache_service_applies_remote_invalidations(self, tmp_path):
+        """Test delete and clear messages from another worker update the local tiers."""
+        cache = _cache_service(tmp_path)
+        await cache.set("oci", "a", [1], ttl=60)
+        await cache.set("cost", "b", [2], ttl=60)
+
+        await cache.handle_invalidation({"action": "delete", "cache_keys": ["oci:a"]})
+        await cache.handle_invalidation({"action": "clear", "namespace": "cost", "generation": 4})
+
+        assert await cache.get("oci", "a") is None
+        assert await cache.get("cost", "b") is None
+        assert cache.get_stats()["namespace_generations"]["cost"] == 4
+
+    @pytest.mark.asyncio
+    async def test_inventory_changes_invalidate_derived_caches(self):
+        """Test inventory change events drop the chatbot context and affected health matrices."""
+        from app.services import chatbot_service
+        from app.services.intelligence_service import IntelligenceService
+
+        oci_service = MagicMock(config={"tenancy": "tenancy"})
+        intelligence = IntelligenceService(oci_service)
+        handler = oci_service.inventory_sync.subscribe.call_args.args[0]
+        for compartment_id in ("c1", "c2", "tenancy"):
+            key = intelligence._get_cache_key("health_matrix", compartment_id)
+            intelligence._cache[key] = "matrix"
+        await chatbot_service._resource_cache.set("oci_resources_summary:default", {"resources": {}})
+
+        changes = [{"event": "created", "id": "i1", "compartment_id": "c1"}]
+        handler(changes)
+        with patch('app.core.invalidation_bus.get_redis_client', return_value=None):
+            await chatbot_service.invalidate_resource_context(changes)
+
+        assert sorted(intelligence._cache) == ["intelligence:health_matrix:c2"]
+        assert chatbot_service._resource_cache.get("oci_resources_summary:default") is None
@@ -0,0 +1,50 @@
+"""
+Unit tests for the in-memory inventory index
+Tests multi-key lookups and facet counts across writes
+"""
+
+import pytest
+
+from app.services.inventory_index import InventoryIndex
+
+
+def instance(n, state="RUNNING", shape="VM.Standard.E4.Flex"):
+    return {"id": f"ocid1.instance.oc1..{n}", "display_name": f"vm-{n}", "lifecycle_state": state, "shape": shape}
+
+
+@pytest.mark.unit
+class TestInventoryIndex:
+    """Test suite for the inventory index."""
+
+    def test_lookups_by_every_key(self):
+        """Test OCID, compartment, category and state lookups intersect correctly."""
+        index = InventoryIndex()
+        index.replace_pair("c1", "compute_instances", [instance(1), instance(2, "STOPPED")])
+        index.replace_pair("c2", "compute_instances", [instance(3, "STOPPED")])
+        index.replace_pair("c2", "block_volumes", [{"id": "ocid1.volume.oc1..1", "lifecycle_state": "AVAILABLE"}])
+
+        assert index.get("ocid1.instance.oc1..2")["display_name"] == "vm-2"
+        assert index.locate("ocid1.volume.oc1..1") == ("c2", "block_volumes")
+        assert index.ids(lifecycle_state="STOPPED") == {"ocid1.instance.oc1..2", "ocid1.instance.oc1..3"}
+        assert index.ids(compartment_id="c2", lifecycle_state="STOPPED") == {"ocid1.instance.oc1..3"}
+        assert [i["id"] for i in index.query("c2", "block_volumes")] == ["ocid1.volume.oc1..1"]
+        assert len(index.query(category="compute_instances", limit=2)) == 2
+
+    def test_facet_counts_follow_replacements(self):
+        """Test counts drop removed items and follow state changes and moves."""
+        index = InventoryIndex()
+        index.replace_pair("c1", "compute_instances", [instance(1), instance(2), instance(3, shape="BM.GPU")])
+        assert index.count(category="compute_instances", field="lifecycle_state", value="RUNNING") == 3
+
+        index.replace_pair("c1", "compute_instances", [instance(1), instance(2, "STOPPED")])
+        index.replace_pair("c2", "compute_instances", [instance(1)])  # Moved to c2
+
+        assert index.count() == 2
+        assert index.count("c1") == 1
+        assert index.count("c2", "compute_instances", "lifecycle_state", "RUNNING") == 1
+        assert index.facets(category="compute_instances") == {
+            "lifecycle_state": {"RUNNING": 1, "STOPPED": 1},
+            "shape": {"VM.Standard.E4.Flex": 2},
+            "resource_type": {},
+        }
+        assert "ocid1.instance.oc1..3" not in index
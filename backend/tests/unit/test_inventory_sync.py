@@ -0,0 +1,106 @@
+"""
+Unit tests for the incremental inventory sync
+Tests delta detection, change events and the persistent snapshot against the fake OCI SDK
+"""
+
+from datetime import timedelta
+
+import pytest
+
+from app.services.inventory_sync import InventorySyncEngine
+from tests.fakes.fake_oci import FakeTenancy
+from tests.fakes.fixtures import fake_oci  # noqa: F401 (pytest fixture)
+
+
+@pytest.fixture
+def synced_service(fake_oci, tmp_path):
+    """OCIService on a fake tenancy with a private cache and snapshot file"""
+    tenancy = FakeTenancy(compartments=4, populated=2, resources_per_type=2)
+    service = fake_oci.install(tenancy)
+    service.inventory_sync = InventorySyncEngine(service, path=str(tmp_path / "inventory.db"))
+    yield tenancy, service
+    if service.inventory_sync.store is not None:
+        service.inventory_sync.store.close()
+
+
+@pytest.mark.unit
+class TestInventorySync:
+    """Test suite for the inventory sync engine."""
+
+    @pytest.mark.asyncio
+    async def test_delta_sync_refreshes_only_changed_pairs(self, synced_service):
+        """Test a delta sync emits created/state_changed events and re-lists one pair."""
+        tenancy, service = synced_service
+        engine = service.inventory_sync
+        events = []
+        engine.subscribe(events.extend)
+
+        await engine.sync_once(full=True)
+        assert engine.ready
+        compartment_id = tenancy.compartments[0].id
+        stopped = tenancy.children("instance", compartment_id)[0]
+        tenancy.launch_instance(compartment_id, "new")
+        tenancy.update(stopped, lifecycle_state="STOPPED")
+        events.clear()
+        tenancy.calls.clear()
+
+        await engine.sync_once(full=False)
+
+        assert sorted((e["event"], e["id"]) for e in events) == [
+            ("created", "ocid1.instance.oc1..new"), ("state_changed", stopped.id)
+        ]
+        assert tenancy.calls["list_instances"] == 1
+        assert tenancy.total_calls() == tenancy.calls["search_resources"] + 1
+
+        tenancy.calls.clear()
+        instances = await service.get_compute_instances(compartment_id)
+        assert len(instances) == 3
+        assert {i["id"]: i["lifecycle_state"] for i in instances}[stopped.id] == "STOPPED"
+        assert tenancy.total_calls() == 0
+
+    @pytest.mark.asyncio
+    async def test_snapshot_survives_restart(self, synced_service, tmp_path):
+        """Test a new engine serves the persisted snapshot before syncing."""
+        tenancy, service = synced_service
+        await service.inventory_sync.sync_once(full=True)
+        before = await service._get_all_resources_from_all_compartments()
+
+        restarted = InventorySyncEngine(service, path=str(tmp_path / "inventory.db"))
+        await restarted.load()
+        service.inventory_sync.store.close()
+        service.inventory_sync = restarted
+        tenancy.calls.clear()
+        after = await service._get_all_resources_from_all_compartments()
+
+        assert restarted.ready
+        assert after["inventory_backend"] == "snapshot"
+        assert after["resources"] == before["resources"]
+        assert after["total_resources"] == before["total_resources"] > 0
+
+    @pytest.mark.asyncio
+    async def test_failed_pair_is_retried_by_the_next_sync(self, synced_service):
+        """Test a pair whose refresh failed is re-listed next cycle even though search no longer reports it."""
+        tenancy, service = synced_service
+        engine = service.inventory_sync
+        events = []
+        engine.subscribe(events.extend)
+        await engine.sync_once(full=True)
+
+        compartment_id = tenancy.compartments[0].id
+        tenancy.launch_instance(compartment_id, "new")
+        refresh_pair = engine._refresh_pair
+
+        async def failing_refresh(pair, expected):
+            raise RuntimeError("listing failed")
+
+        engine._refresh_pair = failing_refresh
+        events.clear()
+        await engine.sync_once(full=False)
+        assert events == [] and engine.get_stats()["failed_pairs"] == 1
+
+        # The instance is now older than the delta window, only the retry can pick it up
+        engine._refresh_pair = refresh_pair
+        engine.last_sync += timedelta(hours=1)
+        await engine.sync_once(full=False)
+        assert [(e["event"], e["id"]) for e in events] == [("created", "ocid1.instance.oc1..new")]
+        assert engine.get_stats()["failed_pairs"] == 0
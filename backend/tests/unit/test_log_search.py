@@ -0,0 +1,65 @@
+"""
+Unit tests for paginated log search
+Tests that searches follow opc-next-page within the result cap and time budget,
+resume from the returned cursor and share cache entries by parameter digest
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.services.monitoring_service import MonitoringService
+from tests.fakes.fake_oci import FakeTenancy
+from tests.fakes.fixtures import fake_oci  # noqa: F401 (pytest fixture)
+
+END = datetime(2026, 1, 1, 12, 0)
+START = END - timedelta(hours=1)
+
+
+@pytest.fixture
+def fake_service(fake_oci, monkeypatch):
+    """Fake tenancy with 250 log records, searched in pages of 100"""
+    monkeypatch.setattr(settings, "LOG_SEARCH_PAGE_SIZE", 100)
+
+    tenancy = FakeTenancy(compartments=1, populated=0)
+    tenancy.add_logs(250)
+    fake_oci.install(tenancy)
+    return tenancy, tenancy.compartments[0].id
+
+
+@pytest.mark.unit
+class TestLogSearch:
+    """Test suite for paginated log search."""
+
+    @pytest.mark.asyncio
+    async def test_search_pages_to_limit_and_resumes_from_cursor(self, fake_service):
+        """Test a capped search returns a cursor, the cursor resumes it and results are cached."""
+        tenancy, compartment_id = fake_service
+
+        first = await MonitoringService().search_logs(compartment_id, "search *", START, END, limit=150)
+        assert len(first["results"]) == 150 and first["stopped_by"] == "max_results"
+        assert tenancy.calls["search_logs"] == 2
+
+        rest = await MonitoringService().search_logs(compartment_id, "search *", START, END, limit=150,
+                                                     page=first["next_page"])
+        assert [r["id"] for r in rest["results"]] == [f"log-{i}" for i in range(150, 250)]
+        assert rest["next_page"] is None and not rest["truncated"]
+
+        # A fresh service instance (as another worker would) hits the same cache entry
+        again = await MonitoringService().search_logs(compartment_id, "search *", START, END, limit=150)
+        assert again == first and tenancy.calls["search_logs"] == 3
+
+    @pytest.mark.asyncio
+    async def test_stream_stops_at_time_budget(self, fake_service):
+        """Test a slow search streams the pages that arrived in time, then a resumable summary."""
+        tenancy, compartment_id = fake_service
+        tenancy.latency = 0.1
+
+        events = [event async for event in MonitoringService().stream_logs(
+            compartment_id, "search *", START, END, time_budget=0.15
+        )]
+
+        pages, summary = events[:-1], events[-1]
+        assert [e["event"] for e in pages] == ["logs"] and pages[0]["count"] == 100
+        assert summary["stopped_by"] == "time_budget" and summary["next_page"] == "100"
@@ -0,0 +1,71 @@
+"""
+Unit tests for the batched Monitoring queries
+Tests that compute alerting and activity checks issue one grouped query per metric
+per compartment against the fake OCI SDK
+"""
+
+import pytest
+
+from app.services.monitoring_service import MonitoringService
+from tests.fakes.fake_oci import FakeTenancy
+from tests.fakes.fixtures import fake_oci  # noqa: F401 (pytest fixture)
+
+
+@pytest.fixture
+def fake_service(fake_oci):
+    """OCIService on a fake tenancy with three running instances in one compartment"""
+    tenancy = FakeTenancy(compartments=2, populated=1, resources_per_type=3)
+    service = fake_oci.install(tenancy)
+    compartment_id = tenancy.compartments[0].id
+    for instance in tenancy.children("instance", compartment_id):
+        tenancy.update(instance, lifecycle_state="RUNNING")
+    return tenancy, service, compartment_id
+
+
+@pytest.mark.unit
+class TestMetricBatcher:
+    """Test suite for grouped metric queries."""
+
+    @pytest.mark.asyncio
+    async def test_compute_alerts_use_one_query_per_metric(self, fake_service):
+        """Test CPU and memory alerts for every running instance come from two calls."""
+        tenancy, service, compartment_id = fake_service
+        busy, idle, swapping = tenancy.children("instance", compartment_id)
+        tenancy.set_metric(busy, "CpuUtilization", 92.0, 96.0)
+        tenancy.set_metric(idle, "CpuUtilization", 3.0, 5.0)
+        tenancy.set_metric(swapping, "MemoryUtilization", 88.0, 90.0)
+
+        alerts = await MonitoringService().get_alarm_status(compartment_id)
+
+        metric_alerts = sorted((a["resource_id"], a["alert_type"]) for a in alerts if a.get("alert_type", "")[:3] in ("CPU", "MEM"))
+        assert metric_alerts == [(busy.id, "CPU_CRITICAL"), (swapping.id, "MEMORY_HIGH")]
+        assert tenancy.calls["summarize_metrics_data"] == 2
+
+    @pytest.mark.asyncio
+    async def test_last_activity_shares_the_compartment_query(self, fake_service):
+        """Test last-activity lookups for several instances reuse one grouped query."""
+        tenancy, service, compartment_id = fake_service
+        active, silent, _ = tenancy.children("instance", compartment_id)
+        tenancy.set_metric(active, "CpuUtilization", 10.0, 12.0, 11.0)
+
+        last_active = await service.get_instance_last_activity(compartment_id, active.id)
+        last_silent = await service.get_instance_last_activity(compartment_id, silent.id)
+
+        assert last_active is not None and last_silent is None
+        assert tenancy.calls["summarize_metrics_data"] == 1
+
+    @pytest.mark.asyncio
+    async def test_every_worker_reports_metric_alerts_from_one_query(self, fake_service):
+        """Test two services sharing a cache (as two workers would) each report metric alerts from their own rule state."""
+        tenancy, service, compartment_id = fake_service
+        busy = tenancy.children("instance", compartment_id)[0]
+        tenancy.set_metric(busy, "CpuUtilization", 92.0, 96.0)
+        workers = [MonitoringService(), MonitoringService()]
+
+        for worker in workers:
+            alerts = await worker.get_alarm_status(compartment_id)
+            assert [(a["resource_id"], a["alert_type"]) for a in alerts if a.get("metric_name")] == [
+                (busy.id, "CPU_CRITICAL")
+            ]
+            assert worker.alert_engine.get_stats()["firing"] == 1
+        assert tenancy.calls["summarize_metrics_data"] == 2
@@ -0,0 +1,65 @@
+"""
+Unit tests for the local metric time-series store
+Tests window reuse across sliding queries, rollups and eviction
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.metric_store import MetricStore, aggregate, epoch
+
+NOW = datetime(2026, 1, 1, 12, 0)
+STEPS = {"1m": 60, "5m": 300, "1h": 3600}
+
+
+def synthetic_fetch(calls):
+    """Fetch returning one point per interval for stream "r1", value = minute of the hour"""
+    async def fetch(start, end, interval):
+        calls.append((epoch(start), epoch(end), interval))
+        step = STEPS[interval]
+        points = [(datetime.utcfromtimestamp(t), float(t // 60 % 60))
+                  for t in range(epoch(start) // step * step, epoch(end), step)]
+        return {"r1": points}
+    return fetch
+
+
+@pytest.mark.unit
+class TestMetricStore:
+    """Test suite for the metric store."""
+
+    @pytest.mark.asyncio
+    async def test_sliding_window_fetches_only_the_new_range(self):
+        """Test a window moved forward refetches just the unsettled tail and rolls up exactly."""
+        store = MetricStore({60: 6 * 3600, 300: 86400, 3600: 14 * 86400}, settle_seconds=120)
+        calls = []
+        query = ("compartment", "oci_computeagent", "CpuUtilization", None)
+
+        step, windows = await store.query(query, NOW - timedelta(hours=1), NOW, synthetic_fetch(calls), now=NOW)
+        later = NOW + timedelta(minutes=5)
+        step, windows = await store.query(query, later - timedelta(hours=1), later, synthetic_fetch(calls), now=later)
+
+        assert step == 60
+        assert len(windows["r1"].timestamps) == 60
+        # Second query only covers the 2 unsettled minutes plus the 5 new ones
+        assert calls[1] == (epoch(NOW) - 120, epoch(later), "1m")
+        rollup = store.series(query[1:3] + ("r1",)).window(epoch(NOW) - 3600, epoch(NOW), 300)
+        assert rollup.counts.tolist() == [5] * 12
+        assert rollup.means.tolist() == [2.0 + 5 * i for i in range(12)]
+        assert aggregate([windows["r1"]])["max"] == 59.0
+
+    @pytest.mark.asyncio
+    async def test_eviction_drops_coverage(self):
+        """Test evicting a series makes its query fetch again, from the coarse tier for long windows."""
+        store = MetricStore({60: 3600, 300: 86400, 3600: 14 * 86400}, max_series=1)
+        calls = []
+        first = ("c1", "ns", "Cpu", None)
+        second = ("c2", "ns", "Memory", None)
+
+        step, _ = await store.query(first, NOW - timedelta(hours=3), NOW, synthetic_fetch(calls), now=NOW)
+        await store.query(second, NOW - timedelta(minutes=30), NOW, synthetic_fetch(calls), now=NOW)
+        await store.query(first, NOW - timedelta(hours=3), NOW, synthetic_fetch(calls), now=NOW)
+
+        assert step == 300
+        assert [interval for _, _, interval in calls] == ["5m", "1m", "5m"]
+        assert store.get_stats()["evictions"] == 2
@@ -0,0 +1,89 @@
+"""
+Unit tests for the OCI rate governor
+Tests AIMD backoff on 429s and per-operation pacing
+"""
+
+import asyncio
+import time
+import pytest
+
+from app.core.oci_governor import THROUGHPUT_WINDOW_SECONDS, OCIRateGovernor, _OperationStats
+
+
+class ThrottledError(Exception):
+    """Stand-in for oci.exceptions.ServiceError carrying a 429"""
+
+    def __init__(self, retry_after=None):
+        super().__init__("TooManyRequests")
+        self.status = 429
+        self.code = "TooManyRequests"
+        self.headers = {"retry-after": retry_after} if retry_after is not None else {}
+
+
+class FakeComputeClient:
+    """Client failing the first ``throttled`` calls with 429"""
+
+    def __init__(self, throttled=0, retry_after=None):
+        self.throttled = throttled
+        self.retry_after = retry_after
+        self.calls = 0
+
+    def get_instance(self, instance_id):
+        self.calls += 1
+        if self.calls <= self.throttled:
+            raise ThrottledError(self.retry_after)
+        return instance_id
+
+
+@pytest.fixture
+def governor():
+    governor = OCIRateGovernor()
+    governor.initial_rate = 20.0
+    governor.min_rate = 1.0
+    governor.max_rate = 100.0
+    governor.burst = 1.0
+    governor.max_retries = 2
+    return governor
+
+
+@pytest.mark.unit
+class TestOCIRateGovernor:
+    """Test suite for the adaptive OCI rate governor."""
+
+    @pytest.mark.asyncio
+    async def test_throttle_cuts_rate_honours_retry_after_and_retries(self, governor):
+        """Test a 429 halves the rate, waits out Retry-After and the retry succeeds."""
+        client = FakeComputeClient(throttled=1, retry_after="0.2")
+
+        started = time.monotonic()
+        assert await governor.call(client.get_instance, "ocid1.instance.a") == "ocid1.instance.a"
+
+        assert time.monotonic() - started >= 0.2
+        stats = governor.get_stats()["operations"]["FakeComputeClient.get_instance"]
+        assert (stats["calls"], stats["successes"], stats["throttles"], stats["retries"]) == (1, 1, 1, 1)
+        assert stats["rate_per_second"] < 20.0
+
+    @pytest.mark.asyncio
+    async def test_paces_concurrent_callers_and_gives_up_after_retries(self, governor):
+        """Test concurrent calls share one bucket and persistent 429s are raised."""
+        client = FakeComputeClient()
+
+        started = time.monotonic()
+        await asyncio.gather(*[governor.call(client.get_instance, str(i)) for i in range(5)])
+        # One burst token, then 20/s: four more calls need about 0.2s
+        assert time.monotonic() - started >= 0.15
+        assert governor.get_stats()["operations"]["FakeComputeClient.get_instance"]["max_queue_wait_ms"] > 0
+
+        always_throttled = FakeComputeClient(throttled=10)
+        with pytest.raises(ThrottledError):
+            await governor.call(always_throttled.get_instance, "x")
+        assert always_throttled.calls == 3
+
+    def test_completion_window_stays_bounded_without_stats_reads(self):
+        """Test completions older than the throughput window are dropped as new ones arrive."""
+        stats = _OperationStats()
+        for second in range(10 * int(THROUGHPUT_WINDOW_SECONDS)):
+            stats.record_completion(float(second))
+
+        assert len(stats.completions) == THROUGHPUT_WINDOW_SECONDS + 1
+        assert stats.throughput(10 * THROUGHPUT_WINDOW_SECONDS) == pytest.approx(1.0)
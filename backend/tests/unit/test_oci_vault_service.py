@@ -415,7 +415,8 @@ class TestOCIVaultService:
         assert "test-secret" in vault._secret_cache
         assert vault._secret_cache["test-secret"].value == "test-value"
     
-    def test_clear_cache(self):
+    @pytest.mark.asyncio
+    async def test_clear_cache(self):
         """Test cache clearing functionality."""
         vault = OCIVaultService()
         
@@ -424,7 +425,7 @@ class TestOCIVaultService:
         
         assert len(vault._secret_cache) == 1
         
-        vault.clear_cache()
+        await vault.clear_cache()
         
         assert len(vault._secret_cache) == 0
     